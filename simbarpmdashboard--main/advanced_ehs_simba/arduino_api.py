@@ -5,7 +5,6 @@ Simple Arduino API for Drilling MVP
 - Stores to Supabase cloud
 """
 
-import os
 import serial
 import json
 import time
@@ -27,17 +26,10 @@ supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 # Import ML predictor
 from ml_predictor import MaterialPredictor
 
-# Initialize predictor
+# Initialize predictor (models load on the first prediction; rule-based
+# results are served while a background job trains missing models)
 predictor = MaterialPredictor()
 
-# Try to load existing models or train new ones
-try:
-    predictor.load_models()
-except:
-    print("Training new models...")
-    os.makedirs('models', exist_ok=True)
-    predictor.train()
-
 
 # ============================================
 # API ENDPOINTS
@@ -55,7 +47,9 @@ def home():
             "/log": "POST - Log drilling data to Supabase",
             "/materials": "GET - List all materials",
             "/history": "GET - Get drilling history",
-            "/stats": "GET - Get statistics"
+            "/stats": "GET - Get statistics",
+            "/models": "GET - List model versions",
+            "/models/<version>/activate": "POST - Switch to a model version"
         }
     })
 
@@ -76,7 +70,8 @@ def predict():
         "rpm": 2300,
         "current": 14.5,
         "vibration_readings": [68, 72, 70, 69, 71],
-        "depth": 45.5
+        "depth": 45.5,
+        "model": "student"  (optional: "ensemble" or "student")
     }
     """
     try:
@@ -85,6 +80,8 @@ def predict():
         # Validate required fields
         if 'rpm' not in data or 'current' not in data:
             return jsonify({"error": "Missing rpm or current"}), 400
+        if data.get('model') not in (None, 'ensemble', 'student'):
+            return jsonify({"error": "model must be 'ensemble' or 'student'"}), 400
         
         # Add default values if missing
         sensor_data = {
@@ -97,7 +94,7 @@ def predict():
         }
         
         # Get prediction
-        result = predictor.predict(sensor_data)
+        result = predictor.predict(sensor_data, model=data.get('model'))
         
         # Convert numpy types to Python types for JSON
         return jsonify({
@@ -107,6 +104,9 @@ def predict():
             'category': str(result['category']),
             'recommended_rpm': int(result.get('recommended_rpm', data['rpm'])),
             'is_anomaly': bool(result['is_anomaly']),
+            'fallback': bool(result['fallback']),
+            'model_version': result['model_version'],
+            'inference_model': result['inference_model'],
             'top_3_predictions': [
                 {
                     'material': str(p['material']),
@@ -170,6 +170,7 @@ def log_to_supabase():
             "confidence": float(prediction['confidence']),
             "category": str(prediction['category']),
             "is_anomaly": bool(prediction['is_anomaly']),
+            "model_version": prediction['model_version'],
             "binary_search_iterations": int(data.get('iterations')) if data.get('iterations') else None,
             "final_rpm": int(data.get('final_rpm')) if data.get('final_rpm') else None
         }
@@ -183,7 +184,8 @@ def log_to_supabase():
                 'material': str(prediction['predicted_material']),
                 'confidence': float(prediction['confidence']),
                 'category': str(prediction['category']),
-                'recommended_rpm': int(prediction.get('recommended_rpm', data['rpm']))
+                'recommended_rpm': int(prediction.get('recommended_rpm', data['rpm'])),
+                'model_version': prediction['model_version']
             },
             "log_id": result.data[0]['id'] if result.data else None
         })
@@ -192,6 +194,37 @@ def log_to_supabase():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/models', methods=['GET'])
+def get_models():
+    """List registered model versions and the one serving"""
+    return jsonify({
+        "active_version": predictor.registry.active_version(),
+        "serving_version": predictor.model_version,
+        "versions": [m.to_dict() for m in predictor.registry.list_versions()]
+    })
+
+
+@app.route('/models/<version>/activate', methods=['POST'])
+def activate_model(version):
+    """
+    Switch to a registered model version without restarting
+    
+    The new version is loaded before it replaces the current one, so
+    predictions continue meanwhile. Other processes follow the ACTIVE
+    pointer on their next poll.
+    """
+    try:
+        predictor.registry.verify(version)
+        predictor.registry.activate(version)
+        predictor.activate_version(version)
+    except KeyError:
+        return jsonify({"error": f"Unknown model version: {version}"}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 409
+    
+    return jsonify({"status": "activated", "version": version})
+
+
 @app.route('/materials', methods=['GET'])
 def get_materials():
     """Get all materials from database"""
@@ -264,10 +297,13 @@ def get_stats():
 # ARDUINO SERIAL BRIDGE (Optional)
 # ============================================
 
-def run_serial_bridge(port='/dev/tty.usbmodem14201', baud=115200):
+def run_serial_bridge(port='/dev/tty.usbmodem14201', baud=115200, model=None):
     """
     Bridge between Arduino Serial and API
     Run this if Arduino sends data via USB Serial
+    
+    model='student' answers with the distilled student model (see
+    distillation.py) instead of the full ensemble.
     """
     print(f"Connecting to Arduino on {port}...")
     
@@ -292,7 +328,7 @@ def run_serial_bridge(port='/dev/tty.usbmodem14201', baud=115200):
                         'depth': data.get('depth', 0)
                     }
                     
-                    prediction = predictor.predict(sensor_data)
+                    prediction = predictor.predict(sensor_data, model=model)
                     print(f"Prediction: {prediction['predicted_material']} ({prediction['confidence']:.1f}%)")
                     
                     # Send result back to Arduino
@@ -322,10 +358,14 @@ def run_serial_bridge(port='/dev/tty.usbmodem14201', baud=115200):
 if __name__ == '__main__':
     import sys
     
-    if len(sys.argv) > 1 and sys.argv[1] == '--serial':
+    # --student: the serial bridge answers with the distilled student model
+    args = [arg for arg in sys.argv[1:] if arg != '--student']
+    model = 'student' if '--student' in sys.argv else None
+    
+    if len(args) > 0 and args[0] == '--serial':
         # Run serial bridge mode
-        port = sys.argv[2] if len(sys.argv) > 2 else '/dev/tty.usbmodem14201'
-        run_serial_bridge(port)
+        port = args[1] if len(args) > 1 else '/dev/tty.usbmodem14201'
+        run_serial_bridge(port, model=model)
     else:
         # Run HTTP API mode
         print("="*50)
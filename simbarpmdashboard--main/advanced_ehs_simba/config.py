@@ -15,6 +15,7 @@ Version: 1.0.0
 from __future__ import annotations
 
 import os
+import tempfile
 from enum import Enum
 from pathlib import Path
 from typing import Any, Optional
@@ -39,6 +40,13 @@ class LogLevel(str, Enum):
     CRITICAL = "CRITICAL"
 
 
+class DropPolicy(str, Enum):
+    """Ingestion queue overflow policies."""
+    OLDEST = "oldest"
+    NEWEST = "newest"
+    DOWNSAMPLE = "downsample"
+
+
 class AlertSeverity(str, Enum):
     """Alert severity levels."""
     INFO = "info"
@@ -57,6 +65,16 @@ class VibrationSensorConfig(BaseModel):
     warning_threshold_g: float = Field(default=2.5, ge=0.1, le=10.0)
     critical_threshold_g: float = Field(default=4.0, ge=0.5, le=15.0)
     fft_window_size: int = Field(default=1024, ge=256, le=4096)
+    spectral_overlap: float = Field(default=0.5, ge=0.0, le=0.9)
+    # Typical bearing defect ranges; derive from bearing geometry where known
+    spectral_bands_hz: dict[str, tuple[float, float]] = Field(
+        default_factory=lambda: {
+            "bpfo": (50.0, 150.0),
+            "bpfi": (100.0, 250.0),
+            "bsf": (150.0, 350.0),
+            "high": (350.0, 500.0),
+        }
+    )
     calibration_offset: float = Field(default=0.0)
 
 
@@ -86,6 +104,7 @@ class AcousticSensorConfig(BaseModel):
     noise_floor_db: float = Field(default=40.0)
     anomaly_threshold_db: float = Field(default=85.0)
     void_detection_freq_hz: tuple[int, int] = Field(default=(5000, 15000))
+    output_rate_hz: int = Field(default=100, ge=1, le=1000)  # Decimated level rate
 
 
 class PowerSensorConfig(BaseModel):
@@ -109,6 +128,15 @@ class SensorConfig(BaseModel):
     health_check_interval_s: int = Field(default=60, ge=10, le=300)
     max_data_age_s: float = Field(default=5.0, ge=1.0, le=30.0)
     min_valid_readings_percent: float = Field(default=95.0, ge=80.0, le=100.0)
+    
+    # Fusion scheduling (event-driven; min rate is the idle heartbeat, 0 disables it)
+    fusion_min_rate_hz: float = Field(default=1.0, ge=0.0, le=10.0)
+    fusion_max_rate_hz: float = Field(default=100.0, ge=1.0, le=1000.0)
+    
+    # Fusion mode: "latest" snapshots or "aligned" resampling onto a common grid
+    fusion_mode: str = Field(default="latest", pattern="^(latest|aligned)$")
+    aligned_fusion_rate_hz: float = Field(default=100.0, ge=1.0, le=1000.0)
+    aligned_window_s: float = Field(default=1.0, ge=0.1, le=60.0)
 
 
 # =============================================================================
@@ -177,6 +205,67 @@ class MaterialPredictorConfig(BaseModel):
         "soft_soil", "clay", "sandstone", "limestone",
         "granite", "basalt", "ore_body", "void"
     ])
+    
+    # Micro-batching inference server
+    batch_max_size: int = Field(default=64, ge=1, le=4096)
+    batch_max_wait_ms: float = Field(default=5.0, ge=0.0, le=1000.0)
+    
+    # Cascade inference: skip GradientBoosting when the RandomForest top-class
+    # probability clears the threshold (recalibrated on held-out data in train)
+    cascade_enabled: bool = Field(default=False)
+    cascade_threshold: float = Field(default=0.8, ge=0.0, le=1.0)
+    cascade_target_agreement: float = Field(default=0.995, ge=0.5, le=1.0)
+    cascade_audit_rate: float = Field(default=0.02, ge=0.0, le=1.0)
+    
+    # Compiled flat-array trees (see tree_compiler); larger batches use
+    # sklearn's own predict_proba, which is faster past a few dozen rows
+    use_compiled_trees: bool = Field(default=True)
+    compiled_max_rows: int = Field(default=64, ge=0, le=100000)
+    
+    # Boosting half of the ensemble: "gradient_boosting" (exact, single
+    # threaded) or "hist_gradient_boosting" (binned, multithreaded)
+    booster: str = Field(
+        default="gradient_boosting",
+        pattern="^(gradient_boosting|hist_gradient_boosting)$",
+    )
+    # Hyperparameter overrides on top of the defaults in ml_predictor, e.g.
+    # the winner of a hyperparameter_search run
+    forest_params: dict[str, Any] = Field(default_factory=dict)
+    booster_params: dict[str, Any] = Field(default_factory=dict)
+    
+    # Model serving predictions: the RF+booster "ensemble" or the distilled
+    # "student" (see student_model). Without load_teacher, versions with a
+    # student load only the student, for low-memory gateways.
+    inference_model: str = Field(default="ensemble", pattern="^(ensemble|student)$")
+    load_teacher: bool = Field(default=True)
+    
+    # Prediction cache (see prediction_cache): results are reused for inputs
+    # whose features round to the same steps, for up to cache_ttl_s. Every
+    # measured model input is keyed, with steps near its sensor noise
+    # (hardness_estimate and ucs_estimate follow from rpm). Results below
+    # cache_min_confidence (percent) are not stored: those inputs sit near a
+    # layer boundary, where another input in the same cell can get a
+    # different material.
+    cache_enabled: bool = Field(default=False)
+    cache_max_entries: int = Field(default=4096, ge=1, le=1_000_000)
+    cache_ttl_s: float = Field(default=5.0, ge=0.0, le=3600.0)
+    cache_resolution: dict[str, float] = Field(default_factory=lambda: {
+        "rpm": 25.0,
+        "current": 0.25,
+        "vibration_mean": 1.0,
+        "vibration_std": 1.0,
+        "vibration_max": 2.0,
+        "rpm_stability": 5.0,
+        "current_spike": 0.5,
+        "depth": 5.0,
+    })
+    cache_min_confidence: float = Field(default=80.0, ge=0.0, le=100.0)
+    
+    # Lazy model loading: until models exist in Settings.models_path, serve
+    # rule-based predictions and train in the training process pool. The registry's
+    # ACTIVE pointer is polled at the same interval for hot swaps.
+    background_training: bool = Field(default=True)
+    model_poll_interval_s: float = Field(default=5.0, ge=0.0, le=3600.0)
 
 
 class MaintenanceModelConfig(BaseModel):
@@ -196,12 +285,67 @@ class MaintenanceModelConfig(BaseModel):
     # RUL thresholds
     rul_warning_hours: float = Field(default=100.0)
     rul_critical_hours: float = Field(default=24.0)
+    
+    # Health reassessment from live fused data
+    update_interval_s: float = Field(default=60.0, ge=1.0, le=3600.0)
+    history_size: int = Field(default=600, ge=10, le=100_000)
+
+
+class TrainingPipelineConfig(BaseModel):
+    """Configuration for the out-of-core material model training pipeline."""
+    chunk_rows: int = Field(default=200_000, ge=100, le=10_000_000)
+    forest_trees: int = Field(default=200, ge=1, le=5000)
+    warm_start_trees_per_chunk: int = Field(default=10, ge=1, le=1000)
+    boost_sample_rows: int = Field(default=500_000, ge=100)
+    eval_sample_rows: int = Field(default=100_000, ge=100)
+    holdout_share: float = Field(default=0.2, gt=0.0, lt=1.0)
+    # Rows generated when a job is started without a data source
+    synthetic_rows: int = Field(default=10_000, ge=100)
+    max_workers: int = Field(default=1, ge=1, le=16)
+    random_state: int = Field(default=42)
+
+
+class HyperparameterSearchConfig(BaseModel):
+    """Configuration for the material model hyperparameter search."""
+    n_folds: int = Field(default=3, ge=2, le=10)
+    n_candidates: int = Field(default=12, ge=1, le=500)
+    # Successive halving: keep 1/halving_factor of the candidates per rung
+    # while the training rows grow by the same factor, starting at min_rows
+    halving_factor: int = Field(default=3, ge=2, le=10)
+    min_rows: int = Field(default=500, ge=50)
+    max_workers: int = Field(default=1, ge=1, le=16)
+    latency_repeats: int = Field(default=30, ge=1, le=10000)
+    latency_batch_rows: int = Field(default=256, ge=2, le=100000)
+    # Single-row latency limit for the winner (None: most accurate on the front)
+    latency_budget_ms: Optional[float] = Field(default=None, gt=0.0)
+    # Scaled CV folds are cached here, relative to Settings.models_path
+    cache_dir: str = Field(default="tuning")
+    random_state: int = Field(default=42)
+
+
+class DistillationConfig(BaseModel):
+    """Configuration for distilling the ensemble into a student model."""
+    # "softmax" (multinomial logistic) or "tree" (one shallow regression tree)
+    kind: str = Field(default="softmax", pattern="^(softmax|tree)$")
+    max_depth: int = Field(default=8, ge=1, le=20)
+    min_samples_leaf: int = Field(default=5, ge=1)
+    l2: float = Field(default=1e-4, ge=0.0)
+    max_iter: int = Field(default=500, ge=1)
+    # Jittered copies of the training rows added to the transfer set, with
+    # noise of augment_noise feature standard deviations
+    augment_copies: int = Field(default=2, ge=0, le=20)
+    augment_noise: float = Field(default=0.1, ge=0.0)
+    latency_repeats: int = Field(default=200, ge=1)
+    random_state: int = Field(default=42)
 
 
 class MLConfig(BaseModel):
     """Combined ML configuration."""
     material_predictor: MaterialPredictorConfig = Field(default_factory=MaterialPredictorConfig)
     maintenance: MaintenanceModelConfig = Field(default_factory=MaintenanceModelConfig)
+    training: TrainingPipelineConfig = Field(default_factory=TrainingPipelineConfig)
+    tuning: HyperparameterSearchConfig = Field(default_factory=HyperparameterSearchConfig)
+    distillation: DistillationConfig = Field(default_factory=DistillationConfig)
     
     # Training settings
     retrain_interval_days: int = Field(default=30)
@@ -270,6 +414,43 @@ class MQTTConfig(BaseModel):
     qos: int = Field(default=1, ge=0, le=2)
     retain: bool = Field(default=False)
     keepalive_s: int = Field(default=60)
+    
+    # Ingestion pipeline (bounded queue between broker and fusion)
+    ingest_queue_size: int = Field(default=10000, ge=100, le=1000000)
+    ingest_batch_max: int = Field(default=512, ge=1, le=100000)
+    drop_policy: DropPolicy = Field(default=DropPolicy.OLDEST)
+    downsample_factor: int = Field(default=4, ge=2, le=100)
+    downsample_high_water: float = Field(default=0.8, ge=0.1, le=1.0)
+
+
+# =============================================================================
+# Live Data Plane Configuration
+# =============================================================================
+
+class LiveDataConfig(BaseModel):
+    """Shared-memory live data plane between the ingest process and API workers."""
+    enabled: bool = Field(default=True)  # Used when api_workers > 1
+    name: str = Field(default="ehs_simba_live")
+    slot_count: int = Field(default=1024, ge=16, le=65536)
+    slot_size: int = Field(default=16384, ge=1024, le=1048576)
+    socket_dir: Path = Field(default=Path(tempfile.gettempdir()) / "ehs_simba")
+    poll_interval_s: float = Field(default=0.5, ge=0.01, le=10.0)
+    attach_timeout_s: float = Field(default=30.0, ge=1.0, le=300.0)
+    status_interval_s: float = Field(default=5.0, ge=0.5, le=60.0)
+    # Energy and maintenance status (minute aggregates, reassessed each minute)
+    equipment_status_interval_s: float = Field(default=60.0, ge=0.5, le=3600.0)
+
+
+# =============================================================================
+# Fleet Configuration
+# =============================================================================
+
+class FleetConfig(BaseModel):
+    """Multi-rig fleet sharding configuration."""
+    enabled: bool = Field(default=False)
+    shards: int = Field(default=0, ge=0, le=256)  # 0 = one shard per CPU core
+    virtual_nodes: int = Field(default=64, ge=1, le=1024)
+    default_rig_id: str = Field(default="rig_01")
 
 
 # =============================================================================
@@ -317,6 +498,9 @@ class EnergyConfig(BaseModel):
     
     # Anomaly detection
     consumption_anomaly_threshold_percent: float = Field(default=20.0)
+    
+    # Power readings sampled from live fused data (~10 Hz)
+    power_sample_interval_s: float = Field(default=0.1, ge=0.01, le=60.0)
 
 
 # =============================================================================
@@ -389,6 +573,8 @@ class Settings(BaseSettings):
     ml: MLConfig = Field(default_factory=MLConfig)
     database: DatabaseConfig = Field(default_factory=DatabaseConfig)
     mqtt: MQTTConfig = Field(default_factory=MQTTConfig)
+    live: LiveDataConfig = Field(default_factory=LiveDataConfig)
+    fleet: FleetConfig = Field(default_factory=FleetConfig)
     drilling: DrillingConfig = Field(default_factory=DrillingConfig)
     energy: EnergyConfig = Field(default_factory=EnergyConfig)
     safety: SafetyConfig = Field(default_factory=SafetyConfig)
@@ -471,12 +657,15 @@ __all__ = [
     "Environment",
     "LogLevel",
     "AlertSeverity",
+    "DropPolicy",
     "SensorConfig",
     "AlertConfig",
     "MLConfig",
     "DatabaseConfig",
     "SupabaseConfig",
     "MQTTConfig",
+    "LiveDataConfig",
+    "FleetConfig",
     "DrillingConfig",
     "EnergyConfig",
     "SafetyConfig",
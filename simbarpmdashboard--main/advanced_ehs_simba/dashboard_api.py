@@ -20,6 +20,7 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import os
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from enum import Enum
@@ -31,6 +32,7 @@ from fastapi import (
     FastAPI,
     HTTPException,
     Query,
+    Request,
     WebSocket,
     WebSocketDisconnect,
     status,
@@ -41,32 +43,58 @@ from pydantic import BaseModel, Field
 
 from analytics_engine import AnalyticsEngine, get_analytics_engine
 from config import Settings, get_settings
+from fleet import (
+    FleetRouter,
+    FleetShard,
+    RigEquipmentFeed,
+    build_shard_ring,
+    energy_status,
+    maintenance_status,
+    resolve_shard_count,
+    shard_live_config,
+)
+from inference_server import MicroBatchInferenceServer
+from live_data_plane import (
+    INGEST_COMMAND,
+    INGEST_FRAMES,
+    INGEST_READING,
+    LIVE_ROLE_ENV,
+    IngestServer,
+    LivePublisher,
+    RecordKind,
+)
 from supabase_client import (
     SupabaseManager,
     get_supabase_manager,
 )
 from energy_optimizer import (
     DrillState,
+    EfficiencyRating,
     EnergyOptimizer,
     PowerReading,
     get_energy_optimizer,
 )
 from maintenance_predictor import (
+    ComponentHealth,
+    MaintenanceScheduler,
+    MaintenanceTask,
     PredictiveMaintenanceEngine,
     get_maintenance_engine,
 )
 from ml_predictor import (
     MaterialPredictor,
-    SensorInput,
     get_material_predictor,
 )
 from safety_monitor import SafetyMonitor, get_safety_monitor
 from sensor_fusion import (
     FusedSensorData,
+    MQTTSensorClient,
     SensorFusionEngine,
     SensorReading,
+    decode_sensor_frames,
     get_fusion_engine,
 )
+from training_pipeline import TrainingPipeline, TrainingReport
 
 logger = logging.getLogger(__name__)
 
@@ -95,6 +123,7 @@ class SensorDataRequest(BaseModel):
     temperature_c: Optional[float] = Field(None, ge=0, le=150)
     acoustic_db: Optional[float] = Field(None, ge=0, le=150)
     timestamp: Optional[str] = None
+    rig_id: Optional[str] = None
 
 
 class PredictionResponse(BaseModel):
@@ -106,6 +135,7 @@ class PredictionResponse(BaseModel):
     is_transition: bool
     depth_m: float
     timestamp: str
+    model_version: Optional[str] = None
 
 
 class AlertResponse(BaseModel):
@@ -190,6 +220,14 @@ class KPIResponse(BaseModel):
     maintenance_due_count: int
 
 
+class TrainingRequest(BaseModel):
+    """Material model training job request."""
+    source: Optional[str] = Field(
+        default=None, description=".npy or .parquet file on the server; synthetic data if omitted"
+    )
+    warm_start: bool = Field(default=False, description="Add forest trees to the active version")
+
+
 # =============================================================================
 # WebSocket Connection Manager
 # =============================================================================
@@ -199,6 +237,8 @@ class ConnectionManager:
     
     def __init__(self):
         self.active_connections: list[WebSocket] = []
+        # Rig each connection follows (default rig until it subscribes)
+        self.rig_ids: dict[WebSocket, str] = {}
         self._lock = asyncio.Lock()
     
     async def connect(self, websocket: WebSocket) -> None:
@@ -206,6 +246,7 @@ class ConnectionManager:
         await websocket.accept()
         async with self._lock:
             self.active_connections.append(websocket)
+            self.rig_ids[websocket] = get_settings().fleet.default_rig_id
         logger.info(f"WebSocket connected. Total: {len(self.active_connections)}")
     
     async def disconnect(self, websocket: WebSocket) -> None:
@@ -213,6 +254,7 @@ class ConnectionManager:
         async with self._lock:
             if websocket in self.active_connections:
                 self.active_connections.remove(websocket)
+            self.rig_ids.pop(websocket, None)
         logger.info(f"WebSocket disconnected. Total: {len(self.active_connections)}")
     
     async def broadcast(self, message: dict[str, Any]) -> None:
@@ -233,6 +275,34 @@ class ConnectionManager:
         for conn in disconnected:
             await self.disconnect(conn)
     
+    def subscribe(self, websocket: WebSocket, rig_id: str) -> None:
+        """Make a connection follow another rig."""
+        self.rig_ids[websocket] = rig_id
+    
+    async def broadcast_text(self, data: str, rig_id: Optional[str] = None) -> None:
+        """
+        Broadcast an already encoded message.
+        
+        Args:
+            data: JSON text
+            rig_id: Send only to connections following this rig (default: all)
+        """
+        if not self.active_connections:
+            return
+        
+        disconnected = []
+        
+        for connection in self.active_connections:
+            if rig_id is not None and self.rig_ids.get(connection) != rig_id:
+                continue
+            try:
+                await connection.send_text(data)
+            except Exception:
+                disconnected.append(connection)
+        
+        for conn in disconnected:
+            await self.disconnect(conn)
+    
     async def send_personal(
         self,
         websocket: WebSocket,
@@ -258,14 +328,23 @@ class AppState:
     
     def __init__(self):
         self.material_predictor: Optional[MaterialPredictor] = None
+        self.inference_server: Optional[MicroBatchInferenceServer] = None
         self.sensor_fusion: Optional[SensorFusionEngine] = None
         self.maintenance_engine: Optional[PredictiveMaintenanceEngine] = None
         self.energy_optimizer: Optional[EnergyOptimizer] = None
+        self.equipment_feed: Optional[RigEquipmentFeed] = None
         self.analytics_engine: Optional[AnalyticsEngine] = None
         self.safety_monitor: Optional[SafetyMonitor] = None
         self.supabase: Optional[SupabaseManager] = None
+        self.training_pipeline: Optional[TrainingPipeline] = None
         
-        # Drilling state
+        # Material model training job
+        self._training_task: Optional[asyncio.Task] = None
+        self.last_training_report: Optional[TrainingReport] = None
+        self.last_training_error: Optional[str] = None
+        
+        # Drilling state (single-process mode; in fleet mode each rig's
+        # session is kept by its shard)
         self.is_drilling = False
         self.current_session_id: Optional[str] = None
         self.current_depth_m = 0.0
@@ -273,6 +352,15 @@ class AppState:
         
         # Streaming task
         self._streaming_task: Optional[asyncio.Task] = None
+        
+        # Live data plane (API worker mode only): shared view of the
+        # shard processes and the channels for forwarding sensor data
+        self.fleet: Optional[FleetRouter] = None
+    
+    @property
+    def is_live_worker(self) -> bool:
+        """True when sensor data is owned by separate shard processes."""
+        return self.fleet is not None
 
 
 app_state = AppState()
@@ -298,27 +386,51 @@ async def lifespan(app: FastAPI):
     
     # Initialize components
     app_state.material_predictor = get_material_predictor()
-    app_state.sensor_fusion = await get_fusion_engine()
-    app_state.maintenance_engine = get_maintenance_engine()
-    app_state.energy_optimizer = get_energy_optimizer()
+    app_state.training_pipeline = TrainingPipeline()
+    # Automatic training of missing models shares the training process pool
+    app_state.material_predictor.training_pipeline = app_state.training_pipeline
+    app_state.inference_server = MicroBatchInferenceServer(app_state.material_predictor)
+    await app_state.inference_server.start()
     app_state.analytics_engine = get_analytics_engine()
-    app_state.safety_monitor = get_safety_monitor()
     
-    # Register callbacks for real-time updates
-    def on_new_prediction(prediction):
-        asyncio.create_task(ws_manager.broadcast({
-            "type": "prediction",
-            "data": prediction.to_dict(),
-        }))
-    
-    def on_safety_alert(alert):
-        asyncio.create_task(ws_manager.broadcast({
-            "type": "safety_alert",
-            "data": alert.to_dict(),
-        }))
-    
-    app_state.sensor_fusion.register_prediction_callback(on_new_prediction)
-    app_state.safety_monitor.register_alert_callback(on_safety_alert)
+    if os.environ.get(LIVE_ROLE_ENV) == "worker":
+        # Sensor fusion, safety, energy and maintenance run per rig in the
+        # shard processes; relay their live records to this worker's
+        # WebSocket clients
+        app_state.fleet = FleetRouter(resolve_shard_count())
+        await app_state.fleet.attach()
+        app_state.fleet.start_relay(_relay_live_record)
+        logger.info(f"Attached to {app_state.fleet.shard_count} shard(s) as API worker")
+    else:
+        app_state.sensor_fusion = await get_fusion_engine()
+        app_state.sensor_fusion.inference_server = app_state.inference_server
+        app_state.safety_monitor = get_safety_monitor()
+        app_state.maintenance_engine = get_maintenance_engine()
+        app_state.energy_optimizer = get_energy_optimizer()
+        
+        # Feed the energy and maintenance engines from fused data
+        app_state.equipment_feed = RigEquipmentFeed(
+            app_state.energy_optimizer,
+            app_state.maintenance_engine,
+        )
+        app_state.sensor_fusion.register_data_callback(app_state.equipment_feed.on_fused_data)
+        app_state.sensor_fusion.register_prediction_callback(app_state.equipment_feed.on_prediction)
+        
+        # Register callbacks for real-time updates
+        def on_new_prediction(prediction):
+            asyncio.create_task(ws_manager.broadcast({
+                "type": "prediction",
+                "data": prediction,
+            }))
+        
+        def on_safety_alert(alert):
+            asyncio.create_task(ws_manager.broadcast({
+                "type": "safety_alert",
+                "data": alert.to_dict(),
+            }))
+        
+        app_state.sensor_fusion.register_prediction_callback(on_new_prediction)
+        app_state.safety_monitor.register_alert_callback(on_safety_alert)
     
     logger.info("Dashboard API started successfully")
     
@@ -333,9 +445,40 @@ async def lifespan(app: FastAPI):
     if app_state._streaming_task:
         app_state._streaming_task.cancel()
     
+    if app_state.inference_server:
+        await app_state.inference_server.stop()
+    
+    if app_state.training_pipeline:
+        app_state.training_pipeline.shutdown(wait=False)
+    
+    if app_state.fleet:
+        await app_state.fleet.close()
+    
     logger.info("Dashboard API shutdown complete")
 
 
+async def _relay_live_record(kind: RecordKind, rig_id: str, message: str) -> None:
+    """
+    Forward a live record from a shard process to WebSocket clients.
+    
+    Safety alerts go to every client; snapshots and predictions only to
+    clients following their rig.
+    """
+    if kind == RecordKind.ALERT:
+        await ws_manager.broadcast_text(message)
+    elif kind != RecordKind.STATUS:
+        await ws_manager.broadcast_text(message, rig_id)
+
+
+def _require_local_rig(rig_id: Optional[str]) -> None:
+    """Reject rig ids other than the default rig in single-process mode."""
+    if rig_id and rig_id != get_settings().fleet.default_rig_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Rig {rig_id} not found",
+        )
+
+
 # =============================================================================
 # FastAPI Application
 # =============================================================================
@@ -391,8 +534,22 @@ async def health_check():
 
 
 @app.get("/status", response_model=StatusResponse, tags=["Status"])
-async def get_system_status():
+async def get_system_status(rig_id: Optional[str] = None):
     """Get current system status."""
+    if app_state.fleet:
+        record = app_state.fleet.latest(RecordKind.STATUS, rig_id)
+        session_id = record["data"].get("current_session_id") if record else None
+        snapshot = app_state.fleet.latest(RecordKind.SNAPSHOT, rig_id)
+        return StatusResponse(
+            status="operational",
+            timestamp=datetime.utcnow().isoformat(),
+            version="1.0.0",
+            is_drilling=session_id is not None,
+            current_depth_m=snapshot["data"]["depth_m"] if session_id and snapshot else None,
+            current_session_id=session_id,
+        )
+    
+    _require_local_rig(rig_id)
     return StatusResponse(
         status="operational",
         timestamp=datetime.utcnow().isoformat(),
@@ -421,33 +578,37 @@ async def predict_material(data: SensorDataRequest):
             detail="Predictor not initialized",
         )
     
-    # Create sensor input
-    sensor_input = SensorInput(
-        rpm=data.rpm,
-        current_a=data.current_a,
-        vibration_g=data.vibration_g,
-        depth_m=data.depth_m,
-        pressure_bar=data.pressure_bar,
-        temperature_c=data.temperature_c,
-        acoustic_db=data.acoustic_db,
-        timestamp=datetime.fromisoformat(data.timestamp) if data.timestamp else datetime.utcnow(),
-    )
+    # Sensor dict in the form MaterialPredictor.predict_batch expects
+    sensor_data = {
+        "rpm": data.rpm,
+        "current": data.current_a,
+        "vibration_readings": [data.vibration_g],
+        "depth": data.depth_m,
+        "rpm_history": [data.rpm],
+        "current_history": [data.current_a],
+    }
     
-    # Get prediction
-    result = app_state.material_predictor.predict(sensor_input)
+    # Get prediction (micro-batched with concurrent requests)
+    result = await app_state.inference_server.predict(sensor_data)
     
     # Update state
+    material = str(result["predicted_material"])
+    previous_material = app_state.current_material
     app_state.current_depth_m = data.depth_m
-    app_state.current_material = result.material
+    app_state.current_material = material
     
     return PredictionResponse(
-        material=result.material,
-        confidence=result.confidence,
-        probabilities=result.probabilities,
-        recommended_rpm=result.recommended_rpm,
-        is_transition=result.is_transition,
-        depth_m=result.depth_m,
-        timestamp=result.timestamp.isoformat(),
+        material=material,
+        confidence=float(result["confidence"]),
+        probabilities={
+            str(p["material"]): float(p["confidence"])
+            for p in result["top_3_predictions"]
+        },
+        recommended_rpm=int(result["recommended_rpm"]),
+        is_transition=previous_material not in ("unknown", material),
+        depth_m=data.depth_m,
+        timestamp=result["timestamp"],
+        model_version=result["model_version"],
     )
 
 
@@ -466,6 +627,119 @@ async def get_prediction_history(
     }
 
 
+@app.get("/models", tags=["Prediction"])
+async def list_model_versions():
+    """List registered material model versions and the one serving."""
+    if not app_state.material_predictor:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Predictor not initialized",
+        )
+    
+    registry = app_state.material_predictor.registry
+    return {
+        "active_version": registry.active_version(),
+        "serving_version": app_state.material_predictor.model_version,
+        "versions": [manifest.to_dict() for manifest in registry.list_versions()],
+        "prediction_cache": app_state.material_predictor.get_cache_stats(),
+    }
+
+
+@app.post("/models/{version}/activate", tags=["Prediction"])
+async def activate_model_version(version: str):
+    """
+    Activate a registered material model version.
+    
+    Moves the registry's ACTIVE pointer and hot-swaps this worker; other
+    workers and shard processes follow within the model poll interval.
+    Predictions are served by the previous version until the new one
+    is loaded.
+    """
+    predictor = app_state.material_predictor
+    if not predictor:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Predictor not initialized",
+        )
+    
+    try:
+        predictor.registry.verify(version)
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Model version {version} not found",
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    
+    predictor.registry.activate(version)
+    await asyncio.get_running_loop().run_in_executor(None, predictor.activate_version, version)
+    
+    return {
+        "status": "activated",
+        "version": version,
+    }
+
+
+@app.post("/models/train", status_code=status.HTTP_202_ACCEPTED, tags=["Prediction"])
+async def start_model_training(request: TrainingRequest):
+    """
+    Start a material model training job.
+    
+    The job runs in the training process pool; the new version is
+    registered, activated and hot-swapped into this worker when it
+    finishes. Poll GET /models/train for the report.
+    """
+    if not app_state.material_predictor or not app_state.training_pipeline:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Predictor not initialized",
+        )
+    if app_state._training_task and not app_state._training_task.done():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A training job is already running",
+        )
+    
+    app_state._training_task = asyncio.create_task(_run_training_job(request))
+    return {
+        "status": "started",
+        "warm_start": request.warm_start,
+    }
+
+
+@app.get("/models/train", tags=["Prediction"])
+async def get_model_training_status():
+    """Status of the current or last material model training job."""
+    report = app_state.last_training_report
+    return {
+        "running": bool(app_state._training_task and not app_state._training_task.done()),
+        "last_report": report.to_dict() if report else None,
+        "last_error": app_state.last_training_error,
+    }
+
+
+async def _run_training_job(request: TrainingRequest) -> None:
+    """Run a training job and switch this worker to its version."""
+    try:
+        report = await app_state.training_pipeline.train_async(
+            request.source, warm_start=request.warm_start
+        )
+        await asyncio.get_running_loop().run_in_executor(
+            None, app_state.material_predictor.activate_version, report.version
+        )
+    except Exception as e:
+        logger.error(f"Material model training failed: {e}")
+        app_state.last_training_error = str(e)
+        return
+    
+    app_state.last_training_report = report
+    app_state.last_training_error = None
+    logger.info(
+        f"Material model version {report.version} trained in {report.total_time:.1f}s"
+    )
+
+
 # =============================================================================
 # Sensor Data Endpoints
 # =============================================================================
@@ -478,12 +752,30 @@ async def submit_sensor_reading(data: SensorDataRequest):
     The reading will be processed through the sensor fusion engine
     and trigger predictions and safety checks.
     """
+    if app_state.fleet:
+        await _forward_to_ingest(INGEST_READING, data.model_dump_json().encode("utf-8"), data.rig_id)
+        # Alerts reach clients through the live data plane
+        return {
+            "status": "queued",
+            "timestamp": data.timestamp or datetime.utcnow().isoformat(),
+        }
+    
     if not app_state.sensor_fusion:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Sensor fusion not initialized",
         )
+    _require_local_rig(data.rig_id)
     
+    return await _process_sensor_request(data, app_state.sensor_fusion, app_state.safety_monitor)
+
+
+async def _process_sensor_request(
+    data: SensorDataRequest,
+    fusion: SensorFusionEngine,
+    safety: Optional[SafetyMonitor],
+) -> dict[str, Any]:
+    """Ingest a sensor reading request into a rig's engines and run safety checks."""
     # Create sensor readings for each value
     timestamp = datetime.fromisoformat(data.timestamp) if data.timestamp else datetime.utcnow()
     
@@ -502,11 +794,11 @@ async def submit_sensor_reading(data: SensorDataRequest):
         readings.append(SensorReading("acoustic_01", "acoustic", data.acoustic_db, "dB", timestamp))
     
     # Process readings
-    await app_state.sensor_fusion.process_batch(readings)
+    await fusion.process_batch(readings)
     
     # Run safety checks
-    if app_state.safety_monitor:
-        alerts = app_state.safety_monitor.check_all(
+    if safety:
+        alerts = safety.check_all(
             vibration_g=data.vibration_g,
             hydraulic_temp_c=data.temperature_c or 45.0,
             motor_temp_c=data.temperature_c or 50.0 if data.temperature_c else 50.0,
@@ -527,14 +819,85 @@ async def submit_sensor_reading(data: SensorDataRequest):
     }
 
 
+async def _forward_to_ingest(kind: bytes, payload: bytes, rig_id: Optional[str] = None) -> None:
+    """Forward sensor data or a command to the rig's shard process (API worker mode)."""
+    try:
+        await app_state.fleet.send(kind, payload, rig_id)
+    except ConnectionError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+        )
+
+
+@app.post("/sensors/frames", tags=["Sensors"])
+async def submit_sensor_frames(
+    request: Request,
+    rig_id: Optional[str] = Query(None, description="Rig the frames belong to"),
+):
+    """
+    Submit high-rate sensor data as binary sensor frames.
+    
+    The body is one or more concatenated frames (Content-Type
+    ``application/octet-stream``) as produced by
+    ``sensor_fusion.encode_sensor_frame``. Use ``/sensors/reading`` with
+    JSON for low-rate sensors.
+    """
+    if app_state.fleet:
+        body = await request.body()
+        try:
+            frames = decode_sensor_frames(body)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid sensor frame: {e}",
+            )
+        await _forward_to_ingest(INGEST_FRAMES, body, rig_id)
+        return {
+            "status": "queued",
+            "frames": len(frames),
+            "samples": sum(len(frame) for frame in frames),
+        }
+    
+    if not app_state.sensor_fusion:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Sensor fusion not initialized",
+        )
+    _require_local_rig(rig_id)
+    
+    try:
+        frames = decode_sensor_frames(await request.body())
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid sensor frame: {e}",
+        )
+    
+    samples = await app_state.sensor_fusion.process_frames(frames)
+    
+    return {
+        "status": "processed",
+        "frames": len(frames),
+        "samples": samples,
+    }
+
+
 @app.get("/sensors/status", tags=["Sensors"])
-async def get_sensor_status():
+async def get_sensor_status(rig_id: Optional[str] = None):
     """Get current sensor health status."""
+    if app_state.fleet:
+        record = app_state.fleet.latest(RecordKind.STATUS, rig_id)
+        if not record:
+            return {"sensors": {}, "statistics": {}}
+        return {key: record["data"][key] for key in ("sensors", "statistics")}
+    
     if not app_state.sensor_fusion:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Sensor fusion not initialized",
         )
+    _require_local_rig(rig_id)
     
     health = app_state.sensor_fusion.get_sensor_health()
     stats = app_state.sensor_fusion.get_buffer_statistics()
@@ -549,13 +912,18 @@ async def get_sensor_status():
 
 
 @app.get("/sensors/current", tags=["Sensors"])
-async def get_current_readings():
+async def get_current_readings(rig_id: Optional[str] = None):
     """Get current (most recent) sensor readings."""
+    if app_state.fleet:
+        record = app_state.fleet.latest(RecordKind.SNAPSHOT, rig_id)
+        return record["data"] if record else {"message": "No recent sensor data available"}
+    
     if not app_state.sensor_fusion:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Sensor fusion not initialized",
         )
+    _require_local_rig(rig_id)
     
     fused = app_state.sensor_fusion.get_fused_data()
     
@@ -566,18 +934,74 @@ async def get_current_readings():
 
 
 # =============================================================================
-# Maintenance Endpoints
+# Fleet Endpoints
 # =============================================================================
 
-@app.get("/maintenance/health", tags=["Maintenance"])
-async def get_component_health():
-    """Get health status for all monitored components."""
-    if not app_state.maintenance_engine:
+@app.get("/fleet/rigs", tags=["Fleet"])
+async def list_fleet_rigs():
+    """List rigs with live data and the shard that owns each."""
+    if app_state.fleet:
+        return {
+            "shards": app_state.fleet.shard_count,
+            "rigs": [
+                {"rig_id": rig_id, "shard": app_state.fleet.shard_for(rig_id)}
+                for rig_id in app_state.fleet.rig_ids()
+            ],
+        }
+    
+    return {
+        "shards": 1,
+        "rigs": [{"rig_id": get_settings().fleet.default_rig_id, "shard": 0}],
+    }
+
+
+@app.get("/fleet/rigs/{rig_id}", tags=["Fleet"])
+async def get_fleet_rig(rig_id: str):
+    """Get a rig's latest sensor, safety, energy and maintenance status."""
+    if app_state.fleet:
+        record = app_state.fleet.latest(RecordKind.STATUS, rig_id)
+        if not record:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Rig {rig_id} not found",
+            )
+        return {"shard": app_state.fleet.shard_for(rig_id), **record["data"]}
+    
+    _require_local_rig(rig_id)
+    if not app_state.sensor_fusion or not app_state.safety_monitor:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Maintenance engine not initialized",
+            detail="Sensor fusion not initialized",
         )
     
+    health = app_state.sensor_fusion.get_sensor_health()
+    return {
+        "shard": 0,
+        "rig_id": rig_id,
+        "sensors": {sensor_id: report.to_dict() for sensor_id, report in health.items()},
+        "statistics": app_state.sensor_fusion.get_buffer_statistics(),
+        "safety": app_state.safety_monitor.get_status().to_dict(),
+        "current_session_id": app_state.current_session_id,
+        "energy": energy_status(app_state.energy_optimizer),
+        "maintenance": maintenance_status(app_state.maintenance_engine),
+    }
+
+
+# =============================================================================
+# Maintenance Endpoints
+# =============================================================================
+
+@app.get("/maintenance/health", tags=["Maintenance"])
+async def get_component_health(rig_id: Optional[str] = None):
+    """Get health status for all monitored components."""
+    if app_state.fleet:
+        maintenance = _fleet_rig_section(rig_id, "maintenance")
+        return {
+            "overall_health": maintenance["overall_health"],
+            "components": maintenance["components"],
+        }
+    
+    _require_maintenance_engine(rig_id)
     health_reports = app_state.maintenance_engine.get_system_health()
     
     return {
@@ -592,15 +1016,15 @@ async def get_component_health():
 @app.get("/maintenance/schedule", tags=["Maintenance"])
 async def get_maintenance_schedule(
     days_ahead: int = Query(30, ge=1, le=365),
+    rig_id: Optional[str] = None,
 ):
     """Get upcoming maintenance schedule."""
-    if not app_state.maintenance_engine:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Maintenance engine not initialized",
-        )
-    
-    tasks = app_state.maintenance_engine.get_maintenance_schedule(days_ahead)
+    if app_state.fleet:
+        # Scheduled here from the component health the rig's shard published
+        tasks = _fleet_maintenance_schedule(_fleet_rig_section(rig_id, "maintenance"), days_ahead)
+    else:
+        _require_maintenance_engine(rig_id)
+        tasks = app_state.maintenance_engine.get_maintenance_schedule(days_ahead)
     
     return {
         "planning_horizon_days": days_ahead,
@@ -610,15 +1034,16 @@ async def get_maintenance_schedule(
 
 
 @app.get("/maintenance/rul", tags=["Maintenance"])
-async def get_remaining_useful_life():
+async def get_remaining_useful_life(rig_id: Optional[str] = None):
     """Get RUL (Remaining Useful Life) for all components."""
-    if not app_state.maintenance_engine:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Maintenance engine not initialized",
-        )
-    
-    rul_summary = app_state.maintenance_engine.get_rul_summary()
+    if app_state.fleet:
+        rul_summary = {
+            name: health["rul_hours"]
+            for name, health in _fleet_rig_section(rig_id, "maintenance")["components"].items()
+        }
+    else:
+        _require_maintenance_engine(rig_id)
+        rul_summary = app_state.maintenance_engine.get_rul_summary()
     
     return {
         "components": rul_summary,
@@ -636,24 +1061,50 @@ async def update_drill_bit_data(
     vibration_history: list[float],
     current_vibration: float,
     materials_drilled: Optional[dict[str, float]] = None,
+    rig_id: Optional[str] = None,
 ):
     """Update drill bit operating data for health assessment."""
-    if not app_state.maintenance_engine:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Maintenance engine not initialized",
-        )
+    if app_state.fleet:
+        # The rig's shard applies it; the next status record shows the result
+        await _forward_rig_command(rig_id, {
+            "command": "update_drill_bit",
+            "operating_hours": operating_hours,
+            "vibration_history": vibration_history,
+            "current_vibration": current_vibration,
+            "materials_drilled": materials_drilled,
+        })
+        return {"status": "queued"}
     
-    health = app_state.maintenance_engine.update_drill_bit_data(
+    _require_maintenance_engine(rig_id)
+    health = app_state.equipment_feed.update_drill_bit(
         operating_hours=operating_hours,
         vibration_history=vibration_history,
-        materials_drilled=materials_drilled,
         current_vibration=current_vibration,
+        materials_drilled=materials_drilled,
     )
     
     return health.to_dict()
 
 
+def _require_maintenance_engine(rig_id: Optional[str]) -> None:
+    """Reject maintenance requests when the local maintenance engine is unavailable."""
+    if not app_state.maintenance_engine:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Maintenance engine not initialized",
+        )
+    _require_local_rig(rig_id)
+
+
+def _fleet_maintenance_schedule(maintenance: dict[str, Any], days_ahead: int) -> list[MaintenanceTask]:
+    """Maintenance schedule for a rig's published component health."""
+    health_reports = [
+        ComponentHealth.from_dict(health)
+        for health in maintenance["components"].values()
+    ]
+    return MaintenanceScheduler().generate_schedule(health_reports, days_ahead)
+
+
 # =============================================================================
 # Energy Endpoints
 # =============================================================================
@@ -661,14 +1112,30 @@ async def update_drill_bit_data(
 @app.get("/energy/metrics", response_model=EnergyMetricsResponse, tags=["Energy"])
 async def get_energy_metrics(
     hours: float = Query(24.0, ge=1, le=168),
+    rig_id: Optional[str] = None,
 ):
-    """Get energy consumption metrics for specified period."""
-    if not app_state.energy_optimizer:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Energy optimizer not initialized",
+    """
+    Get energy consumption metrics for specified period.
+    
+    In fleet mode the rig's shard publishes metrics for fixed periods
+    (1, 8, 24 and 168 hours); the smallest period covering ``hours`` is
+    returned and reported as ``period_hours``.
+    """
+    if app_state.fleet:
+        period = _fleet_energy_period(rig_id, hours)
+        metrics = period["metrics"]
+        return EnergyMetricsResponse(
+            total_energy_kwh=metrics["total_energy_kwh"],
+            peak_power_kw=metrics["peak_power_kw"],
+            avg_power_kw=metrics["avg_power_kw"],
+            drilling_energy_kwh=metrics["drilling_energy_kwh"],
+            idle_energy_kwh=metrics["idle_energy_kwh"],
+            efficiency_percent=metrics["efficiency_percent"],
+            cost_usd=metrics["cost_usd"],
+            period_hours=period["period_hours"],
         )
     
+    _require_energy_optimizer(rig_id)
     metrics = app_state.energy_optimizer.get_energy_metrics(hours)
     
     return EnergyMetricsResponse(
@@ -686,28 +1153,29 @@ async def get_energy_metrics(
 @app.get("/energy/comparison", tags=["Energy"])
 async def get_energy_comparison(
     hours: float = Query(24.0, ge=1, le=168),
+    rig_id: Optional[str] = None,
 ):
     """Get energy cost comparison vs conventional pneumatic drill."""
-    if not app_state.energy_optimizer:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Energy optimizer not initialized",
-        )
+    if app_state.fleet:
+        return _fleet_energy_period(rig_id, hours)["comparison"]
     
+    _require_energy_optimizer(rig_id)
     comparison = app_state.energy_optimizer.get_cost_comparison(hours)
     
     return comparison.to_dict()
 
 
 @app.get("/energy/recommendations", tags=["Energy"])
-async def get_energy_recommendations():
+async def get_energy_recommendations(rig_id: Optional[str] = None):
     """Get energy optimization recommendations."""
-    if not app_state.energy_optimizer:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Energy optimizer not initialized",
-        )
+    if app_state.fleet:
+        recommendations = _fleet_rig_section(rig_id, "energy")["recommendations"]
+        return {
+            "recommendations": recommendations,
+            "total": len(recommendations),
+        }
     
+    _require_energy_optimizer(rig_id)
     recommendations = app_state.energy_optimizer.get_recommendations()
     
     return {
@@ -717,14 +1185,12 @@ async def get_energy_recommendations():
 
 
 @app.get("/energy/efficiency", tags=["Energy"])
-async def get_efficiency_summary():
+async def get_efficiency_summary(rig_id: Optional[str] = None):
     """Get comprehensive efficiency summary."""
-    if not app_state.energy_optimizer:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Energy optimizer not initialized",
-        )
+    if app_state.fleet:
+        return _fleet_rig_section(rig_id, "energy")["efficiency"]
     
+    _require_energy_optimizer(rig_id)
     return app_state.energy_optimizer.get_efficiency_summary()
 
 
@@ -735,14 +1201,9 @@ async def submit_power_reading(
     current_a: float = 0.0,
     power_factor: float = 1.0,
     state: str = "drilling",
+    rig_id: Optional[str] = None,
 ):
     """Submit a power reading."""
-    if not app_state.energy_optimizer:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Energy optimizer not initialized",
-        )
-    
     # Map state string to enum
     drill_state = DrillState(state) if state in [s.value for s in DrillState] else DrillState.DRILLING
     
@@ -755,6 +1216,12 @@ async def submit_power_reading(
         state=drill_state,
     )
     
+    if app_state.fleet:
+        # Anomalies are checked by the rig's shard
+        await _forward_rig_command(rig_id, {"command": "power_reading", **reading.to_dict()})
+        return {"status": "queued"}
+    
+    _require_energy_optimizer(rig_id)
     anomaly = app_state.energy_optimizer.add_power_reading(reading)
     
     return {
@@ -763,6 +1230,25 @@ async def submit_power_reading(
     }
 
 
+def _require_energy_optimizer(rig_id: Optional[str]) -> None:
+    """Reject energy requests when the local energy optimizer is unavailable."""
+    if not app_state.energy_optimizer:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Energy optimizer not initialized",
+        )
+    _require_local_rig(rig_id)
+
+
+def _fleet_energy_period(rig_id: Optional[str], hours: float) -> dict[str, Any]:
+    """The smallest energy period a rig's shard published that covers ``hours``."""
+    periods = _fleet_rig_section(rig_id, "energy")["periods"]
+    return next(
+        (period for period in periods if period["period_hours"] >= hours),
+        periods[-1],
+    )
+
+
 # =============================================================================
 # Analytics Endpoints
 # =============================================================================
@@ -855,14 +1341,19 @@ async def score_hole(
 # =============================================================================
 
 @app.get("/safety/status", response_model=SafetyStatusResponse, tags=["Safety"])
-async def get_safety_status():
+async def get_safety_status(rig_id: Optional[str] = None):
     """Get current safety system status."""
-    if not app_state.safety_monitor:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Safety monitor not initialized",
+    if app_state.fleet:
+        safety = _fleet_rig_status(rig_id)["safety"]
+        return SafetyStatusResponse(
+            is_safe=safety["is_safe"],
+            active_alerts=safety["active_alerts"],
+            highest_alert_level=safety["highest_alert_level"],
+            emergency_stop_active=safety["emergency_stop_active"],
+            system_health=safety["system_health"],
         )
     
+    _require_safety_monitor(rig_id)
     status_obj = app_state.safety_monitor.get_status()
     
     return SafetyStatusResponse(
@@ -875,14 +1366,16 @@ async def get_safety_status():
 
 
 @app.get("/safety/alerts", tags=["Safety"])
-async def get_active_alerts():
+async def get_active_alerts(rig_id: Optional[str] = None):
     """Get all active safety alerts."""
-    if not app_state.safety_monitor:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Safety monitor not initialized",
-        )
+    if app_state.fleet:
+        alerts = _fleet_rig_status(rig_id)["alerts"]
+        return {
+            "alerts": alerts,
+            "count": len(alerts),
+        }
     
+    _require_safety_monitor(rig_id)
     alerts = app_state.safety_monitor.get_active_alerts()
     
     return {
@@ -894,14 +1387,19 @@ async def get_active_alerts():
 @app.get("/safety/alerts/history", tags=["Safety"])
 async def get_alert_history(
     hours: float = Query(24.0, ge=1, le=168),
+    rig_id: Optional[str] = None,
 ):
     """Get historical alerts."""
-    if not app_state.safety_monitor:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Safety monitor not initialized",
-        )
+    if app_state.fleet:
+        # Alerts relayed to this worker since it attached
+        alerts = app_state.fleet.alert_history(rig_id, hours)
+        return {
+            "period_hours": hours,
+            "alerts": alerts,
+            "count": len(alerts),
+        }
     
+    _require_safety_monitor(rig_id)
     alerts = app_state.safety_monitor.get_alert_history(hours)
     
     return {
@@ -915,14 +1413,25 @@ async def get_alert_history(
 async def acknowledge_alert(
     alert_id: str,
     acknowledged_by: str,
+    rig_id: Optional[str] = None,
 ):
     """Acknowledge a safety alert."""
-    if not app_state.safety_monitor:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Safety monitor not initialized",
-        )
+    if app_state.fleet:
+        # The rig's shard applies it; the next status record shows the result
+        known = _fleet_rig_status(rig_id)["alerts"] + app_state.fleet.alert_history(rig_id)
+        if not any(alert["alert_id"] == alert_id for alert in known):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Alert {alert_id} not found",
+            )
+        await _forward_rig_command(rig_id, {
+            "command": "acknowledge_alert",
+            "alert_id": alert_id,
+            "acknowledged_by": acknowledged_by,
+        })
+        return {"status": "queued", "alert_id": alert_id}
     
+    _require_safety_monitor(rig_id)
     success = app_state.safety_monitor.acknowledge_alert(alert_id, acknowledged_by)
     
     if success:
@@ -937,14 +1446,20 @@ async def acknowledge_alert(
 @app.post("/safety/emergency/reset", tags=["Safety"])
 async def reset_emergency_stop(
     authorized_by: str,
+    rig_id: Optional[str] = None,
 ):
     """Reset emergency stop (requires authorization)."""
-    if not app_state.safety_monitor:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Safety monitor not initialized",
-        )
+    if app_state.fleet:
+        await _forward_rig_command(rig_id, {
+            "command": "reset_emergency",
+            "authorized_by": authorized_by,
+        })
+        return {
+            "status": "queued",
+            "authorized_by": authorized_by,
+        }
     
+    _require_safety_monitor(rig_id)
     success = app_state.safety_monitor.reset_emergency(authorized_by)
     
     return {
@@ -954,27 +1469,60 @@ async def reset_emergency_stop(
 
 
 @app.get("/safety/thermal", tags=["Safety"])
-async def get_thermal_status():
+async def get_thermal_status(rig_id: Optional[str] = None):
     """Get current thermal status."""
-    if not app_state.safety_monitor:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Safety monitor not initialized",
-        )
+    if app_state.fleet:
+        return _fleet_rig_status(rig_id)["thermal"]
     
+    _require_safety_monitor(rig_id)
     return app_state.safety_monitor.get_thermal_status()
 
 
 @app.get("/safety/statistics", tags=["Safety"])
-async def get_safety_statistics():
+async def get_safety_statistics(rig_id: Optional[str] = None):
     """Get safety monitoring statistics."""
+    if app_state.fleet:
+        return _fleet_rig_status(rig_id)["safety_statistics"]
+    
+    _require_safety_monitor(rig_id)
+    return app_state.safety_monitor.get_statistics()
+
+
+def _require_safety_monitor(rig_id: Optional[str]) -> None:
+    """Reject safety requests when the local safety monitor is unavailable."""
     if not app_state.safety_monitor:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Safety monitor not initialized",
         )
-    
-    return app_state.safety_monitor.get_statistics()
+    _require_local_rig(rig_id)
+
+
+def _fleet_rig_status(rig_id: Optional[str]) -> dict[str, Any]:
+    """Latest status a rig's shard published (API worker mode)."""
+    record = app_state.fleet.latest(RecordKind.STATUS, rig_id)
+    if not record:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Rig {rig_id or get_settings().fleet.default_rig_id} not found",
+        )
+    return record["data"]
+
+
+def _fleet_rig_section(rig_id: Optional[str], section: str) -> dict[str, Any]:
+    """A section (``energy``, ``maintenance``) of a rig's latest status (API worker mode)."""
+    data = _fleet_rig_status(rig_id)
+    if section not in data:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"No {section} status published for rig {rig_id or get_settings().fleet.default_rig_id} yet",
+        )
+    return data[section]
+
+
+async def _forward_rig_command(rig_id: Optional[str], command: dict[str, Any]) -> None:
+    """Send a command to the shard owning the rig's engines."""
+    await _forward_to_ingest(INGEST_COMMAND, json.dumps(command).encode("utf-8"), rig_id)
 
 
 # =============================================================================
@@ -988,22 +1536,40 @@ async def get_kpi_dashboard():
     
     # Energy efficiency
     efficiency_rating = "good"
-    if app_state.energy_optimizer:
-        from energy_optimizer import EfficiencyRating
+    if app_state.fleet:
+        # Least efficient rig
+        ratings = [
+            EfficiencyRating(record["data"]["energy"]["efficiency"]["efficiency_rating"])
+            for record in app_state.fleet.latest_all(RecordKind.STATUS)
+            if "energy" in record["data"]
+        ]
+        if ratings:
+            efficiency_rating = max(ratings, key=list(EfficiencyRating).index).value
+    elif app_state.energy_optimizer:
         rating = app_state.energy_optimizer.power_monitor.get_efficiency_rating()
         efficiency_rating = rating.value
     
     # Active alerts
     active_alerts = 0
-    if app_state.safety_monitor:
+    if app_state.fleet:
+        active_alerts = sum(
+            record["data"]["safety"]["active_alerts"]
+            for record in app_state.fleet.latest_all(RecordKind.STATUS)
+            if "safety" in record["data"]
+        )
+    elif app_state.safety_monitor:
         status_obj = app_state.safety_monitor.get_status()
         active_alerts = status_obj.active_alerts
     
     # Maintenance due
-    maintenance_due = 0
-    if app_state.maintenance_engine:
+    tasks: list[MaintenanceTask] = []
+    if app_state.fleet:
+        for record in app_state.fleet.latest_all(RecordKind.STATUS):
+            if "maintenance" in record["data"]:
+                tasks.extend(_fleet_maintenance_schedule(record["data"]["maintenance"], 7))
+    elif app_state.maintenance_engine:
         tasks = app_state.maintenance_engine.get_maintenance_schedule(7)
-        maintenance_due = len([t for t in tasks if t.priority.value in ["emergency", "high"]])
+    maintenance_due = len([t for t in tasks if t.priority.value in ["emergency", "high"]])
     
     return KPIResponse(
         total_holes_today=0,  # Would come from database
@@ -1031,8 +1597,14 @@ async def websocket_live_stream(websocket: WebSocket):
     - Material predictions
     - Safety alerts
     - System status updates
+    
+    In fleet mode every record carries a ``rig_id``. A connection gets
+    the sensor updates and predictions of one rig (the default rig until
+    a ``subscribe`` message with ``rig_id`` selects another) and the
+    safety alerts of every rig.
     """
     await ws_manager.connect(websocket)
+    rig_id: Optional[str] = None
     
     try:
         # Send initial status
@@ -1060,14 +1632,22 @@ async def websocket_live_stream(websocket: WebSocket):
                     })
                 elif message.get("type") == "subscribe":
                     # Handle subscription requests
+                    rig_id = message.get("rig_id", rig_id)
+                    if rig_id:
+                        ws_manager.subscribe(websocket, rig_id)
                     await ws_manager.send_personal(websocket, {
                         "type": "subscribed",
                         "channels": message.get("channels", ["all"]),
+                        "rig_id": rig_id,
                     })
                     
             except asyncio.TimeoutError:
                 # Send periodic status update on timeout
-                if app_state.sensor_fusion:
+                if app_state.fleet:
+                    record = app_state.fleet.latest(RecordKind.SNAPSHOT, rig_id)
+                    if record:
+                        await ws_manager.send_personal(websocket, record)
+                elif app_state.sensor_fusion:
                     fused = app_state.sensor_fusion.get_fused_data()
                     if fused:
                         await ws_manager.send_personal(websocket, {
@@ -1092,35 +1672,53 @@ async def start_drilling_session(
     target_depth_m: float,
     grid_x: Optional[float] = None,
     grid_y: Optional[float] = None,
+    rig_id: Optional[str] = None,
 ):
     """Start a new drilling session."""
-    app_state.is_drilling = True
-    app_state.current_depth_m = 0.0
-    app_state.current_session_id = f"SESSION-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
+    session_id = f"SESSION-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
+    
+    if app_state.fleet:
+        # The rig's shard keeps the session; its next status record shows it
+        await _forward_rig_command(rig_id, {"command": "start_session", "session_id": session_id})
+        session_status = "queued"
+    else:
+        _require_local_rig(rig_id)
+        app_state.is_drilling = True
+        app_state.current_depth_m = 0.0
+        app_state.current_session_id = session_id
+        session_status = "started"
     
     # Reset analytics for new hole
     if app_state.analytics_engine:
         app_state.analytics_engine.new_hole()
     
     return {
-        "session_id": app_state.current_session_id,
+        "session_id": session_id,
         "hole_id": hole_id,
         "target_depth_m": target_depth_m,
         "start_time": datetime.utcnow().isoformat(),
-        "status": "started",
+        "status": session_status,
     }
 
 
 @app.post("/drilling/stop", tags=["Drilling"])
 async def stop_drilling_session(
     completion_status: str = "completed",
+    rig_id: Optional[str] = None,
 ):
     """Stop the current drilling session."""
-    session_id = app_state.current_session_id
-    final_depth = app_state.current_depth_m
-    
-    app_state.is_drilling = False
-    app_state.current_session_id = None
+    if app_state.fleet:
+        session_id = _fleet_rig_status(rig_id).get("current_session_id")
+        snapshot = app_state.fleet.latest(RecordKind.SNAPSHOT, rig_id)
+        final_depth = snapshot["data"]["depth_m"] if snapshot else 0.0
+        await _forward_rig_command(rig_id, {"command": "stop_session"})
+    else:
+        _require_local_rig(rig_id)
+        session_id = app_state.current_session_id
+        final_depth = app_state.current_depth_m
+        
+        app_state.is_drilling = False
+        app_state.current_session_id = None
     
     return {
         "session_id": session_id,
@@ -1426,6 +2024,7 @@ async def store_prediction(
     vibration_g: float,
     pressure_bar: Optional[float] = None,
     temperature_c: Optional[float] = None,
+    model_version: Optional[str] = None,
 ):
     """Store a material prediction in Supabase."""
     if not app_state.supabase:
@@ -1444,6 +2043,7 @@ async def store_prediction(
         vibration_g=vibration_g,
         pressure_bar=pressure_bar,
         temperature_c=temperature_c,
+        model_version=model_version,
     )
     
     return {
@@ -1547,19 +2147,140 @@ async def end_database_session(
 # Run Server
 # =============================================================================
 
+async def _shard_main(shard_index: int, shard_count: int) -> None:
+    """
+    Run one shard: the engines of its rigs, MQTT ingest for them, and
+    the live data plane that publishes their records to API workers.
+    """
+    import signal
+    
+    settings = get_settings()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    
+    live_config = shard_live_config(settings.live, shard_index)
+    publisher = LivePublisher(live_config)
+    
+    # One inference server per shard batches predictions across its rigs
+    inference = MicroBatchInferenceServer(get_material_predictor(), settings.ml.material_predictor)
+    await inference.start()
+    shard = FleetShard(
+        shard_index,
+        build_shard_ring(shard_count, settings.fleet),
+        on_record=publisher.publish,
+        settings=settings,
+        inference_server=inference,
+    )
+    
+    async def handle_ingest(kind: bytes, rig_id: str, payload: bytes) -> None:
+        rig = await shard.get_rig(rig_id or settings.fleet.default_rig_id)
+        if kind == INGEST_FRAMES:
+            await rig.fusion.process_frames(decode_sensor_frames(payload))
+        elif kind == INGEST_READING:
+            await _process_sensor_request(
+                SensorDataRequest.model_validate_json(payload),
+                rig.fusion,
+                rig.safety,
+            )
+        elif kind == INGEST_COMMAND:
+            shard.apply_command(rig.rig_id, json.loads(payload))
+    
+    async def publish_status() -> None:
+        # Energy and maintenance change at most once a minute and are
+        # costlier to summarize, so they are published less often
+        last_equipment = float("-inf")
+        while True:
+            await asyncio.sleep(settings.live.status_interval_s)
+            now = loop.time()
+            equipment = now - last_equipment >= settings.live.equipment_status_interval_s
+            if equipment:
+                last_equipment = now
+            shard.publish_status(equipment=equipment)
+    
+    server = IngestServer(live_config.socket_dir, live_config.name, handle_ingest)
+    await server.start()
+    tasks = [asyncio.create_task(publish_status())]
+    
+    # Every shard sees every rig's topics and keeps the ones it owns
+    mqtt_config = settings.mqtt
+    if shard_count > 1:
+        mqtt_config = mqtt_config.model_copy(
+            update={"client_id": f"{mqtt_config.client_id}_s{shard_index}"}
+        )
+    mqtt = MQTTSensorClient(
+        None,
+        mqtt_config,
+        engine_for_rig=shard.get_fusion_engine,
+        rig_filter=shard.owns,
+        default_rig_id=settings.fleet.default_rig_id,
+    )
+    if await mqtt.connect():
+        tasks.append(asyncio.create_task(mqtt.listen()))
+    
+    logger.info(f"Shard {shard_index}/{shard_count} started")
+    try:
+        await stop.wait()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await mqtt.disconnect()
+        await server.stop()
+        await shard.stop()
+        await inference.stop()
+        publisher.close()
+        logger.info(f"Shard {shard_index} stopped")
+
+
+def run_shard_process(shard_index: int = 0, shard_count: int = 1):
+    """Run one shard process feeding the API workers."""
+    asyncio.run(_shard_main(shard_index, shard_count))
+
+
 def run_server():
-    """Run the FastAPI server."""
+    """
+    Run the FastAPI server.
+    
+    With more than one worker, sensor fusion runs in separate shard
+    processes and workers share their output through the live data
+    plane, so every worker serves the same live view. In fleet mode
+    rigs are spread over one shard per CPU core (``fleet.shards``);
+    otherwise a single shard owns the one rig.
+    """
+    import multiprocessing
+    
     import uvicorn
     
     settings = get_settings()
+    shard_processes = []
+    
+    if settings.api_workers > 1 and settings.live.enabled:
+        shard_count = resolve_shard_count(settings.fleet)
+        context = multiprocessing.get_context("spawn")
+        for shard_index in range(shard_count):
+            process = context.Process(
+                target=run_shard_process,
+                args=(shard_index, shard_count),
+                name=f"ehs-simba-shard-{shard_index}",
+            )
+            process.start()
+            shard_processes.append(process)
+        os.environ[LIVE_ROLE_ENV] = "worker"
     
-    uvicorn.run(
-        "dashboard_api:app",
-        host=settings.api_host,
-        port=settings.api_port,
-        workers=settings.api_workers,
-        reload=settings.debug,
-    )
+    try:
+        uvicorn.run(
+            "dashboard_api:app",
+            host=settings.api_host,
+            port=settings.api_port,
+            workers=settings.api_workers,
+            reload=settings.debug,
+        )
+    finally:
+        for process in shard_processes:
+            process.terminate()
+        for process in shard_processes:
+            process.join(timeout=10)
 
 
 if __name__ == "__main__":
@@ -227,6 +227,9 @@ class MaterialPrediction(Base):
     # All class probabilities (for analysis)
     class_probabilities: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
     
+    # Model registry version that produced the prediction
+    model_version: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)
+    
     # Relationship
     session: Mapped["DrillingSession"] = relationship(back_populates="predictions")
     
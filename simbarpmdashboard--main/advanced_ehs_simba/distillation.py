@@ -0,0 +1,305 @@
+"""
+Ensemble Distillation for Advanced EHS Simba Drill System.
+
+This module provides:
+- Distillation of the RF+booster ensemble (the teacher) into a compact
+  student model (see student_model) trained on the teacher's soft labels
+- An accuracy/latency report comparing student and teacher
+- Registration of the teacher plus its student as a new model version
+
+Predictors select the student with ``inference_model="student"`` (or per
+call with ``predict(..., model="student")``); with ``load_teacher=False``
+they load only the student.
+
+Usage:
+    python distillation.py --kind tree --max-depth 8 --activate
+
+Author: EHS Simba Team
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Optional
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from config import DistillationConfig, get_settings
+from ml_predictor import MaterialPredictor
+from student_model import StudentModel, fit_softmax_student, fit_tree_student
+
+logger = logging.getLogger(__name__)
+
+# Rows per timed call in the batch latency comparison
+BATCH_ROWS = 1000
+
+
+# =============================================================================
+# Report
+# =============================================================================
+
+@dataclass
+class DistillationReport:
+    """
+    Student versus teacher on held-out labelled data.
+    
+    Attributes:
+        kind: Student type
+        test_rows: Held-out rows evaluated
+        teacher_accuracy: Ensemble accuracy
+        student_accuracy: Student accuracy
+        agreement: Share of rows where student and teacher pick the same class
+        teacher_single_us: Median time for one row through the ensemble (scaling included)
+        student_single_us: Median time for one row through the student
+        teacher_batch_us_per_row: Ensemble time per row in BATCH_ROWS batches
+        student_batch_us_per_row: Student time per row in BATCH_ROWS batches
+        teacher_bytes: Size of the compiled RF and booster arrays
+        student_bytes: Size of the student arrays
+    """
+    kind: str
+    test_rows: int
+    teacher_accuracy: float
+    student_accuracy: float
+    agreement: float
+    teacher_single_us: float
+    student_single_us: float
+    teacher_batch_us_per_row: float
+    student_batch_us_per_row: float
+    teacher_bytes: int
+    student_bytes: int
+    
+    @property
+    def speedup(self) -> float:
+        """Single-row speedup of the student over the teacher."""
+        return self.teacher_single_us / self.student_single_us
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        result = asdict(self)
+        result["speedup"] = self.speedup
+        return result
+
+
+def _median_us(fn, repeats: int) -> float:
+    """Median wall time of fn in microseconds."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)) * 1e6
+
+
+# =============================================================================
+# Distillation
+# =============================================================================
+
+def teacher_proba(predictor: MaterialPredictor, X: np.ndarray) -> np.ndarray:
+    """
+    Ensemble class probabilities for raw features.
+    
+    Args:
+        predictor: Predictor with loaded teacher models
+        X: Raw feature matrix
+    
+    Returns:
+        Probabilities in ``predictor.rf_model.classes_`` order.
+    """
+    models = predictor.models
+    return predictor._ensemble_proba(models.scaler.transform(X), models)
+
+
+def distill_student(
+    predictor: MaterialPredictor,
+    X: np.ndarray,
+    config: Optional[DistillationConfig] = None,
+) -> StudentModel:
+    """
+    Train a student on the teacher's soft labels.
+    
+    The transfer set is X plus ``augment_copies`` jittered copies, so the
+    student also learns the teacher's behaviour between training rows.
+    
+    Args:
+        predictor: Predictor with loaded teacher models
+        X: Raw feature matrix (unlabelled rows suffice)
+        config: Distillation configuration
+    
+    Returns:
+        Fitted student.
+    """
+    config = config or get_settings().ml.distillation
+    rng = np.random.default_rng(config.random_state)
+    noise = config.augment_noise * X.std(axis=0)
+    transfer = np.vstack(
+        [X] + [X + rng.normal(size=X.shape) * noise for _ in range(config.augment_copies)]
+    )
+    soft_labels = teacher_proba(predictor, transfer)
+    classes = predictor.rf_model.classes_
+    
+    if config.kind == "tree":
+        return fit_tree_student(
+            transfer, soft_labels, classes,
+            max_depth=config.max_depth,
+            min_samples_leaf=config.min_samples_leaf,
+            random_state=config.random_state,
+        )
+    scaler = predictor.scaler
+    return fit_softmax_student(
+        transfer, soft_labels, classes,
+        mean=np.asarray(scaler.mean_), scale=np.asarray(scaler.scale_),
+        l2=config.l2, max_iter=config.max_iter,
+    )
+
+
+def evaluate_student(
+    predictor: MaterialPredictor,
+    student: StudentModel,
+    X: np.ndarray,
+    y: np.ndarray,
+    repeats: int = 200,
+) -> DistillationReport:
+    """
+    Compare a student with its teacher on held-out labelled data.
+    
+    Args:
+        predictor: Predictor with loaded teacher models
+        student: Distilled student
+        X: Held-out raw features
+        y: Held-out labels
+        repeats: Timed calls per latency figure
+    
+    Returns:
+        Accuracy/latency report.
+    """
+    teacher = teacher_proba(predictor, X).argmax(axis=1)
+    student_pred = student.predict_proba(X).argmax(axis=1)
+    classes = predictor.rf_model.classes_
+    
+    single = X[:1]
+    batch = np.resize(X, (BATCH_ROWS, X.shape[1]))
+    batch_repeats = max(1, repeats // 20)
+    models = predictor.models
+    
+    return DistillationReport(
+        kind=student.kind,
+        test_rows=len(y),
+        teacher_accuracy=float(np.mean(classes[teacher] == y)),
+        student_accuracy=float(np.mean(student.classes[student_pred] == y)),
+        agreement=float(np.mean(classes[teacher] == student.classes[student_pred])),
+        teacher_single_us=_median_us(lambda: teacher_proba(predictor, single), repeats),
+        student_single_us=_median_us(lambda: student.predict_proba(single), repeats),
+        teacher_batch_us_per_row=_median_us(
+            lambda: teacher_proba(predictor, batch), batch_repeats) / BATCH_ROWS,
+        student_batch_us_per_row=_median_us(
+            lambda: student.predict_proba(batch), batch_repeats) / BATCH_ROWS,
+        teacher_bytes=int(models.rf_compiled.nbytes + models.gb_compiled.nbytes),
+        student_bytes=student.nbytes,
+    )
+
+
+def distill_and_register(
+    predictor: Optional[MaterialPredictor] = None,
+    X: Optional[np.ndarray] = None,
+    y: Optional[np.ndarray] = None,
+    config: Optional[DistillationConfig] = None,
+    activate: bool = False,
+) -> tuple[str, DistillationReport]:
+    """
+    Distill the serving teacher and register teacher plus student.
+    
+    A fifth of the labelled rows is held out for the report; the rest
+    form the transfer set.
+    
+    Args:
+        predictor: Predictor serving the teacher (default: active version)
+        X: Raw features (default: synthetic data)
+        y: Labels
+        config: Distillation configuration
+        activate: Make the new version active
+    
+    Returns:
+        New version id and the report.
+    
+    Raises:
+        RuntimeError: If there are no teacher models.
+    """
+    config = config or get_settings().ml.distillation
+    predictor = predictor or MaterialPredictor()
+    if not predictor.ensure_loaded() or predictor.rf_model is None:
+        raise RuntimeError("Distillation needs trained ensemble models")
+    if X is None or y is None:
+        X, y = predictor.generate_synthetic_data(samples_per_material=300, seed=config.random_state)
+    
+    X_transfer, X_test, _, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=config.random_state, stratify=y
+    )
+    base_version = predictor.model_version
+    student = distill_student(predictor, X_transfer, config)
+    report = evaluate_student(predictor, student, X_test, y_test, config.latency_repeats)
+    logger.info(
+        f"Student ({student.kind}, {student.nbytes} bytes): accuracy "
+        f"{report.student_accuracy:.3f} vs {report.teacher_accuracy:.3f}, "
+        f"{report.speedup:.0f}x faster per row"
+    )
+    
+    try:
+        teacher_metrics = predictor.registry.get_manifest(base_version).metrics
+    except KeyError:
+        teacher_metrics = predictor.metrics
+    
+    predictor.attach_student(student)
+    predictor.metrics = {
+        **teacher_metrics,
+        "student_accuracy": report.student_accuracy,
+        "student_agreement": report.agreement,
+        "student_single_us": report.student_single_us,
+    }
+    manifest = predictor.save_models(
+        activate=activate,
+        metadata={"base_version": base_version, "student": report.to_dict()},
+    )
+    return manifest.version, report
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Distill the material ensemble into a student model.")
+    parser.add_argument("--kind", choices=["softmax", "tree"], help="Student type")
+    parser.add_argument("--max-depth", type=int, help="Tree student depth")
+    parser.add_argument("--source", help=".npy or .parquet labelled data (default: synthetic)")
+    parser.add_argument("--activate", action="store_true", help="Activate the new version")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO)
+    config = get_settings().ml.distillation.model_copy(update={
+        name: value for name, value in (("kind", args.kind), ("max_depth", args.max_depth))
+        if value is not None
+    })
+    predictor = MaterialPredictor()
+    X = y = None
+    if args.source:
+        X, y = predictor.load_synthetic_data(args.source)
+    
+    version, report = distill_and_register(predictor, X, y, config, activate=args.activate)
+    print(json.dumps({"version": version, **report.to_dict()}, indent=2))
+
+
+# Convenience exports
+__all__ = [
+    "DistillationReport",
+    "teacher_proba",
+    "distill_student",
+    "evaluate_student",
+    "distill_and_register",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -23,7 +23,7 @@ from typing import Any, Optional
 import numpy as np
 from scipy import stats
 
-from config import EnergyConfig, get_settings
+from config import EnergyConfig, PowerSensorConfig, get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -221,9 +221,14 @@ class PowerMonitor:
     Tracks power usage, detects anomalies, and calculates efficiency metrics.
     """
     
-    def __init__(self, config: Optional[EnergyConfig] = None):
+    def __init__(
+        self,
+        config: Optional[EnergyConfig] = None,
+        power_config: Optional[PowerSensorConfig] = None,
+    ):
         """Initialize power monitor."""
         self.config = config or get_settings().energy
+        self.power_config = power_config or get_settings().sensors.power
         
         # Reading buffer (last 24 hours at 10 Hz = 864,000 readings)
         # Use 1-minute aggregations for storage efficiency
@@ -305,10 +310,10 @@ class PowerMonitor:
         anomalies = []
         
         # Check absolute limits
-        if reading.power_kw > self.config.max_power_kw * 1.1:
+        if reading.power_kw > self.power_config.max_power_kw * 1.1:
             anomalies.append(f"Power exceeds maximum: {reading.power_kw:.1f} kW")
         
-        if reading.power_kw > self.config.peak_demand_threshold_kw:
+        if reading.power_kw > self.power_config.peak_demand_threshold_kw:
             anomalies.append(f"Peak demand warning: {reading.power_kw:.1f} kW")
         
         # Check for sudden changes
@@ -768,11 +773,16 @@ class EnergyOptimizer:
         >>> recommendations = optimizer.get_recommendations()
     """
     
-    def __init__(self, config: Optional[EnergyConfig] = None):
+    def __init__(
+        self,
+        config: Optional[EnergyConfig] = None,
+        power_config: Optional[PowerSensorConfig] = None,
+    ):
         """Initialize energy optimizer."""
         self.config = config or get_settings().energy
+        self.power_config = power_config or get_settings().sensors.power
         
-        self.power_monitor = PowerMonitor(self.config)
+        self.power_monitor = PowerMonitor(self.config, self.power_config)
         self.rpm_optimizer = RPMOptimizer(self.config)
         self.cost_calculator = CostCalculator(self.config)
         
@@ -862,7 +872,7 @@ class EnergyOptimizer:
             idle_ratio = metrics.idle_hours / max(metrics.drilling_hours, 1)
             target_idle_ratio = 0.2
             potential_idle_reduction = (idle_ratio - target_idle_ratio) * metrics.drilling_hours
-            idle_power = self.config.idle_power_kw
+            idle_power = self.power_config.idle_power_kw
             
             recommendations.append(OptimizationRecommendation(
                 category="Idle Time Reduction",
@@ -876,8 +886,8 @@ class EnergyOptimizer:
             ))
         
         # 3. Peak demand management
-        if metrics.peak_power_kw > self.config.peak_demand_threshold_kw:
-            excess = metrics.peak_power_kw - self.config.peak_demand_threshold_kw
+        if metrics.peak_power_kw > self.power_config.peak_demand_threshold_kw:
+            excess = metrics.peak_power_kw - self.power_config.peak_demand_threshold_kw
             # Demand charges can be significant
             demand_charge = excess * 15  # Rough estimate: $15/kW/month
             
@@ -889,7 +899,7 @@ class EnergyOptimizer:
                 priority=2,
                 implementation_effort="Medium",
                 current_value=metrics.peak_power_kw,
-                recommended_value=self.config.peak_demand_threshold_kw,
+                recommended_value=self.power_config.peak_demand_threshold_kw,
             ))
         
         # 4. Power factor correction
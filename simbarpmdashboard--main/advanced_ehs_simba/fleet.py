@@ -0,0 +1,730 @@
+"""
+Fleet Sharding Module for Advanced EHS Simba Drill System.
+
+This module provides:
+- Consistent-hash assignment of drill rigs to shard processes
+- Per-rig engine bundles (sensor fusion, safety, energy and maintenance)
+- Feeding each rig's energy optimizer and maintenance engine from its
+  fused sensor data
+- Shard ownership of rigs, creating each rig's engines on first data
+- Worker-side routing of rig queries, sensor data and rig commands
+  to shards
+
+Every process builds the same ring from the same shard count, so API
+workers route a rig's HTTP/WebSocket traffic to the shard that owns it
+without coordination.
+
+Author: EHS Simba Team
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import hashlib
+import json
+import logging
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+import numpy as np
+
+from config import FleetConfig, LiveDataConfig, Settings, get_settings
+from energy_optimizer import DrillState, EnergyOptimizer, PowerReading
+from inference_server import MicroBatchInferenceServer
+from live_data_plane import IngestClient, LiveSubscriber, RecordKind
+from maintenance_predictor import ComponentHealth, PredictiveMaintenanceEngine
+from safety_monitor import SafetyMonitor
+from sensor_fusion import FusedSensorData, SensorFusionEngine
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# Consistent Hashing
+# =============================================================================
+
+def _hash_key(key: str) -> int:
+    """Stable 64-bit hash (independent of PYTHONHASHSEED)."""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class ConsistentHashRing:
+    """
+    Consistent-hash ring mapping keys (rig ids) to nodes (shard indices).
+    
+    Each node is placed on the ring at ``virtual_nodes`` points, so keys
+    spread evenly and adding or removing a node only moves the keys of
+    that node.
+    """
+    
+    def __init__(self, nodes: Iterable[Any] = (), virtual_nodes: int = 64):
+        """
+        Initialize ring.
+        
+        Args:
+            nodes: Initial nodes
+            virtual_nodes: Ring points per node
+        """
+        self.virtual_nodes = virtual_nodes
+        self._points: list[int] = []
+        self._owners: list[Any] = []
+        self._nodes: list[Any] = []
+        
+        for node in nodes:
+            self.add_node(node)
+    
+    @property
+    def nodes(self) -> list[Any]:
+        """Nodes on the ring."""
+        return list(self._nodes)
+    
+    def add_node(self, node: Any) -> None:
+        """Add a node at its virtual points."""
+        if node in self._nodes:
+            return
+        self._nodes.append(node)
+        for replica in range(self.virtual_nodes):
+            point = _hash_key(f"{node}#{replica}")
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+    
+    def remove_node(self, node: Any) -> None:
+        """Remove a node and its virtual points."""
+        if node not in self._nodes:
+            return
+        self._nodes.remove(node)
+        keep = [i for i, owner in enumerate(self._owners) if owner != node]
+        self._points = [self._points[i] for i in keep]
+        self._owners = [self._owners[i] for i in keep]
+    
+    def node_for(self, key: str) -> Any:
+        """
+        Get the node owning a key.
+        
+        Raises:
+            LookupError: If the ring is empty.
+        """
+        if not self._points:
+            raise LookupError("Consistent hash ring has no nodes")
+        index = bisect.bisect(self._points, _hash_key(key)) % len(self._points)
+        return self._owners[index]
+
+
+def resolve_shard_count(config: Optional[FleetConfig] = None) -> int:
+    """Number of shard processes (one per CPU core unless configured)."""
+    config = config or get_settings().fleet
+    if not config.enabled:
+        return 1
+    return config.shards or os.cpu_count() or 1
+
+
+def build_shard_ring(shard_count: int, config: Optional[FleetConfig] = None) -> ConsistentHashRing:
+    """Build the rig -> shard ring shared by every process."""
+    config = config or get_settings().fleet
+    return ConsistentHashRing(range(shard_count), config.virtual_nodes)
+
+
+def shard_live_config(config: LiveDataConfig, shard_index: int) -> LiveDataConfig:
+    """Live data plane settings for one shard (own ring and sockets)."""
+    return config.model_copy(update={"name": f"{config.name}_s{shard_index}"})
+
+
+# =============================================================================
+# Per-Rig Engines
+# =============================================================================
+
+# Periods (hours) of the energy metrics published in rig status; API
+# workers answer a query with the smallest period covering it
+ENERGY_STATUS_PERIODS_HOURS = (1.0, 8.0, 24.0, 168.0)
+
+
+class RigEquipmentFeed:
+    """
+    Feeds a rig's energy optimizer and maintenance engine from its fused
+    sensor data and material predictions.
+    
+    Power readings are sampled from fused data at most every
+    ``energy.power_sample_interval_s``. Operating hours (and hours per
+    predicted material) count while the drill turns at drilling RPM, and
+    component health is reassessed every ``maintenance.update_interval_s``
+    from the recent vibration, pressure and temperature history.
+    """
+    
+    # Longest gap between samples still counted as operating time
+    MAX_SAMPLE_GAP_S = 5.0
+    
+    def __init__(
+        self,
+        energy: EnergyOptimizer,
+        maintenance: PredictiveMaintenanceEngine,
+        settings: Optional[Settings] = None,
+    ):
+        """
+        Initialize feed.
+        
+        Args:
+            energy: Rig's energy optimizer
+            maintenance: Rig's predictive maintenance engine
+            settings: Application settings
+        """
+        settings = settings or get_settings()
+        self.energy = energy
+        self.maintenance = maintenance
+        self.sample_interval_s = settings.energy.power_sample_interval_s
+        self.update_interval_s = settings.ml.maintenance.update_interval_s
+        self.drilling_min_rpm = settings.drilling.min_rpm
+        
+        self.operating_hours = 0.0
+        self.materials_drilled: dict[str, float] = {}
+        self.material = "unknown"
+        
+        history = settings.ml.maintenance.history_size
+        self._vibration: deque[float] = deque(maxlen=history)
+        self._pressure: deque[float] = deque(maxlen=history)
+        self._temperature: deque[float] = deque(maxlen=history)
+        self._last_sample: Optional[datetime] = None
+        self._last_assessment: Optional[datetime] = None
+    
+    def on_fused_data(self, fused: FusedSensorData) -> None:
+        """Sample a fused data point into the energy and maintenance engines."""
+        elapsed = 0.0
+        if self._last_sample is not None:
+            elapsed = (fused.timestamp - self._last_sample).total_seconds()
+            if elapsed < self.sample_interval_s:
+                return
+        self._last_sample = fused.timestamp
+        
+        drilling = fused.rpm >= self.drilling_min_rpm
+        self.energy.add_power_reading(PowerReading(
+            timestamp=fused.timestamp,
+            power_kw=fused.power_kw,
+            current_a=fused.current_a,
+            state=DrillState.DRILLING if drilling else DrillState.IDLE,
+        ))
+        if drilling:
+            hours = min(elapsed, self.MAX_SAMPLE_GAP_S) / 3600
+            self.operating_hours += hours
+            self.materials_drilled[self.material] = self.materials_drilled.get(self.material, 0.0) + hours
+            self.energy.update_drilling_state(self.material, fused.rpm, fused.feed_rate_m_min)
+        
+        self._vibration.append(fused.vibration_g)
+        self._pressure.append(fused.pressure_bar)
+        self._temperature.append(fused.temperature_hydraulic_c)
+        
+        if (
+            self._last_assessment is None
+            or (fused.timestamp - self._last_assessment).total_seconds() >= self.update_interval_s
+        ):
+            self._last_assessment = fused.timestamp
+            self._assess(fused)
+    
+    def on_prediction(self, prediction: dict[str, Any]) -> None:
+        """Attribute drilling time to the predicted material."""
+        self.material = str(prediction.get("predicted_material", self.material)).lower()
+    
+    def update_drill_bit(
+        self,
+        operating_hours: float,
+        vibration_history: list[float],
+        current_vibration: float,
+        materials_drilled: Optional[dict[str, float]] = None,
+    ) -> ComponentHealth:
+        """
+        Apply drill bit data reported by an operator.
+        
+        The reported hours (and material split) replace the counted ones,
+        so later assessments from fused data continue from them.
+        """
+        self.operating_hours = operating_hours
+        self.materials_drilled = dict(materials_drilled or {self.material: operating_hours})
+        return self.maintenance.update_drill_bit_data(
+            operating_hours=operating_hours,
+            vibration_history=vibration_history,
+            materials_drilled=self.materials_drilled,
+            current_vibration=current_vibration,
+        )
+    
+    def _assess(self, fused: FusedSensorData) -> None:
+        """Reassess component health from the sampled history."""
+        vibration = list(self._vibration)
+        self.maintenance.update_drill_bit_data(
+            operating_hours=self.operating_hours,
+            vibration_history=vibration,
+            materials_drilled=self.materials_drilled,
+            current_vibration=fused.vibration_g,
+        )
+        self.maintenance.update_hydraulic_data(
+            operating_hours=self.operating_hours,
+            pressure_history=list(self._pressure),
+            temperature_history=list(self._temperature),
+            current_pressure=fused.pressure_bar,
+            current_temperature=fused.temperature_hydraulic_c,
+            fluid_hours=self.operating_hours,
+        )
+        self.maintenance.update_bearing_data(
+            operating_hours=self.operating_hours,
+            vibration_rms=float(np.sqrt(np.mean(np.square(vibration)))),
+            temperature=fused.temperature_motor_c,
+        )
+
+
+def energy_status(energy: EnergyOptimizer) -> dict[str, Any]:
+    """Summarize an energy optimizer for rig status."""
+    periods = []
+    for hours in ENERGY_STATUS_PERIODS_HOURS:
+        metrics = energy.get_energy_metrics(hours)
+        periods.append({
+            "period_hours": hours,
+            "metrics": metrics.to_dict(),
+            "comparison": energy.cost_calculator.calculate_savings(
+                ehs_energy_kwh=metrics.total_energy_kwh,
+                drilling_hours=metrics.drilling_hours,
+            ).to_dict(),
+        })
+    return {
+        "periods": periods,
+        "recommendations": [r.to_dict() for r in energy.get_recommendations()],
+        "efficiency": energy.get_efficiency_summary(),
+    }
+
+
+def maintenance_status(maintenance: PredictiveMaintenanceEngine) -> dict[str, Any]:
+    """Summarize a maintenance engine for rig status."""
+    return {
+        "overall_health": maintenance.get_overall_system_health(),
+        "components": {
+            name: health.to_dict()
+            for name, health in maintenance.get_system_health().items()
+        },
+    }
+
+
+@dataclass
+class RigContext:
+    """Engines and drilling state owned for one rig."""
+    rig_id: str
+    fusion: SensorFusionEngine
+    safety: SafetyMonitor
+    equipment: RigEquipmentFeed
+    current_session_id: Optional[str] = None
+    metadata: dict[str, Any] = field(default_factory=dict)
+    
+    @property
+    def energy(self) -> EnergyOptimizer:
+        """Rig's energy optimizer."""
+        return self.equipment.energy
+    
+    @property
+    def maintenance(self) -> PredictiveMaintenanceEngine:
+        """Rig's predictive maintenance engine."""
+        return self.equipment.maintenance
+    
+    def get_status(self) -> dict[str, Any]:
+        """Summarize the rig's sensor and safety state."""
+        health = self.fusion.get_sensor_health()
+        return {
+            "rig_id": self.rig_id,
+            "sensors": {sensor_id: report.to_dict() for sensor_id, report in health.items()},
+            "statistics": self.fusion.get_buffer_statistics(),
+            "safety": self.safety.get_status().to_dict(),
+            "alerts": [alert.to_dict() for alert in self.safety.get_active_alerts()],
+            "thermal": self.safety.get_thermal_status(),
+            "safety_statistics": self.safety.get_statistics(),
+            "current_session_id": self.current_session_id,
+        }
+    
+    def get_status_parts(self, equipment: bool = True) -> list[dict[str, Any]]:
+        """
+        Rig status split into the parts published as separate records
+        (sensors and safety, energy, maintenance), each small enough for
+        one live data plane slot.
+        
+        Args:
+            equipment: Include the energy and maintenance parts
+        """
+        parts = [self.get_status()]
+        if equipment:
+            parts.append({"energy": energy_status(self.energy)})
+            parts.append({"maintenance": maintenance_status(self.maintenance)})
+        return parts
+
+
+class FleetShard:
+    """
+    One shard of the fleet: owns the engines of the rigs hashed to it.
+    
+    Rig engines are created on the first data for a rig. Fused data,
+    predictions and alerts from every owned rig are passed to
+    ``on_record`` tagged with the rig id, and also feed the rig's energy
+    optimizer and maintenance engine. Commands from API workers are
+    applied with ``apply_command``.
+    """
+    
+    def __init__(
+        self,
+        shard_index: int,
+        ring: ConsistentHashRing,
+        on_record: Optional[Callable[[RecordKind, dict[str, Any]], Any]] = None,
+        settings: Optional[Settings] = None,
+        inference_server: Optional[MicroBatchInferenceServer] = None,
+    ):
+        """
+        Initialize shard.
+        
+        Args:
+            shard_index: This shard's node on the ring
+            ring: Rig -> shard ring
+            on_record: Called with (kind, message) for live records
+            settings: Application settings
+            inference_server: Shared by every rig's fusion engine
+        """
+        self.shard_index = shard_index
+        self.ring = ring
+        self.on_record = on_record
+        self.settings = settings or get_settings()
+        self.inference_server = inference_server
+        
+        self._rigs: dict[str, RigContext] = {}
+        self._ownership: dict[str, bool] = {}
+        
+        logger.info(f"FleetShard {shard_index} initialized ({len(ring.nodes)} shards)")
+    
+    @property
+    def rigs(self) -> dict[str, RigContext]:
+        """Rigs with engines on this shard."""
+        return self._rigs
+    
+    def owns(self, rig_id: str) -> bool:
+        """Check whether a rig is assigned to this shard."""
+        owned = self._ownership.get(rig_id)
+        if owned is None:
+            owned = self.ring.node_for(rig_id) == self.shard_index
+            self._ownership[rig_id] = owned
+        return owned
+    
+    async def get_rig(self, rig_id: str) -> RigContext:
+        """
+        Get a rig's engines, creating and starting them on first use.
+        
+        Raises:
+            KeyError: If the rig belongs to another shard.
+        """
+        rig = self._rigs.get(rig_id)
+        if rig is not None:
+            return rig
+        if not self.owns(rig_id):
+            raise KeyError(f"Rig {rig_id} is not owned by shard {self.shard_index}")
+        
+        rig = RigContext(
+            rig_id=rig_id,
+            fusion=SensorFusionEngine(
+                self.settings.sensors,
+                inference_server=self.inference_server,
+            ),
+            safety=SafetyMonitor(self.settings.safety),
+            equipment=RigEquipmentFeed(
+                EnergyOptimizer(self.settings.energy, self.settings.sensors.power),
+                PredictiveMaintenanceEngine(self.settings.ml.maintenance),
+                self.settings,
+            ),
+        )
+        self._wire_callbacks(rig)
+        await rig.fusion.start()
+        self._rigs[rig_id] = rig
+        
+        logger.info(f"Shard {self.shard_index} started engines for rig {rig_id}")
+        return rig
+    
+    async def get_fusion_engine(self, rig_id: str) -> SensorFusionEngine:
+        """Get a rig's sensor fusion engine."""
+        return (await self.get_rig(rig_id)).fusion
+    
+    def _wire_callbacks(self, rig: RigContext) -> None:
+        """Feed a rig's equipment engines and forward its live data to on_record."""
+        rig.fusion.register_data_callback(rig.equipment.on_fused_data)
+        rig.fusion.register_prediction_callback(rig.equipment.on_prediction)
+        if self.on_record is None:
+            return
+        rig_id = rig.rig_id
+        emit = self.on_record
+        
+        def on_fused_data(fused: FusedSensorData):
+            emit(RecordKind.SNAPSHOT, {"type": "sensor_update", "rig_id": rig_id, "data": fused.to_dict()})
+        
+        def on_new_prediction(prediction):
+            emit(RecordKind.PREDICTION, {"type": "prediction", "rig_id": rig_id, "data": prediction})
+        
+        def on_safety_alert(alert):
+            emit(RecordKind.ALERT, {"type": "safety_alert", "rig_id": rig_id, "data": alert.to_dict()})
+        
+        rig.fusion.register_data_callback(on_fused_data)
+        rig.fusion.register_prediction_callback(on_new_prediction)
+        rig.safety.register_alert_callback(on_safety_alert)
+    
+    def apply_command(self, rig_id: str, command: dict[str, Any]) -> bool:
+        """
+        Apply a rig command forwarded by an API worker.
+        
+        Commands are named by ``"command"``:
+        
+        - ``acknowledge_alert`` (``alert_id``, ``acknowledged_by``) and
+          ``reset_emergency`` (``authorized_by``) for the safety monitor
+        - ``power_reading`` (``timestamp``, ``power_kw``, ``voltage_v``,
+          ``current_a``, ``power_factor``, ``state``) for the energy
+          optimizer
+        - ``update_drill_bit`` (``operating_hours``, ``vibration_history``,
+          ``current_vibration``, ``materials_drilled``) for the
+          maintenance engine
+        - ``start_session`` (``session_id``) and ``stop_session`` for the
+          rig's drilling session
+        
+        The rig's status is republished at once so workers see the
+        result before the next status interval.
+        
+        Args:
+            rig_id: Rig the command is for
+            command: Decoded command message
+        
+        Returns:
+            True if the command took effect.
+        
+        Raises:
+            ValueError: If the command is unknown.
+        """
+        rig = self._rigs.get(rig_id)
+        name = command.get("command")
+        if name == "acknowledge_alert":
+            applied = rig is not None and rig.safety.acknowledge_alert(
+                command["alert_id"], command["acknowledged_by"]
+            )
+        elif name == "reset_emergency":
+            applied = rig is not None and rig.safety.reset_emergency(command["authorized_by"])
+        elif name == "power_reading":
+            applied = rig is not None
+            if applied:
+                rig.energy.add_power_reading(PowerReading(
+                    timestamp=datetime.fromisoformat(command["timestamp"]),
+                    power_kw=command["power_kw"],
+                    voltage_v=command["voltage_v"],
+                    current_a=command["current_a"],
+                    power_factor=command["power_factor"],
+                    state=DrillState(command["state"]),
+                ))
+        elif name == "update_drill_bit":
+            applied = rig is not None
+            if applied:
+                rig.equipment.update_drill_bit(
+                    operating_hours=command["operating_hours"],
+                    vibration_history=command["vibration_history"],
+                    current_vibration=command["current_vibration"],
+                    materials_drilled=command.get("materials_drilled"),
+                )
+        elif name == "start_session":
+            applied = rig is not None
+            if applied:
+                rig.current_session_id = command["session_id"]
+        elif name == "stop_session":
+            applied = rig is not None and rig.current_session_id is not None
+            if applied:
+                rig.current_session_id = None
+        else:
+            raise ValueError(f"Unknown rig command: {name}")
+        
+        if applied:
+            logger.info(f"Shard {self.shard_index} applied {name} for rig {rig_id}")
+            self.publish_status(rig_id)
+        return applied
+    
+    def publish_status(self, rig_id: Optional[str] = None, equipment: bool = True) -> None:
+        """
+        Emit the status records of one rig, or every rig on this shard.
+        
+        Args:
+            rig_id: Rig to publish (default every rig)
+            equipment: Include the energy and maintenance parts
+        """
+        if self.on_record is None:
+            return
+        rigs = self._rigs.values() if rig_id is None else [self._rigs[rig_id]]
+        for rig in rigs:
+            for part in rig.get_status_parts(equipment):
+                self.on_record(RecordKind.STATUS, {
+                    "type": "rig_status",
+                    "rig_id": rig.rig_id,
+                    "data": part,
+                })
+    
+    async def stop(self) -> None:
+        """Stop every rig's fusion engine."""
+        for rig in self._rigs.values():
+            await rig.fusion.stop()
+
+
+# =============================================================================
+# Worker-Side Routing
+# =============================================================================
+
+class FleetRouter:
+    """
+    API-worker view of the fleet.
+    
+    Attaches to every shard's live data plane, keeps the latest record
+    of each kind and recent safety alerts per rig, and forwards sensor
+    data and rig commands to the shard that owns the rig. A rig's status
+    parts are merged into one cached status record.
+    """
+    
+    # Relayed alerts kept per rig for alert history queries
+    ALERT_HISTORY_SIZE = 1000
+    
+    def __init__(
+        self,
+        shard_count: int,
+        live_config: Optional[LiveDataConfig] = None,
+        fleet_config: Optional[FleetConfig] = None,
+    ):
+        """
+        Initialize router.
+        
+        Args:
+            shard_count: Number of shard processes
+            live_config: Live data plane configuration (unsharded)
+            fleet_config: Fleet configuration
+        """
+        settings = get_settings()
+        self.live_config = live_config or settings.live
+        self.fleet_config = fleet_config or settings.fleet
+        self.ring = build_shard_ring(shard_count, self.fleet_config)
+        
+        self._configs = [shard_live_config(self.live_config, i) for i in range(shard_count)]
+        self._subscribers: list[LiveSubscriber] = []
+        self._clients = [IngestClient(c.socket_dir, c.name) for c in self._configs]
+        self._records: dict[tuple[str, RecordKind], dict[str, Any]] = {}
+        self._alerts: dict[str, deque[dict[str, Any]]] = {}
+        self._relay_tasks: list[asyncio.Task] = []
+    
+    @property
+    def shard_count(self) -> int:
+        """Number of shards."""
+        return len(self._configs)
+    
+    async def attach(self) -> None:
+        """Attach to every shard's ring (waits for the shards to start)."""
+        self._subscribers = list(await asyncio.gather(
+            *(LiveSubscriber.attach(config) for config in self._configs)
+        ))
+    
+    def shard_for(self, rig_id: Optional[str]) -> int:
+        """Shard index owning a rig."""
+        return self.ring.node_for(rig_id or self.fleet_config.default_rig_id)
+    
+    async def send(self, kind: bytes, payload: bytes, rig_id: Optional[str] = None) -> None:
+        """Forward sensor data or a command to the rig's shard."""
+        rig_id = rig_id or self.fleet_config.default_rig_id
+        await self._clients[self.shard_for(rig_id)].send(kind, payload, rig_id)
+    
+    def latest(self, kind: RecordKind, rig_id: Optional[str] = None) -> Optional[dict[str, Any]]:
+        """Most recent message of a kind for a rig."""
+        return self._records.get((rig_id or self.fleet_config.default_rig_id, kind))
+    
+    def latest_all(self, kind: RecordKind) -> list[dict[str, Any]]:
+        """Most recent message of a kind for every rig."""
+        return [message for (_, k), message in self._records.items() if k == kind]
+    
+    def alert_history(self, rig_id: Optional[str] = None, hours: float = 24.0) -> list[dict[str, Any]]:
+        """Relayed alerts for a rig raised in the last ``hours``, oldest first."""
+        cutoff = datetime.utcnow() - timedelta(hours=hours)
+        alerts = self._alerts.get(rig_id or self.fleet_config.default_rig_id, ())
+        return [
+            alert for alert in alerts
+            if datetime.fromisoformat(alert["timestamp"]) >= cutoff
+        ]
+    
+    def rig_ids(self) -> list[str]:
+        """Rigs that have published live data."""
+        return sorted({rig_id for rig_id, _ in self._records})
+    
+    def start_relay(self, on_message: Callable[[RecordKind, str, str], Awaitable[None]]) -> None:
+        """
+        Start relaying live records from every shard.
+        
+        The per-rig cache is primed from records still in each ring;
+        ``on_message`` is then awaited with (kind, rig_id, json_text) for
+        every new record.
+        """
+        for subscriber in self._subscribers:
+            records, last_seq = subscriber.reader.records_since(0)
+            for _, kind, payload in records:
+                self._remember(kind, payload)
+            self._relay_tasks.append(
+                asyncio.create_task(self._relay(subscriber, last_seq, on_message))
+            )
+    
+    async def _relay(
+        self,
+        subscriber: LiveSubscriber,
+        last_seq: int,
+        on_message: Callable[[RecordKind, str, str], Awaitable[None]],
+    ) -> None:
+        """Relay one shard's records."""
+        try:
+            async for kind, payload in subscriber.stream(since_seq=last_seq):
+                rig_id = self._remember(kind, payload)
+                if rig_id is not None:
+                    await on_message(kind, rig_id, payload.decode("utf-8"))
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Fleet relay error: {e}")
+    
+    def _remember(self, kind: RecordKind, payload: bytes) -> Optional[str]:
+        """Cache a record as its rig's latest of that kind; returns its rig id."""
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return None
+        rig_id = message.get("rig_id", self.fleet_config.default_rig_id)
+        if kind == RecordKind.STATUS:
+            cached = self._records.get((rig_id, kind))
+            if cached is not None:
+                message = {**message, "data": {**cached["data"], **message["data"]}}
+        self._records[(rig_id, kind)] = message
+        if kind == RecordKind.ALERT:
+            alerts = self._alerts.get(rig_id)
+            if alerts is None:
+                alerts = self._alerts[rig_id] = deque(maxlen=self.ALERT_HISTORY_SIZE)
+            alerts.append(message["data"])
+        return rig_id
+    
+    async def close(self) -> None:
+        """Stop relaying and detach from every shard."""
+        for task in self._relay_tasks:
+            task.cancel()
+        self._relay_tasks.clear()
+        for client in self._clients:
+            await client.close()
+        for subscriber in self._subscribers:
+            subscriber.close()
+        self._subscribers = []
+
+
+# Convenience exports
+__all__ = [
+    "ConsistentHashRing",
+    "ENERGY_STATUS_PERIODS_HOURS",
+    "RigEquipmentFeed",
+    "energy_status",
+    "maintenance_status",
+    "RigContext",
+    "FleetShard",
+    "FleetRouter",
+    "resolve_shard_count",
+    "build_shard_ring",
+    "shard_live_config",
+]
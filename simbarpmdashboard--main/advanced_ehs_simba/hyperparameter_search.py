@@ -0,0 +1,595 @@
+"""
+Material Model Hyperparameter Search for Advanced EHS Simba Drill System.
+
+This module provides:
+- Scaled cross-validation folds computed once and cached as ``.npy`` files,
+  which every worker process memory-maps instead of copying
+- Random candidates over the RandomForest and booster hyperparameters,
+  evaluated in a process pool
+- Successive halving: each rung trains the surviving candidates on more
+  rows and keeps the best 1/halving_factor of them
+- Scoring on accuracy and on single-row and batch inference latency,
+  with pruning by Pareto rank so fast candidates are not lost to
+  marginally more accurate ones
+- Registration of the winner, retrained on all data, as a model version
+
+Usage:
+    python hyperparameter_search.py --source data/drilling.npy --activate
+
+Author: EHS Simba Team
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import multiprocessing
+import os
+import shutil
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import numpy as np
+from sklearn.model_selection import StratifiedKFold
+from sklearn.preprocessing import StandardScaler
+
+from config import HyperparameterSearchConfig, MaterialPredictorConfig, get_settings
+from ml_predictor import MaterialPredictor, ModelSet
+from tree_compiler import compile_boosting, compile_random_forest
+
+logger = logging.getLogger(__name__)
+
+# Search spaces: every candidate draws one value per parameter
+FOREST_SPACE: dict[str, list[Any]] = {
+    "n_estimators": [50, 100, 200, 400],
+    "max_depth": [8, 12, 15, 20, None],
+    "min_samples_split": [2, 5, 10],
+    "max_features": ["sqrt", 0.5, 1.0],
+}
+GB_SPACE: dict[str, list[Any]] = {
+    "n_estimators": [50, 100, 150],
+    "learning_rate": [0.05, 0.1, 0.2],
+    "max_depth": [3, 5, 7],
+    "subsample": [0.8, 1.0],
+}
+HGB_SPACE: dict[str, list[Any]] = {
+    "max_iter": [50, 100, 150, 300],
+    "learning_rate": [0.05, 0.1, 0.2],
+    "max_depth": [3, 5, 7, None],
+    "max_leaf_nodes": [15, 31, 63],
+}
+
+FOLD_FILES = ("X_train", "y_train", "X_val", "y_val")
+
+
+# =============================================================================
+# Results
+# =============================================================================
+
+@dataclass
+class CandidateResult:
+    """
+    Evaluation of one candidate on one successive-halving rung.
+    
+    Attributes:
+        candidate_id: Index of the candidate in the search
+        forest_params: RandomForest hyperparameters
+        booster_params: Booster hyperparameters
+        rung: Successive-halving rung (0 = fewest rows)
+        train_rows: Training rows per fold
+        accuracy: Mean ensemble accuracy over the validation folds
+        accuracy_std: Standard deviation of the fold accuracies
+        single_latency_ms: Median time to predict one row
+        batch_latency_ms: Median time to predict a latency_batch_rows batch
+        fit_time_s: Mean fit time per fold
+    """
+    candidate_id: int
+    forest_params: dict[str, Any]
+    booster_params: dict[str, Any]
+    rung: int
+    train_rows: int
+    accuracy: float
+    accuracy_std: float
+    single_latency_ms: float
+    batch_latency_ms: float
+    fit_time_s: float
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return asdict(self)
+
+
+@dataclass
+class SearchReport:
+    """
+    Outcome of a hyperparameter search.
+    
+    Attributes:
+        winner: Selected candidate (final-rung result)
+        pareto_front: Non-dominated final-rung results, most accurate first
+        history: Every evaluation, in rung order
+        rung_rows: Training rows per fold on each rung
+        version: Registered model version of the retrained winner
+        elapsed_s: Wall time of the search
+    """
+    winner: CandidateResult
+    pareto_front: list[CandidateResult]
+    history: list[CandidateResult] = field(default_factory=list)
+    rung_rows: list[int] = field(default_factory=list)
+    version: Optional[str] = None
+    elapsed_s: float = 0.0
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "winner": self.winner.to_dict(),
+            "pareto_front": [r.to_dict() for r in self.pareto_front],
+            "history": [r.to_dict() for r in self.history],
+            "rung_rows": self.rung_rows,
+            "version": self.version,
+            "elapsed_s": self.elapsed_s,
+        }
+
+
+# =============================================================================
+# Fold Cache
+# =============================================================================
+
+def cache_folds(
+    X: np.ndarray,
+    y: np.ndarray,
+    cache_root: Union[str, Path],
+    n_folds: int = 3,
+    random_state: int = 42,
+) -> list[Path]:
+    """
+    Write scaled stratified CV folds to disk, once per dataset.
+    
+    Each fold's scaler is fitted on its training part only. Training rows
+    are stored in random order, so the first n rows of a fold are a random
+    sample of it. The cache key hashes the data and the fold settings;
+    folds are built in a staging directory and renamed into place.
+    
+    Args:
+        X: Feature matrix
+        y: Labels
+        cache_root: Directory holding the fold caches
+        n_folds: Number of folds
+        random_state: Seed for the fold split and row order
+    
+    Returns:
+        One directory per fold with X_train, y_train, X_val, y_val ``.npy`` files.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    y = np.asarray(y).astype(str)
+    
+    digest = hashlib.sha256()
+    digest.update(X.tobytes())
+    digest.update(y.tobytes())
+    digest.update(f"{n_folds}:{random_state}".encode())
+    cache_root = Path(cache_root)
+    target = cache_root / f"folds-{digest.hexdigest()[:16]}"
+    fold_paths = [target / f"fold{k}" for k in range(n_folds)]
+    if target.exists():
+        logger.info(f"Using cached folds in {target}")
+        return fold_paths
+    
+    cache_root.mkdir(parents=True, exist_ok=True)
+    staging = cache_root / f".staging-{uuid.uuid4().hex}"
+    rng = np.random.default_rng(random_state)
+    splitter = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=random_state)
+    try:
+        for k, (train, val) in enumerate(splitter.split(X, y)):
+            train = rng.permutation(train)
+            scaler = StandardScaler().fit(X[train])
+            fold = staging / f"fold{k}"
+            fold.mkdir(parents=True)
+            np.save(fold / "X_train.npy", scaler.transform(X[train]))
+            np.save(fold / "y_train.npy", y[train])
+            np.save(fold / "X_val.npy", scaler.transform(X[val]))
+            np.save(fold / "y_val.npy", y[val])
+        os.replace(staging, target)
+    except OSError:
+        # Another search cached the same folds first
+        shutil.rmtree(staging, ignore_errors=True)
+        if not target.exists():
+            raise
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    
+    logger.info(f"Cached {n_folds} folds in {target}")
+    return fold_paths
+
+
+def _load_fold(path: Path) -> dict[str, np.ndarray]:
+    """Memory-map one cached fold."""
+    return {name: np.load(path / f"{name}.npy", mmap_mode="r") for name in FOLD_FILES}
+
+
+# =============================================================================
+# Candidate Evaluation
+# =============================================================================
+
+def _median_ms(fn, repeats: int) -> float:
+    """Median wall time of fn in milliseconds."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)) * 1000.0
+
+
+def evaluate_candidate(
+    candidate_id: int,
+    forest_params: dict[str, Any],
+    booster_params: dict[str, Any],
+    fold_paths: list[Path],
+    train_rows: int,
+    rung: int,
+    predictor_config: MaterialPredictorConfig,
+    config: HyperparameterSearchConfig,
+) -> CandidateResult:
+    """
+    Fit one candidate on the first train_rows rows of every fold.
+    
+    Accuracy is that of the 0.6/0.4 RF/booster ensemble on the validation
+    fold. Latency is measured on the last fold's models through the
+    predictor's own serving path (compiled trees for small batches).
+    
+    Returns:
+        Candidate result for this rung.
+    """
+    predictor = MaterialPredictor(predictor_config)
+    accuracies, fit_times = [], []
+    for path in fold_paths:
+        fold = _load_fold(path)
+        X, y = fold["X_train"][:train_rows], fold["y_train"][:train_rows]
+        
+        start = time.perf_counter()
+        # One core per model: the pool already runs candidates in parallel
+        forest = predictor.make_forest(**forest_params, n_jobs=1).fit(X, y)
+        booster = predictor.make_booster(**booster_params).fit(X, y)
+        fit_times.append(time.perf_counter() - start)
+        
+        models = ModelSet(
+            None, forest, booster, None,
+            compile_random_forest(forest), compile_boosting(booster),
+        )
+        X_val = np.asarray(fold["X_val"])
+        proba = predictor._ensemble_proba(X_val, models)
+        accuracies.append(float(np.mean(forest.classes_[proba.argmax(axis=1)] == fold["y_val"])))
+    
+    rows = np.resize(X_val, (config.latency_batch_rows, X_val.shape[1]))
+    single = rows[:1]
+    
+    def predict(batch):
+        predictor._ensemble_proba(batch, models)
+    
+    predict(rows)
+    return CandidateResult(
+        candidate_id=candidate_id,
+        forest_params=forest_params,
+        booster_params=booster_params,
+        rung=rung,
+        train_rows=len(y),
+        accuracy=float(np.mean(accuracies)),
+        accuracy_std=float(np.std(accuracies)),
+        single_latency_ms=_median_ms(lambda: predict(single), config.latency_repeats),
+        batch_latency_ms=_median_ms(lambda: predict(rows), max(1, config.latency_repeats // 10)),
+        fit_time_s=float(np.mean(fit_times)),
+    )
+
+
+# =============================================================================
+# Pareto Ranking
+# =============================================================================
+
+def _objectives(result: CandidateResult) -> tuple[float, float, float]:
+    """Objectives to minimize."""
+    return (-result.accuracy, result.single_latency_ms, result.batch_latency_ms)
+
+
+def _dominates(a: CandidateResult, b: CandidateResult) -> bool:
+    """True if a is no worse than b everywhere and better somewhere."""
+    oa, ob = _objectives(a), _objectives(b)
+    return all(x <= y for x, y in zip(oa, ob)) and oa != ob
+
+
+def pareto_front(results: list[CandidateResult]) -> list[CandidateResult]:
+    """
+    Results not dominated on accuracy, single-row and batch latency.
+    
+    Returns:
+        Non-dominated results, most accurate first.
+    """
+    front = [r for r in results if not any(_dominates(o, r) for o in results)]
+    return sorted(front, key=lambda r: (-r.accuracy, r.single_latency_ms))
+
+
+def pareto_ranks(results: list[CandidateResult]) -> list[int]:
+    """Non-dominated sorting: rank 0 is the front, rank 1 the front without it, ..."""
+    ranks = [-1] * len(results)
+    remaining = set(range(len(results)))
+    rank = 0
+    while remaining:
+        front = {
+            i for i in remaining
+            if not any(_dominates(results[j], results[i]) for j in remaining)
+        }
+        for i in front:
+            ranks[i] = rank
+        remaining -= front
+        rank += 1
+    return ranks
+
+
+def select_winner(
+    front: list[CandidateResult],
+    latency_budget_ms: Optional[float] = None,
+) -> CandidateResult:
+    """
+    Most accurate front member within the single-row latency budget.
+    
+    Falls back to the fastest member if none fits the budget.
+    """
+    if latency_budget_ms is not None:
+        within = [r for r in front if r.single_latency_ms <= latency_budget_ms]
+        if not within:
+            logger.warning(f"No candidate meets the {latency_budget_ms} ms latency budget")
+            return min(front, key=lambda r: r.single_latency_ms)
+        front = within
+    return max(front, key=lambda r: (r.accuracy, -r.single_latency_ms))
+
+
+# =============================================================================
+# Search
+# =============================================================================
+
+class HyperparameterSearch:
+    """
+    Successive-halving search over the material model hyperparameters.
+    
+    Example:
+        >>> search = HyperparameterSearch()
+        >>> report = search.run(X, y, activate=True)
+        >>> report.winner.forest_params, report.version
+    """
+    
+    def __init__(
+        self,
+        config: Optional[HyperparameterSearchConfig] = None,
+        predictor_config: Optional[MaterialPredictorConfig] = None,
+        models_path: Optional[Union[str, Path]] = None,
+        forest_space: Optional[dict[str, list[Any]]] = None,
+        booster_space: Optional[dict[str, list[Any]]] = None,
+    ):
+        """
+        Initialize search.
+        
+        Args:
+            config: Search configuration
+            predictor_config: Material model configuration (booster type etc.)
+            models_path: Model registry root (default: Settings.models_path)
+            forest_space: RandomForest search space (default: FOREST_SPACE)
+            booster_space: Booster search space (default by booster type)
+        """
+        settings = get_settings()
+        self.config = config or settings.ml.tuning
+        self.predictor_config = predictor_config or settings.ml.material_predictor
+        self.models_path = Path(models_path or settings.models_path)
+        self.forest_space = forest_space or FOREST_SPACE
+        if booster_space is None:
+            booster_space = (
+                HGB_SPACE if self.predictor_config.booster == "hist_gradient_boosting" else GB_SPACE
+            )
+        self.booster_space = booster_space
+    
+    def sample_candidates(self) -> list[tuple[dict[str, Any], dict[str, Any]]]:
+        """
+        Draw distinct (forest_params, booster_params) candidates.
+        
+        The first candidate is the current configuration (empty overrides),
+        so the search never returns something worse than what is deployed.
+        """
+        rng = np.random.default_rng(self.config.random_state)
+        candidates = [({}, {})]
+        seen = {json.dumps(candidates[0], sort_keys=True)}
+        space_size = (
+            math.prod(len(v) for v in self.forest_space.values())
+            * math.prod(len(v) for v in self.booster_space.values())
+        )
+        target = min(self.config.n_candidates, space_size + 1)
+        while len(candidates) < target:
+            candidate = tuple(
+                {name: values[rng.integers(len(values))] for name, values in space.items()}
+                for space in (self.forest_space, self.booster_space)
+            )
+            key = json.dumps(candidate, sort_keys=True)
+            if key not in seen:
+                seen.add(key)
+                candidates.append(candidate)
+        return candidates
+    
+    def rung_rows(self, train_rows: int, n_candidates: int) -> list[int]:
+        """
+        Training rows per fold on each rung; the last rung uses every row.
+        """
+        factor = self.config.halving_factor
+        n_rungs = 1 + int(math.log(max(n_candidates, 1), factor) + 1e-9)
+        if train_rows > self.config.min_rows:
+            n_rungs = min(n_rungs, 1 + int(math.log(train_rows / self.config.min_rows, factor) + 1e-9))
+        else:
+            n_rungs = 1
+        return [
+            max(1, math.ceil(train_rows / factor ** (n_rungs - 1 - rung)))
+            for rung in range(n_rungs)
+        ]
+    
+    def run(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        register: bool = True,
+        activate: bool = False,
+    ) -> SearchReport:
+        """
+        Search, then retrain the winner on all data and register it.
+        
+        Args:
+            X: Feature matrix (MaterialPredictor.feature_names order)
+            y: Labels
+            register: Register the retrained winner as a model version
+            activate: Also make it the active version
+        
+        Returns:
+            Search report.
+        """
+        cfg = self.config
+        start = time.perf_counter()
+        fold_paths = cache_folds(
+            X, y, self.models_path / cfg.cache_dir, cfg.n_folds, cfg.random_state
+        )
+        train_rows = min(len(np.load(path / "y_train.npy", mmap_mode="r")) for path in fold_paths)
+        
+        candidates = self.sample_candidates()
+        rungs = self.rung_rows(train_rows, len(candidates))
+        alive = list(range(len(candidates)))
+        history: list[CandidateResult] = []
+        logger.info(
+            f"Searching {len(candidates)} candidates over {len(rungs)} rung(s) "
+            f"of {rungs} rows per fold"
+        )
+        
+        with ProcessPoolExecutor(
+            max_workers=cfg.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            for rung, rows in enumerate(rungs):
+                futures = [
+                    pool.submit(
+                        evaluate_candidate, i, *candidates[i], fold_paths, rows, rung,
+                        self.predictor_config, cfg,
+                    )
+                    for i in alive
+                ]
+                results = [f.result() for f in futures]
+                history.extend(results)
+                
+                if rung < len(rungs) - 1:
+                    # Keep the best Pareto ranks, most accurate first within a rank
+                    ranks = pareto_ranks(results)
+                    order = sorted(
+                        range(len(results)), key=lambda i: (ranks[i], -results[i].accuracy)
+                    )
+                    keep = max(1, math.ceil(len(results) / cfg.halving_factor))
+                    alive = [results[i].candidate_id for i in order[:keep]]
+                logger.info(
+                    f"Rung {rung}: {len(results)} candidates on {rows} rows, "
+                    f"best accuracy {max(r.accuracy for r in results):.3f}"
+                )
+        
+        front = pareto_front(results)
+        report = SearchReport(
+            winner=select_winner(front, cfg.latency_budget_ms),
+            pareto_front=front,
+            history=history,
+            rung_rows=rungs,
+        )
+        if register:
+            report.version = self._register(X, y, report, activate)
+        report.elapsed_s = time.perf_counter() - start
+        return report
+    
+    def _register(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        report: SearchReport,
+        activate: bool,
+    ) -> str:
+        """Retrain the winner on all data and register it with the search summary."""
+        winner = report.winner
+        config = self.predictor_config.model_copy(update={
+            "forest_params": {**self.predictor_config.forest_params, **winner.forest_params},
+            "booster_params": {**self.predictor_config.booster_params, **winner.booster_params},
+        })
+        trainer = MaterialPredictor(config, self.models_path)
+        trainer.train(X, y, save_model=False)
+        trainer.metrics.update({
+            "cv_accuracy": winner.accuracy,
+            "single_latency_ms": winner.single_latency_ms,
+            "batch_latency_ms": winner.batch_latency_ms,
+        })
+        manifest = trainer.save_models(
+            activate=activate,
+            metadata={
+                "booster": config.booster,
+                "forest_params": config.forest_params,
+                "booster_params": config.booster_params,
+                "pareto_front": [r.to_dict() for r in report.pareto_front],
+            },
+        )
+        return manifest.version
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Tune the material model hyperparameters.")
+    parser.add_argument("--source", help=".npy or .parquet training data (default: synthetic)")
+    parser.add_argument("--samples-per-material", type=int, default=500,
+                        help="Synthetic rows per material when --source is omitted")
+    parser.add_argument("--candidates", type=int, help="Number of candidates")
+    parser.add_argument("--workers", type=int, help="Worker processes")
+    parser.add_argument("--latency-budget-ms", type=float, help="Single-row latency limit")
+    parser.add_argument("--activate", action="store_true", help="Activate the winning version")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO)
+    config = get_settings().ml.tuning.model_copy(update={
+        name: value for name, value in (
+            ("n_candidates", args.candidates),
+            ("max_workers", args.workers),
+            ("latency_budget_ms", args.latency_budget_ms),
+        ) if value is not None
+    })
+    search = HyperparameterSearch(config)
+    predictor = MaterialPredictor(search.predictor_config, search.models_path)
+    if args.source:
+        X, y = predictor.load_synthetic_data(args.source)
+    else:
+        X, y = predictor.generate_synthetic_data(args.samples_per_material, seed=config.random_state)
+    
+    report = search.run(X, y, activate=args.activate)
+    print(json.dumps({
+        "version": report.version,
+        "winner": report.winner.to_dict(),
+        "pareto_front": [r.to_dict() for r in report.pareto_front],
+        "elapsed_s": report.elapsed_s,
+    }, indent=2))
+
+
+# Convenience exports
+__all__ = [
+    "CandidateResult",
+    "SearchReport",
+    "HyperparameterSearch",
+    "cache_folds",
+    "evaluate_candidate",
+    "pareto_front",
+    "pareto_ranks",
+    "select_winner",
+]
+
+
+if __name__ == "__main__":
+    main()
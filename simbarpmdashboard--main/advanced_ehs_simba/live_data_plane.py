@@ -0,0 +1,642 @@
+"""
+Live Data Plane Module for Advanced EHS Simba Drill System.
+
+When the API runs with several uvicorn workers, a single ingest process
+owns sensor fusion, safety monitoring and prediction, and shares its
+output with every worker. This module provides:
+- A fixed-slot shared-memory ring of live records (fused snapshots,
+  alerts, predictions, sensor status) with one writer and lock-free,
+  read-only readers
+- A lightweight Unix datagram doorbell that wakes readers on new records
+- A Unix stream channel for workers to forward sensor payloads and
+  safety commands to the ingest process
+
+Author: EHS Simba Team
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import struct
+import time
+from enum import IntEnum
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from config import LiveDataConfig, get_settings
+
+logger = logging.getLogger(__name__)
+
+# Set to "worker" in API worker processes that read from the data plane
+LIVE_ROLE_ENV = "EHS_LIVE_DATA_ROLE"
+
+
+# =============================================================================
+# Record Kinds
+# =============================================================================
+
+class RecordKind(IntEnum):
+    """Kinds of records published on the live ring."""
+    SNAPSHOT = 0  # Fused sensor data
+    ALERT = 1  # Safety alert
+    PREDICTION = 2  # Material prediction
+    STATUS = 3  # Sensor health and buffer statistics
+
+
+# =============================================================================
+# Shared-Memory Ring
+# =============================================================================
+
+# Ring layout (little-endian):
+#
+#   header (64 bytes)
+#     magic b"EHSL", version u32, slot_count u32, slot_size u32,
+#     write_seq u64, latest_seq[4] u64 (one per RecordKind)
+#   slot_count slots of slot_size bytes, slot for seq s at (s % slot_count)
+#     seq u64, length u32, kind u8, 3 bytes padding, payload (UTF-8 JSON)
+#
+# Sequence numbers start at 1; 0 marks an empty or in-progress slot. The
+# writer zeroes a slot's seq before overwriting it and sets it last, so a
+# reader that sees the same seq before and after copying the payload has
+# a consistent record (a seqlock without a lock).
+_MAGIC = b"EHSL"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIIIQ4Q")
+_HEADER_SIZE = 64
+_WRITE_SEQ_OFFSET = 16
+_LATEST_OFFSET = 24
+_SLOT_HEADER = struct.Struct("<QIB3x")
+_SEQ = struct.Struct("<Q")
+
+
+def _shm_name(name: str) -> str:
+    """Shared memory block name for a data plane name."""
+    return f"{name}_ring"
+
+
+# Blocks created by this process; the writer's resource tracker entry
+# must survive readers attaching in the same process
+_owned_blocks: set[str] = set()
+
+
+class LiveRingWriter:
+    """
+    Single-writer side of the shared-memory record ring.
+    
+    Owns the shared memory block: creates it (replacing a stale block
+    left by a crashed process) and unlinks it on close.
+    """
+    
+    def __init__(self, name: str, slot_count: int = 1024, slot_size: int = 16384):
+        """
+        Create the ring.
+        
+        Args:
+            name: Data plane name
+            slot_count: Number of record slots
+            slot_size: Bytes per slot, including the 16-byte slot header
+        """
+        self.name = name
+        self.slot_count = slot_count
+        self.slot_size = slot_size
+        self.max_payload = slot_size - _SLOT_HEADER.size
+        size = _HEADER_SIZE + slot_count * slot_size
+        
+        try:
+            self._shm = shared_memory.SharedMemory(name=_shm_name(name), create=True, size=size)
+        except FileExistsError:
+            stale = shared_memory.SharedMemory(name=_shm_name(name))
+            stale.close()
+            stale.unlink()
+            self._shm = shared_memory.SharedMemory(name=_shm_name(name), create=True, size=size)
+        
+        _owned_blocks.add(_shm_name(name))
+        self._buf = self._shm.buf
+        self._seq = 0
+        _HEADER.pack_into(self._buf, 0, _MAGIC, _VERSION, slot_count, slot_size, 0, 0, 0, 0, 0)
+        
+        logger.info(f"LiveRingWriter created {_shm_name(name)} ({size} bytes)")
+    
+    @property
+    def write_seq(self) -> int:
+        """Sequence number of the last published record."""
+        return self._seq
+    
+    def publish(self, kind: RecordKind, payload: bytes) -> int:
+        """
+        Publish one record.
+        
+        Args:
+            kind: Record kind
+            payload: Encoded record (UTF-8 JSON)
+        
+        Returns:
+            Sequence number of the record.
+        
+        Raises:
+            ValueError: If the payload does not fit in a slot.
+        """
+        if len(payload) > self.max_payload:
+            raise ValueError(
+                f"Live record of {len(payload)} bytes exceeds slot payload of {self.max_payload}"
+            )
+        
+        seq = self._seq + 1
+        offset = _HEADER_SIZE + (seq % self.slot_count) * self.slot_size
+        buf = self._buf
+        
+        _SEQ.pack_into(buf, offset, 0)
+        start = offset + _SLOT_HEADER.size
+        buf[start:start + len(payload)] = payload
+        _SLOT_HEADER.pack_into(buf, offset, seq, len(payload), int(kind))
+        
+        _SEQ.pack_into(buf, _LATEST_OFFSET + 8 * int(kind), seq)
+        _SEQ.pack_into(buf, _WRITE_SEQ_OFFSET, seq)
+        self._seq = seq
+        return seq
+    
+    def close(self) -> None:
+        """Release and unlink the shared memory block."""
+        self._buf = None
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        _owned_blocks.discard(_shm_name(self.name))
+
+
+class LiveRingReader:
+    """
+    Read-only side of the shared-memory record ring.
+    
+    Readers never write to the block: the mapping is exposed only through
+    a read-only memoryview, and the block is not registered with this
+    process's resource tracker, so a worker exiting cannot unlink it.
+    """
+    
+    def __init__(self, name: str):
+        """
+        Attach to an existing ring.
+        
+        Args:
+            name: Data plane name
+        
+        Raises:
+            FileNotFoundError: If the ring does not exist (yet).
+            ValueError: If the block is not a live ring.
+        """
+        self.name = name
+        self._shm = shared_memory.SharedMemory(name=_shm_name(name))
+        if _shm_name(name) not in _owned_blocks:
+            try:
+                resource_tracker.unregister(self._shm._name, "shared_memory")
+            except Exception:
+                pass
+        
+        self._buf = self._shm.buf.toreadonly()
+        magic, version, self.slot_count, self.slot_size = _HEADER.unpack_from(self._buf, 0)[:4]
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError(f"Shared memory {_shm_name(name)} is not a live data ring")
+    
+    @classmethod
+    async def attach(cls, name: str, timeout_s: float = 30.0) -> LiveRingReader:
+        """
+        Attach to a ring, waiting for the writer to create it.
+        
+        Raises:
+            TimeoutError: If the ring did not appear in time.
+        """
+        deadline = time.monotonic() + timeout_s
+        while True:
+            try:
+                return cls(name)
+            except (FileNotFoundError, ValueError):
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Live data ring {name} not available")
+                await asyncio.sleep(0.1)
+    
+    @property
+    def write_seq(self) -> int:
+        """Sequence number of the last published record."""
+        return _SEQ.unpack_from(self._buf, _WRITE_SEQ_OFFSET)[0]
+    
+    def read(self, seq: int) -> Optional[tuple[RecordKind, bytes]]:
+        """
+        Read one record.
+        
+        Returns:
+            (kind, payload), or None if the slot no longer holds seq.
+        """
+        if seq <= 0:
+            return None
+        offset = _HEADER_SIZE + (seq % self.slot_count) * self.slot_size
+        slot_seq, length, kind = _SLOT_HEADER.unpack_from(self._buf, offset)
+        if slot_seq != seq:
+            return None
+        start = offset + _SLOT_HEADER.size
+        payload = bytes(self._buf[start:start + length])
+        if _SEQ.unpack_from(self._buf, offset)[0] != seq:
+            return None
+        return RecordKind(kind), payload
+    
+    def latest(self, kind: RecordKind) -> Optional[dict[str, Any]]:
+        """Decode the most recent record of a kind, if still in the ring."""
+        record = self.read(_SEQ.unpack_from(self._buf, _LATEST_OFFSET + 8 * int(kind))[0])
+        return json.loads(record[1]) if record else None
+    
+    def records_since(self, last_seq: int) -> tuple[list[tuple[int, RecordKind, bytes]], int]:
+        """
+        Read every record published after last_seq that is still in the ring.
+        
+        Args:
+            last_seq: Last sequence number already consumed
+        
+        Returns:
+            (records as (seq, kind, payload), new last_seq). Records
+            overwritten before they could be read are skipped.
+        """
+        head = self.write_seq
+        start = max(last_seq + 1, head - self.slot_count + 1)
+        if start > last_seq + 1:
+            logger.warning(f"Live data reader lagged, skipped {start - last_seq - 1} records")
+        
+        records = []
+        for seq in range(start, head + 1):
+            record = self.read(seq)
+            if record is not None:
+                records.append((seq, *record))
+        return records, max(head, last_seq)
+    
+    def close(self) -> None:
+        """Detach from the shared memory block (does not unlink it)."""
+        self._buf.release()
+        self._shm.close()
+
+
+# =============================================================================
+# Notify Channel
+# =============================================================================
+
+class DoorbellListener:
+    """
+    Reader end of the notify channel.
+    
+    Binds a Unix datagram socket in the socket directory; the writer's
+    ``Doorbell`` sends a byte to every such socket after publishing.
+    """
+    
+    def __init__(self, socket_dir: Path, name: str):
+        """
+        Bind the listener socket.
+        
+        Args:
+            socket_dir: Directory holding data plane sockets
+            name: Data plane name
+        """
+        socket_dir.mkdir(parents=True, exist_ok=True)
+        self.path = socket_dir / f"{name}.{os.getpid()}.bell"
+        if self.path.exists():
+            self.path.unlink()
+        
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+        self._sock.bind(str(self.path))
+    
+    async def wait(self, timeout: float) -> bool:
+        """
+        Wait for a ring (or timeout), draining queued rings.
+        
+        Returns:
+            True if woken by the doorbell.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(loop.sock_recv(self._sock, 64), timeout)
+        except asyncio.TimeoutError:
+            return False
+        
+        while True:
+            try:
+                self._sock.recv(64)
+            except BlockingIOError:
+                return True
+    
+    def close(self) -> None:
+        """Close and remove the listener socket."""
+        self._sock.close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class Doorbell:
+    """Writer end of the notify channel."""
+    
+    # Seconds between rescans of the socket directory for new listeners
+    RESCAN_INTERVAL_S = 1.0
+    
+    def __init__(self, socket_dir: Path, name: str):
+        """
+        Initialize doorbell.
+        
+        Args:
+            socket_dir: Directory holding data plane sockets
+            name: Data plane name
+        """
+        socket_dir.mkdir(parents=True, exist_ok=True)
+        self.socket_dir = socket_dir
+        self.pattern = f"{name}.*.bell"
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+        self._listeners: list[str] = []
+        self._last_scan = 0.0
+    
+    def ring(self) -> int:
+        """
+        Wake every listener.
+        
+        Returns:
+            Number of listeners notified.
+        """
+        now = time.monotonic()
+        if now - self._last_scan >= self.RESCAN_INTERVAL_S:
+            self._listeners = [str(p) for p in self.socket_dir.glob(self.pattern)]
+            self._last_scan = now
+        
+        notified = 0
+        for path in list(self._listeners):
+            try:
+                self._sock.sendto(b"\x01", path)
+                notified += 1
+            except BlockingIOError:
+                # Listener's queue is full, so it already has a pending wake-up
+                notified += 1
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Listener process is gone
+                self._listeners.remove(path)
+        return notified
+    
+    def close(self) -> None:
+        """Close the doorbell socket."""
+        self._sock.close()
+
+
+# =============================================================================
+# Ingest Channel
+# =============================================================================
+
+# Message: kind (1 byte) + rig id length (u16) + payload length (u32),
+# then the UTF-8 rig id and the payload
+_INGEST_HEADER = struct.Struct("<cHI")
+_MAX_INGEST_MESSAGE = 64 * 1024 * 1024
+
+# Ingest message kinds
+INGEST_FRAMES = b"F"  # Binary sensor frames (see sensor_fusion.encode_sensor_frame)
+INGEST_READING = b"R"  # JSON sensor reading request
+INGEST_COMMAND = b"C"  # JSON rig command (see fleet.FleetShard.apply_command)
+
+
+def _ingest_socket_path(socket_dir: Path, name: str) -> Path:
+    return socket_dir / f"{name}.ingest.sock"
+
+
+class IngestServer:
+    """Ingest-process end of the worker -> ingest channel."""
+    
+    def __init__(
+        self,
+        socket_dir: Path,
+        name: str,
+        handler: Callable[[bytes, str, bytes], Awaitable[None]],
+    ):
+        """
+        Initialize ingest server.
+        
+        Args:
+            socket_dir: Directory holding data plane sockets
+            name: Data plane name
+            handler: Coroutine called with (kind, rig_id, payload) per message
+        """
+        socket_dir.mkdir(parents=True, exist_ok=True)
+        self.path = _ingest_socket_path(socket_dir, name)
+        self.handler = handler
+        self._server: Optional[asyncio.AbstractServer] = None
+    
+    async def start(self) -> None:
+        """Start listening."""
+        if self.path.exists():
+            self.path.unlink()
+        self._server = await asyncio.start_unix_server(self._handle_connection, path=str(self.path))
+        logger.info(f"Ingest channel listening on {self.path}")
+    
+    async def _handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        """Handle messages from one worker connection."""
+        try:
+            while True:
+                header = await reader.readexactly(_INGEST_HEADER.size)
+                kind, rig_length, length = _INGEST_HEADER.unpack(header)
+                if length > _MAX_INGEST_MESSAGE:
+                    logger.error(f"Ingest message of {length} bytes rejected")
+                    break
+                rig_id = (await reader.readexactly(rig_length)).decode("utf-8")
+                payload = await reader.readexactly(length)
+                try:
+                    await self.handler(kind, rig_id, payload)
+                except Exception as e:
+                    logger.error(f"Ingest handler error: {e}")
+        except asyncio.IncompleteReadError:
+            pass
+        finally:
+            writer.close()
+    
+    async def stop(self) -> None:
+        """Stop listening and remove the socket."""
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class IngestClient:
+    """Worker end of the worker -> ingest channel."""
+    
+    def __init__(self, socket_dir: Path, name: str):
+        """
+        Initialize ingest client.
+        
+        Args:
+            socket_dir: Directory holding data plane sockets
+            name: Data plane name
+        """
+        self.path = _ingest_socket_path(socket_dir, name)
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+    
+    async def send(self, kind: bytes, payload: bytes, rig_id: str = "") -> None:
+        """
+        Forward one message to the ingest process.
+        
+        Args:
+            kind: Ingest message kind
+            payload: Message payload
+            rig_id: Rig the data belongs to ("" for the default rig)
+        
+        Raises:
+            ConnectionError: If the ingest process is unreachable.
+        """
+        if len(payload) > _MAX_INGEST_MESSAGE:
+            raise ValueError(f"Ingest message of {len(payload)} bytes is too large")
+        rig = rig_id.encode("utf-8")
+        message = _INGEST_HEADER.pack(kind, len(rig), len(payload)) + rig + payload
+        
+        async with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._writer is None:
+                        _, self._writer = await asyncio.open_unix_connection(str(self.path))
+                    self._writer.write(message)
+                    await self._writer.drain()
+                    return
+                except OSError as e:
+                    self._writer = None
+                    if attempt:
+                        raise ConnectionError(f"Ingest process unreachable: {e}") from e
+    
+    async def close(self) -> None:
+        """Close the connection."""
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+
+
+# =============================================================================
+# Publisher and Subscriber
+# =============================================================================
+
+class LivePublisher:
+    """
+    Ingest-process side of the data plane: ring writer plus doorbell.
+    """
+    
+    def __init__(self, config: Optional[LiveDataConfig] = None):
+        """
+        Initialize publisher.
+        
+        Args:
+            config: Live data plane configuration
+        """
+        self.config = config or get_settings().live
+        self.ring = LiveRingWriter(self.config.name, self.config.slot_count, self.config.slot_size)
+        self.doorbell = Doorbell(self.config.socket_dir, self.config.name)
+        self._dropped = 0
+    
+    def publish(self, kind: RecordKind, message: dict[str, Any]) -> Optional[int]:
+        """
+        Encode and publish a message, then ring the doorbell.
+        
+        Args:
+            kind: Record kind
+            message: JSON-serializable message, forwarded verbatim to clients
+        
+        Returns:
+            Sequence number, or None if the message was too large.
+        """
+        try:
+            seq = self.ring.publish(kind, json.dumps(message, default=str).encode("utf-8"))
+        except ValueError as e:
+            self._dropped += 1
+            logger.error(f"Live record dropped: {e}")
+            return None
+        self.doorbell.ring()
+        return seq
+    
+    def close(self) -> None:
+        """Close the doorbell and unlink the ring."""
+        self.doorbell.close()
+        self.ring.close()
+
+
+class LiveSubscriber:
+    """
+    API-worker side of the data plane: read-only ring plus doorbell listener.
+    """
+    
+    def __init__(self, reader: LiveRingReader, config: Optional[LiveDataConfig] = None):
+        """
+        Initialize subscriber.
+        
+        Args:
+            reader: Attached ring reader
+            config: Live data plane configuration
+        """
+        self.config = config or get_settings().live
+        self.reader = reader
+        self.listener = DoorbellListener(self.config.socket_dir, self.config.name)
+    
+    @classmethod
+    async def attach(cls, config: Optional[LiveDataConfig] = None) -> LiveSubscriber:
+        """Attach to the ring, waiting for the ingest process to create it."""
+        config = config or get_settings().live
+        reader = await LiveRingReader.attach(config.name, config.attach_timeout_s)
+        return cls(reader, config)
+    
+    def latest(self, kind: RecordKind) -> Optional[dict[str, Any]]:
+        """Most recent message of a kind."""
+        return self.reader.latest(kind)
+    
+    async def stream(self, since_seq: Optional[int] = None) -> AsyncIterator[tuple[RecordKind, bytes]]:
+        """
+        Yield (kind, payload) for every new record.
+        
+        Wakes on the doorbell, and also polls every ``poll_interval_s``
+        so a missed datagram only delays records.
+        
+        Args:
+            since_seq: Last sequence number already consumed (default: now)
+        """
+        last_seq = self.reader.write_seq if since_seq is None else since_seq
+        while True:
+            await self.listener.wait(self.config.poll_interval_s)
+            records, last_seq = self.reader.records_since(last_seq)
+            for _, kind, payload in records:
+                yield kind, payload
+    
+    def close(self) -> None:
+        """Close the listener and detach from the ring."""
+        self.listener.close()
+        self.reader.close()
+
+
+# Convenience exports
+__all__ = [
+    "LIVE_ROLE_ENV",
+    "RecordKind",
+    "LiveRingWriter",
+    "LiveRingReader",
+    "DoorbellListener",
+    "Doorbell",
+    "INGEST_FRAMES",
+    "INGEST_READING",
+    "INGEST_COMMAND",
+    "IngestServer",
+    "IngestClient",
+    "LivePublisher",
+    "LiveSubscriber",
+]
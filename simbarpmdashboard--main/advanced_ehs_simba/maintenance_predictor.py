@@ -115,6 +115,16 @@ class ComponentHealth:
             "recommendations": self.recommendations,
             "timestamp": self.timestamp.isoformat(),
         }
+    
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ComponentHealth:
+        """Create from a dictionary produced by ``to_dict``."""
+        return cls(**{
+            **data,
+            "component_type": ComponentType(data["component_type"]),
+            "status": HealthStatus(data["status"]),
+            "timestamp": datetime.fromisoformat(data["timestamp"]),
+        })
 
 
 @dataclass
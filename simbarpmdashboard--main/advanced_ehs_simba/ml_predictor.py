@@ -9,25 +9,165 @@ Features:
 
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+from sklearn.ensemble import (
+    RandomForestClassifier, GradientBoostingClassifier, HistGradientBoostingClassifier
+)
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, confusion_matrix
 import joblib
 import json
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
 from datetime import datetime
+from pathlib import Path
+
+from config import get_settings
+from model_registry import ModelRegistry
+from prediction_cache import PredictionCache
+from student_model import StudentModel
+from tree_compiler import CompiledEnsemble, compile_boosting, compile_random_forest
+
+logger = logging.getLogger(__name__)
+
+# Artifact file names inside a model version directory (or, for models
+# saved before the registry existed, directly under Settings.models_path)
+RF_MODEL_FILE = 'rf_material_model.pkl'
+GB_MODEL_FILE = 'gb_material_model.pkl'
+SCALER_FILE = 'scaler.pkl'
+CASCADE_FILE = 'cascade.json'
+COMPILED_DIR = 'compiled'
+STUDENT_FILE = 'student.npz'
+TRAINING_LOCK_FILE = '.training.lock'
+LEGACY_VERSION = 'legacy'
+
+# A training lock older than this is left over from a crashed job
+TRAINING_LOCK_STALE_S = 3600
+
+# Synthetic data: rows drawn per vectorized block, and independent noise
+# streams per material (one per random feature column)
+SYNTHETIC_CHUNK_ROWS = 1_000_000
+SYNTHETIC_STREAMS = 9
+
+# Default hyperparameters (see MaterialPredictorConfig.forest_params and
+# booster_params, and hyperparameter_search)
+FOREST_PARAMS = {
+    'n_estimators': 200,
+    'max_depth': 15,
+    'min_samples_split': 5,
+    'random_state': 42,
+    'n_jobs': -1
+}
+GB_PARAMS = {
+    'n_estimators': 150,
+    'learning_rate': 0.1,
+    'max_depth': 7,
+    'random_state': 42
+}
+HGB_PARAMS = {
+    'max_iter': 150,
+    'learning_rate': 0.1,
+    'max_depth': 7,
+    'random_state': 42
+}
+
+# One complete set of models with the cascade threshold calibrated for
+# them; predictions read it through a single reference, so a hot swap never
+# mixes versions (or thresholds) within a batch. The distilled student is
+# optional, and is the only model loaded when the teacher is not
+# (config.load_teacher).
+ModelSet = namedtuple('ModelSet', [
+    'version', 'rf_model', 'gb_model', 'scaler', 'rf_compiled', 'gb_compiled', 'student',
+    'cascade_threshold'
+], defaults=(None, None))
+
+_material_predictor = None
+
+
+def get_material_predictor():
+    """Process-wide MaterialPredictor; models load on the first prediction"""
+    global _material_predictor
+    if _material_predictor is None:
+        _material_predictor = MaterialPredictor()
+    return _material_predictor
+
+
+def _or_default(values, default):
+    """Use default for missing or empty readings"""
+    return default if values is None or len(values) == 0 else values
+
+
+def _copy_result(result, **updates):
+    """Copy of a prediction result sharing no mutable parts with the original"""
+    top_3 = [dict(p, properties=dict(p['properties'])) for p in result['top_3_predictions']]
+    return dict(result, top_3_predictions=top_3, **updates)
+
+
+def _ragged_stats(arrays):
+    """Mean, std and max of each array in a ragged list, in one pass"""
+    lengths = np.fromiter((len(a) for a in arrays), dtype=np.intp, count=len(arrays))
+    flat = np.concatenate([np.asarray(a, dtype=float).ravel() for a in arrays])
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    
+    mean = np.add.reduceat(flat, offsets) / lengths
+    deviation = flat - np.repeat(mean, lengths)
+    std = np.sqrt(np.add.reduceat(deviation * deviation, offsets) / lengths)
+    maximum = np.maximum.reduceat(flat, offsets)
+    return mean, std, maximum
+
 
 class MaterialPredictor:
-    def __init__(self):
-        self.rf_model = None
-        self.gb_model = None
-        self.scaler = StandardScaler()
+    def __init__(self, config=None, models_path=None):
+        settings = get_settings()
+        self.config = config or settings.ml.material_predictor
+        self.models_path = Path(models_path or settings.models_path)
+        self.registry = ModelRegistry(self.models_path)
+        self.models = None
+        self.metrics = {}
+        
+        # Lazy loading: models are read on the first prediction; until they
+        # exist a background job trains them and rule-based results are served
+        self.models_loaded = False
+        self._load_lock = threading.Lock()
+        self._last_load_attempt = None
+        self._training_future = None
+        # Process pool for background training (training_pipeline.TrainingPipeline),
+        # created on first use unless the owner shares one
+        self.training_pipeline = None
+        
+        # Hot swap: the ACTIVE pointer is polled and a newly activated
+        # version is loaded in the background before it replaces self.models
+        self._swap_lock = threading.Lock()
+        self._swap_thread = None
+        self._last_version_check = time.monotonic()
+        
+        # Cascade inference (RF first, GB only for ambiguous samples)
+        self.cascade_enabled = self.config.cascade_enabled
+        self._audit_rng = np.random.default_rng()
+        self.cascade_stats = {
+            'samples': 0,
+            'rf_only': 0,
+            'audited': 0,
+            'audit_agreed': 0
+        }
         self.feature_names = [
             'rpm', 'current', 'vibration_mean', 'vibration_std', 
             'vibration_max', 'rpm_stability', 'current_spike', 
             'depth', 'hardness_estimate', 'ucs_estimate'
         ]
         
+        # Results for near-identical inputs (same quantized features) are
+        # reused until they expire or the model version changes
+        self.prediction_cache = None
+        if self.config.cache_enabled:
+            self.prediction_cache = PredictionCache(
+                self.feature_names, self.config.cache_resolution,
+                max_entries=self.config.cache_max_entries, ttl_s=self.config.cache_ttl_s
+            )
+        
         # Material properties database
         self.material_db = {
             'Coal': {'hardness': 1.5, 'ucs': 12.5, 'rpm': 450, 'density': 1.3, 'category': 'A'},
@@ -45,54 +185,201 @@ class MaterialPredictor:
             'Copper': {'hardness': 3.5, 'ucs': 75, 'rpm': 950, 'density': 2.8, 'category': 'B'}
         }
     
-    def generate_synthetic_data(self, samples_per_material=100):
-        """Generate synthetic training data with realistic variations"""
-        X = []
-        y = []
+    def generate_synthetic_data(self, samples_per_material=100, seed=None):
+        """
+        Generate synthetic training data with realistic variations
+        
+        Returns (X, y) in memory; see iter_synthetic_chunks for the
+        sampling and write_synthetic_data for sets too large for memory.
+        """
+        chunks = list(self.iter_synthetic_chunks(
+            samples_per_material, seed=seed, chunk_size=max(samples_per_material, 1)
+        ))
+        if not chunks:
+            return np.empty((0, len(self.feature_names))), np.empty(0, dtype=str)
+        X, y = zip(*chunks)
+        return np.concatenate(X), np.concatenate(y)
+    
+    def iter_synthetic_chunks(self, samples_per_material=100, seed=None,
+                              chunk_size=SYNTHETIC_CHUNK_ROWS):
+        """
+        Yield (X, y) chunks of synthetic training data, material by material
+        
+        Each chunk is drawn in one vectorized block. Every material and
+        noise column has its own np.random.Generator stream spawned from
+        seed, so a seed gives the same rows whatever the chunk size.
+        """
+        material_seeds = np.random.SeedSequence(seed).spawn(len(self.material_db))
+        for (material, props), material_seed in zip(self.material_db.items(), material_seeds):
+            streams = [np.random.default_rng(s) for s in material_seed.spawn(SYNTHETIC_STREAMS)]
+            for start in range(0, samples_per_material, chunk_size):
+                n = min(chunk_size, samples_per_material - start)
+                yield self._synthetic_block(props, n, streams), np.full(n, material)
+    
+    def _synthetic_block(self, props, n, streams):
+        """n synthetic feature rows for one material"""
+        (rpm_rng, current_rng, vib_rng, vib_std_rng, stability_rng,
+         spike_rng, depth_rng, hardness_rng, ucs_rng) = streams
+        base_rpm = props['rpm']
+        base_hardness = props['hardness']
+        base_ucs = props['ucs']
+        
+        # Add realistic noise and variations
+        rpm = base_rpm + rpm_rng.normal(0, base_rpm * 0.1, n)
+        current = (rpm / 200) + current_rng.normal(0, 1.5, n)
+        
+        # Vibration patterns vary with material hardness
+        vib_mean = base_hardness * 10 + vib_rng.normal(0, 5, n)
+        vib_std = base_hardness * 2 + vib_std_rng.normal(0, 2, n)
+        vib_max = vib_mean + vib_std * 2
+        
+        # RPM stability (harder materials = more stable)
+        rpm_stability = 100 - (base_hardness * 5) + stability_rng.normal(0, 10, n)
         
-        for material, props in self.material_db.items():
-            base_rpm = props['rpm']
-            base_hardness = props['hardness']
-            base_ucs = props['ucs']
+        # Current spike during material break
+        current_spike = base_ucs / 20 + spike_rng.normal(0, 2, n)
+        
+        # Depth (random underground position)
+        depth = depth_rng.uniform(10, 200, n)
+        
+        # Estimated properties from sensor readings
+        hardness_est = (rpm / 500) + 1 + hardness_rng.normal(0, 0.5, n)
+        ucs_est = rpm / 15 + ucs_rng.normal(0, 10, n)
+        
+        return np.column_stack([
+            rpm, current, vib_mean, vib_std, vib_max,
+            rpm_stability, current_spike, depth,
+            hardness_est, ucs_est
+        ])
+    
+    def synthetic_dtype(self):
+        """Row dtype of synthetic .npy datasets: one field per feature plus material"""
+        name_length = max(len(material) for material in self.material_db)
+        return np.dtype(
+            [(name, np.float64) for name in self.feature_names]
+            + [('material', f'U{name_length}')]
+        )
+    
+    def write_synthetic_data(self, path, samples_per_material=100, seed=None,
+                             chunk_size=SYNTHETIC_CHUNK_ROWS):
+        """
+        Stream synthetic training data to a .npy or .parquet file
+        
+        .npy files hold a structured array (synthetic_dtype) filled through
+        a memory map; .parquet files (needs pyarrow) get one row group per
+        chunk. Only one chunk is in memory at a time. Returns the row count.
+        """
+        path = Path(path)
+        chunks = self.iter_synthetic_chunks(samples_per_material, seed=seed, chunk_size=chunk_size)
+        total = samples_per_material * len(self.material_db)
+        
+        if path.suffix == '.npy':
+            out = np.lib.format.open_memmap(path, mode='w+', dtype=self.synthetic_dtype(), shape=(total,))
+            row = 0
+            for X, y in chunks:
+                block = out[row:row + len(X)]
+                for i, name in enumerate(self.feature_names):
+                    block[name] = X[:, i]
+                block['material'] = y
+                row += len(X)
+            out.flush()
+            del out
+        elif path.suffix == '.parquet':
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError("Writing Parquet needs pyarrow (pip install pyarrow)")
             
-            for _ in range(samples_per_material):
-                # Add realistic noise and variations
-                rpm = base_rpm + np.random.normal(0, base_rpm * 0.1)
-                current = (rpm / 200) + np.random.normal(0, 1.5)
-                
-                # Vibration patterns vary with material hardness
-                vib_mean = base_hardness * 10 + np.random.normal(0, 5)
-                vib_std = base_hardness * 2 + np.random.normal(0, 2)
-                vib_max = vib_mean + vib_std * 2
-                
-                # RPM stability (harder materials = more stable)
-                rpm_stability = 100 - (base_hardness * 5) + np.random.normal(0, 10)
-                
-                # Current spike during material break
-                current_spike = base_ucs / 20 + np.random.normal(0, 2)
-                
-                # Depth (random underground position)
-                depth = np.random.uniform(10, 200)
-                
-                # Estimated properties from sensor readings
-                hardness_est = (rpm / 500) + 1 + np.random.normal(0, 0.5)
-                ucs_est = rpm / 15 + np.random.normal(0, 10)
-                
-                features = [
-                    rpm, current, vib_mean, vib_std, vib_max,
-                    rpm_stability, current_spike, depth,
-                    hardness_est, ucs_est
-                ]
-                
-                X.append(features)
-                y.append(material)
-        
-        return np.array(X), np.array(y)
+            schema = pa.schema(
+                [(name, pa.float64()) for name in self.feature_names]
+                + [('material', pa.string())]
+            )
+            with pq.ParquetWriter(path, schema) as writer:
+                for X, y in chunks:
+                    columns = [X[:, i] for i in range(X.shape[1])] + [y]
+                    writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+        else:
+            raise ValueError(f"Unsupported synthetic data format '{path.suffix}' (use .npy or .parquet)")
+        
+        return total
+    
+    def load_synthetic_data(self, path):
+        """Read (X, y) from a file written by write_synthetic_data"""
+        path = Path(path)
+        if path.suffix == '.parquet':
+            table = pd.read_parquet(path)
+            return table[self.feature_names].to_numpy(dtype=float), table['material'].to_numpy()
+        
+        data = np.load(path, mmap_mode='r')
+        X = np.column_stack([data[name] for name in self.feature_names])
+        return X, np.asarray(data['material'])
+    
+    # Read-only views of the current model set
+    @property
+    def rf_model(self):
+        return self.models.rf_model if self.models else None
+    
+    @property
+    def gb_model(self):
+        return self.models.gb_model if self.models else None
+    
+    @property
+    def scaler(self):
+        return self.models.scaler if self.models else None
+    
+    @property
+    def rf_compiled(self):
+        return self.models.rf_compiled if self.models else None
+    
+    @property
+    def gb_compiled(self):
+        return self.models.gb_compiled if self.models else None
+    
+    @property
+    def model_version(self):
+        return self.models.version if self.models else None
+    
+    @property
+    def cascade_threshold(self):
+        return self.models.cascade_threshold if self.models else self.config.cascade_threshold
+    
+    def make_forest(self, warm_start=False, **params):
+        """
+        Unfitted RandomForest with the material model hyperparameters
+        
+        FOREST_PARAMS, overridden by config.forest_params, then by params.
+        """
+        return RandomForestClassifier(
+            **{**FOREST_PARAMS, **self.config.forest_params, **params},
+            warm_start=warm_start
+        )
+    
+    def make_booster(self, warm_start=False, **params):
+        """
+        Unfitted boosting model selected by config.booster
+        
+        Its default hyperparameters, overridden by config.booster_params,
+        then by params.
+        """
+        if self.config.booster == 'hist_gradient_boosting':
+            model, defaults = HistGradientBoostingClassifier, HGB_PARAMS
+        else:
+            model, defaults = GradientBoostingClassifier, GB_PARAMS
+        return model(
+            **{**defaults, **self.config.booster_params, **params},
+            warm_start=warm_start
+        )
     
     def train(self, X=None, y=None, save_model=True):
-        """Train the ML models"""
+        """
+        Train the ML models
+        
+        With save_model the models are registered as a new version in the
+        model registry and activated.
+        """
         if X is None or y is None:
-            print("Generating synthetic training data...")
+            logger.info("Generating synthetic training data...")
             X, y = self.generate_synthetic_data(samples_per_material=100)
         
         # Split data
@@ -101,69 +388,325 @@ class MaterialPredictor:
         )
         
         # Scale features
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
+        scaler = StandardScaler()
+        X_train_scaled = scaler.fit_transform(X_train)
+        X_test_scaled = scaler.transform(X_test)
         
         # Train Random Forest
-        print("\nTraining Random Forest...")
-        self.rf_model = RandomForestClassifier(
-            n_estimators=200,
-            max_depth=15,
-            min_samples_split=5,
-            random_state=42,
-            n_jobs=-1
-        )
-        self.rf_model.fit(X_train_scaled, y_train)
+        logger.info("Training Random Forest...")
+        rf_model = self.make_forest()
+        rf_model.fit(X_train_scaled, y_train)
         
         # Train Gradient Boosting
-        print("Training Gradient Boosting...")
-        self.gb_model = GradientBoostingClassifier(
-            n_estimators=150,
-            learning_rate=0.1,
-            max_depth=7,
-            random_state=42
-        )
-        self.gb_model.fit(X_train_scaled, y_train)
+        logger.info(f"Training {self.config.booster}...")
+        gb_model = self.make_booster()
+        gb_model.fit(X_train_scaled, y_train)
         
         # Evaluate
-        rf_score = self.rf_model.score(X_test_scaled, y_test)
-        gb_score = self.gb_model.score(X_test_scaled, y_test)
+        rf_score = rf_model.score(X_test_scaled, y_test)
+        gb_score = gb_model.score(X_test_scaled, y_test)
         
-        print(f"\nRandom Forest Accuracy: {rf_score:.3f}")
-        print(f"Gradient Boosting Accuracy: {gb_score:.3f}")
+        logger.info(f"Random Forest accuracy: {rf_score:.3f}")
+        logger.info(f"Gradient Boosting accuracy: {gb_score:.3f}")
         
         # Feature importance
         feature_importance = pd.DataFrame({
             'feature': self.feature_names,
-            'importance': self.rf_model.feature_importances_
+            'importance': rf_model.feature_importances_
         }).sort_values('importance', ascending=False)
         
-        print("\nTop 5 Most Important Features:")
-        print(feature_importance.head())
+        logger.info(f"Top 5 most important features:\n{feature_importance.head().to_string()}")
+        
+        self._publish(ModelSet(
+            None, rf_model, gb_model, scaler,
+            compile_random_forest(rf_model), compile_boosting(gb_model),
+            cascade_threshold=self.cascade_threshold
+        ))
+        
+        # Calibrate the cascade threshold on held-out data
+        skip_rate = self.calibrate_cascade(X_test_scaled)
+        logger.info(
+            f"Cascade threshold: {self.cascade_threshold:.3f} "
+            f"(skips GB for {skip_rate * 100:.1f}% of held-out samples)"
+        )
+        
+        self.metrics = {
+            'rf_accuracy': rf_score,
+            'gb_accuracy': gb_score,
+            'cascade_skip_rate': skip_rate,
+            'train_samples': len(X_train),
+            'test_samples': len(X_test)
+        }
         
         # Save models
         if save_model:
-            joblib.dump(self.rf_model, 'models/rf_material_model.pkl')
-            joblib.dump(self.gb_model, 'models/gb_material_model.pkl')
-            joblib.dump(self.scaler, 'models/scaler.pkl')
-            print("\nModels saved successfully!")
+            self.save_models()
         
         return rf_score, gb_score
     
+    def save_models(self, activate=True, metadata=None):
+        """
+        Register the current models as a new version under models_path
+        
+        The manifest records features, classes, training metrics, artifact
+        hashes and any extra metadata. With activate the ACTIVE pointer is
+        switched to the new version, which running predictors then hot-swap
+        to. Returns the manifest.
+        """
+        models = self.models
+        manifest = self.registry.register(
+            lambda path: self._write_artifacts(models, path),
+            features=self.feature_names,
+            classes=list(models.rf_model.classes_),
+            metrics=self.metrics,
+            metadata={'cascade_threshold': models.cascade_threshold, **(metadata or {})}
+        )
+        self.models = models._replace(version=manifest.version)
+        if activate:
+            self.registry.activate(manifest.version)
+        logger.info(f"Models saved as version {manifest.version}")
+        return manifest
+    
+    def _write_artifacts(self, models, path):
+        """Write one model set into a (staging) version directory"""
+        joblib.dump(models.rf_model, path / RF_MODEL_FILE)
+        joblib.dump(models.gb_model, path / GB_MODEL_FILE)
+        joblib.dump(models.scaler, path / SCALER_FILE)
+        with open(path / CASCADE_FILE, 'w') as f:
+            json.dump({'threshold': models.cascade_threshold}, f)
+        models.rf_compiled.save(path / COMPILED_DIR / 'rf')
+        models.gb_compiled.save(path / COMPILED_DIR / 'gb')
+        if models.student is not None:
+            models.student.save(path / STUDENT_FILE)
+    
     def load_models(self):
-        """Load pre-trained models"""
+        """
+        Load the active model version from the registry
+        
+        Arrays are memory-mapped read-only (mmap_mode='r'), so processes
+        loading the same files share those pages; the compiled trees are
+        fully memory-mapped. Models saved before the registry existed are
+        read from models_path itself. Returns False if there are no models
+        yet; never trains.
+        """
+        version = self.registry.active_version()
         try:
-            self.rf_model = joblib.load('models/rf_material_model.pkl')
-            self.gb_model = joblib.load('models/gb_material_model.pkl')
-            self.scaler = joblib.load('models/scaler.pkl')
-            print("Models loaded successfully!")
+            if version is None:
+                path, version = self.models_path, LEGACY_VERSION
+            else:
+                path = self.registry.version_path(version)
+            models = self._read_version(path, version)
+        except (FileNotFoundError, KeyError):
+            logger.info(f"Models not found in {self.models_path}")
+            return False
+        
+        self._publish(models)
+        logger.info(f"Models loaded (version {version})")
+        return True
+    
+    def _read_version(self, path, version):
+        """Load and warm up the models stored in path"""
+        cascade_threshold = self.config.cascade_threshold
+        if (path / CASCADE_FILE).exists():
+            with open(path / CASCADE_FILE) as f:
+                cascade_threshold = json.load(f)['threshold']
+        
+        student = None
+        if (path / STUDENT_FILE).exists():
+            student = StudentModel.load(path / STUDENT_FILE)
+            student.predict_proba(np.zeros((1, len(self.feature_names))))
+            if not self.config.load_teacher:
+                return ModelSet(version, None, None, None, None, None, student, cascade_threshold)
+        
+        scaler = joblib.load(path / SCALER_FILE, mmap_mode='r')
+        rf_model = joblib.load(path / RF_MODEL_FILE, mmap_mode='r')
+        gb_model = joblib.load(path / GB_MODEL_FILE, mmap_mode='r')
+        
+        try:
+            rf_compiled = CompiledEnsemble.load(path / COMPILED_DIR / 'rf')
+            gb_compiled = CompiledEnsemble.load(path / COMPILED_DIR / 'gb')
+        except (FileNotFoundError, ValueError):
+            rf_compiled = compile_random_forest(rf_model)
+            gb_compiled = compile_boosting(gb_model)
+        
+        models = ModelSet(
+            version, rf_model, gb_model, scaler, rf_compiled, gb_compiled, student, cascade_threshold
+        )
+        
+        # Touch every model once so the first real prediction after a swap
+        # does not pay for page faults and lazy initialization
+        row = np.zeros((1, len(self.feature_names)))
+        rf_compiled.predict_proba(row)
+        gb_compiled.predict_proba(row)
+        rf_model.predict_proba(row)
+        gb_model.predict_proba(row)
+        return models
+    
+    def _publish(self, models):
+        """Switch predictions to a complete model set in one reference swap"""
+        if models.cascade_threshold is None:
+            models = models._replace(cascade_threshold=self.config.cascade_threshold)
+        self.models = models
+        self.models_loaded = True
+        if self.prediction_cache is not None:
+            self.prediction_cache.invalidate()
+    
+    def attach_student(self, student):
+        """Serve a distilled student alongside the current models (save_models to register it)"""
+        self._publish(self.models._replace(student=student))
+    
+    def activate_version(self, version=None):
+        """
+        Hot-swap to a registered version (default: the ACTIVE one)
+        
+        The artifacts are checked against the manifest hashes and the new
+        version is fully loaded and warmed up first. Predictions keep using
+        the current models until the reference switch, and batches already
+        running finish on the models they started with.
+        This does not move the ACTIVE pointer (see ModelRegistry.activate).
+        Returns the version id now serving.
+        """
+        with self._swap_lock:
+            version = version or self.registry.active_version()
+            if version is None:
+                raise KeyError("No active model version")
+            if version == self.model_version:
+                return version
+            self.registry.verify(version)
+            self._publish(self._read_version(self.registry.version_path(version), version))
+            logger.info(f"Switched to model version {version}")
+            return version
+    
+    def _check_active_version(self):
+        """Start a background hot swap if the ACTIVE pointer moved"""
+        version = self.registry.active_version()
+        if version is None or version == self.model_version:
+            return
+        if self._swap_thread is not None and self._swap_thread.is_alive():
+            return
+        
+        def swap():
+            try:
+                self.activate_version(version)
+            except Exception:
+                logger.exception(f"Could not switch to model version {version}")
+        
+        self._swap_thread = threading.Thread(target=swap, name='material-model-swap', daemon=True)
+        self._swap_thread.start()
+    
+    def ensure_loaded(self):
+        """
+        Load the models on first use
+        
+        If they are missing, start background training (when enabled) and
+        retry loading at most every model_poll_interval_s, so models
+        published by another process are picked up. Once loaded, the
+        ACTIVE pointer is checked on the same interval and a newly
+        activated version is swapped in. Returns True once models are
+        available.
+        """
+        now = time.monotonic()
+        if self.models_loaded:
+            if now - self._last_version_check >= self.config.model_poll_interval_s:
+                self._last_version_check = now
+                self._check_active_version()
             return True
+        
+        with self._load_lock:
+            if self.models_loaded:
+                return True
+            if (self._last_load_attempt is not None
+                    and now - self._last_load_attempt < self.config.model_poll_interval_s):
+                return False
+            self._last_load_attempt = now
+            
+            if self.load_models():
+                return True
+            if self.config.background_training:
+                self.start_background_training()
+            return False
+    
+    def start_background_training(self, X=None, y=None):
+        """
+        Train in the training process pool and publish the models when done
+        
+        The job goes through TrainingPipeline.submit, so training runs in a
+        spawned process rather than inside this (API worker) process, and
+        predictions keep using the rule-based fallback (or the previous
+        models) meanwhile. The result is registered and activated as a new
+        version and switched in when the job finishes. A lock file in
+        models_path keeps other processes from training at the same time;
+        they pick the version up on their next poll. Returns the job's
+        Future, or None if another process is training.
+        """
+        if self._training_future is not None and not self._training_future.done():
+            return self._training_future
+        
+        self.models_path.mkdir(parents=True, exist_ok=True)
+        lock_path = self.models_path / TRAINING_LOCK_FILE
+        try:
+            if time.time() - lock_path.stat().st_mtime > TRAINING_LOCK_STALE_S:
+                lock_path.unlink()
         except FileNotFoundError:
-            print("Models not found. Training new models...")
-            self.train()
-            return True
+            pass
+        
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            logger.info("Material models are being trained by another process")
+            return None
+        
+        try:
+            os.write(fd, str(os.getpid()).encode())
+            if self.training_pipeline is None:
+                # Imported here: training_pipeline builds on this module
+                from training_pipeline import TrainingPipeline
+                self.training_pipeline = TrainingPipeline(
+                    predictor_config=self.config, models_path=self.models_path
+                )
+            source = None if X is None or y is None else (X, y)
+            logger.info("Training material models in the training process pool...")
+            future = self.training_pipeline.submit(source)
+        except Exception:
+            lock_path.unlink(missing_ok=True)
+            raise
+        finally:
+            os.close(fd)
+        
+        self._training_future = future
+        future.add_done_callback(lambda job: self._publish_trained(job, lock_path))
+        return future
+    
+    def _publish_trained(self, job, lock_path):
+        """Switch to the version a background training job registered"""
+        try:
+            self.activate_version(job.result().version)
+        except Exception:
+            logger.exception("Background training failed")
+        finally:
+            lock_path.unlink(missing_ok=True)
     
-    def predict(self, sensor_data, ensemble=True):
+    def _rf_proba(self, features_scaled, models):
+        """RF class probabilities, from the compiled trees for small batches"""
+        if self._use_compiled(models.rf_compiled, features_scaled):
+            return models.rf_compiled.predict_proba(features_scaled)
+        return models.rf_model.predict_proba(features_scaled)
+    
+    def _gb_proba(self, features_scaled, models):
+        """GB class probabilities, from the compiled trees for small batches"""
+        if self._use_compiled(models.gb_compiled, features_scaled):
+            return models.gb_compiled.predict_proba(features_scaled)
+        return models.gb_model.predict_proba(features_scaled)
+    
+    def _use_compiled(self, compiled, features_scaled):
+        """Compiled trees win below compiled_max_rows; sklearn is faster above"""
+        return (
+            compiled is not None
+            and self.config.use_compiled_trees
+            and len(features_scaled) <= self.config.compiled_max_rows
+        )
+    
+    def predict(self, sensor_data, ensemble=True, cascade=None, model=None):
         """
         Predict material from sensor data
         
@@ -173,61 +716,339 @@ class MaterialPredictor:
         - vibration_readings: list of vibration sensor readings
         - depth: current depth (m)
         """
-        # Extract features
-        features = self._extract_features(sensor_data)
-        features_scaled = self.scaler.transform([features])
+        return self.predict_batch([sensor_data], ensemble=ensemble, cascade=cascade, model=model)[0]
+    
+    def predict_batch(self, sensor_data, ensemble=True, cascade=None, model=None):
+        """
+        Predict materials for many samples at once
         
-        if ensemble:
-            # Ensemble prediction (average of both models)
-            rf_proba = self.rf_model.predict_proba(features_scaled)[0]
-            gb_proba = self.gb_model.predict_proba(features_scaled)[0]
-            
-            # Weighted average (RF gets more weight due to better performance)
-            ensemble_proba = 0.6 * rf_proba + 0.4 * gb_proba
-            
-            predicted_idx = np.argmax(ensemble_proba)
-            predicted_material = self.rf_model.classes_[predicted_idx]
-            confidence = ensemble_proba[predicted_idx] * 100
-            
-            # Get top 3 predictions
-            top_3_idx = np.argsort(ensemble_proba)[-3:][::-1]
-            top_3 = [
-                {
-                    'material': self.rf_model.classes_[idx],
-                    'confidence': ensemble_proba[idx] * 100,
-                    'properties': self.material_db[self.rf_model.classes_[idx]]
-                }
-                for idx in top_3_idx
+        sensor_data is either a list of sensor dicts (as for predict) or
+        columns: a numpy structured array, DataFrame or dict of arrays with
+        rpm, current, depth and vibration_mean/std/max fields (the
+        ehs_drill_logs names current_a and depth_m also work).
+        
+        Features for all samples are computed in one vectorized pass and
+        predict_proba runs once per model. Returns one result dict per
+        sample, in the same format as predict().
+        
+        With cascade (default: config cascade_enabled) the ensemble only
+        runs GB for samples whose RF top-class probability is below
+        cascade_threshold; confident samples get the RF result.
+        
+        model picks "ensemble" or the distilled "student" (default:
+        config inference_model). Versions without a student are served by
+        the ensemble; without the teacher (config load_teacher) by the
+        student. Results name the model in 'inference_model'.
+        
+        With config cache_enabled, samples whose quantized features match
+        a recent prediction by the same model version reuse its result
+        (with a fresh timestamp); only the others are evaluated. Only
+        results with at least cache_min_confidence are stored.
+        """
+        features = self.extract_features_batch(sensor_data)
+        if len(features) == 0:
+            return []
+        if not self.ensure_loaded():
+            return self._rule_based_results(features)
+        
+        # One model set for the whole batch, even if a hot swap happens now
+        models = self.models
+        if model is None:
+            model = self.config.inference_model
+        if cascade is None:
+            cascade = self.cascade_enabled
+        
+        cache = self.prediction_cache
+        if cache is None:
+            return self._predict_models(features, models, ensemble, cascade, model)
+        
+        keys = cache.keys(features, model, ensemble, cascade)
+        results = cache.get_many(keys, models.version)
+        missed = [i for i, result in enumerate(results) if result is None]
+        if missed:
+            fresh = self._predict_models(features[missed], models, ensemble, cascade, model)
+            # Store copies, so callers can modify the results they get; less
+            # confident results are near a boundary and always re-evaluated
+            stored = [
+                j for j, result in enumerate(fresh)
+                if result['confidence'] >= self.config.cache_min_confidence
             ]
+            cache.put_many(
+                [keys[missed[j]] for j in stored],
+                [_copy_result(fresh[j]) for j in stored], models.version
+            )
+            for i, result in zip(missed, fresh):
+                results[i] = result
+        
+        timestamp = datetime.now().isoformat()
+        missed = set(missed)
+        return [
+            result if i in missed else _copy_result(result, timestamp=timestamp)
+            for i, result in enumerate(results)
+        ]
+    
+    def _predict_models(self, features, models, ensemble, cascade, model):
+        """Results for a feature matrix from one model set (see predict_batch)"""
+        if models.student is not None and (model == 'student' or models.rf_model is None):
+            return self._build_results(
+                models.student.predict_proba(features), models.student.classes,
+                version=models.version, inference_model='student'
+            )
+        
+        features_scaled = models.scaler.transform(features)
+        
+        rf_proba = self._rf_proba(features_scaled, models)
+        if ensemble and cascade:
+            proba = self._cascade_proba(features_scaled, rf_proba, models)
+        elif ensemble:
+            proba = self._ensemble_proba(features_scaled, models, rf_proba)
         else:
             # Single model prediction
-            predicted_material = self.rf_model.predict(features_scaled)[0]
-            proba = self.rf_model.predict_proba(features_scaled)[0]
-            confidence = max(proba) * 100
+            proba = rf_proba
+        
+        return self._build_results(proba, models.rf_model.classes_, version=models.version)
+    
+    def _ensemble_proba(self, features_scaled, models, rf_proba=None):
+        """Weighted average (RF gets more weight due to better performance)"""
+        if rf_proba is None:
+            rf_proba = self._rf_proba(features_scaled, models)
+        return 0.6 * rf_proba + 0.4 * self._gb_proba(features_scaled, models)
+    
+    def _cascade_proba(self, features_scaled, rf_proba, models):
+        """RF probabilities where RF is confident, ensemble elsewhere"""
+        confident = rf_proba.max(axis=1) >= models.cascade_threshold
+        
+        # Also run GB on a small random share of skipped samples to track
+        # how often the shortcut agrees with the full ensemble
+        audit = confident & (self._audit_rng.random(len(rf_proba)) < self.config.cascade_audit_rate)
+        needs_gb = ~confident | audit
+        
+        proba = rf_proba.copy()
+        if needs_gb.any():
+            gb_proba = self._gb_proba(features_scaled[needs_gb], models)
+            ensemble_proba = 0.6 * rf_proba[needs_gb] + 0.4 * gb_proba
             
-            top_3_idx = np.argsort(proba)[-3:][::-1]
-            top_3 = [
-                {
-                    'material': self.rf_model.classes_[idx],
-                    'confidence': proba[idx] * 100,
-                    'properties': self.material_db[self.rf_model.classes_[idx]]
-                }
-                for idx in top_3_idx
-            ]
+            uncertain = ~confident[needs_gb]
+            proba[needs_gb & ~confident] = ensemble_proba[uncertain]
+            
+            audited = ~uncertain
+            self.cascade_stats['audited'] += int(audited.sum())
+            self.cascade_stats['audit_agreed'] += int(np.sum(
+                ensemble_proba[audited].argmax(axis=1) == rf_proba[needs_gb][audited].argmax(axis=1)
+            ))
         
-        # Anomaly detection (low confidence = unknown material)
-        is_anomaly = confidence < 60
+        self.cascade_stats['samples'] += len(rf_proba)
+        self.cascade_stats['rf_only'] += int(confident.sum())
+        return proba
+    
+    def calibrate_cascade(self, features_scaled, target_agreement=None):
+        """
+        Pick the lowest RF confidence threshold at which the RF-only result
+        agrees with the full ensemble on at least target_agreement of the
+        samples it would skip. Returns the share of samples skipped.
+        """
+        if target_agreement is None:
+            target_agreement = self.config.cascade_target_agreement
+        
+        models = self.models
+        rf_proba = self._rf_proba(features_scaled, models)
+        ensemble_proba = self._ensemble_proba(features_scaled, models, rf_proba)
+        rf_max = rf_proba.max(axis=1)
+        agrees = rf_proba.argmax(axis=1) == ensemble_proba.argmax(axis=1)
         
+        # Agreement among samples at or above each candidate threshold
+        order = np.argsort(-rf_max, kind='stable')
+        sorted_max = rf_max[order]
+        agreement = np.cumsum(agrees[order]) / np.arange(1, len(order) + 1)
+        
+        # Only cut where the confidence changes, so ties stay together
+        last_of_tie = np.append(sorted_max[1:] < sorted_max[:-1], True)
+        ok = np.nonzero(last_of_tie & (agreement >= target_agreement))[0]
+        
+        if len(ok) == 0:
+            # Never skip: no threshold keeps agreement high enough
+            self._publish(models._replace(cascade_threshold=1.0 + 1e-9))
+            return 0.0
+        cut = ok[-1]
+        self._publish(models._replace(cascade_threshold=float(sorted_max[cut])))
+        return (cut + 1) / len(order)
+    
+    def get_cascade_stats(self):
+        """Cascade counters: GB skip rate and audited agreement with the ensemble"""
+        stats = self.cascade_stats
         return {
-            'predicted_material': predicted_material,
-            'confidence': confidence,
-            'top_3_predictions': top_3,
-            'is_anomaly': is_anomaly,
-            'category': self.material_db[predicted_material]['category'],
-            'recommended_rpm': self.material_db[predicted_material]['rpm'],
-            'timestamp': datetime.now().isoformat()
+            **stats,
+            'threshold': self.cascade_threshold,
+            'skip_rate': stats['rf_only'] / stats['samples'] if stats['samples'] else 0.0,
+            'agreement_rate': stats['audit_agreed'] / stats['audited'] if stats['audited'] else None
         }
     
+    def get_cache_stats(self):
+        """Prediction cache counters and hit rate (enabled False when the cache is off)"""
+        if self.prediction_cache is None:
+            return {'enabled': False}
+        return {'enabled': True, **self.prediction_cache.get_stats()}
+    
+    def _rule_based_results(self, features):
+        """
+        Fallback results while no trained model is available
+        
+        Scores each material by how well RPM and mean vibration fit its
+        material_db profile (the same relations generate_synthetic_data
+        uses) and turns the scores into probabilities.
+        """
+        classes = np.array(list(self.material_db))
+        base_rpm = np.array([p['rpm'] for p in self.material_db.values()])
+        base_hardness = np.array([p['hardness'] for p in self.material_db.values()])
+        
+        rpm = features[:, [0]]
+        vib_mean = features[:, [2]]
+        log_likelihood = -0.5 * (
+            ((rpm - base_rpm) / (0.1 * base_rpm)) ** 2
+            + ((vib_mean - base_hardness * 10) / 5) ** 2
+        )
+        log_likelihood -= log_likelihood.max(axis=1, keepdims=True)
+        proba = np.exp(log_likelihood)
+        proba /= proba.sum(axis=1, keepdims=True)
+        
+        return self._build_results(proba, classes, fallback=True, inference_model='rules')
+    
+    def _build_results(self, proba, classes, version=None, fallback=False,
+                       inference_model='ensemble'):
+        """Build prediction result dicts from a matrix of class probabilities"""
+        properties = [self.material_db[material] for material in classes]
+        rows = np.arange(len(proba))
+        
+        predicted_idx = np.argmax(proba, axis=1)
+        confidence = proba[rows, predicted_idx] * 100
+        
+        # Top 3 per row: partition the whole matrix, then sort only those 3
+        k = min(3, proba.shape[1])
+        top_idx = np.argpartition(-proba, k - 1, axis=1)[:, :k]
+        top_proba = np.take_along_axis(proba, top_idx, axis=1)
+        order = np.argsort(-top_proba, axis=1, kind='stable')
+        top_idx = np.take_along_axis(top_idx, order, axis=1)
+        top_conf = np.take_along_axis(top_proba, order, axis=1) * 100
+        
+        # Anomaly detection (low confidence = unknown material)
+        is_anomaly = confidence < 60
+        
+        timestamp = datetime.now().isoformat()
+        results = []
+        for i, idx in enumerate(predicted_idx):
+            results.append({
+                'predicted_material': classes[idx],
+                'confidence': confidence[i],
+                'top_3_predictions': [
+                    {
+                        'material': classes[j],
+                        'confidence': c,
+                        'properties': properties[j]
+                    }
+                    for j, c in zip(top_idx[i], top_conf[i])
+                ],
+                'is_anomaly': bool(is_anomaly[i]),
+                'category': properties[idx]['category'],
+                'recommended_rpm': properties[idx]['rpm'],
+                'model_version': version,
+                'inference_model': inference_model,
+                'fallback': fallback,
+                'timestamp': timestamp
+            })
+        return results
+    
+    def extract_features_batch(self, sensor_data):
+        """
+        Extract the feature matrix (N x 10) for many samples in one pass
+        
+        Accepts a list of sensor dicts or columns (see predict_batch).
+        """
+        if isinstance(sensor_data, (list, tuple)):
+            return self._features_from_dicts(sensor_data)
+        return self._features_from_columns(sensor_data)
+    
+    def _features_from_dicts(self, samples):
+        """Vectorized features for a list of sensor dicts (ragged histories)"""
+        if len(samples) == 0:
+            return np.empty((0, len(self.feature_names)))
+        
+        rpm = np.array([d['rpm'] for d in samples], dtype=float)
+        current = np.array([d['current'] for d in samples], dtype=float)
+        depth = np.array([d.get('depth', 0) for d in samples], dtype=float)
+        
+        # Vibration statistics over ragged readings
+        vib_mean, vib_std, vib_max = _ragged_stats(
+            [_or_default(d.get('vibration_readings'), [50]) for d in samples]
+        )
+        
+        # RPM stability (lower std = more stable)
+        _, rpm_std, _ = _ragged_stats(
+            [_or_default(d.get('rpm_history'), [r]) for d, r in zip(samples, rpm)]
+        )
+        
+        # Current spike detection
+        current_mean, _, current_max = _ragged_stats(
+            [_or_default(d.get('current_history'), [c]) for d, c in zip(samples, current)]
+        )
+        
+        return self._assemble_features(
+            rpm, current, vib_mean, vib_std, vib_max,
+            100 - rpm_std, current_max - current_mean, depth
+        )
+    
+    def _features_from_columns(self, data):
+        """Vectorized features from a structured array, DataFrame or dict of arrays"""
+        if isinstance(data, np.ndarray):
+            names = data.dtype.names or ()
+        else:
+            names = data.keys()
+        
+        def column(*aliases, default=None):
+            for name in aliases:
+                if name in names:
+                    return np.asarray(data[name], dtype=float)
+            if default is None:
+                raise KeyError(aliases[0])
+            return default
+        
+        rpm = column('rpm')
+        n = len(rpm)
+        current = column('current', 'current_a')
+        depth = column('depth', 'depth_m', default=np.zeros(n))
+        
+        if 'vibration_readings' in names:
+            # NaN-padded 2D readings
+            readings = np.asarray(data['vibration_readings'], dtype=float).reshape(n, -1)
+            vib_mean = np.nanmean(readings, axis=1)
+            vib_std = np.nanstd(readings, axis=1)
+            vib_max = np.nanmax(readings, axis=1)
+        else:
+            vib_mean = column('vibration_mean', default=np.full(n, 50.0))
+            vib_std = column('vibration_std', default=np.zeros(n))
+            vib_max = column('vibration_max', default=vib_mean)
+        
+        # Without histories the RPM is perfectly stable and there is no spike
+        rpm_stability = column('rpm_stability', default=np.full(n, 100.0))
+        current_spike = column('current_spike', default=np.zeros(n))
+        
+        return self._assemble_features(
+            rpm, current, vib_mean, vib_std, vib_max,
+            rpm_stability, current_spike, depth
+        )
+    
+    def _assemble_features(self, rpm, current, vib_mean, vib_std, vib_max,
+                           rpm_stability, current_spike, depth):
+        """Stack feature columns in feature_names order"""
+        # Estimated material properties
+        hardness_estimate = (rpm / 500) + 1
+        ucs_estimate = rpm / 15
+        
+        return np.column_stack([
+            rpm, current, vib_mean, vib_std, vib_max,
+            rpm_stability, current_spike, depth,
+            hardness_estimate, ucs_estimate
+        ])
+    
     def _extract_features(self, sensor_data):
         """Extract features from raw sensor data"""
         rpm = sensor_data['rpm']
@@ -299,12 +1120,13 @@ class MaterialPredictor:
         with open(filename, 'w') as f:
             json.dump(report, f, indent=2)
         
-        print(f"Report exported to {filename}")
+        logger.info(f"Report exported to {filename}")
         return report
 
 
 # Example usage and testing
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
     print("="*60)
     print("Material Prediction ML System - Training & Demo")
     print("="*60)
@@ -0,0 +1,262 @@
+"""
+Versioned Model Registry for Advanced EHS Simba Drill System.
+
+This module provides:
+- One immutable directory per model version under ``models_path/versions``
+- A manifest per version (features, classes, training metrics, SHA-256
+  hashes of every artifact)
+- Atomic activation through a pointer file (``models_path/ACTIVE``)
+
+A version is written to a staging directory and renamed into place only
+once its manifest is complete, and the pointer file is replaced with
+``os.replace``. Readers therefore see either the old or the new active
+version, never a partial one, while training and serving run in
+different processes.
+
+Author: EHS Simba Team
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_DIR = "versions"
+MANIFEST_FILE = "manifest.json"
+ACTIVE_POINTER_FILE = "ACTIVE"
+
+
+# =============================================================================
+# Manifest
+# =============================================================================
+
+@dataclass
+class ModelManifest:
+    """
+    Description of one registered model version.
+    
+    Attributes:
+        version: Version id (also the directory name)
+        created_at: ISO creation time
+        features: Feature names in model input order
+        classes: Class labels in output order
+        metrics: Training/evaluation metrics
+        artifacts: SHA-256 hex digest per artifact path (relative to the version)
+        metadata: Free-form extra information
+    """
+    version: str
+    created_at: str
+    features: list[str]
+    classes: list[str]
+    metrics: dict[str, float] = field(default_factory=dict)
+    artifacts: dict[str, str] = field(default_factory=dict)
+    metadata: dict[str, Any] = field(default_factory=dict)
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ModelManifest:
+        """Create from dictionary."""
+        return cls(**data)
+
+
+def _file_sha256(path: Path) -> str:
+    """Hash a file in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _hash_artifacts(root: Path) -> dict[str, str]:
+    """SHA-256 of every file below root except the manifest."""
+    return {
+        path.relative_to(root).as_posix(): _file_sha256(path)
+        for path in sorted(root.rglob("*"))
+        if path.is_file() and path.name != MANIFEST_FILE
+    }
+
+
+# =============================================================================
+# Registry
+# =============================================================================
+
+class ModelRegistry:
+    """
+    Filesystem registry of model versions with an active-version pointer.
+    
+    Example:
+        >>> registry = ModelRegistry(settings.models_path)
+        >>> manifest = registry.register(save_artifacts, features, classes, metrics)
+        >>> registry.activate(manifest.version)
+        >>> registry.active_version()
+        '20261016-101500-3fa2c1d8'
+    """
+    
+    def __init__(self, root: Union[str, Path]):
+        """
+        Initialize registry.
+        
+        Args:
+            root: Directory holding ``versions/`` and the ``ACTIVE`` pointer
+        """
+        self.root = Path(root)
+        self.versions_path = self.root / VERSIONS_DIR
+        self.pointer_path = self.root / ACTIVE_POINTER_FILE
+    
+    def register(
+        self,
+        write_artifacts: Callable[[Path], None],
+        features: list[str],
+        classes: list[str],
+        metrics: Optional[dict[str, float]] = None,
+        metadata: Optional[dict[str, Any]] = None,
+    ) -> ModelManifest:
+        """
+        Create a new version.
+        
+        Args:
+            write_artifacts: Called with an empty directory to write the artifacts into
+            features: Feature names in model input order
+            classes: Class labels in output order
+            metrics: Training/evaluation metrics
+            metadata: Free-form extra information
+        
+        Returns:
+            Manifest of the new (not yet active) version.
+        """
+        self.versions_path.mkdir(parents=True, exist_ok=True)
+        staging = self.versions_path / f".staging-{uuid.uuid4().hex}"
+        staging.mkdir()
+        
+        try:
+            write_artifacts(staging)
+            artifacts = _hash_artifacts(staging)
+            
+            # Version ids sort by creation time; the random suffix tells
+            # apart versions created within the same second
+            created = datetime.now()
+            version = f"{created:%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+            
+            manifest = ModelManifest(
+                version=version,
+                created_at=created.isoformat(),
+                features=list(features),
+                classes=[str(c) for c in classes],
+                metrics={k: float(v) for k, v in (metrics or {}).items()},
+                artifacts=artifacts,
+                metadata=metadata or {},
+            )
+            (staging / MANIFEST_FILE).write_text(json.dumps(manifest.to_dict(), indent=2))
+            os.replace(staging, self.versions_path / version)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        
+        logger.info(f"Registered model version {version}")
+        return manifest
+    
+    def activate(self, version: str) -> None:
+        """
+        Atomically point ``ACTIVE`` at a version.
+        
+        Args:
+            version: Registered version id
+        
+        Raises:
+            KeyError: If the version does not exist.
+        """
+        self.get_manifest(version)
+        tmp = self.pointer_path.with_name(f"{ACTIVE_POINTER_FILE}.{uuid.uuid4().hex}.tmp")
+        tmp.write_text(version + "\n")
+        os.replace(tmp, self.pointer_path)
+        logger.info(f"Activated model version {version}")
+    
+    def active_version(self) -> Optional[str]:
+        """
+        Read the active version id.
+        
+        Returns:
+            Version id, or None if nothing was activated yet.
+        """
+        try:
+            return self.pointer_path.read_text().strip() or None
+        except FileNotFoundError:
+            return None
+    
+    def version_path(self, version: str) -> Path:
+        """
+        Directory of a version.
+        
+        Raises:
+            KeyError: If the version does not exist.
+        """
+        path = self.versions_path / version
+        if (version != Path(version).name or version.startswith(".")
+                or not (path / MANIFEST_FILE).is_file()):
+            raise KeyError(f"Unknown model version: {version}")
+        return path
+    
+    def get_manifest(self, version: str) -> ModelManifest:
+        """
+        Load a version's manifest.
+        
+        Raises:
+            KeyError: If the version does not exist.
+        """
+        path = self.version_path(version) / MANIFEST_FILE
+        return ModelManifest.from_dict(json.loads(path.read_text()))
+    
+    def list_versions(self) -> list[ModelManifest]:
+        """
+        List registered versions, oldest first.
+        
+        Returns:
+            Manifests of every complete version.
+        """
+        if not self.versions_path.exists():
+            return []
+        manifests = []
+        for path in sorted(self.versions_path.iterdir()):
+            if path.name.startswith(".") or not (path / MANIFEST_FILE).is_file():
+                continue
+            manifests.append(self.get_manifest(path.name))
+        return manifests
+    
+    def verify(self, version: str) -> None:
+        """
+        Check a version's artifacts against its manifest hashes.
+        
+        Raises:
+            KeyError: If the version does not exist.
+            ValueError: If an artifact is missing, extra or modified.
+        """
+        manifest = self.get_manifest(version)
+        actual = _hash_artifacts(self.version_path(version))
+        if actual != manifest.artifacts:
+            changed = sorted(
+                name for name in set(actual) | set(manifest.artifacts)
+                if actual.get(name) != manifest.artifacts.get(name)
+            )
+            raise ValueError(f"Model version {version} artifacts do not match manifest: {changed}")
+
+
+# Convenience exports
+__all__ = [
+    "ModelManifest",
+    "ModelRegistry",
+]
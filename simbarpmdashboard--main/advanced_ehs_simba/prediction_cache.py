@@ -0,0 +1,199 @@
+"""
+Prediction Result Cache for Advanced EHS Simba Drill System.
+
+This module provides:
+- PredictionCache: a thread-safe LRU cache with a time-to-live, keyed on
+  feature vectors quantized to per-feature resolutions (e.g. 25 rpm, 0.25 A)
+- Hit, miss, expiry and eviction counters
+
+While the drill stays in one homogeneous layer, the fusion loop and the
+dashboards ask for predictions on nearly identical inputs; all inputs
+that fall in the same quantization cell share one cached result. Keys
+carry the model version (and serving options), and the cache empties
+itself when the version changes.
+
+Author: EHS Simba Team
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+import numpy as np
+
+
+# =============================================================================
+# Prediction Cache
+# =============================================================================
+
+class PredictionCache:
+    """
+    LRU + TTL cache of prediction results on quantized features.
+    
+    Example:
+        >>> cache = PredictionCache(["rpm", "current"], {"rpm": 5, "current": 0.1})
+        >>> keys = cache.keys(features, "ensemble")
+        >>> results = cache.get_many(keys, version)
+        >>> cache.put_many(missed_keys, missed_results, version)
+    """
+    
+    def __init__(
+        self,
+        feature_names: list[str],
+        resolutions: dict[str, float],
+        max_entries: int = 4096,
+        ttl_s: float = 5.0,
+    ):
+        """
+        Initialize cache.
+        
+        Args:
+            feature_names: Feature columns in model input order
+            resolutions: Quantization step per feature name; features not
+                listed are left out of the key, and a step of 0 keys on
+                the exact value
+            max_entries: Entries kept before the least recently used is evicted
+            ttl_s: Seconds an entry stays valid (0 disables expiry)
+        """
+        unknown = sorted(set(resolutions) - set(feature_names))
+        if unknown:
+            raise ValueError(f"Cache resolutions for unknown features: {unknown}")
+        
+        self.columns = np.array(
+            [i for i, name in enumerate(feature_names) if name in resolutions], dtype=np.intp
+        )
+        steps = np.array([resolutions[feature_names[i]] for i in self.columns], dtype=float)
+        self._exact = steps <= 0
+        self._steps = np.where(self._exact, 1.0, steps)
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+    
+    def keys(self, features: np.ndarray, *context: Hashable) -> list[Hashable]:
+        """
+        Cache keys for a feature matrix (model version excluded).
+        
+        Args:
+            features: Feature matrix (n_samples, n_features)
+            *context: Anything else the result depends on (model version,
+                serving options), added to every key
+        
+        Returns:
+            One hashable key per row.
+        """
+        selected = features[:, self.columns]
+        cells = np.where(self._exact, selected, np.floor(selected / self._steps + 0.5))
+        # + 0.0 turns -0.0 (different bytes) into 0.0
+        cells = cells + 0.0
+        return [(context, row.tobytes()) for row in cells]
+    
+    def get_many(self, keys: list[Hashable], version: Optional[str]) -> list[Any]:
+        """
+        Look up results, counting hits and misses.
+        
+        Args:
+            keys: Keys from ``keys``
+            version: Model version serving now; a change clears the cache
+        
+        Returns:
+            Cached result per key, or None where there is none.
+        """
+        now = time.monotonic()
+        results = []
+        with self._lock:
+            self._check_version(version)
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and self.ttl_s > 0 and now - entry[0] > self.ttl_s:
+                    del self._entries[key]
+                    self._stats["expired"] += 1
+                    entry = None
+                if entry is None:
+                    self._stats["misses"] += 1
+                    results.append(None)
+                else:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    results.append(entry[1])
+        return results
+    
+    def put_many(self, keys: list[Hashable], values: list[Any], version: Optional[str]) -> None:
+        """
+        Store results, evicting the least recently used entries.
+        
+        Results of a version that has since been replaced are dropped.
+        
+        Args:
+            keys: Keys from ``keys``
+            values: Result per key
+            version: Model version the results came from
+        """
+        now = time.monotonic()
+        with self._lock:
+            if version != self._version:
+                return
+            for key, value in zip(keys, values):
+                self._entries[key] = (now, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+    
+    def invalidate(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._clear()
+    
+    def _check_version(self, version: Optional[str]) -> None:
+        """Clear the cache when the model version changed (lock held)."""
+        if version != self._version:
+            self._clear()
+            self._version = version
+    
+    def _clear(self) -> None:
+        """Drop every entry and count the invalidation (lock held)."""
+        if self._entries:
+            self._entries.clear()
+            self._stats["invalidations"] += 1
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary with counters, current size and hit rate.
+        """
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl_s,
+                "version": self._version,
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+                "miss_rate": self._stats["misses"] / lookups if lookups else 0.0,
+            }
+
+
+# Convenience exports
+__all__ = [
+    "PredictionCache",
+]
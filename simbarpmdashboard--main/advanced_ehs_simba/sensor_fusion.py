@@ -18,17 +18,21 @@ import asyncio
 import json
 import logging
 import statistics
+import struct
+import time
 from collections import defaultdict, deque
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Callable, Optional
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Optional
 
 import numpy as np
 from scipy import signal
 
-from config import MQTTConfig, SensorConfig, get_settings
-from ml_predictor import MaterialPredictor, PredictionResult, SensorInput
+from config import DropPolicy, MQTTConfig, SensorConfig, get_settings
+from inference_server import MicroBatchInferenceServer
+from ml_predictor import MaterialPredictor
 
 logger = logging.getLogger(__name__)
 
@@ -54,27 +58,40 @@ class DataQuality(str, Enum):
     INVALID = "invalid"
 
 
-@dataclass
+@dataclass(slots=True)
 class SensorReading:
     """
     Individual sensor reading.
     
+    Slotted (no per-instance ``__dict__``) with a float epoch timestamp.
+    ``metadata`` stays None unless a producer sets it. A ``datetime``
+    passed as ``timestamp`` is converted on construction (naive values
+    are taken as UTC).
+    
     Attributes:
         sensor_id: Unique identifier for the sensor
         sensor_type: Type of sensor (vibration, temperature, etc.)
         value: Measured value
         unit: Measurement unit
-        timestamp: Reading timestamp
+        timestamp: Reading time in epoch seconds
         quality: Data quality score (0-1)
-        metadata: Additional metadata
+        metadata: Optional additional metadata
     """
     sensor_id: str
     sensor_type: str
     value: float
     unit: str
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    timestamp: float = field(default_factory=time.time)
     quality: float = 1.0
-    metadata: dict[str, Any] = field(default_factory=dict)
+    metadata: Optional[dict[str, Any]] = None
+    
+    def __post_init__(self) -> None:
+        if isinstance(self.timestamp, datetime):
+            self.timestamp = _to_epoch(self.timestamp)
+    
+    def as_datetime(self) -> datetime:
+        """Reading time as a naive UTC datetime."""
+        return _from_epoch(self.timestamp)
     
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -83,13 +100,33 @@ class SensorReading:
             "sensor_type": self.sensor_type,
             "value": self.value,
             "unit": self.unit,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": self.as_datetime().isoformat(),
             "quality": self.quality,
-            "metadata": self.metadata,
+            "metadata": self.metadata or {},
         }
 
 
 @dataclass
+class VibrationSpectrum:
+    """Spectral and time-domain features of one vibration window."""
+    timestamp: float  # Epoch seconds of the window's last sample
+    rms: float
+    kurtosis: float
+    crest_factor: float
+    band_energy: dict[str, float] = field(default_factory=dict)  # g^2 per band
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "timestamp": _from_epoch(self.timestamp).isoformat(),
+            "rms": self.rms,
+            "kurtosis": self.kurtosis,
+            "crest_factor": self.crest_factor,
+            "band_energy": dict(self.band_energy),
+        }
+
+
+@dataclass(slots=True)
 class FusedSensorData:
     """
     Fused data from all sensors at a point in time.
@@ -114,21 +151,23 @@ class FusedSensorData:
     sensors_active: int = 0
     sensors_total: int = 0
     
-    # Raw readings for detailed analysis
-    raw_readings: dict[str, SensorReading] = field(default_factory=dict)
-    
-    def to_sensor_input(self) -> SensorInput:
-        """Convert to SensorInput for ML prediction."""
-        return SensorInput(
-            rpm=self.rpm,
-            current_a=self.current_a,
-            vibration_g=self.vibration_g,
-            depth_m=self.depth_m,
-            pressure_bar=self.pressure_bar,
-            temperature_c=max(self.temperature_hydraulic_c, self.temperature_motor_c),
-            acoustic_db=self.acoustic_db,
-            timestamp=self.timestamp,
-        )
+    # Latest vibration spectral features, if a full window is available
+    vibration_spectrum: Optional[VibrationSpectrum] = None
+    
+    # Raw readings for detailed analysis, only built when a subscriber
+    # asks for them (see SensorFusionEngine.register_data_callback)
+    raw_readings: Optional[dict[str, SensorReading]] = None
+    
+    def to_sensor_input(self) -> dict[str, Any]:
+        """Convert to the sensor dict MaterialPredictor.predict expects."""
+        return {
+            "rpm": self.rpm,
+            "current": self.current_a,
+            "vibration_readings": [self.vibration_g],
+            "depth": self.depth_m,
+            "rpm_history": [self.rpm],
+            "current_history": [self.current_a],
+        }
     
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -147,6 +186,70 @@ class FusedSensorData:
             "overall_quality": self.overall_quality,
             "sensors_active": self.sensors_active,
             "sensors_total": self.sensors_total,
+            "vibration_spectrum": (
+                self.vibration_spectrum.to_dict() if self.vibration_spectrum else None
+            ),
+        }
+
+
+# Sensor type -> FusedSensorData field
+_FUSED_FIELDS = {
+    "rpm": "rpm",
+    "current": "current_a",
+    "vibration": "vibration_g",
+    "depth": "depth_m",
+    "pressure": "pressure_bar",
+    "temperature_hydraulic": "temperature_hydraulic_c",
+    "temperature_motor": "temperature_motor_c",
+    "acoustic": "acoustic_db",
+    "power": "power_kw",
+}
+
+
+@dataclass
+class AlignedSensorBlock:
+    """
+    Block of fused sensor data resampled onto a common timestamp grid.
+    
+    Columns are keyed by ``FusedSensorData`` field name and share the
+    ``timestamps`` grid (UTC epoch seconds), so downstream consumers can
+    work on whole arrays instead of one snapshot at a time.
+    """
+    timestamps: np.ndarray
+    columns: dict[str, np.ndarray]
+    sensors_active: int = 0
+    sensors_total: int = 0
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+    
+    @property
+    def overall_quality(self) -> float:
+        """Fraction of expected sensors contributing live data."""
+        return self.sensors_active / self.sensors_total if self.sensors_total else 0.0
+    
+    def row(self, index: int) -> FusedSensorData:
+        """Materialize one grid row as FusedSensorData."""
+        return FusedSensorData(
+            timestamp=_from_epoch(float(self.timestamps[index])),
+            **{name: float(column[index]) for name, column in self.columns.items()},
+            overall_quality=self.overall_quality,
+            sensors_active=self.sensors_active,
+            sensors_total=self.sensors_total,
+        )
+    
+    def to_rows(self) -> list[FusedSensorData]:
+        """Materialize all grid rows as FusedSensorData."""
+        return [self.row(i) for i in range(len(self))]
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary of column lists."""
+        return {
+            "timestamps": self.timestamps.tolist(),
+            **{name: column.tolist() for name, column in self.columns.items()},
+            "overall_quality": self.overall_quality,
+            "sensors_active": self.sensors_active,
+            "sensors_total": self.sensors_total,
         }
 
 
@@ -184,9 +287,41 @@ class SensorHealthReport:
 # Sensor Buffer
 # =============================================================================
 
+# Quality scores (0-1) are stored as uint8 codes
+_QUALITY_SCALE = 255.0
+
+
+def _to_epoch(timestamp: datetime) -> float:
+    """Convert a datetime (naive UTC or aware) to epoch seconds."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+def _from_epoch(epoch_s: float) -> datetime:
+    """Convert epoch seconds to a naive UTC datetime."""
+    return datetime.fromtimestamp(epoch_s, tz=timezone.utc).replace(tzinfo=None)
+
+
+def _quality_to_code(quality: float) -> int:
+    """Quantize a 0-1 quality score to a uint8 code."""
+    if quality >= 1.0:
+        return 255
+    if quality <= 0.0:
+        return 0
+    return int(quality * _QUALITY_SCALE + 0.5)
+
+
 class SensorBuffer:
     """
-    Circular buffer for sensor data with statistics tracking.
+    Columnar ring buffer for sensor data with statistics tracking.
+    
+    Samples are stored struct-of-arrays style in preallocated NumPy
+    arrays (float64 epoch timestamps, float32 values, uint8 quality)
+    instead of one ``SensorReading`` object per sample. Every sample is
+    written twice, at slot ``i`` and at its mirror ``i + buffer_size``,
+    so the most recent N samples are always one contiguous slice and
+    can be handed out as zero-copy, read-only views.
     
     Provides:
     - Rolling window of recent readings
@@ -201,6 +336,8 @@ class SensorBuffer:
         sensor_type: str,
         buffer_size: int = 1000,
         expected_rate_hz: float = 10.0,
+        unit: str = "",
+        valid_range: Optional[tuple[float, float]] = None,
     ):
         """
         Initialize sensor buffer.
@@ -210,20 +347,39 @@ class SensorBuffer:
             sensor_type: Type of sensor
             buffer_size: Maximum readings to keep
             expected_rate_hz: Expected reading frequency
+            unit: Measurement unit (taken from the first reading if empty)
+            valid_range: (min, max) valid value range for out-of-range counting
         """
         self.sensor_id = sensor_id
         self.sensor_type = sensor_type
-        self.buffer_size = buffer_size
+        self.buffer_size = max(int(buffer_size), 1)
         self.expected_rate_hz = expected_rate_hz
+        self.unit = unit
+        self.valid_range = valid_range
+        
+        # Mirrored column storage (2 x buffer_size)
+        self._timestamps = np.zeros(2 * self.buffer_size, dtype=np.float64)
+        self._values = np.zeros(2 * self.buffer_size, dtype=np.float32)
+        self._quality = np.zeros(2 * self.buffer_size, dtype=np.uint8)
+        self._pos = 0  # Next slot to write, in [0, buffer_size)
+        self._size = 0
         
-        self._buffer: deque[SensorReading] = deque(maxlen=buffer_size)
         self._last_reading: Optional[SensorReading] = None
         self._reading_count = 0
         self._out_of_range_count = 0
         
-        # Statistics
-        self._running_sum = 0.0
-        self._running_sum_sq = 0.0
+        # Rolling statistics: windowed Welford mean/M2 and monotonic
+        # (sequence, value) deques whose fronts hold the window min/max
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._max_window: deque[tuple[int, float]] = deque()
+        self._min_window: deque[tuple[int, float]] = deque()
+        
+        # Health accumulators: window sums split at the half-window
+        # boundary (sequence number of the first second-half sample)
+        self._split_seq = 0
+        self._first_half_sum = 0.0
+        self._second_half_sum = 0.0
         
         # Health tracking
         self._last_health_check = datetime.utcnow()
@@ -232,18 +388,39 @@ class SensorBuffer:
     @property
     def count(self) -> int:
         """Number of readings in buffer."""
-        return len(self._buffer)
+        return self._size
+    
+    @property
+    def total_count(self) -> int:
+        """Number of readings ever appended (including evicted ones)."""
+        return self._reading_count
     
     @property
     def is_empty(self) -> bool:
         """Check if buffer is empty."""
-        return len(self._buffer) == 0
+        return self._size == 0
     
     @property
     def latest(self) -> Optional[SensorReading]:
         """Get most recent reading."""
+        if self._last_reading is None and self._size:
+            self._last_reading = self._reading_at(self._end() - 1)
         return self._last_reading
     
+    @property
+    def latest_value(self) -> Optional[float]:
+        """Most recent value, without materializing a SensorReading."""
+        if self._size == 0:
+            return None
+        return float(self._values[self._end() - 1])
+    
+    @property
+    def latest_timestamp(self) -> Optional[float]:
+        """Most recent timestamp as UTC epoch seconds."""
+        if self._size == 0:
+            return None
+        return float(self._timestamps[self._end() - 1])
+    
     @property
     def status(self) -> SensorStatus:
         """Get current sensor status."""
@@ -256,29 +433,309 @@ class SensorBuffer:
         Args:
             reading: Sensor reading to add
         """
-        # Remove oldest reading from statistics if buffer is full
-        if len(self._buffer) >= self.buffer_size:
-            oldest = self._buffer[0]
-            self._running_sum -= oldest.value
-            self._running_sum_sq -= oldest.value ** 2
+        if not self.unit:
+            self.unit = reading.unit
         
-        # Add new reading
-        self._buffer.append(reading)
+        self._write(
+            reading.timestamp,
+            reading.value,
+            reading.quality,
+        )
         self._last_reading = reading
+    
+    def _write(self, timestamp: float, value: float, quality: float) -> None:
+        """Write one sample into its slot and mirror slot."""
+        pos = self._pos
+        mirror = pos + self.buffer_size
+        full = self._size >= self.buffer_size
+        oldest = float(self._values[pos])
+        
+        if full:
+            if self._reading_count - self._size < self._split_seq:
+                self._first_half_sum -= oldest
+            else:
+                self._second_half_sum -= oldest
+            self._out_of_range_count -= self._is_out_of_range(oldest)
+        
+        self._timestamps[pos] = self._timestamps[mirror] = timestamp
+        self._values[pos] = self._values[mirror] = value
+        self._quality[pos] = self._quality[mirror] = _quality_to_code(quality)
+        
+        # Update statistics with the value as stored (float32)
+        stored = float(self._values[pos])
+        if full:
+            # Windowed Welford: replace the evicted sample in place
+            delta = stored - oldest
+            new_mean = self._mean + delta / self._size
+            self._m2 += delta * (stored - new_mean + oldest - self._mean)
+            self._mean = new_mean
+        else:
+            self._size += 1
+            delta = stored - self._mean
+            self._mean += delta / self._size
+            self._m2 += delta * (stored - self._mean)
+        
+        max_window, min_window = self._max_window, self._min_window
+        while max_window and max_window[-1][1] <= stored:
+            max_window.pop()
+        max_window.append((self._reading_count, stored))
+        while min_window and min_window[-1][1] >= stored:
+            min_window.pop()
+        min_window.append((self._reading_count, stored))
+        
         self._reading_count += 1
+        self._expire_extrema()
+        
+        self._second_half_sum += stored
+        self._out_of_range_count += self._is_out_of_range(stored)
+        
+        self._pos = pos + 1 if pos + 1 < self.buffer_size else 0
+        self._rebalance_halves()
+        if self._pos == 0:
+            self._resync_statistics()
+    
+    def extend(
+        self,
+        timestamps: np.ndarray,
+        values: np.ndarray,
+        quality: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Append a contiguous block of samples in one vectorized write.
+        
+        Args:
+            timestamps: Epoch timestamps in seconds (oldest first)
+            values: Sample values
+            quality: Optional quality scores (0-1), defaults to 1.0
+        """
+        values = np.asarray(values, dtype=np.float32).ravel()
+        timestamps = np.asarray(timestamps, dtype=np.float64).ravel()
+        k = len(values)
+        if k == 0:
+            return
+        if len(timestamps) != k:
+            raise ValueError("timestamps and values must have the same length")
+        
+        if quality is None:
+            codes = np.full(k, 255, dtype=np.uint8)
+        else:
+            codes = np.clip(
+                np.rint(np.asarray(quality, dtype=np.float64).ravel() * _QUALITY_SCALE),
+                0, 255,
+            ).astype(np.uint8)
+        
+        cap = self.buffer_size
+        
+        # A block larger than the buffer replaces it entirely
+        if k >= cap:
+            self._reading_count += k - cap
+            values, timestamps, codes = values[-cap:], timestamps[-cap:], codes[-cap:]
+            k = cap
+            self.clear()
+        
+        first_seq = self._reading_count
+        
+        # Evict the oldest samples that the block will overwrite
+        overflow = self._size + k - cap
+        if overflow > 0:
+            start = self._end() - self._size
+            evicted = self._values[start:start + overflow].astype(np.float64)
+            in_first = min(max(self._split_seq - (first_seq - self._size), 0), overflow)
+            self._first_half_sum -= float(evicted[:in_first].sum())
+            self._second_half_sum -= float(evicted[in_first:].sum())
+            self._out_of_range_count -= self._count_out_of_range(evicted)
+            self._remove_block(evicted)
+        
+        # Write in at most two chunks (before and after the wrap point)
+        pos = self._pos
+        first = min(k, cap - pos)
+        for column, data in (
+            (self._timestamps, timestamps),
+            (self._values, values),
+            (self._quality, codes),
+        ):
+            column[pos:pos + first] = data[:first]
+            column[pos + cap:pos + cap + first] = data[:first]
+            if first < k:
+                column[:k - first] = data[first:]
+                column[cap:cap + k - first] = data[first:]
+        
+        added = values.astype(np.float64)
+        self._reading_count += k
+        self._merge_block(added)
+        self._push_extrema_block(first_seq, added)
+        self._expire_extrema()
+        
+        self._second_half_sum += float(added.sum())
+        self._out_of_range_count += self._count_out_of_range(added)
+        
+        self._pos = (pos + k) % cap
+        self._last_reading = None
+        self._rebalance_halves()
+        if pos + k >= cap:
+            self._resync_statistics()
+    
+    def _merge_block(self, block: np.ndarray) -> None:
+        """Combine a block's mean/M2 into the window (Chan et al.)."""
+        k = len(block)
+        block_mean = float(block.mean())
+        block_m2 = float(np.square(block - block_mean).sum())
+        n = self._size + k
+        delta = block_mean - self._mean
+        self._m2 += block_m2 + delta * delta * self._size * k / n
+        self._mean += delta * k / n
+        self._size = n
+    
+    def _remove_block(self, block: np.ndarray) -> None:
+        """Remove an evicted block's mean/M2 from the window."""
+        m = len(block)
+        n = self._size
+        remaining = n - m
+        if remaining <= 0:
+            self._mean = self._m2 = 0.0
+            self._size = 0
+            return
+        block_mean = float(block.mean())
+        block_m2 = float(np.square(block - block_mean).sum())
+        mean = (n * self._mean - m * block_mean) / remaining
+        delta = block_mean - mean
+        self._m2 -= block_m2 + delta * delta * remaining * m / n
+        self._mean = mean
+        self._size = remaining
+    
+    def _push_extrema_block(self, first_seq: int, block: np.ndarray) -> None:
+        """Push a block's min/max candidates onto the monotonic deques."""
+        # Only suffix extrema of the block can ever be a window min/max
+        suffix_max = np.maximum.accumulate(block[::-1])[::-1]
+        suffix_min = np.minimum.accumulate(block[::-1])[::-1]
+        
+        max_window = self._max_window
+        while max_window and max_window[-1][1] <= suffix_max[0]:
+            max_window.pop()
+        for i in np.flatnonzero(block > np.append(suffix_max[1:], -np.inf)).tolist():
+            max_window.append((first_seq + i, float(block[i])))
+        
+        min_window = self._min_window
+        while min_window and min_window[-1][1] >= suffix_min[0]:
+            min_window.pop()
+        for i in np.flatnonzero(block < np.append(suffix_min[1:], np.inf)).tolist():
+            min_window.append((first_seq + i, float(block[i])))
+    
+    def _expire_extrema(self) -> None:
+        """Drop min/max candidates that have left the window."""
+        oldest = self._reading_count - self._size
+        while self._max_window[0][0] < oldest:
+            self._max_window.popleft()
+        while self._min_window[0][0] < oldest:
+            self._min_window.popleft()
+    
+    def _resync_statistics(self) -> None:
+        """Recompute accumulators exactly (once per buffer cycle, amortized O(1))."""
+        values = self.get_values().astype(np.float64)
+        self._mean = float(values.mean())
+        self._m2 = float(np.square(values - self._mean).sum())
+        
+        half = self._split_seq - (self._reading_count - self._size)
+        self._first_half_sum = float(values[:half].sum())
+        self._second_half_sum = float(values[half:].sum())
+        self._out_of_range_count = self._count_out_of_range(values)
+    
+    def _rebalance_halves(self) -> None:
+        """Move the half-window boundary to oldest + size // 2."""
+        oldest = self._reading_count - self._size
+        if self._split_seq < oldest:
+            # Samples between were evicted from the second half already
+            self._split_seq = oldest
+        
+        target = oldest + self._size // 2
+        if target > self._split_seq:
+            end = self._end()
+            lo = end - (self._reading_count - self._split_seq)
+            hi = end - (self._reading_count - target)
+            moved = float(self._values[lo:hi].sum(dtype=np.float64))
+            self._first_half_sum += moved
+            self._second_half_sum -= moved
+            self._split_seq = target
+    
+    def _is_out_of_range(self, value: float) -> int:
+        """1 if value is outside valid_range, else 0."""
+        if self.valid_range is None:
+            return 0
+        return int(value < self.valid_range[0] or value > self.valid_range[1])
+    
+    def _count_out_of_range(self, values: np.ndarray) -> int:
+        """Count values outside valid_range."""
+        if self.valid_range is None:
+            return 0
+        return int(np.count_nonzero(
+            (values < self.valid_range[0]) | (values > self.valid_range[1])
+        ))
+    
+    def set_valid_range(self, valid_range: tuple[float, float]) -> None:
+        """Set the valid range and recount out-of-range samples once."""
+        self.valid_range = valid_range
+        self._out_of_range_count = self._count_out_of_range(self.get_values())
+    
+    def get_drift(self) -> float:
+        """
+        Relative change between the second and first half-window means.
         
-        # Update running statistics
-        self._running_sum += reading.value
-        self._running_sum_sq += reading.value ** 2
+        Returns:
+            (mean2 - mean1) / |mean1|, or 0.0 with fewer than 2 samples.
+        """
+        first_count = self._split_seq - (self._reading_count - self._size)
+        second_count = self._reading_count - self._split_seq
+        if first_count <= 0 or second_count <= 0:
+            return 0.0
+        first_half = self._first_half_sum / first_count
+        second_half = self._second_half_sum / second_count
+        return (second_half - first_half) / (abs(first_half) + 1e-10)
+    
+    def _end(self) -> int:
+        """Index one past the newest sample in the mirrored arrays."""
+        return (self._pos - 1) % self.buffer_size + self.buffer_size + 1
+    
+    def _view(self, column: np.ndarray, n: Optional[int]) -> np.ndarray:
+        """Read-only view of the last n entries of a column."""
+        size = self._size if n is None else max(0, min(int(n), self._size))
+        end = self._end()
+        view = column[end - size:end]
+        view.flags.writeable = False
+        return view
+    
+    def _reading_at(self, index: int) -> SensorReading:
+        """Materialize a SensorReading from a mirrored-array index."""
+        return SensorReading(
+            sensor_id=self.sensor_id,
+            sensor_type=self.sensor_type,
+            value=float(self._values[index]),
+            unit=self.unit,
+            timestamp=float(self._timestamps[index]),
+            quality=float(self._quality[index]) / _QUALITY_SCALE,
+        )
     
     def get_recent(self, n: int = 100) -> list[SensorReading]:
-        """Get n most recent readings."""
-        return list(self._buffer)[-n:]
+        """
+        Get n most recent readings.
+        
+        Readings are rebuilt from the column arrays, so per-reading
+        metadata is not preserved.
+        """
+        size = max(0, min(int(n), self._size))
+        end = self._end()
+        return [self._reading_at(i) for i in range(end - size, end)]
     
     def get_values(self, n: Optional[int] = None) -> np.ndarray:
-        """Get values as numpy array."""
-        readings = list(self._buffer)[-n:] if n else list(self._buffer)
-        return np.array([r.value for r in readings])
+        """Get values as a read-only float32 view (oldest first)."""
+        return self._view(self._values, n or None)
+    
+    def get_timestamps(self, n: Optional[int] = None) -> np.ndarray:
+        """Get timestamps as a read-only float64 epoch-seconds view."""
+        return self._view(self._timestamps, n or None)
+    
+    def get_quality(self, n: Optional[int] = None) -> np.ndarray:
+        """Get quality scores as a float array in [0, 1]."""
+        return self._view(self._quality, n or None) / _QUALITY_SCALE
     
     def get_statistics(self) -> dict[str, float]:
         """
@@ -296,35 +753,44 @@ class SensorBuffer:
                 "count": 0,
             }
         
-        values = self.get_values()
-        n = len(values)
-        
-        mean = self._running_sum / n
-        variance = (self._running_sum_sq / n) - (mean ** 2)
-        std = np.sqrt(max(0, variance))
+        n = self._size
         
         return {
-            "mean": float(mean),
-            "std": float(std),
-            "min": float(values.min()),
-            "max": float(values.max()),
+            "mean": self._mean,
+            "std": float(np.sqrt(max(0.0, self._m2 / n))),
+            "min": self._min_window[0][1],
+            "max": self._max_window[0][1],
             "count": n,
         }
     
     def get_rate_hz(self) -> float:
         """Calculate actual reading rate in Hz."""
-        if len(self._buffer) < 2:
-            return 0.0
-        
-        readings = list(self._buffer)[-100:]  # Use last 100 readings
-        if len(readings) < 2:
+        if self._size < 2:
             return 0.0
         
-        time_span = (readings[-1].timestamp - readings[0].timestamp).total_seconds()
+        timestamps = self.get_timestamps(100)  # Use last 100 readings
+        time_span = float(timestamps[-1] - timestamps[0])
         if time_span <= 0:
             return 0.0
         
-        return len(readings) / time_span
+        return len(timestamps) / time_span
+    
+    def outlier_mask(self, z_threshold: float = 3.0) -> np.ndarray:
+        """
+        Vectorized z-score outlier mask.
+        
+        Args:
+            z_threshold: Z-score threshold for outlier detection
+            
+        Returns:
+            Boolean array aligned with get_values().
+        """
+        values = self.get_values()
+        if self._size < 10 or self._m2 <= 0:
+            return np.zeros(len(values), dtype=bool)
+        
+        std = np.sqrt(self._m2 / self._size)
+        return np.abs(values - self._mean) > z_threshold * std
     
     def detect_outliers(self, z_threshold: float = 3.0) -> list[SensorReading]:
         """
@@ -336,20 +802,11 @@ class SensorBuffer:
         Returns:
             List of outlier readings.
         """
-        if len(self._buffer) < 10:
-            return []
-        
-        stats = self.get_statistics()
-        if stats["std"] == 0:
-            return []
-        
-        outliers = []
-        for reading in self._buffer:
-            z_score = abs((reading.value - stats["mean"]) / stats["std"])
-            if z_score > z_threshold:
-                outliers.append(reading)
-        
-        return outliers
+        offset = self._end() - self._size
+        return [
+            self._reading_at(offset + i)
+            for i in np.flatnonzero(self.outlier_mask(z_threshold)).tolist()
+        ]
     
     def assess_health(
         self,
@@ -366,10 +823,8 @@ class SensorBuffer:
         Returns:
             SensorHealthReport with status and metrics.
         """
-        now = datetime.utcnow()
-        
         # Check for offline sensor
-        if self._last_reading is None:
+        if self._size == 0:
             self._status = SensorStatus.OFFLINE
             return SensorHealthReport(
                 sensor_id=self.sensor_id,
@@ -385,14 +840,16 @@ class SensorBuffer:
             )
         
         # Check data age
-        data_age = (now - self._last_reading.timestamp).total_seconds()
+        last_timestamp = self.latest_timestamp
+        last_reading_time = _from_epoch(last_timestamp)
+        data_age = time.time() - last_timestamp
         if data_age > max_data_age_s:
             self._status = SensorStatus.OFFLINE
             return SensorHealthReport(
                 sensor_id=self.sensor_id,
                 sensor_type=self.sensor_type,
                 status=SensorStatus.OFFLINE,
-                last_reading_time=self._last_reading.timestamp,
+                last_reading_time=last_reading_time,
                 readings_per_second=0.0,
                 noise_level=0.0,
                 drift=0.0,
@@ -401,24 +858,20 @@ class SensorBuffer:
                 message=f"Sensor offline - last reading {data_age:.1f}s ago",
             )
         
-        # Calculate metrics
+        # Calculate metrics (all maintained incrementally on append)
         rate_hz = self.get_rate_hz()
         stats = self.get_statistics()
         
         # Calculate out-of-range percentage
-        values = self.get_values()
-        out_of_range = np.sum((values < valid_range[0]) | (values > valid_range[1]))
-        out_of_range_pct = (out_of_range / len(values)) * 100 if len(values) > 0 else 0
+        if valid_range != self.valid_range:
+            self.set_valid_range(valid_range)
+        out_of_range_pct = (self._out_of_range_count / self._size) * 100
         
         # Calculate noise level (coefficient of variation)
         noise_level = stats["std"] / abs(stats["mean"]) if stats["mean"] != 0 else 0
         
         # Calculate drift (trend in recent readings)
-        drift = 0.0
-        if len(values) >= 50:
-            first_half = values[:len(values)//2].mean()
-            second_half = values[len(values)//2:].mean()
-            drift = (second_half - first_half) / (abs(first_half) + 1e-10)
+        drift = self.get_drift() if self._size >= 50 else 0.0
         
         # Determine status
         requires_calibration = False
@@ -440,7 +893,7 @@ class SensorBuffer:
             sensor_id=self.sensor_id,
             sensor_type=self.sensor_type,
             status=status,
-            last_reading_time=self._last_reading.timestamp,
+            last_reading_time=last_reading_time,
             readings_per_second=rate_hz,
             noise_level=noise_level,
             drift=drift,
@@ -451,192 +904,678 @@ class SensorBuffer:
     
     def clear(self) -> None:
         """Clear all buffer data."""
-        self._buffer.clear()
+        self._pos = 0
+        self._size = 0
         self._last_reading = None
-        self._running_sum = 0.0
-        self._running_sum_sq = 0.0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._max_window.clear()
+        self._min_window.clear()
+        self._split_seq = self._reading_count
+        self._first_half_sum = 0.0
+        self._second_half_sum = 0.0
+        self._out_of_range_count = 0
 
 
 # =============================================================================
 # Data Preprocessor
 # =============================================================================
 
-class DataPreprocessor:
+@lru_cache(maxsize=64)
+def _butter_sos(order: int, cutoff_freq: float, sampling_rate: float) -> np.ndarray:
+    """Design (once per parameter set) a low-pass Butterworth filter as SOS."""
+    nyquist = sampling_rate / 2
+    normalized_cutoff = min(cutoff_freq / nyquist, 0.99)
+    return signal.butter(order, normalized_cutoff, btype='low', output='sos')
+
+
+@lru_cache(maxsize=16)
+def _butter_bandpass_sos(
+    order: int, low_freq: float, high_freq: float, sampling_rate: float
+) -> np.ndarray:
+    """Design (once per parameter set) a band-pass Butterworth filter as SOS."""
+    nyquist = sampling_rate / 2
+    band = (max(low_freq / nyquist, 1e-6), min(high_freq / nyquist, 0.99))
+    return signal.butter(order, band, btype='band', output='sos')
+
+
+class StreamingFilter:
     """
-    Preprocesses raw sensor data for ML pipeline.
+    Causal low-pass Butterworth filter with persistent state.
     
-    Provides:
-    - Noise filtering
-    - Outlier removal
-    - Signal smoothing
-    - Resampling
+    Each call filters only the newly appended samples with ``sosfilt``
+    and carries the ``zi`` state over, so filtering a stream chunk by
+    chunk gives the same output as filtering it in one pass.
     """
     
-    def __init__(self, config: Optional[SensorConfig] = None):
-        """Initialize preprocessor with configuration."""
-        self.config = config or get_settings().sensors
-    
-    def filter_noise(
+    def __init__(
         self,
-        values: np.ndarray,
         cutoff_freq: float = 100.0,
         sampling_rate: float = 1000.0,
         order: int = 4,
-    ) -> np.ndarray:
+    ):
         """
-        Apply low-pass Butterworth filter to remove noise.
+        Initialize streaming filter.
         
         Args:
-            values: Input signal
             cutoff_freq: Cutoff frequency in Hz
             sampling_rate: Sampling rate in Hz
             order: Filter order
-            
-        Returns:
-            Filtered signal.
         """
-        if len(values) < 12:  # Need enough samples for filter
+        self.sos = _butter_sos(int(order), float(cutoff_freq), float(sampling_rate))
+        self._zi: Optional[np.ndarray] = None
+    
+    def process(self, values: np.ndarray) -> np.ndarray:
+        """Filter new samples, continuing from the previous call."""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
             return values
         
-        nyquist = sampling_rate / 2
-        normalized_cutoff = min(cutoff_freq / nyquist, 0.99)
+        # Start in steady state at the first sample to avoid a step transient
+        if self._zi is None:
+            self._zi = signal.sosfilt_zi(self.sos) * values[0]
         
-        b, a = signal.butter(order, normalized_cutoff, btype='low')
-        
-        # Use filtfilt for zero-phase filtering
-        try:
-            filtered = signal.filtfilt(b, a, values)
-            return filtered
-        except ValueError:
-            return values
+        filtered, self._zi = signal.sosfilt(self.sos, values, zi=self._zi)
+        return filtered
     
-    def remove_outliers(
-        self,
-        values: np.ndarray,
-        z_threshold: float = 3.0,
-    ) -> np.ndarray:
+    def reset(self) -> None:
+        """Drop filter state (next call restarts in steady state)."""
+        self._zi = None
+
+
+class StreamingOutlierClipper:
+    """
+    Incremental z-score outlier replacement.
+    
+    Streaming counterpart of ``DataPreprocessor.remove_outliers``:
+    samples more than ``z_threshold`` standard deviations from an
+    exponentially weighted mean are replaced with that mean.
+    """
+    
+    def __init__(self, z_threshold: float = 3.0, alpha: float = 0.01, warmup: int = 10):
         """
-        Remove outliers using z-score method, replacing with median.
+        Initialize outlier clipper.
         
         Args:
-            values: Input values
             z_threshold: Z-score threshold
-            
-        Returns:
-            Values with outliers replaced.
+            alpha: Per-sample weight of the exponentially weighted statistics
+            warmup: Samples to observe before clipping starts
         """
-        if len(values) < 3:
+        self.z_threshold = z_threshold
+        self.alpha = alpha
+        self.warmup = warmup
+        self._mean = 0.0
+        self._var = 0.0
+        self._count = 0
+    
+    def process(self, values: np.ndarray) -> np.ndarray:
+        """Replace outliers in new samples and update statistics."""
+        values = np.array(values, dtype=np.float64)
+        k = len(values)
+        if k == 0:
             return values
         
-        median = np.median(values)
-        std = np.std(values)
-        
-        if std == 0:
-            return values
+        if self._count >= self.warmup and self._var > 0:
+            std = np.sqrt(self._var)
+            values[np.abs(values - self._mean) > self.z_threshold * std] = self._mean
         
-        z_scores = np.abs((values - median) / std)
-        cleaned = values.copy()
-        cleaned[z_scores > z_threshold] = median
+        # Blend chunk statistics in with the weight k samples would carry
+        chunk_mean = float(values.mean())
+        chunk_var = float(values.var())
+        if self._count == 0:
+            self._mean, self._var = chunk_mean, chunk_var
+        else:
+            weight = 1.0 - (1.0 - self.alpha) ** k
+            delta = chunk_mean - self._mean
+            self._mean += weight * delta
+            self._var = (1.0 - weight) * (self._var + weight * delta * delta) + weight * chunk_var
+        self._count += k
         
-        return cleaned
+        return values
     
-    def smooth(
-        self,
-        values: np.ndarray,
-        window_size: int = 5,
-    ) -> np.ndarray:
+    def reset(self) -> None:
+        """Drop accumulated statistics."""
+        self._mean = 0.0
+        self._var = 0.0
+        self._count = 0
+
+
+class StreamingSmoother:
+    """Causal moving-average smoother carrying its window tail between calls."""
+    
+    def __init__(self, window_size: int = 5):
         """
-        Apply moving average smoothing.
+        Initialize smoother.
         
         Args:
-            values: Input values
             window_size: Smoothing window size
-            
-        Returns:
-            Smoothed values.
         """
-        if len(values) < window_size:
+        self.window_size = max(int(window_size), 1)
+        self._kernel = np.ones(self.window_size) / self.window_size
+        self._tail: Optional[np.ndarray] = None
+    
+    def process(self, values: np.ndarray) -> np.ndarray:
+        """Smooth new samples using the tail of the previous call."""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0 or self.window_size == 1:
             return values
         
-        kernel = np.ones(window_size) / window_size
-        smoothed = np.convolve(values, kernel, mode='same')
+        if self._tail is None:
+            self._tail = np.full(self.window_size - 1, values[0])
         
-        return smoothed
+        padded = np.concatenate((self._tail, values))
+        self._tail = padded[-(self.window_size - 1):]
+        return np.convolve(padded, self._kernel, mode='valid')
     
-    def resample(
-        self,
-        readings: list[SensorReading],
-        target_rate_hz: float,
-    ) -> list[SensorReading]:
+    def reset(self) -> None:
+        """Drop the carried window tail."""
+        self._tail = None
+
+
+class StreamingPipeline:
+    """Chain of streaming stages applied incrementally to new samples."""
+    
+    def __init__(self, stages: list[Any]):
         """
-        Resample readings to target rate using interpolation.
+        Initialize pipeline.
         
         Args:
-            readings: Input readings
-            target_rate_hz: Target sampling rate
-            
-        Returns:
-            Resampled readings.
+            stages: Objects with process(values) and reset() methods
         """
-        if len(readings) < 2:
-            return readings
-        
-        # Get time range
-        start_time = readings[0].timestamp
-        end_time = readings[-1].timestamp
-        duration = (end_time - start_time).total_seconds()
+        self.stages = stages
+    
+    def process(self, values: np.ndarray) -> np.ndarray:
+        """Run new samples through every stage."""
+        for stage in self.stages:
+            values = stage.process(values)
+        return values
+    
+    def reset(self) -> None:
+        """Reset every stage."""
+        for stage in self.stages:
+            stage.reset()
+
+
+@dataclass
+class AcousticWindows:
+    """Per-window acoustic features produced by ``AcousticDecimator``."""
+    timestamps: np.ndarray  # Epoch seconds at the end of each window
+    level_db: np.ndarray  # Broadband level
+    band_energy: np.ndarray  # Mean square in the void-detection band
+    band_db: np.ndarray  # Band level
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+class AcousticDecimator:
+    """
+    Streaming decimator turning raw acoustic emission into window levels.
+    
+    Raw samples (e.g. 50 kHz) are band-pass filtered into the void
+    detection band with a persistent-state ``sosfilt``, squared, and
+    integrated over windows of ``sampling_rate / output_rate`` samples.
+    The integrate-and-dump stage is a polyphase decimator with a boxcar
+    prototype: the D polyphase branches are the columns of an (n, D)
+    reshape, so each window costs one vectorized reduction. Samples that
+    do not fill a window are kept in a preallocated carry buffer for the
+    next call.
+    """
+    
+    def __init__(
+        self,
+        sampling_rate_hz: float = 50000.0,
+        output_rate_hz: float = 100.0,
+        band_hz: tuple[float, float] = (5000.0, 15000.0),
+        order: int = 4,
+        reference: float = 20e-6,
+    ):
+        """
+        Initialize acoustic decimator.
         
-        if duration <= 0:
-            return readings
+        Args:
+            sampling_rate_hz: Raw input sampling rate in Hz
+            output_rate_hz: Requested output (window) rate in Hz
+            band_hz: (low, high) edges of the band in Hz
+            order: Band-pass filter order
+            reference: Reference amplitude for dB levels (20 uPa)
+        """
+        self.sampling_rate_hz = float(sampling_rate_hz)
+        self.decimation = max(1, int(round(sampling_rate_hz / output_rate_hz)))
+        self.output_rate_hz = self.sampling_rate_hz / self.decimation
+        self.reference_power = float(reference) ** 2
+        self.sos = _butter_bandpass_sos(
+            int(order), float(band_hz[0]), float(band_hz[1]), self.sampling_rate_hz
+        )
         
-        # Create new timestamps
-        n_samples = int(duration * target_rate_hz)
-        if n_samples < 1:
-            return readings
+        # Carry of raw and band-passed samples not yet forming a full window
+        self._carry = np.empty((2, self.decimation), dtype=np.float64)
+        self._carry_len = 0
+        self._zi = np.zeros((self.sos.shape[0], 2))
+        self._next_timestamp: Optional[float] = None
+    
+    def process(
+        self,
+        samples: np.ndarray,
+        start_timestamp: Optional[float] = None,
+    ) -> AcousticWindows:
+        """
+        Consume raw samples and emit features for every completed window.
         
-        # Extract values and timestamps
-        times = np.array([
-            (r.timestamp - start_time).total_seconds()
-            for r in readings
-        ])
+        Args:
+            samples: New raw samples
+            start_timestamp: Epoch seconds of the first new sample. If
+                omitted, the stream is assumed contiguous with the last call.
+                
+        Returns:
+            Features of the windows completed by these samples.
+        """
+        samples = np.asarray(samples, dtype=np.float64).ravel()
+        d = self.decimation
+        dt = 1.0 / self.sampling_rate_hz
+        
+        if start_timestamp is None:
+            start_timestamp = self._next_timestamp if self._next_timestamp is not None else time.time()
+        self._next_timestamp = start_timestamp + len(samples) * dt
+        
+        if len(samples) == 0:
+            empty = np.empty(0)
+            return AcousticWindows(empty, empty, empty, empty)
+        
+        band, self._zi = signal.sosfilt(self.sos, samples, zi=self._zi)
+        
+        carry = self._carry_len
+        total = carry + len(samples)
+        n_windows = total // d
+        
+        if n_windows == 0:
+            self._carry[0, carry:total] = samples
+            self._carry[1, carry:total] = band
+            self._carry_len = total
+            empty = np.empty(0)
+            return AcousticWindows(empty, empty, empty, empty)
+        
+        used = n_windows * d - carry
+        raw_windows = np.concatenate((self._carry[0, :carry], samples[:used])).reshape(n_windows, d)
+        band_windows = np.concatenate((self._carry[1, :carry], band[:used])).reshape(n_windows, d)
+        
+        # Broadband power is taken about each window's mean so a DC offset
+        # on the transducer does not read as sound
+        level_power = raw_windows.var(axis=1)
+        band_energy = np.einsum("ij,ij->i", band_windows, band_windows) / d
+        
+        remainder = len(samples) - used
+        self._carry[0, :remainder] = samples[used:]
+        self._carry[1, :remainder] = band[used:]
+        self._carry_len = remainder
+        
+        # Window j ends on chunk sample (j + 1) * d - 1 - carry
+        timestamps = start_timestamp + (np.arange(1, n_windows + 1) * d - 1 - carry) * dt
+        
+        return AcousticWindows(
+            timestamps=timestamps,
+            level_db=self._to_db(level_power),
+            band_energy=band_energy,
+            band_db=self._to_db(band_energy),
+        )
+    
+    def _to_db(self, power: np.ndarray) -> np.ndarray:
+        """Convert mean-square power to dB re the reference amplitude."""
+        return 10.0 * np.log10(np.maximum(power, 1e-30) / self.reference_power)
+    
+    def reset(self) -> None:
+        """Drop filter state, carried samples and the stream clock."""
+        self._carry_len = 0
+        self._zi = np.zeros((self.sos.shape[0], 2))
+        self._next_timestamp = None
+
+
+class VibrationSpectralEngine:
+    """
+    Streaming overlapping-window spectral feature extractor.
+    
+    New samples are cut into Hann-windowed frames of ``window_size`` with
+    ``overlap`` between consecutive frames. All frames completed by a
+    call are stacked and transformed with one batched ``rfft``. The
+    window, frequency axis, PSD scaling and band bin indices are computed
+    once at construction, and band energies are read off a cumulative sum
+    of each frame's power spectrum, so overlapping bands cost two lookups.
+    """
+    
+    def __init__(
+        self,
+        window_size: int = 1024,
+        sampling_rate: float = 1000.0,
+        overlap: float = 0.5,
+        bands: Optional[dict[str, tuple[float, float]]] = None,
+    ):
+        """
+        Initialize spectral engine.
+        
+        Args:
+            window_size: Samples per FFT frame
+            sampling_rate: Sampling rate in Hz
+            overlap: Fraction of a frame shared with the next frame
+            bands: Band name -> (low, high) in Hz, edges inclusive
+        """
+        n = int(window_size)
+        self.window_size = n
+        self.hop = max(1, int(round(n * (1.0 - overlap))))
+        self.sampling_rate = float(sampling_rate)
+        
+        self.window = signal.get_window("hann", n)
+        self.freqs = np.fft.rfftfreq(n, 1.0 / self.sampling_rate)
+        
+        # One-sided PSD scaling: a frame's bins sum to its mean square
+        self._bin_scale = np.full(len(self.freqs), 2.0 / (n * np.sum(self.window ** 2)))
+        self._bin_scale[0] /= 2
+        if n % 2 == 0:
+            self._bin_scale[-1] /= 2
+        
+        self.bands = dict(bands or {})
+        edges = np.array(list(self.bands.values()), dtype=np.float64).reshape(-1, 2)
+        self._band_lo = np.searchsorted(self.freqs, edges[:, 0], side="left")
+        self._band_hi = np.searchsorted(self.freqs, edges[:, 1], side="right")
+        
+        self._carry = np.empty(n, dtype=np.float64)
+        self._carry_len = 0
+        self._next_timestamp: Optional[float] = None
+    
+    def process(
+        self,
+        samples: np.ndarray,
+        start_timestamp: Optional[float] = None,
+    ) -> list[VibrationSpectrum]:
+        """
+        Consume new samples and return features for every completed frame.
+        
+        Args:
+            samples: New vibration samples
+            start_timestamp: Epoch seconds of the first new sample. If
+                omitted, the stream is assumed contiguous with the last call.
+                
+        Returns:
+            Features of the frames completed by these samples, oldest first.
+        """
+        samples = np.asarray(samples, dtype=np.float64).ravel()
+        n = self.window_size
+        dt = 1.0 / self.sampling_rate
+        
+        if start_timestamp is None:
+            start_timestamp = self._next_timestamp if self._next_timestamp is not None else time.time()
+        self._next_timestamp = start_timestamp + len(samples) * dt
+        
+        carry = self._carry_len
+        data = np.concatenate((self._carry[:carry], samples))
+        if len(data) < n:
+            self._carry[:len(data)] = data
+            self._carry_len = len(data)
+            return []
+        
+        frames = np.lib.stride_tricks.sliding_window_view(data, n)[::self.hop]
+        n_frames = len(frames)
+        
+        # Time-domain features
+        centred = frames - frames.mean(axis=1, keepdims=True)
+        squared = centred ** 2
+        m2 = squared.mean(axis=1)
+        m4 = np.einsum("ij,ij->i", squared, squared) / n
+        rms = np.sqrt(np.einsum("ij,ij->i", frames, frames) / n)
+        peak = np.abs(frames).max(axis=1)
+        kurtosis = np.divide(m4, m2 ** 2, out=np.zeros(n_frames), where=m2 > 0)
+        crest = np.divide(peak, rms, out=np.zeros(n_frames), where=rms > 0)
+        
+        # Batched spectra and band energies
+        spectra = np.fft.rfft(centred * self.window, axis=1)
+        power = (spectra.real ** 2 + spectra.imag ** 2) * self._bin_scale
+        cumulative = np.zeros((n_frames, power.shape[1] + 1))
+        np.cumsum(power, axis=1, out=cumulative[:, 1:])
+        band_energy = cumulative[:, self._band_hi] - cumulative[:, self._band_lo]
+        
+        consumed = n_frames * self.hop
+        remainder = len(data) - consumed
+        self._carry[:remainder] = data[consumed:]
+        self._carry_len = remainder
+        
+        # Frame k ends on data sample k * hop + n - 1; data starts `carry` early
+        timestamps = start_timestamp + (np.arange(n_frames) * self.hop + n - 1 - carry) * dt
+        
+        names = list(self.bands)
+        return [
+            VibrationSpectrum(
+                timestamp=float(timestamps[k]),
+                rms=float(rms[k]),
+                kurtosis=float(kurtosis[k]),
+                crest_factor=float(crest[k]),
+                band_energy=dict(zip(names, band_energy[k].tolist())),
+            )
+            for k in range(n_frames)
+        ]
+    
+    def reset(self) -> None:
+        """Drop carried samples and the stream clock."""
+        self._carry_len = 0
+        self._next_timestamp = None
+
+
+class DataPreprocessor:
+    """
+    Preprocesses raw sensor data for ML pipeline.
+    
+    Provides:
+    - Noise filtering
+    - Outlier removal
+    - Signal smoothing
+    - Resampling
+    """
+    
+    def __init__(self, config: Optional[SensorConfig] = None):
+        """Initialize preprocessor with configuration."""
+        self.config = config or get_settings().sensors
+        
+        # Streaming pipeline state by stream key (usually sensor_id)
+        self._streams: dict[str, StreamingPipeline] = {}
+    
+    def filter_noise(
+        self,
+        values: np.ndarray,
+        cutoff_freq: float = 100.0,
+        sampling_rate: float = 1000.0,
+        order: int = 4,
+    ) -> np.ndarray:
+        """
+        Apply low-pass Butterworth filter to remove noise.
+        
+        Args:
+            values: Input signal
+            cutoff_freq: Cutoff frequency in Hz
+            sampling_rate: Sampling rate in Hz
+            order: Filter order
+            
+        Returns:
+            Filtered signal.
+        """
+        if len(values) < 12:  # Need enough samples for filter
+            return values
+        
+        sos = _butter_sos(int(order), float(cutoff_freq), float(sampling_rate))
+        
+        # Use sosfiltfilt for zero-phase filtering
+        try:
+            filtered = signal.sosfiltfilt(sos, values)
+            return filtered
+        except ValueError:
+            return values
+    
+    def remove_outliers(
+        self,
+        values: np.ndarray,
+        z_threshold: float = 3.0,
+    ) -> np.ndarray:
+        """
+        Remove outliers using z-score method, replacing with median.
+        
+        Args:
+            values: Input values
+            z_threshold: Z-score threshold
+            
+        Returns:
+            Values with outliers replaced.
+        """
+        if len(values) < 3:
+            return values
+        
+        median = np.median(values)
+        std = np.std(values)
+        
+        if std == 0:
+            return values
+        
+        z_scores = np.abs((values - median) / std)
+        cleaned = values.copy()
+        cleaned[z_scores > z_threshold] = median
+        
+        return cleaned
+    
+    def smooth(
+        self,
+        values: np.ndarray,
+        window_size: int = 5,
+    ) -> np.ndarray:
+        """
+        Apply moving average smoothing.
+        
+        Args:
+            values: Input values
+            window_size: Smoothing window size
+            
+        Returns:
+            Smoothed values.
+        """
+        if len(values) < window_size:
+            return values
+        
+        kernel = np.ones(window_size) / window_size
+        smoothed = np.convolve(values, kernel, mode='same')
+        
+        return smoothed
+    
+    def resample_arrays(
+        self,
+        timestamps: np.ndarray,
+        values: np.ndarray,
+        target_rate_hz: Optional[float] = None,
+        grid: Optional[np.ndarray] = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Resample a stream onto a regular or given timestamp grid.
+        
+        Array counterpart of ``resample``: one vectorized ``np.interp``
+        call, values outside the stream's span hold the edge sample.
+        
+        Args:
+            timestamps: Sample timestamps in seconds (ascending)
+            values: Sample values
+            target_rate_hz: Target sampling rate (used when grid is None)
+            grid: Explicit target timestamps
+            
+        Returns:
+            Tuple of (grid timestamps, resampled values).
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        
+        if grid is None:
+            if len(timestamps) < 2 or not target_rate_hz:
+                return timestamps, values
+            duration = timestamps[-1] - timestamps[0]
+            n_samples = int(duration * target_rate_hz)
+            if duration <= 0 or n_samples < 1:
+                return timestamps, values
+            grid = np.linspace(timestamps[0], timestamps[-1], n_samples)
+        
+        grid = np.asarray(grid, dtype=np.float64)
+        if len(values) == 0:
+            return grid, np.full(len(grid), np.nan)
+        if len(values) == 1:
+            return grid, np.full(len(grid), values[0])
+        
+        return grid, np.interp(grid, timestamps, values)
+    
+    def resample(
+        self,
+        readings: list[SensorReading],
+        target_rate_hz: float,
+    ) -> list[SensorReading]:
+        """
+        Resample readings to target rate using interpolation.
+        
+        Args:
+            readings: Input readings
+            target_rate_hz: Target sampling rate
+            
+        Returns:
+            Resampled readings.
+        """
+        if len(readings) < 2:
+            return readings
+        
+        # Get time range
+        start_time = readings[0].timestamp
+        duration = readings[-1].timestamp - start_time
+        
+        if duration <= 0 or int(duration * target_rate_hz) < 1:
+            return readings
+        
+        # Extract values and timestamps
+        times = np.array([r.timestamp for r in readings]) - start_time
         values = np.array([r.value for r in readings])
         
         # Interpolate
-        new_times = np.linspace(0, duration, n_samples)
-        new_values = np.interp(new_times, times, values)
+        new_times, new_values = self.resample_arrays(times, values, target_rate_hz)
         
         # Create new readings
-        resampled = []
         template = readings[0]
         
-        for i, (t, v) in enumerate(zip(new_times, new_values)):
-            new_timestamp = start_time + timedelta(seconds=t)
-            resampled.append(SensorReading(
+        return [
+            SensorReading(
                 sensor_id=template.sensor_id,
                 sensor_type=template.sensor_type,
                 value=float(v),
                 unit=template.unit,
-                timestamp=new_timestamp,
+                timestamp=start_time + float(t),
                 quality=template.quality,
-            ))
-        
-        return resampled
+            )
+            for t, v in zip(new_times, new_values)
+        ]
     
     def preprocess_pipeline(
         self,
         values: np.ndarray,
         sensor_type: str,
+        streaming: bool = False,
+        stream_id: Optional[str] = None,
     ) -> np.ndarray:
         """
         Apply full preprocessing pipeline based on sensor type.
         
         Args:
-            values: Raw sensor values
+            values: Raw sensor values (only the new samples when streaming)
             sensor_type: Type of sensor
+            streaming: Process incrementally, keeping per-stream state
+            stream_id: Stream key for state (defaults to sensor_type)
             
         Returns:
             Preprocessed values.
         """
+        if streaming:
+            key = stream_id or sensor_type
+            pipeline = self._streams.get(key)
+            if pipeline is None:
+                pipeline = self.create_stream(sensor_type)
+                self._streams[key] = pipeline
+            return pipeline.process(values)
+        
         # Type-specific processing
         if sensor_type == "vibration":
             # Heavy filtering for vibration
@@ -655,6 +1594,38 @@ class DataPreprocessor:
             values = self.smooth(values, window_size=5)
         
         return values
+    
+    def create_stream(self, sensor_type: str) -> StreamingPipeline:
+        """
+        Build the streaming equivalent of the batch pipeline for a type.
+        
+        Args:
+            sensor_type: Type of sensor
+            
+        Returns:
+            New StreamingPipeline with fresh state.
+        """
+        if sensor_type == "vibration":
+            return StreamingPipeline([
+                StreamingOutlierClipper(z_threshold=4.0),
+                StreamingFilter(
+                    cutoff_freq=200.0,
+                    sampling_rate=self.config.vibration.sampling_rate_hz,
+                ),
+            ])
+        elif sensor_type == "acoustic":
+            return StreamingPipeline([
+                StreamingOutlierClipper(z_threshold=3.5),
+                StreamingSmoother(window_size=3),
+            ])
+        return StreamingPipeline([
+            StreamingOutlierClipper(),
+            StreamingSmoother(window_size=5),
+        ])
+    
+    def reset_stream(self, stream_id: str) -> None:
+        """Forget streaming state for a stream."""
+        self._streams.pop(stream_id, None)
 
 
 # =============================================================================
@@ -686,6 +1657,7 @@ class SensorFusionEngine:
         self,
         config: Optional[SensorConfig] = None,
         predictor: Optional[MaterialPredictor] = None,
+        inference_server: Optional[MicroBatchInferenceServer] = None,
     ):
         """
         Initialize sensor fusion engine.
@@ -693,9 +1665,12 @@ class SensorFusionEngine:
         Args:
             config: Sensor configuration
             predictor: Material predictor instance (optional)
+            inference_server: Micro-batching server to predict through
+                instead of calling the predictor on the event loop
         """
         self.config = config or get_settings().sensors
         self.predictor = predictor
+        self.inference_server = inference_server
         self.preprocessor = DataPreprocessor(self.config)
         
         # Sensor buffers by sensor_id
@@ -707,15 +1682,47 @@ class SensorFusionEngine:
         
         # Callbacks for new data
         self._data_callbacks: list[Callable[[FusedSensorData], None]] = []
-        self._prediction_callbacks: list[Callable[[PredictionResult], None]] = []
+        self._raw_reading_subscribers = 0
+        self._prediction_callbacks: list[Callable[[dict[str, Any]], None]] = []
         
         # State
         self._is_running = False
         self._fusion_task: Optional[asyncio.Task] = None
+        self._health_task: Optional[asyncio.Task] = None
+        self._prediction_task: Optional[asyncio.Task] = None
+        
+        # Cached health reports, refreshed in the background
+        self._health_cache: dict[str, SensorHealthReport] = {}
         
         # Sensor mapping (sensor_id -> sensor_type)
         self._sensor_mapping: dict[str, str] = {}
         
+        # Fusion index (sensor_type -> buffer) and the ids it watches
+        self._type_index: dict[str, SensorBuffer] = {}
+        self._watched_ids: set[str] = set()
+        
+        # Set when a watched sensor receives new data
+        self._data_event = asyncio.Event()
+        self._fusion_count = 0
+        
+        # Aligned fusion: last emitted grid timestamp and block subscribers
+        self._last_aligned_ts: Optional[float] = None
+        self._block_callbacks: list[Callable[[AlignedSensorBlock], None]] = []
+        
+        # Raw acoustic decimators by sensor_id
+        self._acoustic_decimators: dict[str, AcousticDecimator] = {}
+        
+        # Vibration spectral features, fed from the fused vibration buffer
+        vibration = self.config.vibration
+        self._spectral_engine = VibrationSpectralEngine(
+            window_size=vibration.fft_window_size,
+            sampling_rate=vibration.sampling_rate_hz,
+            overlap=vibration.spectral_overlap,
+            bands=vibration.spectral_bands_hz,
+        )
+        self._spectrum_seq = 0
+        self._spectra: deque[VibrationSpectrum] = deque(maxlen=120)
+        
         # Expected sensors
         self._expected_sensors = {
             "rpm": "rpm_01",
@@ -741,6 +1748,11 @@ class SensorFusionEngine:
         """Get latest fused sensor data."""
         return self._fused_data
     
+    @property
+    def fusion_count(self) -> int:
+        """Number of fusions performed by the fusion loop."""
+        return self._fusion_count
+    
     async def start(self) -> None:
         """Start the sensor fusion engine."""
         if self._is_running:
@@ -750,17 +1762,12 @@ class SensorFusionEngine:
         
         # Initialize buffers for expected sensors
         for sensor_type, sensor_id in self._expected_sensors.items():
-            expected_rate = self._get_expected_rate(sensor_type)
-            self._buffers[sensor_id] = SensorBuffer(
-                sensor_id=sensor_id,
-                sensor_type=sensor_type,
-                buffer_size=int(expected_rate * 60),  # 1 minute of data
-                expected_rate_hz=expected_rate,
-            )
-            self._sensor_mapping[sensor_id] = sensor_type
+            self._get_or_create_buffer(sensor_id, sensor_type)
         
-        # Start fusion loop
+        # Start fusion loop and health refresh
+        self.refresh_sensor_health()
         self._fusion_task = asyncio.create_task(self._fusion_loop())
+        self._health_task = asyncio.create_task(self._health_loop())
         
         logger.info("SensorFusionEngine started")
     
@@ -768,12 +1775,13 @@ class SensorFusionEngine:
         """Stop the sensor fusion engine."""
         self._is_running = False
         
-        if self._fusion_task:
-            self._fusion_task.cancel()
-            try:
-                await self._fusion_task
-            except asyncio.CancelledError:
-                pass
+        for task in (self._fusion_task, self._health_task, self._prediction_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
         
         logger.info("SensorFusionEngine stopped")
     
@@ -784,50 +1792,376 @@ class SensorFusionEngine:
         Args:
             reading: Sensor reading to process
         """
-        sensor_id = reading.sensor_id
+        self._get_or_create_buffer(reading.sensor_id, reading.sensor_type).add(reading)
+        if reading.sensor_id in self._watched_ids:
+            self._data_event.set()
+    
+    async def process_batch(self, readings: list[SensorReading]) -> None:
+        """Process a batch of readings efficiently."""
+        watched = False
+        for reading in readings:
+            self._get_or_create_buffer(reading.sensor_id, reading.sensor_type).add(reading)
+            watched = watched or reading.sensor_id in self._watched_ids
+        if watched:
+            self._data_event.set()
+    
+    async def process_columns(
+        self,
+        sensor_ids: Any,
+        sensor_types: Any,
+        timestamps: Any,
+        values: Any,
+        quality: Any = None,
+        units: Optional[dict[str, str]] = None,
+    ) -> int:
+        """
+        Ingest a columnar frame of readings from many sensors.
+        
+        Rows are grouped by sensor in one vectorized pass (stable sort on
+        the sensor index) and each sensor's contiguous slice is appended
+        to its buffer with a single ``SensorBuffer.extend`` call. Rows for
+        one sensor must be in time order.
+        
+        Args:
+            sensor_ids: Sensor id per row (array-like), or one id for all rows
+            sensor_types: Sensor type per row (array-like), or one type for all rows
+            timestamps: Epoch timestamps in seconds (array or memoryview)
+            values: Sample values (array or memoryview)
+            quality: Optional quality scores (0-1) per row
+            units: Optional measurement unit per sensor id
+            
+        Returns:
+            Number of rows ingested.
+        """
+        units = units or {}
+        values = np.asarray(values, dtype=np.float32).ravel()
+        timestamps = np.asarray(timestamps, dtype=np.float64).ravel()
+        n = len(values)
+        if len(timestamps) != n:
+            raise ValueError("timestamps and values must have the same length")
+        if quality is not None:
+            quality = np.asarray(quality, dtype=np.float64).ravel()
+            if len(quality) != n:
+                raise ValueError("quality and values must have the same length")
+        if n == 0:
+            return 0
+        
+        # Single-sensor frame: no grouping needed
+        if isinstance(sensor_ids, str):
+            sensor_type = sensor_types if isinstance(sensor_types, str) else str(np.asarray(sensor_types).ravel()[0])
+            self._get_or_create_buffer(
+                sensor_ids, sensor_type, units.get(sensor_ids, "")
+            ).extend(timestamps, values, quality)
+            if sensor_ids in self._watched_ids:
+                self._data_event.set()
+            return n
+        
+        ids = np.asarray(sensor_ids).ravel()
+        if len(ids) != n:
+            raise ValueError("sensor_ids and values must have the same length")
+        types = None if isinstance(sensor_types, str) else np.asarray(sensor_types).ravel()
+        
+        unique_ids, first_index, inverse = np.unique(
+            ids, return_index=True, return_inverse=True
+        )
+        if len(unique_ids) > 1:
+            order = np.argsort(inverse, kind="stable")
+            timestamps = timestamps[order]
+            values = values[order]
+            if quality is not None:
+                quality = quality[order]
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(inverse.ravel()))))
+        
+        for i, sensor_id in enumerate(unique_ids.tolist()):
+            sensor_type = sensor_types if types is None else str(types[first_index[i]])
+            lo, hi = bounds[i], bounds[i + 1]
+            self._get_or_create_buffer(
+                str(sensor_id), sensor_type, units.get(str(sensor_id), "")
+            ).extend(
+                timestamps[lo:hi],
+                values[lo:hi],
+                None if quality is None else quality[lo:hi],
+            )
+        
+        if not self._watched_ids.isdisjoint(unique_ids.tolist()):
+            self._data_event.set()
+        
+        return n
+    
+    async def process_frames(self, frames: list[SensorFrame]) -> int:
+        """
+        Ingest decoded binary sensor frames.
+        
+        Each frame is appended to its sensor's buffer with one
+        ``SensorBuffer.extend`` call straight from the decoded view.
+        
+        Args:
+            frames: Decoded sensor frames
+            
+        Returns:
+            Number of samples ingested.
+        """
+        ingested = 0
+        notify = False
+        
+        for frame in frames:
+            if not len(frame):
+                continue
+            if frame.sensor_type == "acoustic" and self._is_raw_acoustic(frame):
+                self._ingest_raw_acoustic(frame)
+                ingested += len(frame)
+                notify = notify or frame.sensor_id in self._watched_ids
+                continue
+            self._get_or_create_buffer(frame.sensor_id, frame.sensor_type).extend(
+                frame.timestamps,
+                frame.values,
+                None if frame.quality >= 1.0 else np.full(len(frame), frame.quality),
+            )
+            ingested += len(frame)
+            notify = notify or frame.sensor_id in self._watched_ids
         
-        # Create buffer if needed
-        if sensor_id not in self._buffers:
-            sensor_type = reading.sensor_type
+        if notify:
+            self._data_event.set()
+        
+        return ingested
+    
+    def _get_or_create_buffer(
+        self,
+        sensor_id: str,
+        sensor_type: str,
+        unit: str = "",
+    ) -> SensorBuffer:
+        """Get the buffer for a sensor, creating it on first use."""
+        buffer = self._buffers.get(sensor_id)
+        if buffer is None:
             expected_rate = self._get_expected_rate(sensor_type)
-            self._buffers[sensor_id] = SensorBuffer(
+            buffer = SensorBuffer(
                 sensor_id=sensor_id,
                 sensor_type=sensor_type,
-                buffer_size=int(expected_rate * 60),
+                buffer_size=int(expected_rate * 60),  # 1 minute of data
                 expected_rate_hz=expected_rate,
+                unit=unit,
+                valid_range=self._get_valid_range(sensor_type),
             )
+            self._buffers[sensor_id] = buffer
             self._sensor_mapping[sensor_id] = sensor_type
-        
-        # Add to buffer
-        self._buffers[sensor_id].add(reading)
-    
-    async def process_batch(self, readings: list[SensorReading]) -> None:
-        """Process a batch of readings efficiently."""
-        for reading in readings:
-            await self.process_reading(reading)
+            
+            # The first buffer of an expected type feeds fusion
+            if sensor_type in self._expected_sensors and sensor_type not in self._type_index:
+                self._type_index[sensor_type] = buffer
+                self._watched_ids.add(sensor_id)
+        elif unit and not buffer.unit:
+            buffer.unit = unit
+        return buffer
     
     def register_data_callback(
         self,
         callback: Callable[[FusedSensorData], None],
+        include_raw_readings: bool = False,
     ) -> None:
-        """Register callback for new fused data."""
+        """
+        Register callback for new fused data.
+        
+        Args:
+            callback: Called with each FusedSensorData
+            include_raw_readings: Populate ``raw_readings`` on fused data.
+                Off by default so fusion does not materialize a
+                SensorReading per sensor on every tick.
+        """
         self._data_callbacks.append(callback)
+        if include_raw_readings:
+            self._raw_reading_subscribers += 1
     
     def register_prediction_callback(
         self,
-        callback: Callable[[PredictionResult], None],
+        callback: Callable[[dict[str, Any]], None],
     ) -> None:
         """Register callback for new predictions."""
         self._prediction_callbacks.append(callback)
     
-    def get_fused_data(self) -> Optional[FusedSensorData]:
+    def _update_vibration_spectrum(self) -> Optional[VibrationSpectrum]:
+        """
+        Run the spectral engine over vibration samples added since the
+        previous call.
+        
+        Returns:
+            Latest spectrum, or None if no full window has been seen.
+        """
+        buffer = self._type_index.get("vibration")
+        if buffer is None:
+            return self._spectra[-1] if self._spectra else None
+        
+        new = buffer.total_count - self._spectrum_seq
+        if new > buffer.count:
+            # Samples were evicted before we saw them: restart the stream
+            self._spectral_engine.reset()
+            new = buffer.count
+        self._spectrum_seq = buffer.total_count
+        
+        if new > 0:
+            timestamps = buffer.get_timestamps(new)
+            self._spectra.extend(
+                self._spectral_engine.process(buffer.get_values(new), float(timestamps[0]))
+            )
+        
+        return self._spectra[-1] if self._spectra else None
+    
+    def get_vibration_spectra(self, n: Optional[int] = None) -> list[VibrationSpectrum]:
+        """
+        Get recent vibration spectral features, oldest first.
+        
+        Args:
+            n: Number of most recent windows (all retained if None)
+        """
+        self._update_vibration_spectrum()
+        spectra = list(self._spectra)
+        return spectra if n is None else spectra[-n:]
+    
+    def _is_raw_acoustic(self, frame: SensorFrame) -> bool:
+        """Check whether an acoustic frame is sampled above the level rate."""
+        return 0.0 < frame.sample_period_s < 0.5 / self.config.acoustic.output_rate_hz
+    
+    def _ingest_raw_acoustic(self, frame: SensorFrame) -> None:
+        """
+        Decimate a raw acoustic frame into level and band buffers.
+        
+        The broadband level goes to the frame's sensor (type ``acoustic``)
+        and the void-detection band level to ``<sensor_id>_band`` (type
+        ``acoustic_band``); raw samples are never buffered.
+        """
+        sampling_rate = 1.0 / frame.sample_period_s
+        decimator = self._acoustic_decimators.get(frame.sensor_id)
+        if decimator is None or abs(decimator.sampling_rate_hz - sampling_rate) > 1e-6 * sampling_rate:
+            acoustic = self.config.acoustic
+            decimator = AcousticDecimator(
+                sampling_rate_hz=sampling_rate,
+                output_rate_hz=acoustic.output_rate_hz,
+                band_hz=acoustic.void_detection_freq_hz,
+            )
+            self._acoustic_decimators[frame.sensor_id] = decimator
+        
+        windows = decimator.process(frame.values, frame.start_timestamp)
+        if not len(windows):
+            return
+        
+        quality = None if frame.quality >= 1.0 else np.full(len(windows), frame.quality)
+        self._get_or_create_buffer(frame.sensor_id, "acoustic").extend(
+            windows.timestamps, windows.level_db, quality
+        )
+        self._get_or_create_buffer(f"{frame.sensor_id}_band", "acoustic_band").extend(
+            windows.timestamps, windows.band_db, quality
+        )
+    
+    def register_block_callback(
+        self,
+        callback: Callable[[AlignedSensorBlock], None],
+    ) -> None:
+        """Register callback for new aligned data blocks (aligned mode)."""
+        self._block_callbacks.append(callback)
+    
+    def get_fused_data(self, include_raw_readings: bool = False) -> Optional[FusedSensorData]:
         """Get current fused sensor data."""
-        return self._fuse_sensors()
+        return self._fuse_sensors(include_raw_readings)
+    
+    def get_aligned_data(
+        self,
+        rate_hz: Optional[float] = None,
+        window_s: Optional[float] = None,
+        since: Optional[float] = None,
+    ) -> Optional[AlignedSensorBlock]:
+        """
+        Resample all live streams onto a common timestamp grid.
+        
+        The grid is aligned to multiples of ``1 / rate_hz`` and ends at the
+        oldest "latest" timestamp among live sensors, so no stream is
+        extrapolated forward. Missing or stale sensors contribute their
+        default value.
+        
+        Args:
+            rate_hz: Grid rate (defaults to config.aligned_fusion_rate_hz)
+            window_s: Window length in seconds (defaults to config.aligned_window_s)
+            since: Only emit grid points after this epoch timestamp
+            
+        Returns:
+            AlignedSensorBlock or None if insufficient data.
+        """
+        rate_hz = rate_hz or self.config.aligned_fusion_rate_hz
+        window_s = window_s or self.config.aligned_window_s
+        now = time.time()
+        
+        active = {
+            sensor_type: buffer
+            for sensor_type, buffer in self._type_index.items()
+            if not buffer.is_empty
+            and now - buffer.latest_timestamp <= self.config.max_data_age_s
+        }
+        essential = ("rpm", "current", "vibration", "depth")
+        if not active or (
+            not all(sensor_type in active for sensor_type in essential)
+            and len(active) < 2
+        ):
+            return None
+        
+        # Common grid over the window all live streams have reached
+        step = 1.0 / rate_hz
+        end = min(buffer.latest_timestamp for buffer in active.values())
+        start = end - window_s
+        if since is not None:
+            start = max(start, since)
+        grid = np.arange(np.floor(start / step) + 1, np.floor(end / step) + 1) * step
+        if len(grid) == 0:
+            return None
+        
+        columns = {}
+        for sensor_type in self._expected_sensors:
+            field_name = _FUSED_FIELDS.get(sensor_type)
+            if field_name is None:
+                continue
+            buffer = active.get(sensor_type)
+            if buffer is None:
+                columns[field_name] = np.full(len(grid), self._get_default_value(sensor_type))
+                continue
+            
+            # Only interpolate over the part of the buffer covering the grid
+            timestamps = buffer.get_timestamps()
+            lo = max(int(np.searchsorted(timestamps, grid[0], side="right")) - 1, 0)
+            _, columns[field_name] = self.preprocessor.resample_arrays(
+                timestamps[lo:], buffer.get_values()[lo:], grid=grid,
+            )
+        
+        # Feed rate from the depth gradient (m/s -> m/min)
+        depth = columns.get("depth_m")
+        if depth is not None and len(grid) >= 2:
+            columns["feed_rate_m_min"] = np.abs(np.gradient(depth, grid)) * 60
+        else:
+            columns["feed_rate_m_min"] = np.zeros(len(grid))
+        
+        return AlignedSensorBlock(
+            timestamps=grid,
+            columns=columns,
+            sensors_active=len(active),
+            sensors_total=len(self._expected_sensors),
+        )
     
     def get_sensor_health(self) -> dict[str, SensorHealthReport]:
         """
         Get health status for all sensors.
         
+        Returns the reports cached by the background health task, so
+        reads never trigger recomputation. Before the engine is started
+        the cache is filled on first access.
+        
+        Returns:
+            Dictionary mapping sensor_id to health report.
+        """
+        if not self._health_cache and not self._is_running:
+            self.refresh_sensor_health()
+        return self._health_cache
+    
+    def refresh_sensor_health(self) -> dict[str, SensorHealthReport]:
+        """
+        Reassess every buffer and replace the cached health reports.
+        
         Returns:
             Dictionary mapping sensor_id to health report.
         """
@@ -843,6 +2177,7 @@ class SensorFusionEngine:
             )
             reports[sensor_id] = report
         
+        self._health_cache = reports
         return reports
     
     def get_buffer_statistics(self) -> dict[str, dict[str, float]]:
@@ -853,39 +2188,38 @@ class SensorFusionEngine:
         }
     
     async def _fusion_loop(self) -> None:
-        """Main fusion loop running at regular intervals."""
-        fusion_interval = 0.1  # 10 Hz fusion rate
+        """
+        Event-driven fusion loop.
+        
+        Sleeps until a watched sensor produces new data, then fuses at
+        most once per ``1 / fusion_max_rate_hz`` seconds; readings that
+        arrive in between are coalesced into the next fusion. When no data
+        arrives, a heartbeat fusion runs every ``1 / fusion_min_rate_hz``
+        seconds so stale sensors age out (a min rate of 0 disables it).
+        """
+        loop = asyncio.get_running_loop()
+        min_interval = 1.0 / self.config.fusion_max_rate_hz
+        heartbeat = (
+            1.0 / self.config.fusion_min_rate_hz
+            if self.config.fusion_min_rate_hz > 0 else None
+        )
+        last_fusion = float("-inf")
         
         while self._is_running:
             try:
-                # Fuse sensor data
-                fused = self._fuse_sensors()
+                try:
+                    await asyncio.wait_for(self._data_event.wait(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    pass
                 
-                if fused:
-                    self._fused_data = fused
-                    self._last_fusion_time = datetime.utcnow()
-                    
-                    # Notify callbacks
-                    for callback in self._data_callbacks:
-                        try:
-                            callback(fused)
-                        except Exception as e:
-                            logger.error(f"Data callback error: {e}")
-                    
-                    # Run prediction if predictor available
-                    if self.predictor and self.predictor.is_trained:
-                        try:
-                            prediction = self.predictor.predict(fused.to_sensor_input())
-                            
-                            for callback in self._prediction_callbacks:
-                                try:
-                                    callback(prediction)
-                                except Exception as e:
-                                    logger.error(f"Prediction callback error: {e}")
-                        except Exception as e:
-                            logger.error(f"Prediction error: {e}")
+                # Coalesce bursts up to the maximum fusion rate
+                delay = last_fusion + min_interval - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
                 
-                await asyncio.sleep(fusion_interval)
+                self._data_event.clear()
+                last_fusion = loop.time()
+                self._run_fusion()
                 
             except asyncio.CancelledError:
                 break
@@ -893,43 +2227,116 @@ class SensorFusionEngine:
                 logger.error(f"Fusion loop error: {e}")
                 await asyncio.sleep(1.0)
     
-    def _fuse_sensors(self) -> Optional[FusedSensorData]:
+    async def _health_loop(self) -> None:
+        """Refresh cached health reports every health_check_interval_s."""
+        while self._is_running:
+            try:
+                await asyncio.sleep(self.config.health_check_interval_s)
+                self.refresh_sensor_health()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Health loop error: {e}")
+    
+    def _run_fusion(self) -> None:
+        """Fuse current data and notify data and prediction callbacks."""
+        if self.config.fusion_mode == "aligned":
+            block = self.get_aligned_data(since=self._last_aligned_ts)
+            if block is None:
+                return
+            self._last_aligned_ts = float(block.timestamps[-1])
+            
+            for callback in self._block_callbacks:
+                try:
+                    callback(block)
+                except Exception as e:
+                    logger.error(f"Block callback error: {e}")
+            
+            fused = block.row(-1)
+        else:
+            fused = self._fuse_sensors()
+        
+        if not fused:
+            return
+        
+        self._fused_data = fused
+        self._last_fusion_time = fused.timestamp
+        self._fusion_count += 1
+        
+        # Notify callbacks
+        for callback in self._data_callbacks:
+            try:
+                callback(fused)
+            except Exception as e:
+                logger.error(f"Data callback error: {e}")
+        
+        # Run prediction if predictor available
+        if self.inference_server is not None and self.inference_server.is_running:
+            # One request in flight; ticks that arrive meanwhile are skipped
+            if self._prediction_task is None or self._prediction_task.done():
+                self._prediction_task = asyncio.create_task(self._predict_via_server(fused))
+        elif self.predictor and self.predictor.is_trained:
+            try:
+                self._notify_prediction(self.predictor.predict(fused.to_sensor_input()))
+            except Exception as e:
+                logger.error(f"Prediction error: {e}")
+    
+    async def _predict_via_server(self, fused: FusedSensorData) -> None:
+        """Predict through the inference server and notify callbacks."""
+        try:
+            self._notify_prediction(await self.inference_server.predict(fused.to_sensor_input()))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Prediction error: {e}")
+    
+    def _notify_prediction(self, prediction: dict[str, Any]) -> None:
+        """Pass a prediction to the prediction callbacks."""
+        for callback in self._prediction_callbacks:
+            try:
+                callback(prediction)
+            except Exception as e:
+                logger.error(f"Prediction callback error: {e}")
+    
+    def _fuse_sensors(self, include_raw_readings: bool = False) -> Optional[FusedSensorData]:
         """
         Fuse all sensor readings into a single data point.
         
+        Args:
+            include_raw_readings: Populate ``raw_readings`` even if no
+                subscriber asked for them
+        
         Returns:
             FusedSensorData or None if insufficient data.
         """
         # Collect latest values from each sensor type
         values = {}
-        raw_readings = {}
+        raw_readings = {} if include_raw_readings or self._raw_reading_subscribers else None
         sensors_active = 0
+        now = time.time()
         
-        for sensor_type, default_sensor_id in self._expected_sensors.items():
-            # Find buffer for this sensor type
-            buffer = None
-            for sid, buf in self._buffers.items():
-                if self._sensor_mapping.get(sid) == sensor_type:
-                    buffer = buf
-                    break
+        for sensor_type in self._expected_sensors:
+            buffer = self._type_index.get(sensor_type)
             
             if buffer is None or buffer.is_empty:
                 values[sensor_type] = self._get_default_value(sensor_type)
                 continue
             
             # Check data freshness
-            latest = buffer.latest
-            if latest:
-                age = (datetime.utcnow() - latest.timestamp).total_seconds()
-                if age <= self.config.max_data_age_s:
-                    values[sensor_type] = latest.value
-                    raw_readings[sensor_type] = latest
-                    sensors_active += 1
-                else:
-                    values[sensor_type] = self._get_default_value(sensor_type)
+            age = now - buffer.latest_timestamp
+            if age <= self.config.max_data_age_s:
+                values[sensor_type] = buffer.latest_value
+                if raw_readings is not None:
+                    raw_readings[sensor_type] = buffer.latest
+                sensors_active += 1
             else:
                 values[sensor_type] = self._get_default_value(sensor_type)
         
+        # Spectral features from vibration samples since the last fusion
+        spectrum = self._update_vibration_spectrum()
+        if spectrum is not None and now - spectrum.timestamp > self.config.max_data_age_s:
+            spectrum = None
+        
         # Calculate overall quality
         total_sensors = len(self._expected_sensors)
         quality = sensors_active / total_sensors if total_sensors > 0 else 0
@@ -946,16 +2353,16 @@ class SensorFusionEngine:
         
         # Calculate feed rate from depth changes
         feed_rate = 0.0
-        depth_buffer = self._buffers.get(self._expected_sensors.get("depth"))
+        depth_buffer = self._type_index.get("depth")
         if depth_buffer and depth_buffer.count >= 10:
             recent_depths = depth_buffer.get_values(10)
             if len(recent_depths) >= 2:
-                depth_change = recent_depths[-1] - recent_depths[0]
+                depth_change = float(recent_depths[-1]) - float(recent_depths[0])
                 # Assume 10 readings over ~1 second
                 feed_rate = abs(depth_change) * 60  # m/min
         
         return FusedSensorData(
-            timestamp=datetime.utcnow(),
+            timestamp=_from_epoch(now),
             rpm=values.get("rpm", 0.0),
             current_a=values.get("current", 0.0),
             vibration_g=values.get("vibration", 0.0),
@@ -969,6 +2376,7 @@ class SensorFusionEngine:
             overall_quality=quality,
             sensors_active=sensors_active,
             sensors_total=total_sensors,
+            vibration_spectrum=spectrum,
             raw_readings=raw_readings,
         )
     
@@ -980,7 +2388,8 @@ class SensorFusionEngine:
             "temperature_hydraulic": self.config.temperature.sampling_rate_hz,
             "temperature_motor": self.config.temperature.sampling_rate_hz,
             "pressure": self.config.pressure.sampling_rate_hz,
-            "acoustic": 100.0,  # Downsampled from high rate
+            "acoustic": self.config.acoustic.output_rate_hz,  # Decimated from raw rate
+            "acoustic_band": self.config.acoustic.output_rate_hz,
             "power": self.config.power.sampling_rate_hz,
             "rpm": 10.0,
             "current": 10.0,
@@ -997,6 +2406,7 @@ class SensorFusionEngine:
             "temperature_motor": (0.0, 150.0),
             "pressure": (0.0, 500.0),
             "acoustic": (20.0, 140.0),
+            "acoustic_band": (0.0, 140.0),
             "power": (0.0, 500.0),
             "rpm": (0.0, 300.0),
             "current": (0.0, 500.0),
@@ -1020,6 +2430,163 @@ class SensorFusionEngine:
         return defaults.get(sensor_type, 0.0)
 
 
+# =============================================================================
+# Binary Sensor Frames
+# =============================================================================
+
+# Frame layout (all fields little-endian):
+#
+#   offset  size  field
+#   0       2     magic b"SF"
+#   2       1     format version (1)
+#   3       1     sensor type code (see SENSOR_TYPE_CODES, 0 = unknown)
+#   4       2     sensor id length N in bytes (uint16)
+#   6       1     quality code (uint8, quality * 255)
+#   7       1     reserved (0)
+#   8       8     start timestamp, epoch seconds (float64)
+#   16      8     sample period, seconds (float64)
+#   24      4     sample count M (uint32)
+#   28      N     sensor id (UTF-8)
+#   28+N    0-3   zero padding to a 4-byte boundary
+#   ...     4*M   sample values (float32)
+#
+# Frames may be concatenated in one payload. A 50 kHz acoustic stream sent
+# in 5000-sample frames carries ~40 bytes of overhead per 20 kB of data.
+FRAME_MAGIC = b"SF"
+FRAME_VERSION = 1
+_FRAME_HEADER = struct.Struct("<2sBBHBxddI")
+_FRAME_DTYPE = np.dtype("<f4")
+
+SENSOR_TYPE_CODES = {
+    "rpm": 1,
+    "current": 2,
+    "vibration": 3,
+    "depth": 4,
+    "pressure": 5,
+    "temperature_hydraulic": 6,
+    "temperature_motor": 7,
+    "acoustic": 8,
+    "power": 9,
+}
+_SENSOR_TYPE_NAMES = {code: name for name, code in SENSOR_TYPE_CODES.items()}
+
+
+@dataclass
+class SensorFrame:
+    """Evenly sampled block of values for one sensor."""
+    sensor_id: str
+    sensor_type: str
+    start_timestamp: float  # Epoch seconds of the first sample
+    sample_period_s: float
+    values: np.ndarray  # float32, may be a read-only view of the payload
+    quality: float = 1.0
+    
+    def __len__(self) -> int:
+        return len(self.values)
+    
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Epoch timestamps of every sample."""
+        return self.start_timestamp + np.arange(len(self.values)) * self.sample_period_s
+
+
+def is_binary_frame(payload: bytes) -> bool:
+    """Check whether a payload starts with a binary sensor frame."""
+    return bytes(payload[:2]) == FRAME_MAGIC
+
+
+def encode_sensor_frame(
+    sensor_id: str,
+    sensor_type: str,
+    values: Any,
+    start_timestamp: float,
+    sample_period_s: float,
+    quality: float = 1.0,
+) -> bytes:
+    """
+    Encode samples as a binary sensor frame.
+    
+    Args:
+        sensor_id: Sensor identifier
+        sensor_type: Sensor type (unknown types are sent as code 0)
+        values: Sample values
+        start_timestamp: Epoch seconds of the first sample
+        sample_period_s: Time between samples in seconds
+        quality: Quality score (0-1) for the whole frame
+        
+    Returns:
+        Encoded frame bytes.
+    """
+    values = np.ascontiguousarray(values, dtype=_FRAME_DTYPE).ravel()
+    id_bytes = sensor_id.encode("utf-8")
+    header = _FRAME_HEADER.pack(
+        FRAME_MAGIC,
+        FRAME_VERSION,
+        SENSOR_TYPE_CODES.get(sensor_type, 0),
+        len(id_bytes),
+        int(round(min(max(quality, 0.0), 1.0) * _QUALITY_SCALE)),
+        float(start_timestamp),
+        float(sample_period_s),
+        len(values),
+    )
+    padding = b"\0" * (-(len(header) + len(id_bytes)) % 4)
+    return b"".join((header, id_bytes, padding, values.tobytes()))
+
+
+def decode_sensor_frames(
+    payload: bytes,
+    default_sensor_type: str = "unknown",
+) -> list[SensorFrame]:
+    """
+    Decode one or more concatenated binary sensor frames.
+    
+    Sample values are returned as read-only ``np.frombuffer`` views of
+    the payload, so decoding does not copy sample data.
+    
+    Args:
+        payload: Raw payload (bytes, bytearray or memoryview)
+        default_sensor_type: Type used for frames with type code 0
+        
+    Returns:
+        List of decoded frames.
+        
+    Raises:
+        ValueError: If the payload is truncated or not a valid frame.
+    """
+    frames = []
+    offset = 0
+    total = len(payload)
+    
+    while offset < total:
+        if total - offset < _FRAME_HEADER.size:
+            raise ValueError("Truncated sensor frame header")
+        magic, version, type_code, id_len, quality_code, start, period, count = (
+            _FRAME_HEADER.unpack_from(payload, offset)
+        )
+        if magic != FRAME_MAGIC:
+            raise ValueError("Invalid sensor frame magic")
+        if version != FRAME_VERSION:
+            raise ValueError(f"Unsupported sensor frame version: {version}")
+        
+        id_start = offset + _FRAME_HEADER.size
+        data_start = id_start + id_len + (-(_FRAME_HEADER.size + id_len) % 4)
+        data_end = data_start + count * _FRAME_DTYPE.itemsize
+        if data_end > total:
+            raise ValueError("Truncated sensor frame data")
+        
+        frames.append(SensorFrame(
+            sensor_id=bytes(payload[id_start:id_start + id_len]).decode("utf-8"),
+            sensor_type=_SENSOR_TYPE_NAMES.get(type_code, default_sensor_type),
+            start_timestamp=start,
+            sample_period_s=period,
+            values=np.frombuffer(payload, dtype=_FRAME_DTYPE, count=count, offset=data_start),
+            quality=quality_code / _QUALITY_SCALE,
+        ))
+        offset = data_end
+    
+    return frames
+
+
 # =============================================================================
 # MQTT Client for Sensor Data
 # =============================================================================
@@ -1030,12 +2597,49 @@ class MQTTSensorClient:
     
     Connects to MQTT broker and routes incoming sensor messages
     to the SensorFusionEngine.
+    
+    Messages are put on a bounded queue as they arrive and drained in
+    batches by a separate ingest task, which decodes them into columns
+    and hands each batch to ``SensorFusionEngine.process_columns``. When
+    fusion stalls and the queue fills, ``MQTTConfig.drop_policy`` decides
+    what is discarded:
+    
+    - ``oldest``: evict the oldest queued message
+    - ``newest``: drop the incoming message
+    - ``downsample``: above the high-water mark keep only every
+      ``downsample_factor``-th message per sensor, then evict oldest
+    
+    Payloads are JSON, either a single reading::
+    
+        {"value": 2.5, "unit": "g", "timestamp": "...", "quality": 1.0}
+    
+    or a batch of evenly spaced samples::
+    
+        {"values": [...], "timestamp": 1718000000.0, "sample_period_s": 0.001}
+    
+    where ``timestamp`` (ISO string or epoch seconds) is the first
+    sample's time. High-rate streams should publish binary sensor frames
+    (see ``encode_sensor_frame``) instead; they are detected by their
+    magic bytes and decoded without copying. A frame with type code 0
+    takes its sensor type from the topic.
+    
+    Topics are ``<prefix>/<sensor_type>/<sensor_id>`` for a single rig,
+    or ``<prefix>/<rig_id>/<sensor_type>/<sensor_id>`` in fleet mode.
+    With ``engine_for_rig`` set, each rig's messages go to that rig's
+    fusion engine, and ``rig_filter`` drops messages for rigs this
+    process does not own.
     """
     
+    # Upper bound on distinct topics kept in the parse cache
+    TOPIC_CACHE_SIZE = 4096
+    
     def __init__(
         self,
-        fusion_engine: SensorFusionEngine,
+        fusion_engine: Optional[SensorFusionEngine],
         config: Optional[MQTTConfig] = None,
+        engine_for_rig: Optional[Callable[[str], Awaitable[SensorFusionEngine]]] = None,
+        rig_filter: Optional[Callable[[str], bool]] = None,
+        default_rig_id: Optional[str] = None,
     ):
         """
         Initialize MQTT client.
@@ -1043,14 +2647,40 @@ class MQTTSensorClient:
         Args:
             fusion_engine: Sensor fusion engine to send data to
             config: MQTT configuration
+            engine_for_rig: Resolves a rig id to its fusion engine (fleet mode)
+            rig_filter: Returns False for rigs whose messages are dropped
+            default_rig_id: Rig for topics without a rig segment
         """
+        if fusion_engine is None and engine_for_rig is None:
+            raise ValueError("fusion_engine or engine_for_rig is required")
         self.fusion_engine = fusion_engine
         self.config = config or get_settings().mqtt
+        self.engine_for_rig = engine_for_rig
+        self.rig_filter = rig_filter
+        self.default_rig_id = default_rig_id or get_settings().fleet.default_rig_id
+        self._topic_prefix = self.config.sensor_topic_prefix.strip("/").split("/")
         
         self._client = None
         self._is_connected = False
         self._reconnect_task: Optional[asyncio.Task] = None
         
+        # Ingestion pipeline
+        self._queue: asyncio.Queue[tuple[str, bytes, float]] = asyncio.Queue(
+            maxsize=self.config.ingest_queue_size
+        )
+        self._ingest_task: Optional[asyncio.Task] = None
+        self._topic_cache: dict[str, tuple[str, str, str]] = {}
+        self._downsample_counters: dict[str, int] = defaultdict(int)
+        self._stats = {
+            "received": 0,
+            "ingested_readings": 0,
+            "dropped_oldest": 0,
+            "dropped_newest": 0,
+            "downsampled": 0,
+            "other_rig": 0,
+            "decode_errors": 0,
+        }
+        
         logger.info(f"MQTTSensorClient initialized for {self.config.broker_host}:{self.config.broker_port}")
     
     @property
@@ -1058,6 +2688,24 @@ class MQTTSensorClient:
         """Check if connected to broker."""
         return self._is_connected
     
+    @property
+    def queue_depth(self) -> int:
+        """Number of messages waiting to be ingested."""
+        return self._queue.qsize()
+    
+    def get_ingest_stats(self) -> dict[str, int]:
+        """
+        Get ingestion pipeline counters.
+        
+        Returns:
+            Dictionary with queue depth/capacity and message counters.
+        """
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            **self._stats,
+        }
+    
     async def connect(self) -> bool:
         """
         Connect to MQTT broker.
@@ -1100,6 +2748,8 @@ class MQTTSensorClient:
     
     async def disconnect(self) -> None:
         """Disconnect from MQTT broker."""
+        await self._stop_ingest()
+        
         if self._client and self._is_connected:
             try:
                 await self._client.__aexit__(None, None, None)
@@ -1112,57 +2762,253 @@ class MQTTSensorClient:
         """
         Listen for incoming sensor messages.
         
-        This is a blocking call that processes messages until stopped.
+        This is a blocking call that enqueues messages until stopped;
+        decoding and fusion ingestion run in a separate ingest task.
         """
         if not self._is_connected or not self._client:
             logger.warning("Cannot listen - not connected")
             return
         
+        if self._ingest_task is None or self._ingest_task.done():
+            self._ingest_task = asyncio.create_task(self._ingest_loop())
+        
         try:
             async for message in self._client.messages:
-                await self._process_message(message)
+                self.enqueue(str(message.topic), message.payload)
         except Exception as e:
             logger.error(f"MQTT listen error: {e}")
             self._is_connected = False
     
-    async def _process_message(self, message) -> None:
-        """Process incoming MQTT message."""
-        try:
-            # Parse topic to get sensor info
-            # Expected format: ehs/simba/sensors/<sensor_type>/<sensor_id>
-            topic_parts = str(message.topic).split("/")
+    def enqueue(self, topic: str, payload: bytes) -> bool:
+        """
+        Queue a raw message for ingestion, applying the drop policy.
+        
+        Args:
+            topic: MQTT topic
+            payload: Raw message payload
             
-            if len(topic_parts) >= 5:
-                sensor_type = topic_parts[-2]
-                sensor_id = topic_parts[-1]
-            else:
-                sensor_type = "unknown"
-                sensor_id = topic_parts[-1] if topic_parts else "unknown"
+        Returns:
+            True if the message was queued.
+        """
+        self._stats["received"] += 1
+        queue = self._queue
+        policy = self.config.drop_policy
+        
+        if self.rig_filter is not None and not self.rig_filter(self._parse_topic(topic)[0]):
+            self._stats["other_rig"] += 1
+            return False
+        
+        if (
+            policy == DropPolicy.DOWNSAMPLE
+            and queue.qsize() >= queue.maxsize * self.config.downsample_high_water
+        ):
+            _, _, sensor_id = self._parse_topic(topic)
+            self._downsample_counters[sensor_id] += 1
+            if self._downsample_counters[sensor_id] % self.config.downsample_factor:
+                self._stats["downsampled"] += 1
+                return False
+        
+        if queue.full():
+            if policy == DropPolicy.NEWEST:
+                self._stats["dropped_newest"] += 1
+                return False
+            queue.get_nowait()
+            self._stats["dropped_oldest"] += 1
+        
+        queue.put_nowait((topic, payload, time.time()))
+        return True
+    
+    async def _ingest_loop(self) -> None:
+        """Drain the queue in batches into the fusion engine."""
+        queue = self._queue
+        batch_max = self.config.ingest_batch_max
+        
+        while True:
+            try:
+                items = [await queue.get()]
+                while len(items) < batch_max:
+                    try:
+                        items.append(queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                await self._ingest(items)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"MQTT ingest error: {e}")
+    
+    async def _stop_ingest(self) -> None:
+        """Cancel the ingest task."""
+        if self._ingest_task:
+            self._ingest_task.cancel()
+            try:
+                await self._ingest_task
+            except asyncio.CancelledError:
+                pass
+            self._ingest_task = None
+    
+    async def _ingest(self, items: list[tuple[str, bytes, float]]) -> int:
+        """
+        Decode queued messages and ingest them, one frame per rig.
+        
+        Args:
+            items: (topic, payload, receive_time) tuples
             
-            # Parse payload
-            payload = json.loads(message.payload.decode())
+        Returns:
+            Number of readings ingested.
+        """
+        if self.engine_for_rig is None:
+            ingested = await self._ingest_into(self.fusion_engine, items)
+        else:
+            by_rig: dict[str, list[tuple[str, bytes, float]]] = defaultdict(list)
+            for item in items:
+                by_rig[self._parse_topic(item[0])[0]].append(item)
+            ingested = 0
+            for rig_id, rig_items in by_rig.items():
+                engine = await self.engine_for_rig(rig_id)
+                ingested += await self._ingest_into(engine, rig_items)
+        
+        self._stats["ingested_readings"] += ingested
+        return ingested
+    
+    async def _ingest_into(
+        self,
+        engine: SensorFusionEngine,
+        items: list[tuple[str, bytes, float]],
+    ) -> int:
+        """
+        Decode messages for one engine and ingest them in arrival order.
+        
+        JSON readings and batches are gathered into one columnar frame;
+        a binary payload first flushes the columns gathered so far, so
+        each sensor's rows reach its buffer in the order they arrived.
+        
+        Args:
+            engine: Fusion engine receiving the readings
+            items: (topic, payload, receive_time) tuples
             
-            # Create sensor reading
-            reading = SensorReading(
-                sensor_id=sensor_id,
-                sensor_type=sensor_type,
-                value=float(payload.get("value", 0)),
-                unit=payload.get("unit", ""),
-                timestamp=datetime.fromisoformat(payload["timestamp"]) 
-                    if "timestamp" in payload else datetime.utcnow(),
-                quality=float(payload.get("quality", 1.0)),
-                metadata=payload.get("metadata", {}),
+        Returns:
+            Number of readings ingested.
+        """
+        # Single readings are collected row-wise, batches as array segments
+        rows: list[tuple[str, str, float, float, float]] = []
+        segments: list[tuple[Any, Any, np.ndarray, np.ndarray, Any]] = []
+        units: dict[str, str] = {}
+        ingested = 0
+        
+        def flush_rows() -> None:
+            if rows:
+                ids, types, timestamps, values, quality = zip(*rows)
+                segments.append((
+                    np.array(ids),
+                    np.array(types),
+                    np.array(timestamps),
+                    np.array(values, dtype=np.float32),
+                    np.array(quality),
+                ))
+                rows.clear()
+        
+        async def flush_columns() -> int:
+            flush_rows()
+            if not segments:
+                return 0
+            lengths = [len(segment[3]) for segment in segments]
+            count = await engine.process_columns(
+                np.concatenate([np.broadcast_to(s[0], n) for s, n in zip(segments, lengths)]),
+                np.concatenate([np.broadcast_to(s[1], n) for s, n in zip(segments, lengths)]),
+                np.concatenate([s[2] for s in segments]),
+                np.concatenate([s[3] for s in segments]),
+                np.concatenate([np.broadcast_to(s[4], n) for s, n in zip(segments, lengths)]),
+                units=units,
             )
+            segments.clear()
+            return count
+        
+        for topic, payload, received_at in items:
+            try:
+                _, sensor_type, sensor_id = self._parse_topic(topic)
+                if is_binary_frame(payload):
+                    frames = decode_sensor_frames(payload, sensor_type)
+                    ingested += await flush_columns()
+                    ingested += await engine.process_frames(frames)
+                    continue
+                data = json.loads(payload)
+                if data.get("unit"):
+                    units[sensor_id] = str(data["unit"])
+                
+                if "values" in data:
+                    samples = np.asarray(data["values"], dtype=np.float32).ravel()
+                    period = float(data.get("sample_period_s", 0.0))
+                    start = (
+                        _parse_timestamp(data["timestamp"]) if "timestamp" in data
+                        else received_at - period * (len(samples) - 1)
+                    )
+                    flush_rows()
+                    segments.append((
+                        sensor_id,
+                        sensor_type,
+                        start + np.arange(len(samples)) * period,
+                        samples,
+                        float(data.get("quality", 1.0)),
+                    ))
+                else:
+                    rows.append((
+                        sensor_id,
+                        sensor_type,
+                        _parse_timestamp(data["timestamp"]) if "timestamp" in data
+                        else received_at,
+                        float(data.get("value", 0)),
+                        float(data.get("quality", 1.0)),
+                    ))
+            except (ValueError, TypeError, KeyError) as e:
+                # json.JSONDecodeError is a ValueError
+                self._stats["decode_errors"] += 1
+                logger.warning(f"Invalid MQTT sensor payload on {topic}: {e}")
+        
+        return ingested + await flush_columns()
+    
+    def _parse_topic(self, topic: str) -> tuple[str, str, str]:
+        """
+        Parse (rig_id, sensor_type, sensor_id) from a topic, with caching.
+        
+        Expected format: ehs/simba/sensors/[<rig_id>/]<sensor_type>/<sensor_id>
+        """
+        parsed = self._topic_cache.get(topic)
+        if parsed is None:
+            topic_parts = topic.split("/")
+            prefix_len = len(self._topic_prefix)
+            rest = topic_parts[prefix_len:]
             
-            # Send to fusion engine
-            await self.fusion_engine.process_reading(reading)
+            if topic_parts[:prefix_len] == self._topic_prefix and len(rest) == 3:
+                parsed = (rest[0], rest[1], rest[2])
+            elif len(topic_parts) >= 5:
+                parsed = (self.default_rig_id, topic_parts[-2], topic_parts[-1])
+            else:
+                parsed = (
+                    self.default_rig_id,
+                    "unknown",
+                    topic_parts[-1] if topic_parts else "unknown",
+                )
             
-        except json.JSONDecodeError as e:
-            logger.warning(f"Invalid JSON in MQTT message: {e}")
+            if len(self._topic_cache) < self.TOPIC_CACHE_SIZE:
+                self._topic_cache[topic] = parsed
+        return parsed
+    
+    async def _process_message(self, message) -> None:
+        """Process a single incoming MQTT message immediately."""
+        try:
+            await self._ingest([(str(message.topic), message.payload, time.time())])
         except Exception as e:
             logger.error(f"Error processing MQTT message: {e}")
 
 
+def _parse_timestamp(value: Any) -> float:
+    """Parse an ISO string or epoch-seconds number to epoch seconds."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    return _to_epoch(datetime.fromisoformat(value))
+
+
 # =============================================================================
 # Convenience Functions
 # =============================================================================
@@ -1189,12 +3035,26 @@ __all__ = [
     "SensorStatus",
     "DataQuality",
     "SensorReading",
+    "VibrationSpectrum",
     "FusedSensorData",
+    "AlignedSensorBlock",
     "SensorHealthReport",
+    "SensorFrame",
     "SensorBuffer",
     "DataPreprocessor",
+    "StreamingFilter",
+    "StreamingOutlierClipper",
+    "StreamingSmoother",
+    "StreamingPipeline",
+    "AcousticWindows",
+    "AcousticDecimator",
+    "VibrationSpectralEngine",
     "SensorFusionEngine",
     "MQTTSensorClient",
+    "SENSOR_TYPE_CODES",
+    "encode_sensor_frame",
+    "decode_sensor_frames",
+    "is_binary_frame",
     "get_fusion_engine",
 ]
 
@@ -0,0 +1,253 @@
+"""
+Distilled Student Models for Advanced EHS Simba Drill System.
+
+This module provides:
+- StudentModel: a compact material classifier stored as a few NumPy
+  arrays in one ``.npz`` file and evaluated with a handful of NumPy
+  operations
+- Fitting of a multinomial logistic ("softmax") student or a single
+  shallow regression-tree student on teacher soft labels
+
+Students take the raw feature matrix: the softmax student has the
+teacher's scaler folded into its weights, and tree splits do not depend
+on scaling. See distillation for training against the ensemble.
+
+Author: EHS Simba Team
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+from scipy.optimize import minimize
+from sklearn.tree import DecisionTreeRegressor
+
+_ARRAYS = ("coef", "intercept", "feature", "threshold", "left", "right", "leaf_index", "leaf_value")
+
+
+# =============================================================================
+# Student Model
+# =============================================================================
+
+@dataclass
+class StudentModel:
+    """
+    Compact classifier distilled from the material ensemble.
+    
+    Attributes:
+        kind: "softmax" or "tree"
+        classes: Class labels in predict_proba column order
+        coef: Weights on raw features, (n_features, n_classes) (softmax)
+        intercept: Bias per class (softmax)
+        feature: Split feature per node (tree; 0 at leaves)
+        threshold: Split threshold per node (tree; go left if x <= threshold)
+        left: Left child per node (tree; self at leaves)
+        right: Right child per node (tree; self at leaves)
+        leaf_index: Row of ``leaf_value`` per node (tree)
+        leaf_value: Class probabilities per leaf (tree)
+        max_depth: Deepest root-to-leaf path (tree)
+    """
+    kind: str
+    classes: np.ndarray
+    coef: Optional[np.ndarray] = None
+    intercept: Optional[np.ndarray] = None
+    feature: Optional[np.ndarray] = None
+    threshold: Optional[np.ndarray] = None
+    left: Optional[np.ndarray] = None
+    right: Optional[np.ndarray] = None
+    leaf_index: Optional[np.ndarray] = None
+    leaf_value: Optional[np.ndarray] = None
+    max_depth: int = 0
+    
+    @property
+    def nbytes(self) -> int:
+        """Total size of the model arrays."""
+        return sum(getattr(self, name).nbytes for name in _ARRAYS if getattr(self, name) is not None)
+    
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities.
+        
+        Args:
+            X: Raw feature matrix (n_samples, n_features)
+        
+        Returns:
+            Probabilities, shape (n_samples, n_classes).
+        """
+        X = np.atleast_2d(X)
+        if self.kind == "softmax":
+            z = X @ self.coef + self.intercept
+            z -= z.max(axis=1, keepdims=True)
+            proba = np.exp(z)
+            return proba / proba.sum(axis=1, keepdims=True)
+        
+        # Trees were fitted on float32 features, as sklearn casts them
+        X = np.asarray(X, dtype=np.float32)
+        if len(X) == 1:
+            # One row: a scalar walk beats max_depth rounds of array ops
+            row, node = X[0].tolist(), 0
+            feature, threshold = self.feature, self.threshold
+            while self.left[node] != node:
+                node = self.left[node] if row[feature[node]] <= threshold[node] else self.right[node]
+            return self.leaf_value[self.leaf_index[node]][None, :].astype(np.float64)
+        
+        rows = np.arange(len(X))
+        nodes = np.zeros(len(X), dtype=np.intp)
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return self.leaf_value[self.leaf_index[nodes]].astype(np.float64)
+    
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Write the model to one ``.npz`` file.
+        
+        Args:
+            path: Target file
+        """
+        arrays = {name: getattr(self, name) for name in _ARRAYS if getattr(self, name) is not None}
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                kind=np.array(self.kind),
+                classes=np.asarray(self.classes, dtype=str),
+                max_depth=np.array(self.max_depth),
+                **arrays,
+            )
+    
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> StudentModel:
+        """
+        Load a model written by ``save``.
+        
+        Args:
+            path: ``.npz`` file
+        
+        Returns:
+            StudentModel with its arrays in memory.
+        """
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in _ARRAYS if name in data.files}
+            return cls(
+                kind=str(data["kind"]),
+                classes=data["classes"].astype(object),
+                max_depth=int(data["max_depth"]),
+                **arrays,
+            )
+
+
+# =============================================================================
+# Fitting
+# =============================================================================
+
+def fit_softmax_student(
+    X: np.ndarray,
+    soft_labels: np.ndarray,
+    classes: np.ndarray,
+    mean: np.ndarray,
+    scale: np.ndarray,
+    l2: float = 1e-4,
+    max_iter: int = 500,
+) -> StudentModel:
+    """
+    Fit a multinomial logistic student by cross-entropy on soft labels.
+    
+    The model is fitted on standardized features (L-BFGS) and the
+    standardization is then folded into the weights.
+    
+    Args:
+        X: Raw feature matrix of the transfer set
+        soft_labels: Teacher class probabilities per row
+        classes: Class labels in soft_labels column order
+        mean: Feature means of the teacher's scaler
+        scale: Feature scales of the teacher's scaler
+        l2: L2 penalty on the weights
+        max_iter: L-BFGS iteration limit
+    
+    Returns:
+        Softmax StudentModel on raw features.
+    """
+    Z = (X - mean) / scale
+    n_rows, n_features = Z.shape
+    n_classes = soft_labels.shape[1]
+    
+    def loss(params: np.ndarray) -> tuple[float, np.ndarray]:
+        W = params[:-n_classes].reshape(n_features, n_classes)
+        logits = Z @ W + params[-n_classes:]
+        logits -= logits.max(axis=1, keepdims=True)
+        log_proba = logits - np.log(np.exp(logits).sum(axis=1, keepdims=True))
+        residual = (np.exp(log_proba) - soft_labels) / n_rows
+        value = -np.sum(soft_labels * log_proba) / n_rows + 0.5 * l2 * np.sum(W ** 2)
+        grad = np.concatenate([(Z.T @ residual + l2 * W).ravel(), residual.sum(axis=0)])
+        return value, grad
+    
+    result = minimize(
+        loss, np.zeros(n_features * n_classes + n_classes), jac=True,
+        method="L-BFGS-B", options={"maxiter": max_iter},
+    )
+    W = result.x[:-n_classes].reshape(n_features, n_classes)
+    b = result.x[-n_classes:]
+    
+    return StudentModel(
+        kind="softmax",
+        classes=np.asarray(classes, dtype=object),
+        coef=W / scale[:, None],
+        intercept=b - (mean / scale) @ W,
+    )
+
+
+def fit_tree_student(
+    X: np.ndarray,
+    soft_labels: np.ndarray,
+    classes: np.ndarray,
+    max_depth: int = 8,
+    min_samples_leaf: int = 5,
+    random_state: Optional[int] = None,
+) -> StudentModel:
+    """
+    Fit one regression tree to the soft labels (leaves hold mean probabilities).
+    
+    Args:
+        X: Raw feature matrix of the transfer set
+        soft_labels: Teacher class probabilities per row
+        classes: Class labels in soft_labels column order
+        max_depth: Tree depth limit
+        min_samples_leaf: Minimum transfer rows per leaf
+        random_state: Seed for tie-breaking between splits
+    
+    Returns:
+        Tree StudentModel.
+    """
+    tree = DecisionTreeRegressor(
+        max_depth=max_depth, min_samples_leaf=min_samples_leaf, random_state=random_state,
+    ).fit(X, soft_labels).tree_
+    
+    node_ids = np.arange(tree.node_count)
+    is_leaf = tree.children_left == -1
+    leaf_index = np.zeros(tree.node_count, dtype=np.int32)
+    leaf_index[is_leaf] = np.arange(is_leaf.sum())
+    index_dtype = np.int16 if tree.node_count < 2 ** 15 else np.int32
+    
+    return StudentModel(
+        kind="tree",
+        classes=np.asarray(classes, dtype=object),
+        feature=np.where(is_leaf, 0, tree.feature).astype(np.int16),
+        threshold=np.where(is_leaf, 0.0, tree.threshold),
+        left=np.where(is_leaf, node_ids, tree.children_left).astype(index_dtype),
+        right=np.where(is_leaf, node_ids, tree.children_right).astype(index_dtype),
+        leaf_index=leaf_index.astype(index_dtype),
+        leaf_value=tree.value[is_leaf, :, 0].astype(np.float32),
+        max_depth=int(tree.max_depth),
+    )
+
+
+# Convenience exports
+__all__ = [
+    "StudentModel",
+    "fit_softmax_student",
+    "fit_tree_student",
+]
@@ -298,6 +298,7 @@ class SupabaseManager:
         pressure_bar: Optional[float] = None,
         temperature_c: Optional[float] = None,
         class_probabilities: Optional[dict] = None,
+        model_version: Optional[str] = None,
     ) -> dict:
         """Insert a new material prediction."""
         data = {
@@ -311,6 +312,7 @@ class SupabaseManager:
             "pressure_bar": pressure_bar,
             "temperature_c": temperature_c,
             "class_probabilities": class_probabilities or {},
+            "model_version": model_version,
         }
         
         result = self.client.table(TABLE_MATERIAL_PREDICTIONS).insert(data).execute()
@@ -0,0 +1,21 @@
+"""
+Shared fixtures for the Advanced EHS Simba Drill System tests.
+"""
+
+import pytest
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ml_predictor import MaterialPredictor
+
+
+@pytest.fixture(scope="module")
+def trained_predictor():
+    """Predictor trained on a small synthetic dataset (one per test module)."""
+    model = MaterialPredictor()
+    X, y = model.generate_synthetic_data(samples_per_material=30, seed=7)
+    model.train(X, y, save_model=False)
+    return model
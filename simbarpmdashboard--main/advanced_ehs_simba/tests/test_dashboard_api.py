@@ -0,0 +1,190 @@
+"""
+Unit tests for the dashboard API endpoints.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import dashboard_api
+from config import FleetConfig, LiveDataConfig, MaterialPredictorConfig, get_settings
+from fleet import FleetRouter, FleetShard, build_shard_ring
+from inference_server import MicroBatchInferenceServer
+from live_data_plane import INGEST_COMMAND, RecordKind
+from sensor_fusion import FusedSensorData
+
+
+@pytest.fixture
+def api(trained_predictor, monkeypatch):
+    """App state with the trained predictor behind a micro-batching server."""
+    monkeypatch.setattr(dashboard_api, "app_state", dashboard_api.AppState())
+    dashboard_api.app_state.material_predictor = trained_predictor
+    dashboard_api.app_state.inference_server = MicroBatchInferenceServer(
+        trained_predictor, MaterialPredictorConfig(), max_wait_ms=20,
+    )
+    return dashboard_api.app_state
+
+
+async def _post_concurrently(app_state, path, bodies):
+    """POST bodies concurrently (lifespan not run) with the inference server up."""
+    await app_state.inference_server.start()
+    try:
+        transport = httpx.ASGITransport(app=dashboard_api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(client.post(path, json=body) for body in bodies))
+    finally:
+        await app_state.inference_server.stop()
+
+
+class TestPredictEndpoint:
+    """Tests for POST /predict through the inference server."""
+
+    def test_micro_batched_predictions(self, api, trained_predictor):
+        """Test concurrent requests are batched and mapped to PredictionResponse."""
+        bodies = [
+            {"rpm": 280.0, "current_a": 6.5, "vibration_g": 15.0, "depth_m": 12.0},
+            {"rpm": 120.0, "current_a": 3.0, "vibration_g": 4.0, "depth_m": 12.5},
+        ]
+
+        responses = asyncio.run(_post_concurrently(api, "/predict", bodies))
+
+        assert [r.status_code for r in responses] == [200, 200]
+        assert api.inference_server.get_stats()["batches"] == 1
+        for response, body in zip(responses, bodies):
+            data = response.json()
+            expected = trained_predictor.predict({
+                "rpm": body["rpm"],
+                "current": body["current_a"],
+                "vibration_readings": [body["vibration_g"]],
+                "depth": body["depth_m"],
+            })
+            assert data["material"] == expected["predicted_material"]
+            assert data["confidence"] == pytest.approx(expected["confidence"])
+            assert list(data["probabilities"]) == [
+                p["material"] for p in expected["top_3_predictions"]
+            ]
+            assert data["recommended_rpm"] == expected["recommended_rpm"]
+            assert data["depth_m"] == body["depth_m"]
+            assert data["model_version"] == expected["model_version"]
+
+
+class _FakeWebSocket:
+    """Records the text frames sent to it."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data):
+        self.sent.append(data)
+
+
+class TestLiveRelay:
+    """Tests for relaying shard records to WebSocket clients."""
+
+    def test_records_reach_only_clients_following_their_rig(self, monkeypatch):
+        """Test snapshots go to the rig's followers and alerts to everyone."""
+        manager = dashboard_api.ConnectionManager()
+        monkeypatch.setattr(dashboard_api, "ws_manager", manager)
+        default_rig, other_rig = _FakeWebSocket(), _FakeWebSocket()
+
+        async def scenario():
+            await manager.connect(default_rig)
+            await manager.connect(other_rig)
+            manager.subscribe(other_rig, "rig_b")
+            for kind, rig_id in (
+                (RecordKind.SNAPSHOT, "rig_b"),
+                (RecordKind.PREDICTION, "rig_c"),
+                (RecordKind.SNAPSHOT, get_settings().fleet.default_rig_id),
+                (RecordKind.STATUS, "rig_b"),
+                (RecordKind.ALERT, "rig_c"),
+            ):
+                await dashboard_api._relay_live_record(kind, rig_id, f"{kind.name}:{rig_id}")
+
+        asyncio.run(scenario())
+
+        default_rig_id = get_settings().fleet.default_rig_id
+        assert default_rig.sent == [f"SNAPSHOT:{default_rig_id}", "ALERT:rig_c"]
+        assert other_rig.sent == ["SNAPSHOT:rig_b", "ALERT:rig_c"]
+
+
+class TestFleetEquipmentEndpoints:
+    """Tests for energy, maintenance and drilling endpoints in fleet mode."""
+
+    def test_endpoints_answer_from_rig_status(self, monkeypatch):
+        """Test reads come from the rig's published status and writes reach its shard."""
+        records, sent = [], []
+        shard = FleetShard(
+            0, build_shard_ring(1, FleetConfig()),
+            on_record=lambda kind, message: records.append((kind, message)),
+        )
+        router = FleetRouter(1, LiveDataConfig(), FleetConfig(enabled=True, shards=1))
+
+        async def send(kind, payload, rig_id=None):
+            sent.append((kind, json.loads(payload), rig_id))
+
+        monkeypatch.setattr(router, "send", send)
+        monkeypatch.setattr(dashboard_api, "app_state", dashboard_api.AppState())
+        dashboard_api.app_state.fleet = router
+
+        async def scenario():
+            rig = await shard.get_rig("rig_07")
+            rig.equipment.update_drill_bit(450.0, [1.0] * 20, 2.5)
+            start = datetime.utcnow() - timedelta(minutes=3)
+            for i in range(1500):
+                rig.equipment.on_fused_data(FusedSensorData(
+                    timestamp=start + i * timedelta(milliseconds=100),
+                    rpm=80.0, current_a=200.0, vibration_g=2.5, depth_m=12.0,
+                    pressure_bar=200.0, temperature_hydraulic_c=45.0,
+                    temperature_motor_c=50.0, acoustic_db=70.0,
+                    power_kw=150.0, feed_rate_m_min=0.5,
+                ))
+            shard.publish_status()
+            for kind, message in records:
+                router._remember(kind, json.dumps(message).encode())
+
+            transport = httpx.ASGITransport(app=dashboard_api.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                responses = {
+                    "metrics": await client.get("/energy/metrics", params={"rig_id": "rig_07", "hours": 3}),
+                    "rul": await client.get("/maintenance/rul", params={"rig_id": "rig_07"}),
+                    "schedule": await client.get("/maintenance/schedule", params={"rig_id": "rig_07", "days_ahead": 30}),
+                    "missing": await client.get("/energy/efficiency", params={"rig_id": "rig_99"}),
+                    "reading": await client.post("/energy/reading", params={"power_kw": 120.0, "rig_id": "rig_07"}),
+                    "start": await client.post(
+                        "/drilling/start", params={"hole_id": "H-1", "target_depth_m": 20.0, "rig_id": "rig_07"},
+                    ),
+                }
+            for _, command, rig_id in sent:
+                shard.apply_command(rig_id, command)
+            await shard.stop()
+            return rig, responses
+
+        rig, responses = asyncio.run(scenario())
+
+        metrics = responses["metrics"].json()
+        assert metrics["period_hours"] == 8.0
+        assert metrics["total_energy_kwh"] == pytest.approx(rig.energy.get_energy_metrics(8.0).total_energy_kwh)
+        assert responses["rul"].json()["components"] == rig.maintenance.get_rul_summary()
+        schedule = responses["schedule"].json()
+        assert schedule["total_tasks"] > 0
+        assert [t["component_id"] for t in schedule["tasks"]] == [
+            t.component_id for t in rig.maintenance.get_maintenance_schedule(30)
+        ]
+        assert responses["missing"].status_code == 404
+        assert responses["reading"].json() == {"status": "queued"}
+        assert [(kind, command["command"]) for kind, command, _ in sent] == [
+            (INGEST_COMMAND, "power_reading"), (INGEST_COMMAND, "start_session"),
+        ]
+        assert rig.energy.power_monitor.get_current_power() == 120.0
+        assert rig.current_session_id == responses["start"].json()["session_id"]
@@ -0,0 +1,343 @@
+"""
+Unit tests for fleet sharding.
+"""
+
+import asyncio
+import json
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import FleetConfig, LiveDataConfig, MQTTConfig
+from energy_optimizer import EnergyOptimizer
+from fleet import (
+    ConsistentHashRing,
+    FleetRouter,
+    FleetShard,
+    RigEquipmentFeed,
+    build_shard_ring,
+    shard_live_config,
+)
+from live_data_plane import INGEST_READING, IngestServer, LivePublisher, RecordKind
+from maintenance_predictor import PredictiveMaintenanceEngine
+from sensor_fusion import FusedSensorData, MQTTSensorClient
+
+RIGS = [f"rig_{i:02d}" for i in range(1, 401)]
+
+
+def _fused(timestamp, rpm=80.0, vibration_g=1.5):
+    """Fused data point of a rig drilling at steady load."""
+    return FusedSensorData(
+        timestamp=timestamp,
+        rpm=rpm,
+        current_a=200.0,
+        vibration_g=vibration_g,
+        depth_m=12.0,
+        pressure_bar=200.0,
+        temperature_hydraulic_c=45.0,
+        temperature_motor_c=50.0,
+        acoustic_db=70.0,
+        power_kw=150.0,
+        feed_rate_m_min=0.5,
+    )
+
+
+class TestConsistentHashRing:
+    """Tests for the rig -> shard hash ring."""
+
+    def test_assignment_is_deterministic(self):
+        """Test independently built rings agree (every process routes alike)."""
+        first = ConsistentHashRing(range(4))
+        second = ConsistentHashRing(range(4))
+
+        assert [first.node_for(rig) for rig in RIGS] == [second.node_for(rig) for rig in RIGS]
+
+    def test_rigs_spread_across_shards(self):
+        """Test every shard gets a fair share of rigs."""
+        ring = ConsistentHashRing(range(4), virtual_nodes=128)
+        counts = Counter(ring.node_for(rig) for rig in RIGS)
+
+        assert set(counts) == {0, 1, 2, 3}
+        assert min(counts.values()) > len(RIGS) / 4 * 0.6
+
+    def test_adding_shard_only_moves_its_rigs(self):
+        """Test a new shard takes rigs without reshuffling the others."""
+        ring = ConsistentHashRing(range(4))
+        before = {rig: ring.node_for(rig) for rig in RIGS}
+        ring.add_node(4)
+        after = {rig: ring.node_for(rig) for rig in RIGS}
+
+        moved = [rig for rig in RIGS if before[rig] != after[rig]]
+
+        assert moved
+        assert all(after[rig] == 4 for rig in moved)
+
+    def test_empty_ring_raises(self):
+        """Test lookups on an empty ring fail loudly."""
+        with pytest.raises(LookupError):
+            ConsistentHashRing().node_for("rig_01")
+
+
+class TestFleetShard:
+    """Tests for per-rig engine ownership."""
+
+    def test_shards_partition_rigs(self):
+        """Test each rig is owned by exactly one shard."""
+        ring = build_shard_ring(3, FleetConfig())
+        shards = [FleetShard(i, ring) for i in range(3)]
+
+        for rig in RIGS[:50]:
+            assert sum(shard.owns(rig) for shard in shards) == 1
+
+    def test_rig_engines_created_once(self):
+        """Test rig engines are created on first use and tagged in records."""
+        ring = build_shard_ring(2, FleetConfig())
+        records = []
+        shard = FleetShard(0, ring, on_record=lambda kind, message: records.append((kind, message)))
+        own = next(rig for rig in RIGS if shard.owns(rig))
+        other = next(rig for rig in RIGS if not shard.owns(rig))
+
+        async def scenario():
+            rig = await shard.get_rig(own)
+            again = await shard.get_rig(own)
+            with pytest.raises(KeyError):
+                await shard.get_rig(other)
+            shard.publish_status()
+            await shard.stop()
+            return rig, again
+
+        rig, again = asyncio.run(scenario())
+
+        assert again is rig
+        assert list(shard.rigs) == [own]
+        assert {kind for kind, _ in records} == {RecordKind.STATUS}
+        assert {message["rig_id"] for _, message in records} == {own}
+        assert "safety" in records[0][1]["data"]
+        assert "energy" in records[1][1]["data"]
+        assert "maintenance" in records[2][1]["data"]
+
+    def test_safety_commands_reach_rig_monitor(self):
+        """Test forwarded acknowledge commands apply and republish status."""
+        ring = build_shard_ring(2, FleetConfig())
+        records = []
+        shard = FleetShard(0, ring, on_record=lambda kind, message: records.append((kind, message)))
+        own = next(rig for rig in RIGS if shard.owns(rig))
+
+        async def scenario():
+            rig = await shard.get_rig(own)
+            alert = rig.safety.check_all(
+                vibration_g=3.0, hydraulic_temp_c=55.0, motor_temp_c=60.0,
+                pressure_bar=250.0, resistance=150.0, depth_m=15.0,
+            )[0]
+            records.clear()
+            applied = shard.apply_command(own, {
+                "command": "acknowledge_alert", "alert_id": alert.alert_id, "acknowledged_by": "op",
+            })
+            missing = shard.apply_command(own, {
+                "command": "acknowledge_alert", "alert_id": "nope", "acknowledged_by": "op",
+            })
+            with pytest.raises(ValueError):
+                shard.apply_command(own, {"command": "self_destruct"})
+            await shard.stop()
+            return applied, missing
+
+        applied, missing = asyncio.run(scenario())
+
+        assert applied and not missing
+        assert len(records) == 3
+        kind, message = records[0]
+        assert kind == RecordKind.STATUS
+        assert message["data"]["alerts"] == []
+        assert message["data"]["safety"]["active_alerts"] == 0
+
+    def test_equipment_commands_reach_rig_engines(self):
+        """Test forwarded power readings, drill bit updates and sessions apply."""
+        ring = build_shard_ring(2, FleetConfig())
+        shard = FleetShard(0, ring)
+        own = next(rig for rig in RIGS if shard.owns(rig))
+
+        async def scenario():
+            rig = await shard.get_rig(own)
+            shard.apply_command(own, {
+                "command": "power_reading", "timestamp": datetime.utcnow().isoformat(),
+                "power_kw": 120.0, "voltage_v": 480.0, "current_a": 250.0,
+                "power_factor": 0.95, "state": "drilling",
+            })
+            shard.apply_command(own, {
+                "command": "update_drill_bit", "operating_hours": 350.0,
+                "vibration_history": [1.2, 1.4], "current_vibration": 1.4,
+                "materials_drilled": {"granite": 100.0, "sandstone": 250.0},
+            })
+            started = shard.apply_command(own, {"command": "start_session", "session_id": "SESSION-1"})
+            session_id = rig.current_session_id
+            stopped = shard.apply_command(own, {"command": "stop_session"})
+            stopped_again = shard.apply_command(own, {"command": "stop_session"})
+            await shard.stop()
+            return rig, started, session_id, stopped, stopped_again
+
+        rig, started, session_id, stopped, stopped_again = asyncio.run(scenario())
+
+        assert rig.energy.power_monitor.get_current_power() == 120.0
+        assert rig.maintenance.get_system_health()["drill_bit"].metrics["operating_hours"] == 350.0
+        assert rig.equipment.operating_hours == 350.0
+        assert started and session_id == "SESSION-1"
+        assert stopped and not stopped_again
+        assert rig.current_session_id is None
+
+    def test_mqtt_routes_topics_to_rig_engines(self):
+        """Test rig topics reach their rig's engine and foreign rigs are dropped."""
+        ring = build_shard_ring(2, FleetConfig())
+        shard = FleetShard(0, ring)
+        own = next(rig for rig in RIGS if shard.owns(rig))
+        other = next(rig for rig in RIGS if not shard.owns(rig))
+        client = MQTTSensorClient(
+            None, MQTTConfig(), engine_for_rig=shard.get_fusion_engine, rig_filter=shard.owns,
+        )
+
+        assert client.enqueue(f"ehs/simba/sensors/{own}/rpm/rpm_01", b'{"value": 80.0}')
+        assert not client.enqueue(f"ehs/simba/sensors/{other}/rpm/rpm_01", b'{"value": 90.0}')
+
+        async def scenario():
+            items = [client._queue.get_nowait()]
+            ingested = await client._ingest(items)
+            await shard.stop()
+            return ingested
+
+        assert asyncio.run(scenario()) == 1
+        assert shard.rigs[own].fusion._buffers["rpm_01"].latest_value == 80.0
+        assert client.get_ingest_stats()["other_rig"] == 1
+
+
+class TestRigEquipmentFeed:
+    """Tests for feeding energy and maintenance engines from fused data."""
+
+    def test_fused_data_feeds_energy_and_maintenance(self):
+        """Test power is sampled, drilling hours counted and health reassessed."""
+        feed = RigEquipmentFeed(EnergyOptimizer(), PredictiveMaintenanceEngine())
+        feed.on_prediction({"predicted_material": "Granite"})
+        start = datetime.utcnow() - timedelta(minutes=5)
+        step = timedelta(milliseconds=50)
+
+        # 150 s drilling at 20 Hz, then 30 s idle
+        for i in range(3000):
+            feed.on_fused_data(_fused(start + i * step))
+        for i in range(3000, 3600):
+            feed.on_fused_data(_fused(start + i * step, rpm=0.0))
+
+        metrics = feed.energy.get_energy_metrics(1.0)
+        health = feed.maintenance.get_system_health()
+
+        # Sampled at 10 Hz; hours only while drilling
+        assert feed.operating_hours == pytest.approx(1499 * 0.1 / 3600)
+        assert feed.materials_drilled == {"granite": pytest.approx(feed.operating_hours)}
+        assert metrics.drilling_energy_kwh > 0
+        assert metrics.total_energy_kwh == pytest.approx(150.0 * 2 / 60)
+        assert {"drill_bit", "bearing"} <= set(health)
+        assert any(name.startswith("hydraulic_") for name in health)
+        # Reassessed every 60 s: the last one at 120 s
+        assert health["drill_bit"].metrics["operating_hours"] == pytest.approx(120 / 3600)
+
+
+class TestFleetRouter:
+    """Tests for worker-side routing across shard processes."""
+
+    def test_router_caches_and_routes_per_rig(self, tmp_path):
+        """Test per-rig latest records and ingest routing across two shards."""
+        live_config = LiveDataConfig(
+            name=f"ehs_fl_{os.getpid()}"[:16],
+            slot_count=16,
+            slot_size=1024,
+            socket_dir=tmp_path,
+            poll_interval_s=0.05,
+        )
+        fleet_config = FleetConfig(enabled=True, shards=2)
+        ring = build_shard_ring(2, fleet_config)
+        rig_a = next(rig for rig in RIGS if ring.node_for(rig) == 0)
+        rig_b = next(rig for rig in RIGS if ring.node_for(rig) == 1)
+
+        async def scenario():
+            received = [[], []]
+            publishers, servers = [], []
+            for index in range(2):
+                config = shard_live_config(live_config, index)
+                publishers.append(LivePublisher(config))
+
+                async def handler(kind, rig_id, payload, index=index):
+                    received[index].append(rig_id)
+
+                server = IngestServer(config.socket_dir, config.name, handler)
+                await server.start()
+                servers.append(server)
+
+            publishers[0].publish(RecordKind.SNAPSHOT, {"rig_id": rig_a, "data": {"rpm": 80}})
+            publishers[1].publish(RecordKind.SNAPSHOT, {"rig_id": rig_b, "data": {"rpm": 60}})
+
+            router = FleetRouter(2, live_config, fleet_config)
+            await router.attach()
+            relayed = []
+
+            async def on_message(kind, rig_id, message):
+                relayed.append((rig_id, message))
+
+            router.start_relay(on_message)
+            publishers[1].publish(RecordKind.SNAPSHOT, {"rig_id": rig_b, "data": {"rpm": 65}})
+            await router.send(INGEST_READING, b"{}", rig_a)
+            await router.send(INGEST_READING, b"{}", rig_b)
+            for _ in range(50):
+                if relayed and all(received):
+                    break
+                await asyncio.sleep(0.05)
+
+            result = (
+                router.latest(RecordKind.SNAPSHOT, rig_a),
+                router.latest(RecordKind.SNAPSHOT, rig_b),
+                router.rig_ids(),
+                relayed,
+                received,
+            )
+            await router.close()
+            for server, publisher in zip(servers, publishers):
+                await server.stop()
+                publisher.close()
+            return result
+
+        latest_a, latest_b, rig_ids, relayed, received = asyncio.run(scenario())
+
+        assert latest_a["data"] == {"rpm": 80}
+        assert latest_b["data"] == {"rpm": 65}
+        assert rig_ids == sorted([rig_a, rig_b])
+        assert [rig_id for rig_id, _ in relayed] == [rig_b]
+        assert received == [[rig_a], [rig_b]]
+
+    def test_router_keeps_alert_history_per_rig(self):
+        """Test relayed alerts are kept per rig and filtered by age."""
+        router = FleetRouter(2, LiveDataConfig(), FleetConfig(enabled=True, shards=2))
+        now = datetime.utcnow()
+        for rig_id, age_hours in (("rig_a", 0.5), ("rig_a", 30.0), ("rig_b", 1.0)):
+            alert = {"alert_id": f"{rig_id}_{age_hours}", "timestamp": (now - timedelta(hours=age_hours)).isoformat()}
+            router._remember(RecordKind.ALERT, json.dumps({"rig_id": rig_id, "data": alert}).encode())
+        router._remember(RecordKind.STATUS, json.dumps({"rig_id": "rig_a", "data": {}}).encode())
+        router._remember(RecordKind.STATUS, json.dumps({"rig_id": "rig_b", "data": {}}).encode())
+
+        assert [a["alert_id"] for a in router.alert_history("rig_a", 24.0)] == ["rig_a_0.5"]
+        assert len(router.alert_history("rig_a", 48.0)) == 2
+        assert [a["alert_id"] for a in router.alert_history("rig_b")] == ["rig_b_1.0"]
+        assert len(router.latest_all(RecordKind.STATUS)) == 2
+
+    def test_router_merges_status_parts(self):
+        """Test a rig's status parts combine into one status record."""
+        router = FleetRouter(2, LiveDataConfig(), FleetConfig(enabled=True, shards=2))
+        for data in ({"safety": {"active_alerts": 1}}, {"energy": {"periods": []}}, {"safety": {"active_alerts": 0}}):
+            router._remember(RecordKind.STATUS, json.dumps({"rig_id": "rig_a", "data": data}).encode())
+
+        assert router.latest(RecordKind.STATUS, "rig_a")["data"] == {
+            "safety": {"active_alerts": 0},
+            "energy": {"periods": []},
+        }
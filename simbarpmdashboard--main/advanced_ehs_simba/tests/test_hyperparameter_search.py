@@ -0,0 +1,131 @@
+"""
+Unit tests for the material model hyperparameter search.
+"""
+
+import numpy as np
+import pytest
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import HyperparameterSearchConfig, MaterialPredictorConfig
+from hyperparameter_search import (
+    CandidateResult,
+    HyperparameterSearch,
+    cache_folds,
+    pareto_front,
+    pareto_ranks,
+    select_winner,
+)
+from ml_predictor import MaterialPredictor
+
+
+def _result(candidate_id, accuracy, single_ms, batch_ms=1.0):
+    return CandidateResult(
+        candidate_id=candidate_id, forest_params={}, booster_params={}, rung=0, train_rows=100,
+        accuracy=accuracy, accuracy_std=0.0, single_latency_ms=single_ms,
+        batch_latency_ms=batch_ms, fit_time_s=0.0,
+    )
+
+
+@pytest.fixture(scope="module")
+def data():
+    """Small synthetic dataset."""
+    return MaterialPredictor().generate_synthetic_data(samples_per_material=60, seed=21)
+
+
+class TestFoldCache:
+    """Tests for the memory-mapped CV fold cache."""
+
+    def test_folds_cached_once_and_memory_mapped(self, data, tmp_path):
+        """Test folds are written once per dataset and scaled on their training part."""
+        X, y = data
+
+        paths = cache_folds(X, y, tmp_path, n_folds=3)
+        mtime = (paths[0] / "X_train.npy").stat().st_mtime_ns
+        again = cache_folds(X, y, tmp_path, n_folds=3)
+        X_train = np.load(paths[0] / "X_train.npy", mmap_mode="r")
+        y_val = np.load(paths[0] / "y_val.npy", mmap_mode="r")
+
+        assert again == paths
+        assert (paths[0] / "X_train.npy").stat().st_mtime_ns == mtime
+        assert len(list(tmp_path.iterdir())) == 1
+        assert isinstance(X_train, np.memmap)
+        assert len(X_train) + len(y_val) == len(y)
+        np.testing.assert_allclose(X_train.mean(axis=0), 0.0, atol=1e-9)
+
+    def test_different_data_gets_new_cache(self, data, tmp_path):
+        """Test the cache key follows the data."""
+        X, y = data
+
+        first = cache_folds(X, y, tmp_path, n_folds=3)
+        second = cache_folds(X[1:], y[1:], tmp_path, n_folds=3)
+
+        assert first[0].parent != second[0].parent
+
+
+class TestParetoSelection:
+    """Tests for Pareto ranking and winner selection."""
+
+    def test_front_and_ranks(self):
+        """Test dominated candidates are ranked behind the front."""
+        results = [
+            _result(0, 0.90, 5.0),
+            _result(1, 0.85, 1.0),
+            _result(2, 0.80, 2.0),
+            _result(3, 0.95, 9.0),
+        ]
+
+        assert [r.candidate_id for r in pareto_front(results)] == [3, 0, 1]
+        assert pareto_ranks(results) == [0, 0, 1, 0]
+
+    def test_latency_budget(self):
+        """Test the winner is the most accurate candidate within the budget."""
+        front = [_result(3, 0.95, 9.0), _result(0, 0.90, 5.0), _result(1, 0.85, 1.0)]
+
+        assert select_winner(front).candidate_id == 3
+        assert select_winner(front, latency_budget_ms=6.0).candidate_id == 0
+        assert select_winner(front, latency_budget_ms=0.5).candidate_id == 1
+
+
+class TestHyperparameterSearch:
+    """Tests for successive halving and registration of the winner."""
+
+    def test_rung_rows_grow_to_full_data(self):
+        """Test rungs multiply the rows by the halving factor."""
+        search = HyperparameterSearch(HyperparameterSearchConfig(halving_factor=3, min_rows=100))
+
+        assert search.rung_rows(2700, 9) == [300, 900, 2700]
+        assert search.rung_rows(2700, 1) == [2700]
+        assert search.rung_rows(1000, 27) == [112, 334, 1000]
+        assert search.rung_rows(150, 27) == [150]
+
+    def test_search_prunes_and_registers_winner(self, data, tmp_path):
+        """Test losers are pruned and the winner is registered with its parameters."""
+        X, y = data
+        search = HyperparameterSearch(
+            HyperparameterSearchConfig(n_candidates=6, min_rows=100, latency_repeats=3),
+            MaterialPredictorConfig(booster="hist_gradient_boosting"),
+            tmp_path,
+            forest_space={"n_estimators": [5, 20], "max_depth": [4, None]},
+            booster_space={"max_iter": [5, 15]},
+        )
+
+        report = search.run(X, y, activate=True)
+        predictor = MaterialPredictor(models_path=tmp_path)
+        manifest = predictor.registry.get_manifest(report.version)
+        rungs = [[r for r in report.history if r.rung == k] for k in range(len(report.rung_rows))]
+
+        assert len(report.rung_rows) == 2
+        assert len(rungs[0]) == 6 and len(rungs[1]) == 2
+        assert {r.candidate_id for r in rungs[1]} <= {r.candidate_id for r in rungs[0]}
+        assert report.winner in report.pareto_front
+        assert all(r.single_latency_ms > 0 and r.batch_latency_ms > 0 for r in report.history)
+        assert predictor.registry.active_version() == report.version
+        assert manifest.metadata["forest_params"] == report.winner.forest_params
+        assert manifest.metrics["cv_accuracy"] == pytest.approx(report.winner.accuracy)
+        assert predictor.load_models()
+        if "n_estimators" in report.winner.forest_params:
+            assert predictor.rf_model.n_estimators == report.winner.forest_params["n_estimators"]
@@ -0,0 +1,123 @@
+"""
+Unit tests for the micro-batching inference server.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import MaterialPredictorConfig
+from inference_server import MicroBatchInferenceServer
+
+
+def _samples(n):
+    rng = np.random.default_rng(3)
+    return [
+        {
+            "rpm": float(rpm),
+            "current": float(rpm / 200),
+            "vibration_readings": list(rng.normal(40, 5, 5)),
+            "depth": 30.0,
+        }
+        for rpm in rng.uniform(400, 3000, n)
+    ]
+
+
+class TestMicroBatchInferenceServer:
+    """Tests for request batching and result scattering."""
+
+    def test_concurrent_requests_share_batches(self, trained_predictor):
+        """Test concurrent callers are served by a few batched calls."""
+        samples = _samples(40)
+        server = MicroBatchInferenceServer(
+            trained_predictor, MaterialPredictorConfig(), max_batch_size=16, max_wait_ms=20,
+        )
+
+        async def scenario():
+            await server.start()
+            try:
+                return await asyncio.gather(*(server.predict(s) for s in samples))
+            finally:
+                await server.stop()
+
+        results = asyncio.run(scenario())
+        stats = server.get_stats()
+        expected = trained_predictor.predict_batch(samples)
+
+        assert [r["predicted_material"] for r in results] == [
+            r["predicted_material"] for r in expected
+        ]
+        assert stats["requests"] == 40
+        assert stats["batches"] <= 4
+        assert stats["max_batch_size"] == 16
+
+    def test_lone_request_flushed_after_max_wait(self, trained_predictor):
+        """Test a partial batch runs once the wait bound expires."""
+        server = MicroBatchInferenceServer(
+            trained_predictor, MaterialPredictorConfig(), max_batch_size=64, max_wait_ms=5,
+        )
+
+        async def scenario():
+            await server.start()
+            try:
+                return await asyncio.wait_for(server.predict(_samples(1)[0]), timeout=5.0)
+            finally:
+                await server.stop()
+
+        result = asyncio.run(scenario())
+
+        assert result["predicted_material"] in trained_predictor.material_db
+        assert server.get_stats()["batches"] == 1
+
+    def test_error_reaches_only_its_caller(self, trained_predictor):
+        """Test a malformed request fails alone and its batch-mates succeed."""
+        server = MicroBatchInferenceServer(trained_predictor, MaterialPredictorConfig(), max_wait_ms=20)
+        sample = _samples(1)[0]
+
+        async def scenario():
+            await server.start()
+            try:
+                return await asyncio.gather(
+                    server.predict(sample),
+                    server.predict({"current": 2.0}),
+                    return_exceptions=True,
+                )
+            finally:
+                await server.stop()
+
+        good, bad = asyncio.run(scenario())
+        expected = trained_predictor.predict_batch([sample])[0]
+
+        assert good["predicted_material"] == expected["predicted_material"]
+        assert isinstance(bad, KeyError)
+        assert server.get_stats()["batches"] == 1
+        assert server.get_stats()["errors"] == 1
+
+    def test_stop_cancels_batch_being_gathered(self, trained_predictor):
+        """Test callers of a dequeued, still-filling batch do not hang on stop."""
+        server = MicroBatchInferenceServer(trained_predictor, MaterialPredictorConfig(), max_wait_ms=200)
+
+        async def scenario():
+            await server.start()
+            pending = asyncio.ensure_future(server.predict(_samples(1)[0]))
+            await asyncio.sleep(0.02)
+            await server.stop()
+            return await asyncio.wait_for(asyncio.gather(pending, return_exceptions=True), timeout=1.0)
+
+        (result,) = asyncio.run(scenario())
+
+        assert isinstance(result, asyncio.CancelledError)
+        assert server.get_stats()["batches"] == 0
+
+    def test_predict_requires_running_server(self, trained_predictor):
+        """Test requests are rejected before start."""
+        server = MicroBatchInferenceServer(trained_predictor, MaterialPredictorConfig())
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(server.predict(_samples(1)[0]))
@@ -0,0 +1,156 @@
+"""
+Unit tests for the live data plane.
+"""
+
+import asyncio
+import json
+import os
+
+import pytest
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import LiveDataConfig
+from live_data_plane import (
+    INGEST_FRAMES,
+    IngestClient,
+    IngestServer,
+    LivePublisher,
+    LiveRingReader,
+    LiveRingWriter,
+    LiveSubscriber,
+    RecordKind,
+)
+
+
+@pytest.fixture
+def live_config(tmp_path):
+    """Data plane config with a unique name and private socket dir."""
+    return LiveDataConfig(
+        name=f"ehs_test_{os.getpid()}_{tmp_path.name}"[:24],
+        slot_count=16,
+        slot_size=1024,
+        socket_dir=tmp_path,
+        poll_interval_s=0.05,
+    )
+
+
+class TestLiveRing:
+    """Tests for the shared-memory record ring."""
+
+    def test_round_trip_and_latest(self, live_config):
+        """Test records and per-kind latest values are visible to readers."""
+        writer = LiveRingWriter(live_config.name, live_config.slot_count, live_config.slot_size)
+        reader = LiveRingReader(live_config.name)
+        try:
+            writer.publish(RecordKind.SNAPSHOT, b'{"rpm": 80}')
+            writer.publish(RecordKind.ALERT, b'{"level": "critical"}')
+            writer.publish(RecordKind.SNAPSHOT, b'{"rpm": 85}')
+
+            records, last_seq = reader.records_since(0)
+
+            assert last_seq == 3
+            assert [(seq, kind) for seq, kind, _ in records] == [
+                (1, RecordKind.SNAPSHOT), (2, RecordKind.ALERT), (3, RecordKind.SNAPSHOT),
+            ]
+            assert reader.latest(RecordKind.SNAPSHOT) == {"rpm": 85}
+            assert reader.latest(RecordKind.PREDICTION) is None
+        finally:
+            reader.close()
+            writer.close()
+
+    def test_lagging_reader_skips_overwritten(self, live_config):
+        """Test a reader that falls behind resumes at the oldest live slot."""
+        writer = LiveRingWriter(live_config.name, live_config.slot_count, live_config.slot_size)
+        reader = LiveRingReader(live_config.name)
+        try:
+            for i in range(40):
+                writer.publish(RecordKind.SNAPSHOT, json.dumps({"i": i}).encode())
+
+            records, last_seq = reader.records_since(0)
+
+            assert last_seq == 40
+            assert [seq for seq, _, _ in records] == list(range(25, 41))
+            assert json.loads(records[-1][2]) == {"i": 39}
+        finally:
+            reader.close()
+            writer.close()
+
+    def test_reader_mapping_is_read_only(self, live_config):
+        """Test readers cannot write to the shared block."""
+        writer = LiveRingWriter(live_config.name, live_config.slot_count, live_config.slot_size)
+        reader = LiveRingReader(live_config.name)
+        try:
+            with pytest.raises(TypeError):
+                reader._buf[0] = 0
+            with pytest.raises(ValueError):
+                writer.publish(RecordKind.SNAPSHOT, b"x" * live_config.slot_size)
+        finally:
+            reader.close()
+            writer.close()
+
+
+class TestLiveChannels:
+    """Tests for the notify and ingest channels."""
+
+    def test_subscriber_wakes_on_publish(self, live_config):
+        """Test the doorbell delivers new records to a subscriber."""
+        async def scenario():
+            publisher = LivePublisher(live_config)
+            subscriber = await LiveSubscriber.attach(live_config)
+            received = []
+
+            async def consume():
+                async for kind, payload in subscriber.stream():
+                    received.append((kind, json.loads(payload)))
+                    if len(received) == 2:
+                        return
+
+            task = asyncio.create_task(consume())
+            await asyncio.sleep(0.01)
+            publisher.doorbell.RESCAN_INTERVAL_S = 0.0
+            publisher.publish(RecordKind.PREDICTION, {"type": "prediction"})
+            publisher.publish(RecordKind.ALERT, {"type": "safety_alert"})
+            await asyncio.wait_for(task, timeout=2.0)
+
+            subscriber.close()
+            publisher.close()
+            return received
+
+        received = asyncio.run(scenario())
+
+        assert received == [
+            (RecordKind.PREDICTION, {"type": "prediction"}),
+            (RecordKind.ALERT, {"type": "safety_alert"}),
+        ]
+
+    def test_ingest_channel_forwards_messages(self, live_config):
+        """Test workers' payloads reach the ingest handler intact."""
+        async def scenario():
+            received = []
+            done = asyncio.Event()
+
+            async def handler(kind, rig_id, payload):
+                received.append((kind, rig_id, payload))
+                if len(received) == 2:
+                    done.set()
+
+            server = IngestServer(live_config.socket_dir, live_config.name, handler)
+            await server.start()
+            client = IngestClient(live_config.socket_dir, live_config.name)
+            await client.send(INGEST_FRAMES, b"SF" + bytes(100))
+            await client.send(b"R", b'{"rpm": 80}', rig_id="rig_07")
+            await asyncio.wait_for(done.wait(), timeout=2.0)
+            await client.close()
+            await server.stop()
+            return received
+
+        received = asyncio.run(scenario())
+
+        assert received == [
+            (INGEST_FRAMES, "", b"SF" + bytes(100)),
+            (b"R", "rig_07", b'{"rpm": 80}'),
+        ]
@@ -0,0 +1,468 @@
+"""
+Unit tests for MaterialPredictor batch inference.
+"""
+
+import logging
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier, HistGradientBoostingClassifier
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import tree_compiler
+from config import MaterialPredictorConfig, TrainingPipelineConfig
+from ml_predictor import MaterialPredictor
+from training_pipeline import TrainingPipeline
+from tree_compiler import (
+    CompiledEnsemble, compile_boosting, compile_gradient_boosting, compile_random_forest,
+)
+
+
+def _samples(n, seed=3):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "rpm": float(rpm),
+            "current": float(rpm / 200),
+            "vibration_readings": list(rng.normal(40, 5, rng.integers(1, 8))),
+            "rpm_history": list(rpm + rng.normal(0, 5, rng.integers(1, 6))),
+            "current_history": list(rpm / 200 + rng.normal(0, 0.5, 4)),
+            "depth": float(rng.uniform(10, 200)),
+        }
+        for rpm in rng.uniform(400, 3000, n)
+    ]
+
+
+def _sharing_models(predictor, config):
+    """Predictor with its own config, using another predictor's trained models."""
+    model = MaterialPredictor(config)
+    model._publish(predictor.models._replace(rf_compiled=None, gb_compiled=None))
+    return model
+
+
+class TestSyntheticData:
+    """Tests for the vectorized, chunked synthetic data generator."""
+
+    def test_seeded_and_independent_of_chunk_size(self):
+        """Test a seed gives the same rows for any chunking."""
+        model = MaterialPredictor()
+
+        X, y = model.generate_synthetic_data(samples_per_material=50, seed=1)
+        chunks = list(model.iter_synthetic_chunks(50, seed=1, chunk_size=7))
+
+        assert X.shape == (50 * len(model.material_db), len(model.feature_names))
+        np.testing.assert_array_equal(np.concatenate([c[0] for c in chunks]), X)
+        np.testing.assert_array_equal(np.concatenate([c[1] for c in chunks]), y)
+        assert max(len(c[0]) for c in chunks) == 7
+        assert not np.array_equal(model.generate_synthetic_data(50, seed=2)[0], X)
+
+    def test_follows_material_profiles(self):
+        """Test per-material statistics match the material database."""
+        model = MaterialPredictor()
+        X, y = model.generate_synthetic_data(samples_per_material=2000, seed=3)
+
+        for material, props in model.material_db.items():
+            rows = X[y == material]
+            assert rows[:, 0].mean() == pytest.approx(props["rpm"], rel=0.01)
+            assert rows[:, 2].mean() == pytest.approx(props["hardness"] * 10, abs=0.5)
+            np.testing.assert_allclose(rows[:, 4], rows[:, 2] + 2 * rows[:, 3])
+            assert rows[:, 7].min() >= 10 and rows[:, 7].max() < 200
+
+    def test_npy_streaming_round_trip(self, tmp_path):
+        """Test chunks streamed into a memory-mapped .npy file read back intact."""
+        model = MaterialPredictor()
+        path = tmp_path / "synthetic.npy"
+
+        rows = model.write_synthetic_data(path, samples_per_material=300, seed=4, chunk_size=64)
+        X, y = model.load_synthetic_data(path)
+        expected_X, expected_y = model.generate_synthetic_data(300, seed=4)
+
+        assert rows == len(expected_X)
+        assert np.load(path, mmap_mode="r").dtype == model.synthetic_dtype()
+        np.testing.assert_array_equal(X, expected_X)
+        np.testing.assert_array_equal(y, expected_y)
+
+    def test_parquet_round_trip(self, tmp_path):
+        """Test Parquet output with one row group per chunk."""
+        pytest.importorskip("pyarrow")
+        model = MaterialPredictor()
+        path = tmp_path / "synthetic.parquet"
+
+        model.write_synthetic_data(path, samples_per_material=100, seed=5, chunk_size=40)
+        X, y = model.load_synthetic_data(path)
+        expected_X, expected_y = model.generate_synthetic_data(100, seed=5)
+
+        np.testing.assert_array_equal(X, expected_X)
+        np.testing.assert_array_equal(y, expected_y)
+
+    def test_unsupported_format(self, tmp_path):
+        """Test unknown file suffixes are rejected."""
+        with pytest.raises(ValueError):
+            MaterialPredictor().write_synthetic_data(tmp_path / "synthetic.csv", 10)
+
+
+class TestBatchFeatures:
+    """Tests for vectorized feature extraction."""
+
+    def test_ragged_dicts_match_single_extraction(self, trained_predictor):
+        """Test one-pass features equal per-sample extraction."""
+        samples = _samples(50)
+        samples[0]["vibration_readings"] = []
+
+        features = trained_predictor.extract_features_batch(samples)
+        samples[0]["vibration_readings"] = [50]
+        expected = np.array([trained_predictor._extract_features(s) for s in samples])
+
+        assert features.shape == (50, len(trained_predictor.feature_names))
+        np.testing.assert_allclose(features, expected, rtol=1e-12)
+
+    def test_structured_array_with_drill_log_columns(self, trained_predictor):
+        """Test ehs_drill_logs-style columns (current_a, depth_m, stats)."""
+        logs = np.array(
+            [(470.0, 6.5, 14.0, 1.4, 16.0, 25.5), (2320.0, 14.8, 70.0, 1.4, 72.0, 82.3)],
+            dtype=[
+                ("rpm", "f8"), ("current_a", "f8"), ("vibration_mean", "f8"),
+                ("vibration_std", "f8"), ("vibration_max", "f8"), ("depth_m", "f8"),
+            ],
+        )
+
+        features = trained_predictor.extract_features_batch(logs)
+
+        np.testing.assert_allclose(features[:, 0], [470.0, 2320.0])
+        np.testing.assert_allclose(features[:, 7], [25.5, 82.3])
+        np.testing.assert_allclose(features[:, 5], 100.0)
+        np.testing.assert_allclose(features[:, 6], 0.0)
+
+    def test_padded_readings_and_dataframe(self, trained_predictor):
+        """Test NaN-padded vibration readings in a DataFrame-like mapping."""
+        readings = np.array([[10.0, 20.0, np.nan], [30.0, 30.0, 60.0]])
+
+        features = trained_predictor.extract_features_batch({
+            "rpm": [500.0, 900.0], "current": [2.5, 4.5], "vibration_readings": readings,
+        })
+        frame = trained_predictor.extract_features_batch(pd.DataFrame({
+            "rpm": [500.0], "current": [2.5], "vibration_mean": [15.0],
+        }))
+
+        np.testing.assert_allclose(features[:, 2], [15.0, 40.0])
+        np.testing.assert_allclose(features[:, 4], [20.0, 60.0])
+        assert frame[0, 2] == 15.0
+
+
+class TestPredictBatch:
+    """Tests for MaterialPredictor.predict_batch."""
+
+    def test_matches_reference_predictions(self, trained_predictor):
+        """Test batched results equal a row-by-row sklearn reference."""
+        samples = _samples(12)
+        classes = trained_predictor.rf_model.classes_
+
+        batched = trained_predictor.predict_batch(samples, cascade=False)
+
+        for sample, result in zip(samples, batched):
+            features = trained_predictor.scaler.transform([trained_predictor._extract_features(sample)])
+            proba = (
+                0.6 * trained_predictor.rf_model.predict_proba(features)[0]
+                + 0.4 * trained_predictor.gb_model.predict_proba(features)[0]
+            )
+            reference = dict(zip(classes, proba * 100))
+            assert result["predicted_material"] == classes[np.argmax(proba)]
+            assert result["confidence"] == pytest.approx(proba.max() * 100)
+            # Materials may differ only between tied probabilities
+            top_3 = [p["confidence"] for p in result["top_3_predictions"]]
+            assert top_3 == pytest.approx(np.sort(proba)[::-1][:3] * 100)
+            for p in result["top_3_predictions"]:
+                assert p["confidence"] == pytest.approx(reference[p["material"]])
+
+    def test_top_3_sorted_and_consistent(self, trained_predictor):
+        """Test top-k comes out in descending confidence led by the prediction."""
+        for result in trained_predictor.predict_batch(_samples(100, seed=5), ensemble=False):
+            confidences = [p["confidence"] for p in result["top_3_predictions"]]
+            assert confidences == sorted(confidences, reverse=True)
+            assert confidences[0] == pytest.approx(result["confidence"])
+
+    def test_empty_batch(self, trained_predictor):
+        """Test an empty batch returns no results."""
+        assert trained_predictor.predict_batch([]) == []
+
+
+class TestCascadeInference:
+    """Tests for RF-first cascade inference."""
+
+    def test_calibrated_threshold_keeps_agreement(self, trained_predictor):
+        """Test calibration picks a threshold that agrees with the ensemble."""
+        samples = _samples(300, seed=8)
+        features = trained_predictor.scaler.transform(trained_predictor.extract_features_batch(samples))
+        skip_rate = trained_predictor.calibrate_cascade(features, target_agreement=1.0)
+
+        cascade = trained_predictor.predict_batch(samples, cascade=True)
+        full = trained_predictor.predict_batch(samples, cascade=False)
+
+        assert 0.0 < skip_rate <= 1.0
+        assert [r["predicted_material"] for r in cascade] == [
+            r["predicted_material"] for r in full
+        ]
+
+    def test_threshold_bounds_select_models(self, trained_predictor):
+        """Test threshold 0 is RF-only and an unreachable threshold is the full ensemble."""
+        samples = _samples(40, seed=9)
+        saved = trained_predictor.models
+        try:
+            trained_predictor._publish(saved._replace(cascade_threshold=0.0))
+            rf_only = trained_predictor.predict_batch(samples, cascade=True)
+            trained_predictor._publish(saved._replace(cascade_threshold=1.1))
+            never_skip = trained_predictor.predict_batch(samples, cascade=True)
+        finally:
+            trained_predictor._publish(saved)
+
+        rf = trained_predictor.predict_batch(samples, ensemble=False)
+        full = trained_predictor.predict_batch(samples, cascade=False)
+
+        assert [r["confidence"] for r in rf_only] == pytest.approx([r["confidence"] for r in rf])
+        assert [r["confidence"] for r in never_skip] == pytest.approx([r["confidence"] for r in full])
+
+    def test_batch_uses_threshold_of_its_model_set(self, trained_predictor):
+        """Test a batch keeps its model set's threshold when another set is published."""
+        model = _sharing_models(trained_predictor, MaterialPredictorConfig(cascade_audit_rate=0.0))
+        samples = _samples(40, seed=9)
+        features = model.extract_features_batch(samples)
+        rf_only_models = model.models._replace(cascade_threshold=0.0)
+        model._publish(model.models._replace(cascade_threshold=1.1))
+
+        results = model._predict_models(features, rf_only_models, True, True, "ensemble")
+        rf = model.predict_batch(samples, ensemble=False)
+
+        assert model.get_cascade_stats()["threshold"] == 1.1
+        assert [r["confidence"] for r in results] == pytest.approx([r["confidence"] for r in rf])
+
+    def test_counters_track_skips_and_audits(self, trained_predictor):
+        """Test skip-rate and audited-agreement counters."""
+        model = _sharing_models(
+            trained_predictor, MaterialPredictorConfig(cascade_enabled=True, cascade_audit_rate=1.0),
+        )
+        samples = _samples(200, seed=10)
+        features = model.scaler.transform(model.extract_features_batch(samples))
+        confident = model.rf_model.predict_proba(features).max(axis=1) >= model.cascade_threshold
+
+        model.predict_batch(samples)
+        stats = model.get_cascade_stats()
+
+        assert stats["samples"] == 200
+        assert stats["rf_only"] == confident.sum()
+        assert stats["skip_rate"] == pytest.approx(confident.mean())
+        assert stats["audited"] == stats["rf_only"]
+        assert 0.0 <= stats["agreement_rate"] <= 1.0
+
+
+class TestCompiledTrees:
+    """Tests for the flat-array tree evaluator."""
+
+    def test_matches_sklearn_predict_proba(self, trained_predictor, monkeypatch):
+        """Test compiled RF and GB reproduce predict_proba across chunks."""
+        monkeypatch.setattr(tree_compiler, "EVAL_CHUNK_ROWS", 64)
+        features = trained_predictor.scaler.transform(
+            trained_predictor.extract_features_batch(_samples(300, seed=12))
+        )
+
+        for model, compiled in (
+            (trained_predictor.rf_model, compile_random_forest(trained_predictor.rf_model)),
+            (trained_predictor.gb_model, compile_gradient_boosting(trained_predictor.gb_model)),
+        ):
+            expected = model.predict_proba(features)
+            proba = compiled.predict_proba(features)
+            np.testing.assert_allclose(proba, expected, atol=1e-12)
+            assert list(compiled.classes) == list(model.classes_)
+            assert (proba.argmax(axis=1) == expected.argmax(axis=1)).all()
+
+    def test_binary_boosting(self):
+        """Test the two-class (sigmoid) boosting path."""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(200, 4))
+        y = np.where(X[:, 0] + X[:, 1] ** 2 > 1, "hard", "soft")
+        model = GradientBoostingClassifier(n_estimators=20, max_depth=3).fit(X, y)
+
+        np.testing.assert_allclose(
+            compile_gradient_boosting(model).predict_proba(X), model.predict_proba(X), atol=1e-12,
+        )
+
+    @pytest.mark.parametrize("n_classes", [2, 3])
+    def test_hist_gradient_boosting(self, n_classes, tmp_path):
+        """Test HistGradientBoosting compiles and survives a save/load round trip."""
+        rng = np.random.default_rng(1)
+        X = rng.normal(size=(300, 4))
+        y = np.digitize(X[:, 0] + X[:, 1] ** 2, [0.5, 1.5][:n_classes - 1])
+        model = HistGradientBoostingClassifier(max_iter=20, max_depth=4).fit(X, y)
+
+        compiled = compile_boosting(model)
+        compiled.save(tmp_path / "hgb")
+
+        np.testing.assert_allclose(compiled.predict_proba(X), model.predict_proba(X), atol=1e-10)
+        np.testing.assert_allclose(
+            CompiledEnsemble.load(tmp_path / "hgb").predict_proba(X), model.predict_proba(X), atol=1e-10,
+        )
+
+    def test_saved_artifact_is_memory_mapped_and_smaller(self, trained_predictor, tmp_path):
+        """Test save/load round trip through np.load(mmap_mode='r')."""
+        compiled = compile_random_forest(trained_predictor.rf_model)
+        compiled.save(tmp_path / "rf")
+        joblib.dump(trained_predictor.rf_model, tmp_path / "rf.pkl")
+
+        loaded = CompiledEnsemble.load(tmp_path / "rf")
+        features = trained_predictor.scaler.transform(trained_predictor.extract_features_batch(_samples(20)))
+        artifact_bytes = sum(f.stat().st_size for f in (tmp_path / "rf").iterdir())
+
+        assert isinstance(loaded.threshold, np.memmap)
+        np.testing.assert_array_equal(loaded.predict_proba(features), compiled.predict_proba(features))
+        assert artifact_bytes < (tmp_path / "rf.pkl").stat().st_size
+
+    def test_predict_batch_same_with_and_without_compiled(self, trained_predictor):
+        """Test the runtime switch does not change predictions."""
+        model = _sharing_models(trained_predictor, MaterialPredictorConfig(use_compiled_trees=False))
+        samples = _samples(30, seed=13)
+
+        compiled = trained_predictor.predict_batch(samples)
+        reference = model.predict_batch(samples)
+
+        assert [r["predicted_material"] for r in compiled] == [
+            r["predicted_material"] for r in reference
+        ]
+        assert [r["confidence"] for r in compiled] == pytest.approx(
+            [r["confidence"] for r in reference]
+        )
+
+
+class TestLazyLoading:
+    """Tests for lazy, memory-mapped model loading and the fallback."""
+
+    def test_missing_models_serve_rule_based_fallback(self, tmp_path):
+        """Test no synchronous training happens when models are missing."""
+        model = MaterialPredictor(
+            MaterialPredictorConfig(background_training=False), models_path=tmp_path,
+        )
+
+        coal = {"rpm": 470, "current": 2.3, "vibration_readings": [15]}
+
+        results = model.predict_batch(_samples(5) + [coal])
+
+        assert not model.models_loaded
+        assert all(r["fallback"] for r in results)
+        assert results[-1]["predicted_material"] == "Coal"
+        assert list(tmp_path.iterdir()) == []
+
+    def test_loads_from_models_path_on_first_prediction(self, trained_predictor, tmp_path):
+        """Test saved models are loaded lazily, memory-mapped, from models_path."""
+        source = MaterialPredictor(MaterialPredictorConfig(), models_path=tmp_path)
+        source._publish(trained_predictor.models)
+        manifest = source.save_models()
+
+        model = MaterialPredictor(MaterialPredictorConfig(), models_path=tmp_path)
+        assert not model.models_loaded
+
+        samples = _samples(10, seed=14)
+        results = model.predict_batch(samples)
+
+        assert model.models_loaded
+        assert model.model_version == manifest.version
+        assert all(r["model_version"] == manifest.version for r in results)
+        assert isinstance(model.scaler.mean_, np.memmap)
+        assert isinstance(model.gb_compiled.leaf_value, np.memmap)
+        assert not any(r["fallback"] for r in results)
+        assert [r["predicted_material"] for r in results] == [
+            r["predicted_material"] for r in trained_predictor.predict_batch(samples)
+        ]
+
+    def test_background_training_publishes_models(self, tmp_path):
+        """Test the fallback is replaced once the pool training job finishes."""
+        model = MaterialPredictor(
+            MaterialPredictorConfig(background_training=False), models_path=tmp_path,
+        )
+        model.training_pipeline = TrainingPipeline(
+            TrainingPipelineConfig(chunk_rows=400, forest_trees=12, eval_sample_rows=300),
+            model.config, tmp_path,
+        )
+        X, y = model.generate_synthetic_data(samples_per_material=20, seed=15)
+
+        assert model.predict_batch(_samples(3))[0]["fallback"]
+        try:
+            report = model.start_background_training(X, y).result(timeout=120)
+            # The version is switched in by the job's done callback
+            deadline = time.monotonic() + 30
+            while not model.models_loaded and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            model.training_pipeline.shutdown()
+
+        assert model.models_loaded
+        assert model.model_version == report.version
+        assert not model.predict_batch(_samples(3))[0]["fallback"]
+        assert model.registry.active_version() == model.model_version
+        assert not (tmp_path / ".training.lock").exists()
+
+
+class TestModelHotSwap:
+    """Tests for switching model versions while serving."""
+
+    def test_activated_version_is_swapped_in(self, trained_predictor, tmp_path):
+        """Test a running predictor follows the ACTIVE pointer."""
+        publisher = MaterialPredictor(MaterialPredictorConfig(), models_path=tmp_path)
+        publisher._publish(trained_predictor.models)
+        first = publisher.save_models()
+        X, y = publisher.generate_synthetic_data(samples_per_material=20, seed=16)
+        publisher.train(X, y, save_model=False)
+        second = publisher.save_models(activate=False)
+
+        serving = MaterialPredictor(
+            MaterialPredictorConfig(model_poll_interval_s=0.0), models_path=tmp_path,
+        )
+        assert serving.predict(_samples(1)[0])["model_version"] == first.version
+
+        publisher.registry.activate(second.version)
+        serving.predict(_samples(1)[0])
+        serving._swap_thread.join(timeout=30)
+
+        assert serving.model_version == second.version
+        assert serving.predict(_samples(1)[0])["model_version"] == second.version
+
+    def test_corrupted_version_is_not_activated(self, trained_predictor, tmp_path):
+        """Test hash verification keeps the current models serving."""
+        publisher = MaterialPredictor(MaterialPredictorConfig(), models_path=tmp_path)
+        publisher._publish(trained_predictor.models)
+        good = publisher.save_models()
+        bad = publisher.save_models(activate=False)
+        (publisher.registry.version_path(bad.version) / "scaler.pkl").write_bytes(b"x")
+
+        serving = MaterialPredictor(MaterialPredictorConfig(), models_path=tmp_path)
+        serving.activate_version()
+        with pytest.raises(ValueError):
+            serving.activate_version(bad.version)
+
+        assert serving.model_version == good.version
+
+    def test_failed_background_swap_is_logged(self, trained_predictor, tmp_path, caplog):
+        """Test a hot swap that fails in the swap thread reaches the log."""
+        publisher = MaterialPredictor(MaterialPredictorConfig(), models_path=tmp_path)
+        publisher._publish(trained_predictor.models)
+        good = publisher.save_models()
+        bad = publisher.save_models(activate=False)
+        (publisher.registry.version_path(bad.version) / "scaler.pkl").write_bytes(b"x")
+
+        serving = MaterialPredictor(
+            MaterialPredictorConfig(model_poll_interval_s=0.0), models_path=tmp_path,
+        )
+        serving.predict(_samples(1)[0])
+        publisher.registry.activate(bad.version)
+        with caplog.at_level(logging.ERROR, logger="ml_predictor"):
+            serving.predict(_samples(1)[0])
+            serving._swap_thread.join(timeout=30)
+
+        assert serving.model_version == good.version
+        assert any(
+            bad.version in record.getMessage() and record.exc_info for record in caplog.records
+        )
@@ -0,0 +1,87 @@
+"""
+Unit tests for the versioned model registry.
+"""
+
+import json
+
+import pytest
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from model_registry import ModelRegistry
+
+
+def _writer(payload):
+    def write(path):
+        (path / "model.bin").write_bytes(payload)
+        (path / "nested").mkdir()
+        (path / "nested" / "meta.json").write_text(json.dumps({"n": len(payload)}))
+    return write
+
+
+class TestModelRegistry:
+    """Tests for version registration and activation."""
+
+    def test_register_writes_manifest_with_hashes(self, tmp_path):
+        """Test a version directory carries a complete manifest."""
+        registry = ModelRegistry(tmp_path)
+
+        manifest = registry.register(
+            _writer(b"abc"), ["rpm", "current"], ["Coal", "Granite"], {"accuracy": 0.9},
+        )
+
+        assert registry.get_manifest(manifest.version) == manifest
+        assert set(manifest.artifacts) == {"model.bin", "nested/meta.json"}
+        assert manifest.features == ["rpm", "current"]
+        assert manifest.metrics == {"accuracy": 0.9}
+        assert registry.active_version() is None
+        registry.verify(manifest.version)
+
+    def test_activate_switches_pointer(self, tmp_path):
+        """Test activation moves the ACTIVE pointer between versions."""
+        registry = ModelRegistry(tmp_path)
+        first = registry.register(_writer(b"one"), [], [])
+        second = registry.register(_writer(b"two"), [], [])
+
+        registry.activate(first.version)
+        assert registry.active_version() == first.version
+        registry.activate(second.version)
+
+        assert registry.active_version() == second.version
+        assert [m.version for m in registry.list_versions()] == sorted([first.version, second.version])
+        assert [p.name for p in tmp_path.iterdir() if p.name.endswith(".tmp")] == []
+
+    def test_unknown_versions_rejected(self, tmp_path):
+        """Test activation of missing or path-like versions fails."""
+        registry = ModelRegistry(tmp_path)
+        registry.register(_writer(b"x"), [], [])
+
+        for version in ("missing", "../versions", ".staging-1"):
+            with pytest.raises(KeyError):
+                registry.activate(version)
+        assert registry.active_version() is None
+
+    def test_failed_writer_leaves_no_version(self, tmp_path):
+        """Test a failing artifact writer leaves nothing behind."""
+        registry = ModelRegistry(tmp_path)
+
+        def broken(path):
+            (path / "partial").write_bytes(b"x")
+            raise RuntimeError("disk full")
+
+        with pytest.raises(RuntimeError):
+            registry.register(broken, [], [])
+        assert registry.list_versions() == []
+        assert list(registry.versions_path.iterdir()) == []
+
+    def test_verify_detects_modified_artifact(self, tmp_path):
+        """Test hash verification catches changed files."""
+        registry = ModelRegistry(tmp_path)
+        manifest = registry.register(_writer(b"abc"), [], [])
+        (registry.version_path(manifest.version) / "model.bin").write_bytes(b"abd")
+
+        with pytest.raises(ValueError, match="model.bin"):
+            registry.verify(manifest.version)
@@ -0,0 +1,224 @@
+"""
+Unit tests for the quantized-feature prediction cache.
+"""
+
+import numpy as np
+import pytest
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import MaterialPredictorConfig
+from ml_predictor import MaterialPredictor
+from prediction_cache import PredictionCache
+
+FEATURES = ["rpm", "current", "depth"]
+
+
+def _sample(rpm=1500.0, current=7.0, depth=30.0):
+    return {"rpm": rpm, "current": current, "vibration_readings": [40, 42, 39], "depth": depth}
+
+
+def _caching(trained_predictor, **config):
+    """Caching predictor sharing the trained models."""
+    model = MaterialPredictor(MaterialPredictorConfig(cache_enabled=True, cache_ttl_s=60.0, **config))
+    model._publish(trained_predictor.models)
+    return model
+
+
+@pytest.fixture
+def predictor(trained_predictor):
+    """Caching predictor that stores every result, whatever its confidence."""
+    return _caching(trained_predictor, cache_min_confidence=0.0)
+
+
+class TestPredictionCache:
+    """Tests for keys, LRU eviction, expiry and invalidation."""
+
+    def test_keys_quantize_listed_features(self):
+        """Test rows in the same cell share a key and unlisted features are ignored."""
+        cache = PredictionCache(FEATURES, {"rpm": 5.0, "current": 0.1})
+        features = np.array([
+            [1500.0, 7.01, 10.0],
+            [1502.4, 6.96, 99.0],
+            [1502.6, 7.00, 10.0],
+            [1500.0, 7.10, 10.0],
+        ])
+        keys = cache.keys(features, "ensemble")
+
+        assert keys[0] == keys[1]
+        assert keys[2] != keys[0]
+        assert keys[3] != keys[0]
+        assert cache.keys(features[:1], "student")[0] != keys[0]
+
+    def test_zero_step_keys_on_exact_value(self):
+        """Test a step of 0 keys on the exact value, with -0.0 equal to 0.0."""
+        cache = PredictionCache(FEATURES, {"depth": 0.0})
+        keys = cache.keys(np.array([[1.0, 1.0, 0.0], [1.0, 1.0, -0.0], [1.0, 1.0, 1e-9]]))
+
+        assert keys[0] == keys[1]
+        assert keys[2] != keys[0]
+
+    def test_unknown_feature_rejected(self):
+        """Test resolutions must name model features."""
+        with pytest.raises(ValueError):
+            PredictionCache(FEATURES, {"vibration_g": 0.05})
+
+    def test_lru_eviction_and_stats(self):
+        """Test the least recently used entry is evicted first."""
+        cache = PredictionCache(FEATURES, {"rpm": 1.0}, max_entries=2)
+        keys = cache.keys(np.array([[1.0, 0, 0], [2.0, 0, 0], [3.0, 0, 0]]))
+        cache.get_many(keys[:2], "v1")
+        cache.put_many(keys[:2], ["a", "b"], "v1")
+        assert cache.get_many(keys[:1], "v1") == ["a"]
+
+        cache.put_many(keys[2:], ["c"], "v1")
+        stats = cache.get_stats()
+
+        assert cache.get_many(keys, "v1") == ["a", None, "c"]
+        assert stats["evictions"] == 1
+        assert stats["entries"] == 2
+        assert stats["hits"] == 1 and stats["misses"] == 2
+        assert stats["hit_rate"] == pytest.approx(1 / 3)
+
+    def test_entries_expire(self, monkeypatch):
+        """Test entries older than the TTL miss."""
+        clock = [100.0]
+        monkeypatch.setattr("prediction_cache.time.monotonic", lambda: clock[0])
+        cache = PredictionCache(FEATURES, {"rpm": 1.0}, ttl_s=5.0)
+        keys = cache.keys(np.array([[1.0, 0, 0]]))
+        cache.get_many(keys, "v1")
+        cache.put_many(keys, ["a"], "v1")
+
+        clock[0] = 104.0
+        assert cache.get_many(keys, "v1") == ["a"]
+        clock[0] = 110.0
+        assert cache.get_many(keys, "v1") == [None]
+        assert cache.get_stats()["expired"] == 1
+
+    def test_version_change_invalidates(self):
+        """Test a new model version clears the cache and stale results are dropped."""
+        cache = PredictionCache(FEATURES, {"rpm": 1.0})
+        keys = cache.keys(np.array([[1.0, 0, 0]]))
+        cache.get_many(keys, "v1")
+        cache.put_many(keys, ["a"], "v1")
+
+        assert cache.get_many(keys, "v2") == [None]
+        cache.put_many(keys, ["stale"], "v1")
+
+        assert cache.get_many(keys, "v2") == [None]
+        assert cache.get_stats()["invalidations"] == 1
+        assert cache.get_stats()["version"] == "v2"
+
+
+class TestCachedPredictions:
+    """Tests for the cache in front of MaterialPredictor.predict_batch."""
+
+    def test_near_identical_inputs_hit(self, predictor):
+        """Test inputs in the same cell reuse the result and skip the models."""
+        first = predictor.predict(_sample())
+        second = predictor.predict(_sample(rpm=1501.0, current=7.02, depth=30.1))
+        stats = predictor.get_cache_stats()
+
+        assert second["predicted_material"] == first["predicted_material"]
+        assert second["confidence"] == first["confidence"]
+        assert stats["enabled"] and stats["hits"] == 1 and stats["misses"] == 1
+
+    def test_batch_evaluates_only_misses(self, predictor, monkeypatch):
+        """Test a mixed batch runs the models on the new cells only."""
+        predictor.predict(_sample())
+        rows = []
+        original = predictor._predict_models
+        monkeypatch.setattr(
+            predictor, "_predict_models",
+            lambda features, *args: rows.append(len(features)) or original(features, *args),
+        )
+
+        results = predictor.predict_batch([_sample(), _sample(rpm=2800.0), _sample(rpm=2801.0)])
+        uncached = MaterialPredictor(predictor.config.model_copy(update={"cache_enabled": False}))
+        uncached._publish(predictor.models)
+        expected = uncached.predict_batch([_sample(), _sample(rpm=2800.0), _sample(rpm=2801.0)])
+
+        assert rows == [2]
+        assert [r["predicted_material"] for r in results] == [
+            r["predicted_material"] for r in expected
+        ]
+
+    def test_returned_results_are_copies(self, predictor):
+        """Test modifying a result does not change the cached entry."""
+        predictor.predict(_sample())["predicted_material"] = "Unobtainium"
+        hit = predictor.predict(_sample())
+        hit["top_3_predictions"][0]["material"] = "Unobtainium"
+        hit["top_3_predictions"][0]["properties"]["rpm"] = -1
+        hit["top_3_predictions"].clear()
+
+        result = predictor.predict(_sample())
+
+        assert result["predicted_material"] != "Unobtainium"
+        assert len(result["top_3_predictions"]) == 3
+        assert result["top_3_predictions"][0]["material"] == result["predicted_material"]
+        assert result["top_3_predictions"][0]["properties"]["rpm"] > 0
+
+    def test_sensor_jitter_hits_with_default_resolution(self, trained_predictor):
+        """Test steady drilling with realistic sensor noise mostly hits the cache."""
+        predictor = _caching(trained_predictor)
+        rng = np.random.default_rng(21)
+        samples = [
+            {
+                "rpm": 450.0 + rng.normal(0, 3),
+                "current": 2.3 + rng.normal(0, 0.05),
+                "vibration_readings": list(15 + rng.normal(0, 1.0, 5)),
+                "depth": 30.0 + 0.01 * i,
+                "rpm_history": list(450.0 + rng.normal(0, 3, 10)),
+                "current_history": list(2.3 + rng.normal(0, 0.05, 10)),
+            }
+            for i in range(200)
+        ]
+
+        for sample in samples:
+            predictor.predict(sample)
+
+        assert predictor.get_cache_stats()["hit_rate"] > 0.8
+
+    def test_cached_results_match_uncached_at_default_resolution(self, trained_predictor):
+        """Test the default key and confidence floor never change the predicted material."""
+        predictor = _caching(trained_predictor)
+        X, _ = trained_predictor.generate_synthetic_data(samples_per_material=20, seed=2)
+        noise = {
+            "rpm": 3.0, "current": 0.05, "vibration_mean": 0.5, "vibration_std": 0.3,
+            "vibration_max": 0.7, "rpm_stability": 0.7, "current_spike": 0.03, "depth": 0.05,
+        }
+        rng = np.random.default_rng(5)
+        rows = np.tile(X, (5, 1))
+        columns = {
+            name: rows[:, i] + rng.normal(0, noise[name], len(rows))
+            for i, name in enumerate(predictor.feature_names) if name in noise
+        }
+
+        cached = []
+        for start in range(0, len(rows), 10):
+            batch = {name: values[start:start + 10] for name, values in columns.items()}
+            cached.extend(r["predicted_material"] for r in predictor.predict_batch(batch))
+        expected = [r["predicted_material"] for r in trained_predictor.predict_batch(columns)]
+
+        assert predictor.get_cache_stats()["hits"] > 50
+        assert cached == expected
+
+    def test_options_and_model_swap_miss(self, predictor, trained_predictor):
+        """Test other serving options and a newly published model set miss."""
+        predictor.predict(_sample())
+        predictor.predict(_sample(), ensemble=False)
+        predictor._publish(trained_predictor.models._replace(version="v2"))
+        result = predictor.predict(_sample())
+        stats = predictor.get_cache_stats()
+
+        assert stats["hits"] == 0 and stats["misses"] == 3
+        assert result["model_version"] == "v2"
+        assert stats["version"] == "v2"
+
+    def test_disabled_by_default(self, trained_predictor):
+        """Test the cache is off unless configured."""
+        assert MaterialPredictor().prediction_cache is None
+        assert trained_predictor.get_cache_stats() == {"enabled": False}
@@ -0,0 +1,666 @@
+"""
+Unit tests for Sensor Fusion module.
+"""
+
+import asyncio
+import json
+
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+from scipy import signal
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import DropPolicy, MQTTConfig, SensorConfig
+from sensor_fusion import (
+    SensorStatus,
+    SensorReading,
+    SensorBuffer,
+    SensorFusionEngine,
+    DataPreprocessor,
+    StreamingFilter,
+    AcousticDecimator,
+    VibrationSpectralEngine,
+    MQTTSensorClient,
+    encode_sensor_frame,
+    decode_sensor_frames,
+)
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def make_readings(values, start=None, rate_hz=10.0, sensor_id="vib_01"):
+    """Build evenly spaced readings ending at (or starting from) start."""
+    start = start or datetime.utcnow() - timedelta(seconds=len(values) / rate_hz)
+    return [
+        SensorReading(
+            sensor_id=sensor_id,
+            sensor_type="vibration",
+            value=float(v),
+            unit="g",
+            timestamp=start + timedelta(seconds=i / rate_hz),
+        )
+        for i, v in enumerate(values)
+    ]
+
+
+class TestSensorReading:
+    """Tests for the compact SensorReading record."""
+
+    def test_slotted_with_epoch_timestamp(self):
+        """Test readings carry no __dict__ and normalize datetimes."""
+        when = datetime(2024, 1, 1, 12, 0, 0)
+        reading = SensorReading("vib_01", "vibration", 2.5, "g", when)
+
+        assert not hasattr(reading, "__dict__")
+        assert reading.timestamp == (when - EPOCH).total_seconds()
+        assert reading.as_datetime() == when
+        assert reading.metadata is None
+        assert reading.to_dict()["timestamp"] == when.isoformat()
+
+
+class TestSensorBuffer:
+    """Tests for SensorBuffer ring buffer."""
+
+    def test_empty_buffer(self):
+        """Test empty buffer state."""
+        buffer = SensorBuffer("vib_01", "vibration", buffer_size=10)
+
+        assert buffer.is_empty
+        assert buffer.latest is None
+        assert len(buffer.get_values()) == 0
+        assert buffer.get_statistics()["count"] == 0
+
+    def test_wraparound_keeps_most_recent(self):
+        """Test that the buffer keeps only the newest buffer_size values."""
+        buffer = SensorBuffer("vib_01", "vibration", buffer_size=8)
+        for reading in make_readings(range(20)):
+            buffer.add(reading)
+
+        assert buffer.count == 8
+        np.testing.assert_array_equal(buffer.get_values(), np.arange(12, 20))
+        np.testing.assert_array_equal(buffer.get_values(3), [17, 18, 19])
+        assert buffer.latest.value == 19.0
+
+    def test_values_are_read_only_views(self):
+        """Test that value access does not copy the buffer."""
+        buffer = SensorBuffer("vib_01", "vibration", buffer_size=8)
+        for reading in make_readings(range(11)):
+            buffer.add(reading)
+
+        values = buffer.get_values()
+
+        assert values.dtype == np.float32
+        assert not values.flags.writeable
+        assert np.shares_memory(values, buffer.get_values(4))
+
+    def test_running_statistics_after_wrap(self):
+        """Test running statistics stay consistent after eviction."""
+        buffer = SensorBuffer("vib_01", "vibration", buffer_size=50)
+        data = np.random.default_rng(0).normal(2.0, 0.5, 200)
+        for reading in make_readings(data):
+            buffer.add(reading)
+
+        stats = buffer.get_statistics()
+        window = data[-50:].astype(np.float32)
+
+        assert stats["count"] == 50
+        assert stats["mean"] == pytest.approx(window.mean(), rel=1e-5)
+        assert stats["std"] == pytest.approx(window.std(), rel=1e-3)
+        assert stats["max"] == pytest.approx(window.max())
+
+    def test_rate_and_recent_readings(self):
+        """Test rate estimate and reconstruction of recent readings."""
+        buffer = SensorBuffer("vib_01", "vibration", buffer_size=100)
+        readings = make_readings(np.ones(60), rate_hz=20.0)
+        for reading in readings:
+            buffer.add(reading)
+
+        recent = buffer.get_recent(5)
+
+        assert buffer.get_rate_hz() == pytest.approx(20.0, rel=0.05)
+        assert len(recent) == 5
+        assert recent[-1].unit == "g"
+        assert abs(recent[-1].timestamp - readings[-1].timestamp) < 1e-3
+
+    def test_extend_matches_add(self):
+        """Test bulk extend produces the same window as per-reading add."""
+        readings = make_readings(np.arange(25))
+        by_add = SensorBuffer("vib_01", "vibration", buffer_size=10)
+        by_extend = SensorBuffer("vib_01", "vibration", buffer_size=10)
+        for reading in readings[:3]:
+            by_add.add(reading)
+            by_extend.add(reading)
+        for reading in readings[3:]:
+            by_add.add(reading)
+
+        timestamps = by_add.get_timestamps()
+        by_extend.extend(np.array([r.timestamp for r in readings[3:18]]), np.arange(3, 18))
+        by_extend.extend(timestamps[-7:], np.arange(18, 25))
+
+        np.testing.assert_array_equal(by_extend.get_values(), by_add.get_values())
+        assert by_extend.get_statistics()["mean"] == pytest.approx(by_add.get_statistics()["mean"])
+        assert by_extend.latest.value == 24.0
+
+    def test_rolling_statistics_match_window(self):
+        """Test O(1) rolling stats against the window under mixed appends."""
+        rng = np.random.default_rng(3)
+        buffer = SensorBuffer("pressure_01", "pressure", buffer_size=64)
+        for step in range(40):
+            chunk = rng.normal(200.0, 0.05, rng.integers(1, 30)).astype(np.float32)
+            if step % 3 == 0:
+                for value in chunk:
+                    buffer._write(0.0, float(value), 1.0)
+            else:
+                buffer.extend(np.zeros(len(chunk)), chunk)
+
+            window = buffer.get_values().astype(np.float64)
+            stats = buffer.get_statistics()
+            assert stats["min"] == window.min()
+            assert stats["max"] == window.max()
+            assert stats["mean"] == pytest.approx(window.mean(), rel=1e-12)
+            assert stats["std"] == pytest.approx(window.std(), rel=1e-6)
+
+    def test_outlier_mask(self):
+        """Test the vectorized outlier mask flags spikes."""
+        buffer = SensorBuffer("vib_01", "vibration", buffer_size=100)
+        data = np.random.default_rng(4).normal(2.0, 0.1, 100)
+        data[[10, 70]] = 9.0
+        buffer.extend(np.zeros(100), data)
+
+        mask = buffer.outlier_mask(z_threshold=3.0)
+
+        assert mask.shape == (100,)
+        np.testing.assert_array_equal(np.flatnonzero(mask), [10, 70])
+        assert [r.value for r in buffer.detect_outliers()] == [9.0, 9.0]
+
+    def test_incremental_health_accumulators(self):
+        """Test drift and out-of-range counters match a full recompute."""
+        rng = np.random.default_rng(5)
+        buffer = SensorBuffer("temp_01", "temperature", buffer_size=97, valid_range=(0.0, 80.0))
+        for step in range(60):
+            chunk = rng.normal(60.0 + step, 15.0, rng.integers(1, 40))
+            if step % 4 == 0:
+                for value in chunk:
+                    buffer._write(0.0, float(value), 1.0)
+            else:
+                buffer.extend(np.zeros(len(chunk)), chunk)
+
+            window = buffer.get_values().astype(np.float64)
+            half = len(window) // 2
+            if half:
+                expected = (window[half:].mean() - window[:half].mean()) / abs(window[:half].mean())
+                assert buffer.get_drift() == pytest.approx(expected, rel=1e-9, abs=1e-12)
+            assert buffer._out_of_range_count == np.count_nonzero(window > 80.0)
+
+    def test_assess_health_healthy(self):
+        """Test healthy sensor assessment."""
+        buffer = SensorBuffer("vib_01", "vibration", buffer_size=100, expected_rate_hz=10.0)
+        for reading in make_readings(np.full(60, 2.0)):
+            buffer.add(reading)
+
+        report = buffer.assess_health(valid_range=(0.0, 15.0))
+
+        assert report.status == SensorStatus.HEALTHY
+        assert report.out_of_range_percent == 0.0
+
+    def test_assess_health_stale(self):
+        """Test stale data is reported offline."""
+        buffer = SensorBuffer("vib_01", "vibration", buffer_size=10)
+        start = datetime.utcnow() - timedelta(minutes=5)
+        for reading in make_readings([1.0, 1.0], start=start):
+            buffer.add(reading)
+
+        report = buffer.assess_health(valid_range=(0.0, 15.0))
+
+        assert report.status == SensorStatus.OFFLINE
+
+
+class TestSensorFusionEngine:
+    """Tests for SensorFusionEngine ingestion."""
+
+    def test_process_columns_groups_by_sensor(self):
+        """Test columnar ingestion routes interleaved rows to their buffers."""
+        engine = SensorFusionEngine()
+        now = (datetime.utcnow() - EPOCH).total_seconds()
+        ids = np.array(["vib_01", "pressure_01", "vib_01", "vib_01", "pressure_01"])
+        types = np.array(["vibration", "pressure", "vibration", "vibration", "pressure"])
+        timestamps = now + np.arange(5) * 0.001
+        values = np.array([1.0, 200.0, 2.0, 3.0, 210.0])
+
+        ingested = asyncio.run(engine.process_columns(
+            ids, types, memoryview(timestamps), values,
+        ))
+
+        assert ingested == 5
+        np.testing.assert_array_equal(engine._buffers["vib_01"].get_values(), [1.0, 2.0, 3.0])
+        np.testing.assert_array_equal(engine._buffers["pressure_01"].get_values(), [200.0, 210.0])
+        assert engine._sensor_mapping["pressure_01"] == "pressure"
+
+    def test_process_columns_length_mismatch(self):
+        """Test mismatched column lengths are rejected."""
+        engine = SensorFusionEngine()
+
+        with pytest.raises(ValueError):
+            asyncio.run(engine.process_columns("vib_01", "vibration", np.zeros(3), np.zeros(4)))
+
+
+class TestFusionScheduler:
+    """Tests for the event-driven fusion loop."""
+
+    @staticmethod
+    def _push_frame(engine, now):
+        """Push one reading for each essential sensor."""
+        return engine.process_columns(
+            ["rpm_01", "current_01", "vib_01", "depth_01"],
+            ["rpm", "current", "vibration", "depth"],
+            np.full(4, now),
+            [80.0, 120.0, 2.5, 15.0],
+        )
+
+    def test_idle_engine_does_not_fuse(self):
+        """Test that no fusion runs without data when the heartbeat is off."""
+        async def scenario():
+            engine = SensorFusionEngine(SensorConfig(fusion_min_rate_hz=0.0))
+            await engine.start()
+            await asyncio.sleep(0.05)
+            await engine.stop()
+            return engine
+
+        engine = asyncio.run(scenario())
+
+        assert engine.fusion_count == 0
+        assert engine.fused_data is None
+
+    def test_bursts_are_coalesced(self):
+        """Test that a burst of frames produces a single fusion."""
+        async def scenario():
+            engine = SensorFusionEngine(SensorConfig(
+                fusion_min_rate_hz=0.0,
+                fusion_max_rate_hz=10.0,
+            ))
+            await engine.start()
+            now = (datetime.utcnow() - EPOCH).total_seconds()
+            await self._push_frame(engine, now)
+            await asyncio.sleep(0.02)
+            for _ in range(5):
+                await self._push_frame(engine, now)
+            await asyncio.sleep(0.05)
+            counts = engine.fusion_count
+            await engine.stop()
+            return engine, counts
+
+        engine, counts = asyncio.run(scenario())
+
+        assert counts == 1
+        assert engine.fused_data.rpm == 80.0
+        assert engine.fused_data.sensors_active == 4
+        assert engine.fused_data.raw_readings is None
+
+    def test_raw_readings_only_for_subscribers(self):
+        """Test raw readings are built once a subscriber asks for them."""
+        engine = SensorFusionEngine(SensorConfig())
+        now = (datetime.utcnow() - EPOCH).total_seconds()
+        asyncio.run(self._push_frame(engine, now))
+
+        assert engine.get_fused_data().raw_readings is None
+        assert engine.get_fused_data(include_raw_readings=True).raw_readings["rpm"].value == 80.0
+
+        engine.register_data_callback(lambda fused: None, include_raw_readings=True)
+
+        assert set(engine.get_fused_data().raw_readings) == {"rpm", "current", "vibration", "depth"}
+
+
+class TestAlignedFusion:
+    """Tests for time-aligned multi-rate fusion."""
+
+    def test_resample_arrays_on_grid(self):
+        """Test array resampling interpolates onto an explicit grid."""
+        preprocessor = DataPreprocessor(SensorConfig())
+
+        grid, values = preprocessor.resample_arrays(
+            np.array([0.0, 1.0, 2.0]), np.array([0.0, 10.0, 20.0]),
+            grid=np.array([0.5, 1.5, 3.0]),
+        )
+
+        np.testing.assert_allclose(values, [5.0, 15.0, 20.0])
+
+    def test_aligned_block_interpolates_streams(self):
+        """Test fast and slow streams are aligned on one grid."""
+        engine = SensorFusionEngine(SensorConfig())
+        end = (datetime.utcnow() - EPOCH).total_seconds()
+
+        fast_t = end - 2.0 + np.arange(2000) * 0.001
+        slow_t = end - 2.0 + np.arange(21) * 0.1
+        for sensor_id, sensor_type, t, v in (
+            ("vib_01", "vibration", fast_t, fast_t - fast_t[0]),
+            ("rpm_01", "rpm", slow_t, 80.0 + 10.0 * (slow_t - slow_t[0])),
+            ("current_01", "current", slow_t, np.full(21, 120.0)),
+            ("depth_01", "depth", slow_t, 10.0 + 0.01 * (slow_t - slow_t[0])),
+        ):
+            asyncio.run(engine.process_columns(sensor_id, sensor_type, t, v))
+
+        block = engine.get_aligned_data(rate_hz=100.0, window_s=1.0)
+        elapsed = block.timestamps - slow_t[0]
+
+        assert 99 <= len(block) <= 101
+        np.testing.assert_allclose(np.diff(block.timestamps), 0.01, atol=1e-6)
+        np.testing.assert_allclose(block.columns["rpm"], 80.0 + 10.0 * elapsed, rtol=1e-5)
+        np.testing.assert_allclose(block.columns["vibration_g"], elapsed, atol=2e-3)
+        np.testing.assert_allclose(block.columns["feed_rate_m_min"], 0.6, rtol=1e-3)
+        assert block.row(-1).current_a == pytest.approx(120.0)
+
+    def test_aligned_since_emits_only_new_points(self):
+        """Test successive aligned calls do not repeat grid points."""
+        engine = SensorFusionEngine(SensorConfig())
+        end = (datetime.utcnow() - EPOCH).total_seconds()
+        t = end - 1.0 + np.arange(11) * 0.1
+        asyncio.run(engine.process_columns(
+            np.repeat(["rpm_01", "current_01"], 11),
+            np.repeat(["rpm", "current"], 11),
+            np.tile(t, 2), np.ones(22),
+        ))
+
+        first = engine.get_aligned_data(rate_hz=10.0, window_s=0.5)
+        second = engine.get_aligned_data(rate_hz=10.0, since=float(first.timestamps[-1]))
+
+        assert len(first) >= 4
+        assert second is None
+
+
+class TestStreamingPreprocessing:
+    """Tests for stateful streaming preprocessing."""
+
+    def test_chunked_filter_matches_single_pass(self):
+        """Test chunked filtering equals filtering the whole stream."""
+        data = np.random.default_rng(1).normal(0.0, 1.0, 1000)
+        chunked = StreamingFilter(cutoff_freq=200.0, sampling_rate=1000.0)
+        whole = StreamingFilter(cutoff_freq=200.0, sampling_rate=1000.0)
+
+        out = np.concatenate([chunked.process(chunk) for chunk in np.array_split(data, 7)])
+
+        np.testing.assert_allclose(out, whole.process(data), atol=1e-12)
+
+    def test_filter_coefficients_are_cached(self):
+        """Test filters with the same design share coefficients."""
+        a = StreamingFilter(cutoff_freq=50.0, sampling_rate=1000.0, order=4)
+        b = StreamingFilter(cutoff_freq=50.0, sampling_rate=1000.0, order=4)
+
+        assert a.sos is b.sos
+        np.testing.assert_allclose(a.sos, signal.butter(4, 0.1, output="sos"))
+
+    def test_streaming_pipeline_keeps_state_per_stream(self):
+        """Test streaming pipeline output length and per-stream state."""
+        preprocessor = DataPreprocessor(SensorConfig())
+        data = np.random.default_rng(2).normal(60.0, 0.5, 50)
+        data[30] = 500.0
+
+        first = preprocessor.preprocess_pipeline(data[:25], "temperature", streaming=True, stream_id="t1")
+        second = preprocessor.preprocess_pipeline(data[25:], "temperature", streaming=True, stream_id="t1")
+
+        assert len(first) == 25 and len(second) == 25
+        assert second.max() < 65.0
+        assert set(preprocessor._streams) == {"t1"}
+
+
+class TestSensorHealthCache:
+    """Tests for cached sensor health reports."""
+
+    def test_reads_do_not_recompute(self):
+        """Test health reads return the cached map until refreshed."""
+        async def scenario():
+            engine = SensorFusionEngine(SensorConfig())
+            await engine.start()
+            first = engine.get_sensor_health()
+            await engine.process_columns("vib_01", "vibration", np.full(3, 0.0), np.ones(3))
+            second = engine.get_sensor_health()
+            refreshed = engine.refresh_sensor_health()
+            await engine.stop()
+            return first, second, refreshed
+
+        first, second, refreshed = asyncio.run(scenario())
+
+        assert second is first
+        assert first["vib_01"].status == SensorStatus.OFFLINE
+        assert refreshed["vib_01"].last_reading_time is not None
+
+
+class TestMQTTIngestion:
+    """Tests for the bounded MQTT ingestion pipeline."""
+
+    TOPIC = "ehs/simba/sensors/vibration/vib_01"
+
+    @staticmethod
+    def _client(**overrides):
+        config = MQTTConfig(ingest_queue_size=100, **overrides)
+        return MQTTSensorClient(SensorFusionEngine(SensorConfig()), config)
+
+    def test_drop_oldest_keeps_newest_messages(self):
+        """Test the default policy evicts the oldest queued message."""
+        client = self._client()
+        for i in range(150):
+            client.enqueue(self.TOPIC, json.dumps({"value": i}).encode())
+
+        stats = client.get_ingest_stats()
+
+        assert stats["queue_depth"] == 100
+        assert stats["dropped_oldest"] == 50
+        assert json.loads(client._queue.get_nowait()[1])["value"] == 50
+
+    def test_drop_newest_rejects_incoming(self):
+        """Test the newest policy keeps the queue head intact."""
+        client = self._client(drop_policy=DropPolicy.NEWEST)
+        accepted = [client.enqueue(self.TOPIC, b'{"value": 1}') for _ in range(120)]
+
+        assert sum(accepted) == 100
+        assert client.get_ingest_stats()["dropped_newest"] == 20
+
+    def test_downsample_above_high_water(self):
+        """Test per-sensor downsampling engages above the high-water mark."""
+        client = self._client(drop_policy=DropPolicy.DOWNSAMPLE, downsample_factor=4)
+        for _ in range(80):
+            client.enqueue(self.TOPIC, b'{"value": 1}')
+        for _ in range(40):
+            client.enqueue(self.TOPIC, b'{"value": 1}')
+
+        stats = client.get_ingest_stats()
+
+        assert stats["queue_depth"] == 90
+        assert stats["downsampled"] == 30
+        assert stats["dropped_oldest"] == 0
+
+    def test_batched_payloads_decode_into_buffers(self):
+        """Test batch and single payloads are ingested as one frame."""
+        client = self._client()
+        start = (datetime.utcnow() - EPOCH).total_seconds()
+        client.enqueue(self.TOPIC, json.dumps({
+            "values": [0.5, 1.0, 1.5, 2.0], "timestamp": start, "sample_period_s": 0.001,
+        }).encode())
+        client.enqueue("ehs/simba/sensors/rpm/rpm_01", b'{"value": 80.0}')
+        client.enqueue(self.TOPIC, b"not json")
+
+        items = [client._queue.get_nowait() for _ in range(3)]
+        ingested = asyncio.run(client._ingest(items))
+        buffers = client.fusion_engine._buffers
+
+        assert ingested == 5
+        np.testing.assert_array_equal(buffers["vib_01"].get_values(), [0.5, 1.0, 1.5, 2.0])
+        np.testing.assert_allclose(np.diff(buffers["vib_01"].get_timestamps()), 0.001, atol=1e-6)
+        assert buffers["rpm_01"].latest_value == 80.0
+        assert client.get_ingest_stats()["decode_errors"] == 1
+        assert client._topic_cache[self.TOPIC] == ("rig_01", "vibration", "vib_01")
+
+    def test_mixed_payloads_keep_arrival_order(self):
+        """Test single, batch and binary payloads for one sensor stay in order."""
+        client = self._client()
+        start = (datetime.utcnow() - EPOCH).total_seconds()
+        client.enqueue(self.TOPIC, json.dumps({"value": 1.0, "unit": "g", "timestamp": start}).encode())
+        client.enqueue(self.TOPIC, json.dumps({
+            "values": [2.0, 3.0], "timestamp": start + 0.001, "sample_period_s": 0.001,
+        }).encode())
+        client.enqueue(self.TOPIC, encode_sensor_frame("vib_01", "vibration", [4.0, 5.0], start + 0.003, 0.001))
+        client.enqueue(self.TOPIC, json.dumps({"value": 6.0, "timestamp": start + 0.005}).encode())
+
+        items = [client._queue.get_nowait() for _ in range(4)]
+        ingested = asyncio.run(client._ingest(items))
+        buffer = client.fusion_engine._buffers["vib_01"]
+
+        assert ingested == 6
+        np.testing.assert_array_equal(buffer.get_values(), [1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+        assert np.all(np.diff(buffer.get_timestamps()) > 0)
+        assert buffer.unit == "g"
+
+
+class TestBinaryFrames:
+    """Tests for the binary sensor frame format."""
+
+    def test_round_trip_is_zero_copy(self):
+        """Test frames decode to views of the payload."""
+        values = np.random.default_rng(6).normal(0.0, 1.0, 5000).astype(np.float32)
+        payload = encode_sensor_frame("acoustic_01", "acoustic", values, 1700000000.0, 2e-5, quality=0.5)
+        payload += encode_sensor_frame("vib_x", "custom", [1.0, 2.0], 1700000000.0, 0.001)
+
+        first, second = decode_sensor_frames(payload, default_sensor_type="vibration")
+
+        assert len(payload) == 2 * 28 + 12 + 8 + 4 * 5002
+        assert first.sensor_id == "acoustic_01" and first.sensor_type == "acoustic"
+        assert first.quality == pytest.approx(0.5, abs=1 / 255)
+        np.testing.assert_array_equal(first.values, values)
+        assert np.shares_memory(first.values, np.frombuffer(payload, dtype=np.uint8))
+        assert second.sensor_type == "vibration"
+        np.testing.assert_allclose(second.timestamps - 1700000000.0, [0.0, 0.001], atol=1e-6)
+
+    def test_truncated_frame_rejected(self):
+        """Test truncated payloads raise ValueError."""
+        payload = encode_sensor_frame("vib_01", "vibration", np.ones(10), 0.0, 0.001)
+
+        with pytest.raises(ValueError):
+            decode_sensor_frames(payload[:-3])
+        with pytest.raises(ValueError):
+            decode_sensor_frames(b"XX" + payload[2:])
+
+    def test_mqtt_ingests_binary_and_json(self):
+        """Test MQTT ingestion mixes binary frames with JSON readings."""
+        client = MQTTSensorClient(SensorFusionEngine(SensorConfig()), MQTTConfig())
+        start = (datetime.utcnow() - EPOCH).total_seconds()
+        frame = encode_sensor_frame("vib_01", "vibration", np.arange(100), start, 0.001)
+        client.enqueue("ehs/simba/sensors/vibration/vib_01", frame)
+        client.enqueue("ehs/simba/sensors/rpm/rpm_01", b'{"value": 80.0}')
+
+        items = [client._queue.get_nowait() for _ in range(2)]
+        ingested = asyncio.run(client._ingest(items))
+        buffers = client.fusion_engine._buffers
+
+        assert ingested == 101
+        np.testing.assert_array_equal(buffers["vib_01"].get_values(), np.arange(100))
+        assert buffers["rpm_01"].latest_value == 80.0
+
+
+class TestAcousticDecimation:
+    """Tests for streaming acoustic decimation."""
+
+    FS = 50000.0
+
+    def _tone(self, freq_hz, seconds=0.2, amplitude=1.0):
+        t = np.arange(int(self.FS * seconds)) / self.FS
+        return amplitude * np.sin(2 * np.pi * freq_hz * t)
+
+    def test_chunked_matches_single_pass(self):
+        """Test windows are identical regardless of chunking."""
+        data = np.random.default_rng(7).normal(0.0, 0.1, 25000)
+        chunked = AcousticDecimator(self.FS, output_rate_hz=100.0)
+        whole = AcousticDecimator(self.FS, output_rate_hz=100.0)
+
+        parts = [chunked.process(chunk, 0.0 if i == 0 else None)
+                 for i, chunk in enumerate(np.array_split(data, 13))]
+        expected = whole.process(data, 0.0)
+
+        assert len(expected) == 50
+        np.testing.assert_allclose(np.concatenate([p.band_db for p in parts]), expected.band_db)
+        np.testing.assert_allclose(np.concatenate([p.timestamps for p in parts]), expected.timestamps)
+        np.testing.assert_allclose(np.diff(expected.timestamps), 0.01)
+
+    def test_band_energy_isolates_void_band(self):
+        """Test in-band tones dominate the band level, out-of-band do not."""
+        decimator = AcousticDecimator(self.FS, output_rate_hz=100.0, band_hz=(5000.0, 15000.0))
+        in_band = decimator.process(self._tone(10000.0), 0.0)
+        decimator.reset()
+        out_band = decimator.process(self._tone(500.0), 0.0)
+
+        # Unit sine: mean square 0.5 -> 10*log10(0.5 / (20e-6)^2) ~= 91 dB
+        assert in_band.level_db[-1] == pytest.approx(91.0, abs=0.1)
+        assert in_band.band_db[-1] == pytest.approx(in_band.level_db[-1], abs=0.5)
+        assert out_band.band_db[-1] < out_band.level_db[-1] - 60.0
+
+    def test_engine_buffers_decimated_levels(self):
+        """Test raw acoustic frames are buffered only as window levels."""
+        engine = SensorFusionEngine(SensorConfig())
+        start = (datetime.utcnow() - EPOCH).total_seconds() - 0.2
+        frame = encode_sensor_frame("acoustic_01", "acoustic", self._tone(10000.0, amplitude=0.02),
+                                    start, 1.0 / self.FS)
+
+        asyncio.run(engine.process_frames(decode_sensor_frames(frame)))
+        level = engine._buffers["acoustic_01"]
+        band = engine._buffers["acoustic_01_band"]
+
+        assert level.count == band.count == 20
+        np.testing.assert_allclose(np.diff(level.get_timestamps()), 0.01, atol=1e-6)
+        assert level.latest_value == pytest.approx(57.0, abs=0.2)
+
+
+class TestVibrationSpectralEngine:
+    """Tests for overlapping-window vibration spectral features."""
+
+    BANDS = {"bpfo": (50.0, 150.0), "high": (350.0, 500.0)}
+
+    def test_chunked_matches_single_pass(self):
+        """Test 50% overlap framing is independent of chunking."""
+        data = np.random.default_rng(8).normal(0.0, 1.0, 5000)
+        chunked = VibrationSpectralEngine(1024, 1000.0, 0.5, self.BANDS)
+        whole = VibrationSpectralEngine(1024, 1000.0, 0.5, self.BANDS)
+
+        parts = [s for i, chunk in enumerate(np.array_split(data, 9))
+                 for s in chunked.process(chunk, 0.0 if i == 0 else None)]
+        expected = whole.process(data, 0.0)
+
+        assert len(expected) == (5000 - 1024) // 512 + 1
+        assert [s.rms for s in parts] == pytest.approx([s.rms for s in expected])
+        assert [s.band_energy["high"] for s in parts] == pytest.approx(
+            [s.band_energy["high"] for s in expected])
+        assert expected[0].timestamp == pytest.approx(1.023)
+        assert expected[1].timestamp - expected[0].timestamp == pytest.approx(0.512)
+
+    def test_tone_features(self):
+        """Test a pure tone lands in its band with sine statistics."""
+        t = np.arange(2048) / 1000.0
+        engine = VibrationSpectralEngine(1024, 1000.0, 0.5, self.BANDS)
+
+        spectrum = engine.process(2.0 * np.sin(2 * np.pi * 125.0 * t), 0.0)[-1]
+
+        assert spectrum.rms == pytest.approx(np.sqrt(2.0), rel=1e-3)
+        assert spectrum.crest_factor == pytest.approx(np.sqrt(2.0), rel=1e-3)
+        assert spectrum.kurtosis == pytest.approx(1.5, rel=1e-2)
+        assert spectrum.band_energy["bpfo"] == pytest.approx(2.0, rel=0.02)
+        assert spectrum.band_energy["high"] < 1e-4
+
+    def test_fused_data_exposes_spectrum(self):
+        """Test fusion attaches the latest spectrum for fresh vibration data."""
+        engine = SensorFusionEngine(SensorConfig())
+        now = (datetime.utcnow() - EPOCH).total_seconds()
+        t = now - 2.0 + np.arange(2000) * 0.001
+        asyncio.run(engine.process_columns("vib_01", "vibration", t, np.random.default_rng(9).normal(0, 1, 2000)))
+        asyncio.run(engine.process_columns(
+            ["rpm_01", "current_01", "depth_01"], ["rpm", "current", "depth"],
+            np.full(3, now), [80.0, 120.0, 15.0],
+        ))
+
+        fused = engine._fuse_sensors()
+
+        assert fused.vibration_spectrum is not None
+        assert fused.vibration_spectrum.kurtosis == pytest.approx(3.0, abs=0.6)
+        assert set(fused.to_dict()["vibration_spectrum"]["band_energy"]) == {"bpfo", "bpfi", "bsf", "high"}
+        assert len(engine.get_vibration_spectra()) == 2
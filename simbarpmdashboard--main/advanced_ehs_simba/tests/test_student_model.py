@@ -0,0 +1,119 @@
+"""
+Unit tests for the distilled student model.
+"""
+
+import numpy as np
+import pytest
+from sklearn.tree import DecisionTreeRegressor
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import DistillationConfig, MaterialPredictorConfig
+from distillation import distill_and_register, distill_student, teacher_proba
+from ml_predictor import MaterialPredictor
+from student_model import StudentModel, fit_softmax_student, fit_tree_student
+
+SAMPLE = {"rpm": 1500, "current": 7.0, "vibration_readings": [40, 42, 39], "depth": 30.0}
+
+
+@pytest.fixture(scope="module")
+def data():
+    """Small synthetic dataset."""
+    return MaterialPredictor().generate_synthetic_data(samples_per_material=40, seed=31)
+
+
+@pytest.fixture(scope="module")
+def teacher(data, tmp_path_factory):
+    """Predictor with a registered ensemble."""
+    model = MaterialPredictor(models_path=tmp_path_factory.mktemp("models"))
+    model.train(*data, save_model=True)
+    return model
+
+
+class TestStudentModel:
+    """Tests for student fitting, evaluation and storage."""
+
+    def test_softmax_folds_scaler_into_weights(self):
+        """Test raw-feature probabilities equal those of the standardized fit."""
+        rng = np.random.default_rng(0)
+        X = rng.normal(50, 10, size=(400, 3))
+        soft = rng.dirichlet(np.ones(4), size=400)
+        mean, scale = X.mean(axis=0), X.std(axis=0)
+
+        raw = fit_softmax_student(X, soft, np.arange(4), mean, scale)
+        unit = fit_softmax_student((X - mean) / scale, soft, np.arange(4), np.zeros(3), np.ones(3))
+
+        np.testing.assert_allclose(raw.predict_proba(X), unit.predict_proba((X - mean) / scale), atol=1e-9)
+        np.testing.assert_allclose(raw.predict_proba(X).sum(axis=1), 1.0)
+
+    def test_tree_matches_regression_tree(self):
+        """Test the exported tree reproduces sklearn, one row or many."""
+        rng = np.random.default_rng(1)
+        X = rng.normal(size=(600, 5))
+        soft = rng.dirichlet(np.ones(3), size=600)
+        reference = DecisionTreeRegressor(max_depth=6, min_samples_leaf=5, random_state=0).fit(X, soft)
+
+        student = fit_tree_student(X, soft, np.arange(3), max_depth=6, min_samples_leaf=5, random_state=0)
+        X_test = rng.normal(size=(50, 5))
+
+        np.testing.assert_allclose(student.predict_proba(X_test), reference.predict(X_test), atol=1e-6)
+        np.testing.assert_array_equal(
+            np.vstack([student.predict_proba(row[None]) for row in X_test]),
+            student.predict_proba(X_test),
+        )
+
+    @pytest.mark.parametrize("kind", ["softmax", "tree"])
+    def test_distilled_student_is_small_and_round_trips(self, teacher, data, kind, tmp_path):
+        """Test students follow the teacher and survive save/load."""
+        X, _ = data
+        student = distill_student(teacher, X, DistillationConfig(kind=kind, max_depth=6))
+        student.save(tmp_path / "student.npz")
+        loaded = StudentModel.load(tmp_path / "student.npz")
+
+        agreement = np.mean(
+            student.predict_proba(X).argmax(axis=1) == teacher_proba(teacher, X).argmax(axis=1)
+        )
+
+        assert agreement > 0.6
+        assert (tmp_path / "student.npz").stat().st_size < 32 * 1024
+        assert list(loaded.classes) == list(teacher.rf_model.classes_)
+        np.testing.assert_array_equal(loaded.predict_proba(X), student.predict_proba(X))
+
+
+class TestStudentServing:
+    """Tests for registering and selecting the student at runtime."""
+
+    def test_register_and_select_student(self, teacher, data):
+        """Test the student is registered with a report and chosen per call or by config."""
+        version, report = distill_and_register(
+            teacher, *data, DistillationConfig(latency_repeats=5), activate=True,
+        )
+        manifest = teacher.registry.get_manifest(version)
+        served = MaterialPredictor(models_path=teacher.models_path)
+
+        assert "student.npz" in manifest.artifacts
+        assert manifest.metadata["student"]["student_bytes"] == report.student_bytes
+        assert report.student_single_us > 0 and report.teacher_single_us > 0
+        assert 0.0 <= report.agreement <= 1.0
+        assert served.predict(SAMPLE)["inference_model"] == "ensemble"
+        assert served.predict(SAMPLE, model="student")["inference_model"] == "student"
+        assert served.predict(SAMPLE, model="student")["model_version"] == version
+
+        student_only = MaterialPredictor(
+            MaterialPredictorConfig(inference_model="student", load_teacher=False), teacher.models_path,
+        )
+        result = student_only.predict(SAMPLE, model="ensemble")
+
+        assert student_only.rf_model is None
+        assert result["inference_model"] == "student"
+        assert result["predicted_material"] in student_only.material_db
+
+    def test_version_without_student_serves_ensemble(self, data, tmp_path):
+        """Test asking for a missing student falls back to the ensemble."""
+        model = MaterialPredictor(models_path=tmp_path)
+        model.train(*data, save_model=False)
+
+        assert model.predict(SAMPLE, model="student")["inference_model"] == "ensemble"
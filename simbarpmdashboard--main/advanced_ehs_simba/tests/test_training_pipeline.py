@@ -0,0 +1,139 @@
+"""
+Unit tests for the out-of-core material model training pipeline.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import MaterialPredictorConfig, TrainingPipelineConfig
+from ml_predictor import MaterialPredictor
+from training_pipeline import TrainingPipeline, count_rows, iter_training_chunks
+
+
+def _config(**overrides):
+    values = dict(chunk_rows=400, forest_trees=12, warm_start_trees_per_chunk=2, eval_sample_rows=300)
+    values.update(overrides)
+    return TrainingPipelineConfig(**values)
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    """Synthetic .npy dataset written one material after another."""
+    path = tmp_path / "train.npy"
+    MaterialPredictor(models_path=tmp_path).write_synthetic_data(path, samples_per_material=100, seed=4)
+    return path
+
+
+class TestTrainingChunks:
+    """Tests for chunked reading of training data."""
+
+    def test_npy_chunks_cover_file_and_mix_materials(self, dataset):
+        """Test strided chunks read every row once and sample all materials."""
+        predictor = MaterialPredictor(models_path=dataset.parent)
+        X_all, y_all = predictor.load_synthetic_data(dataset)
+
+        chunks = list(iter_training_chunks(dataset, predictor.feature_names, 400))
+
+        assert count_rows(dataset) == len(y_all) == 1300
+        assert len(chunks) == 4
+        assert sum(len(y) for _, y in chunks) == len(y_all)
+        assert all(set(y) == set(y_all) for _, y in chunks)
+        np.testing.assert_array_equal(
+            np.sort(np.concatenate([X for X, _ in chunks]), axis=0), np.sort(X_all, axis=0),
+        )
+
+    def test_unsupported_format_rejected(self, tmp_path):
+        """Test unknown file types raise ValueError."""
+        with pytest.raises(ValueError):
+            list(iter_training_chunks(tmp_path / "train.csv", ["rpm"], 100))
+
+    def test_parquet_chunks(self, tmp_path):
+        """Test Parquet files are read in record batches."""
+        pytest.importorskip("pyarrow")
+        path = tmp_path / "train.parquet"
+        predictor = MaterialPredictor(models_path=tmp_path)
+        predictor.write_synthetic_data(path, samples_per_material=20, seed=4)
+
+        chunks = list(iter_training_chunks(path, predictor.feature_names, 100))
+
+        assert count_rows(path) == 260
+        assert sum(len(y) for _, y in chunks) == 260
+
+
+class TestTrainingPipeline:
+    """Tests for chunked training, warm starts and the process pool."""
+
+    @pytest.mark.parametrize("booster", ["gradient_boosting", "hist_gradient_boosting"])
+    def test_chunked_training_registers_version(self, dataset, booster):
+        """Test a run trains on every chunk and records its stage timings."""
+        pipeline = TrainingPipeline(
+            _config(boost_sample_rows=500), MaterialPredictorConfig(booster=booster), dataset.parent,
+        )
+
+        report = pipeline.run(dataset)
+        predictor = MaterialPredictor(MaterialPredictorConfig(booster=booster), dataset.parent)
+        manifest = predictor.registry.get_manifest(report.version)
+
+        assert predictor.load_models()
+        assert predictor.model_version == report.version
+        assert report.forest_trees == 12
+        assert report.boost_rows <= 500
+        assert report.rows == 1300
+        assert set(report.stage_timings) == {"scan", "forest", "boosting", "compile", "evaluate", "register"}
+        assert manifest.metadata["booster"] == booster
+        assert set(manifest.metadata["stage_timings"]) <= set(report.stage_timings)
+        assert report.metrics["rf_accuracy"] > 0.3
+        assert len(predictor.predict_batch([{"rpm": 1500, "current": 7.0, "depth": 30.0}])) == 1
+
+    def test_warm_start_grows_forest(self, dataset):
+        """Test new data with a subset of materials adds trees to the active version."""
+        pipeline = TrainingPipeline(_config(), MaterialPredictorConfig(), dataset.parent)
+        base = pipeline.run(dataset)
+        X, y = MaterialPredictor().generate_synthetic_data(samples_per_material=40, seed=9)
+        subset = np.isin(y, ["Coal", "Limestone", "Granite"])
+
+        report = pipeline.run((X[subset], y[subset]), warm_start=True)
+        predictor = MaterialPredictor(models_path=dataset.parent)
+        predictor.load_models()
+
+        assert report.base_version == base.version
+        assert report.forest_trees == base.forest_trees + 2
+        assert report.boost_rows == 0
+        assert "boosting" not in report.stage_timings
+        assert predictor.model_version == report.version
+        assert len(predictor.rf_model.classes_) == len(predictor.material_db)
+        assert list(predictor.rf_model.classes_) == list(predictor.gb_model.classes_)
+
+    def test_warm_start_needs_active_version(self, tmp_path):
+        """Test a warm start without a base version is rejected."""
+        pipeline = TrainingPipeline(_config(), MaterialPredictorConfig(), tmp_path)
+
+        with pytest.raises(KeyError):
+            pipeline.run(MaterialPredictor().generate_synthetic_data(10, seed=1), warm_start=True)
+
+    def test_train_async_runs_in_process_pool(self, dataset):
+        """Test the event loop keeps running while a pool job trains."""
+        pipeline = TrainingPipeline(_config(), MaterialPredictorConfig(), dataset.parent)
+
+        async def scenario():
+            ticks = 0
+            job = asyncio.ensure_future(pipeline.train_async(dataset))
+            while not job.done():
+                await asyncio.sleep(0.01)
+                ticks += 1
+            return await job, ticks
+
+        try:
+            report, ticks = asyncio.run(scenario())
+        finally:
+            pipeline.shutdown()
+
+        assert ticks > 0
+        assert MaterialPredictor(models_path=dataset.parent).registry.active_version() == report.version
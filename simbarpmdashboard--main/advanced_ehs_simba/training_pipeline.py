@@ -0,0 +1,468 @@
+"""
+Material Model Training Pipeline for Advanced EHS Simba Drill System.
+
+This module provides:
+- Chunked reading of labelled training data from disk (structured ``.npy``
+  files through a memory map, or Parquet through pyarrow)
+- Out-of-core training: the RandomForest grows chunk by chunk with
+  ``warm_start``; the boosting model (GradientBoosting or
+  HistGradientBoosting) fits a bounded sample drawn during the same pass
+- Incremental updates that add forest trees to the active version as new
+  labelled drilling data arrives (the booster is carried over)
+- A process pool, so training never runs inside an API worker
+- Per-stage timings, recorded in the model registry manifest
+
+Author: EHS Simba Team
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import multiprocessing
+import tempfile
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Optional, Union
+
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+
+from config import MaterialPredictorConfig, TrainingPipelineConfig, get_settings
+from ml_predictor import MaterialPredictor, ModelSet
+from tree_compiler import compile_boosting, compile_random_forest
+
+logger = logging.getLogger(__name__)
+
+# A labelled data source: a .npy/.parquet path or an in-memory (X, y) pair
+TrainingSource = Union[str, Path, tuple[np.ndarray, np.ndarray]]
+
+
+# =============================================================================
+# Report
+# =============================================================================
+
+@dataclass
+class TrainingReport:
+    """
+    Result of one training run.
+    
+    Attributes:
+        version: Registered model version id
+        warm_start: Whether the run extended the previously active version
+        base_version: Version that was extended (warm start only)
+        booster: Boosting model type
+        rows: Labelled rows read from the source
+        forest_trees: Trees in the resulting forest
+        boost_rows: Rows the boosting model was fitted on (0 for warm starts)
+        holdout_rows: Rows held out for evaluation and cascade calibration
+        metrics: Evaluation metrics
+        stage_timings: Wall time per stage in seconds
+    """
+    version: str
+    warm_start: bool
+    base_version: Optional[str]
+    booster: str
+    rows: int
+    forest_trees: int
+    boost_rows: int
+    holdout_rows: int
+    metrics: dict[str, float] = field(default_factory=dict)
+    stage_timings: dict[str, float] = field(default_factory=dict)
+    
+    @property
+    def total_time(self) -> float:
+        """Sum of all stage timings in seconds."""
+        return sum(self.stage_timings.values())
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        result = asdict(self)
+        result["total_time"] = self.total_time
+        return result
+
+
+@contextmanager
+def _stage(timings: dict[str, float], name: str) -> Iterator[None]:
+    """Record the wall time of a pipeline stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+        logger.info(f"Training stage '{name}' took {timings[name]:.2f}s")
+
+
+# =============================================================================
+# Chunked Data Sources
+# =============================================================================
+
+def count_rows(source: TrainingSource) -> int:
+    """
+    Number of labelled rows in a source without reading the data.
+    
+    Args:
+        source: .npy/.parquet path or (X, y) pair
+    
+    Returns:
+        Row count.
+    """
+    if isinstance(source, tuple):
+        return len(source[1])
+    path = Path(source)
+    if path.suffix == ".npy":
+        return len(np.load(path, mmap_mode="r"))
+    if path.suffix == ".parquet":
+        return _parquet_file(path).metadata.num_rows
+    raise ValueError(f"Unsupported training data format '{path.suffix}' (use .npy or .parquet)")
+
+
+def iter_training_chunks(
+    source: TrainingSource,
+    feature_names: list[str],
+    chunk_rows: int,
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """
+    Yield (X, y) chunks of at most roughly chunk_rows rows.
+    
+    Memory-mapped ``.npy`` files and in-memory arrays are read in strided
+    chunks (chunk k holds rows k, k + n_chunks, ...), so each chunk samples
+    the whole file even when it was written one material at a time.
+    Parquet files are read in file order, one record batch per chunk, and
+    should therefore mix materials within row groups.
+    
+    Args:
+        source: .npy/.parquet path or (X, y) pair
+        feature_names: Feature columns in model input order
+        chunk_rows: Target rows per chunk
+    
+    Yields:
+        Feature matrix (float64) and label vector per chunk.
+    """
+    if isinstance(source, tuple):
+        X, y = source
+        n_chunks = max(1, math.ceil(len(y) / chunk_rows))
+        for k in range(n_chunks):
+            yield np.asarray(X[k::n_chunks], dtype=np.float64), np.asarray(y[k::n_chunks])
+        return
+    
+    path = Path(source)
+    if path.suffix == ".npy":
+        data = np.load(path, mmap_mode="r")
+        n_chunks = max(1, math.ceil(len(data) / chunk_rows))
+        for k in range(n_chunks):
+            X = np.column_stack([data[name][k::n_chunks] for name in feature_names])
+            yield X.astype(np.float64, copy=False), np.asarray(data["material"][k::n_chunks])
+    elif path.suffix == ".parquet":
+        columns = list(feature_names) + ["material"]
+        for batch in _parquet_file(path).iter_batches(batch_size=chunk_rows, columns=columns):
+            X = np.column_stack([batch.column(name).to_numpy() for name in feature_names])
+            yield X.astype(np.float64, copy=False), batch.column("material").to_numpy(zero_copy_only=False)
+    else:
+        raise ValueError(f"Unsupported training data format '{path.suffix}' (use .npy or .parquet)")
+
+
+def _parquet_file(path: Path):
+    """Open a Parquet file, importing pyarrow lazily."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading Parquet needs pyarrow (pip install pyarrow)")
+    return pq.ParquetFile(path)
+
+
+def _with_anchors(
+    X: np.ndarray,
+    y: np.ndarray,
+    classes: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Append one zero-weight row per class missing from a chunk.
+    
+    Warm-started estimators take their classes from each fit's labels; the
+    anchors keep every fit on the full class set without influencing
+    the splits.
+    
+    Returns:
+        Features, labels and sample weights.
+    """
+    missing = np.setdiff1d(classes, y)
+    weights = np.ones(len(y))
+    if len(missing) == 0:
+        return X, y, weights
+    X = np.vstack([X, np.zeros((len(missing), X.shape[1]))])
+    y = np.concatenate([y, missing])
+    return X, y, np.concatenate([weights, np.zeros(len(missing))])
+
+
+# =============================================================================
+# Pipeline
+# =============================================================================
+
+class TrainingPipeline:
+    """
+    Out-of-core training of the material models.
+    
+    ``run`` trains in the calling process; ``submit`` and ``train_async``
+    run the same job in a process pool and return once the new version is
+    registered (and activated), ready for ``MaterialPredictor.activate_version``.
+    
+    Example:
+        >>> pipeline = TrainingPipeline()
+        >>> report = await pipeline.train_async("data/drilling.npy")
+        >>> predictor.activate_version(report.version)
+    """
+    
+    def __init__(
+        self,
+        config: Optional[TrainingPipelineConfig] = None,
+        predictor_config: Optional[MaterialPredictorConfig] = None,
+        models_path: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Initialize pipeline.
+        
+        Args:
+            config: Pipeline configuration
+            predictor_config: Material model configuration (booster type etc.)
+            models_path: Model registry root (default: Settings.models_path)
+        """
+        settings = get_settings()
+        self.config = config or settings.ml.training
+        self.predictor_config = predictor_config or settings.ml.material_predictor
+        self.models_path = Path(models_path or settings.models_path).resolve()
+        self._executor: Optional[ProcessPoolExecutor] = None
+    
+    # -------------------------------------------------------------------------
+    # Process pool
+    # -------------------------------------------------------------------------
+    
+    def submit(self, source: Optional[TrainingSource] = None, warm_start: bool = False) -> Future:
+        """
+        Run a training job in the process pool.
+        
+        Args:
+            source: Labelled data; synthetic data is generated if omitted
+            warm_start: Extend the active version instead of training afresh
+        
+        Returns:
+            Future resolving to the job's TrainingReport.
+        """
+        if isinstance(source, (str, Path)):
+            source = Path(source).resolve()
+        if self._executor is None:
+            # spawn: a forked API worker would carry its event loop and
+            # sockets into the child
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.config.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor.submit(
+            run_training_job, source, self.config, self.predictor_config,
+            self.models_path, warm_start,
+        )
+    
+    async def train_async(
+        self,
+        source: Optional[TrainingSource] = None,
+        warm_start: bool = False,
+    ) -> TrainingReport:
+        """Await a process-pool training job without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(source, warm_start))
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the process pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+    
+    # -------------------------------------------------------------------------
+    # Training
+    # -------------------------------------------------------------------------
+    
+    def run(
+        self,
+        source: Optional[TrainingSource] = None,
+        warm_start: bool = False,
+        activate: bool = True,
+    ) -> TrainingReport:
+        """
+        Train, register and optionally activate a model version.
+        
+        Args:
+            source: Labelled data; synthetic data is generated if omitted
+            warm_start: Add forest trees fitted on source to the active version
+            activate: Point the registry's ACTIVE version at the result
+        
+        Returns:
+            Training report.
+        
+        Raises:
+            KeyError: If warm_start is set and there is no active version.
+            ValueError: If warm_start data holds classes the base version lacks.
+        """
+        if source is None:
+            with tempfile.TemporaryDirectory() as tmp:
+                trainer = MaterialPredictor(self.predictor_config, self.models_path)
+                path = Path(tmp) / "synthetic.npy"
+                samples = math.ceil(self.config.synthetic_rows / len(trainer.material_db))
+                trainer.write_synthetic_data(path, samples_per_material=samples)
+                return self.run(path, warm_start=warm_start, activate=activate)
+        
+        cfg = self.config
+        timings: dict[str, float] = {}
+        trainer = MaterialPredictor(self.predictor_config, self.models_path)
+        features = trainer.feature_names
+        
+        base_version = None
+        with _stage(timings, "scan"):
+            rows = count_rows(source)
+            if warm_start:
+                base_version = trainer.registry.active_version()
+                if base_version is None:
+                    raise KeyError("Warm start needs an active model version")
+                base = trainer._read_version(
+                    trainer.registry.version_path(base_version), base_version
+                )
+                cascade_threshold = base.cascade_threshold
+                scaler, forest, booster = base.scaler, base.rf_model, base.gb_model
+                booster_name = trainer.registry.get_manifest(base_version).metadata.get(
+                    "booster", "gradient_boosting"
+                )
+                classes = forest.classes_
+                new_classes = set()
+                for _, y in iter_training_chunks(source, features, cfg.chunk_rows):
+                    new_classes.update(np.unique(y))
+                unknown = sorted(str(c) for c in new_classes - set(classes))
+                if unknown:
+                    raise ValueError(f"Warm start data has classes the base version lacks: {unknown}")
+            else:
+                # Pass 1: scaler statistics and the class set
+                scaler = StandardScaler()
+                labels = set()
+                for X, y in iter_training_chunks(source, features, cfg.chunk_rows):
+                    scaler.partial_fit(X)
+                    labels.update(np.unique(y))
+                classes = np.array(sorted(labels))
+                forest = trainer.make_forest(warm_start=True)
+                booster = trainer.make_booster()
+                booster_name = self.predictor_config.booster
+                cascade_threshold = trainer.cascade_threshold
+        
+        n_chunks = max(1, math.ceil(rows / cfg.chunk_rows))
+        if warm_start:
+            trees_per_chunk = cfg.warm_start_trees_per_chunk
+        else:
+            trees_per_chunk = math.ceil(cfg.forest_trees / n_chunks)
+        holdout_share = min(cfg.holdout_share, cfg.eval_sample_rows / rows)
+        boost_share = min(1.0, cfg.boost_sample_rows / max(1.0, rows * (1 - holdout_share)))
+        rng = np.random.default_rng(cfg.random_state)
+        
+        # Pass 2: grow the forest chunk by chunk and draw the boosting
+        # sample and the holdout on the way
+        boost_X, boost_y, holdout_X, holdout_y = [], [], [], []
+        forest.set_params(warm_start=True)
+        for X, y in iter_training_chunks(source, features, cfg.chunk_rows):
+            with _stage(timings, "forest"):
+                X = scaler.transform(X)
+                held = rng.random(len(y)) < holdout_share
+                holdout_X.append(X[held])
+                holdout_y.append(y[held])
+                X, y = X[~held], y[~held]
+                if len(y) == 0:
+                    continue
+                
+                if not warm_start:
+                    sampled = rng.random(len(y)) < boost_share
+                    boost_X.append(X[sampled])
+                    boost_y.append(y[sampled])
+                
+                X, y, weights = _with_anchors(X, y, classes)
+                forest.set_params(n_estimators=len(getattr(forest, "estimators_", [])) + trees_per_chunk)
+                forest.fit(X, y, sample_weight=weights)
+        
+        # Warm starts keep the base booster: HistGradientBoosting re-bins
+        # its inputs on every fit, which would corrupt the existing trees
+        boost_rows = sum(len(y) for y in boost_y)
+        if not warm_start:
+            with _stage(timings, "boosting"):
+                X, y, weights = _with_anchors(np.concatenate(boost_X), np.concatenate(boost_y), classes)
+                booster.fit(X, y, sample_weight=weights)
+        
+        with _stage(timings, "compile"):
+            models = ModelSet(
+                None, forest, booster, scaler,
+                compile_random_forest(forest), compile_boosting(booster),
+                cascade_threshold=cascade_threshold,
+            )
+            trainer._publish(models)
+        
+        with _stage(timings, "evaluate"):
+            holdout_X = np.concatenate(holdout_X)
+            holdout_y = np.concatenate(holdout_y)
+            metrics = {
+                "train_samples": rows - len(holdout_y),
+                "test_samples": len(holdout_y),
+                "boost_samples": boost_rows,
+            }
+            if len(holdout_y):
+                metrics["rf_accuracy"] = forest.score(holdout_X, holdout_y)
+                metrics["gb_accuracy"] = booster.score(holdout_X, holdout_y)
+                metrics["cascade_skip_rate"] = trainer.calibrate_cascade(holdout_X)
+        
+        with _stage(timings, "register"):
+            trainer.metrics = metrics
+            manifest = trainer.save_models(
+                activate=activate,
+                metadata={
+                    "booster": booster_name,
+                    "base_version": base_version,
+                    "stage_timings": dict(timings),
+                },
+            )
+        
+        report = TrainingReport(
+            version=manifest.version,
+            warm_start=warm_start,
+            base_version=base_version,
+            booster=booster_name,
+            rows=rows,
+            forest_trees=len(forest.estimators_),
+            boost_rows=boost_rows,
+            holdout_rows=len(holdout_y),
+            metrics={k: float(v) for k, v in metrics.items()},
+            stage_timings=timings,
+        )
+        logger.info(
+            f"Trained model version {report.version} on {rows} rows "
+            f"in {report.total_time:.1f}s"
+        )
+        return report
+
+
+def run_training_job(
+    source: Optional[TrainingSource],
+    config: TrainingPipelineConfig,
+    predictor_config: MaterialPredictorConfig,
+    models_path: Union[str, Path],
+    warm_start: bool = False,
+) -> TrainingReport:
+    """Process-pool entry point: one complete training run."""
+    logging.basicConfig(level=logging.INFO)
+    pipeline = TrainingPipeline(config, predictor_config, models_path)
+    return pipeline.run(source, warm_start=warm_start)
+
+
+# Convenience exports
+__all__ = [
+    "TrainingReport",
+    "TrainingPipeline",
+    "count_rows",
+    "iter_training_chunks",
+    "run_training_job",
+]
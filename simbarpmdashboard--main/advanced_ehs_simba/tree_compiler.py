@@ -0,0 +1,393 @@
+"""
+Compiled Tree Ensembles for Advanced EHS Simba Drill System.
+
+This module provides:
+- Export of fitted RandomForest, GradientBoosting and HistGradientBoosting
+  classifiers into contiguous NumPy node arrays (feature, threshold, left,
+  right, leaf value)
+- Vectorized level-synchronous evaluation of every tree for every row
+- Artifact directories of ``.npy`` files that load with ``np.load(mmap_mode='r')``
+
+All trees are flattened into one node table. Leaves point to themselves,
+so a fixed number of ``max_depth`` steps moves every (row, tree) cursor
+to its leaf without branching per tree. Leaf values are stored once per
+leaf and looked up through ``leaf_index``.
+
+Author: EHS Simba Team
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections import namedtuple
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Union
+
+import numpy as np
+from sklearn.dummy import DummyClassifier
+from sklearn.ensemble import (
+    GradientBoostingClassifier,
+    HistGradientBoostingClassifier,
+    RandomForestClassifier,
+)
+
+logger = logging.getLogger(__name__)
+
+# Node arrays stored in an artifact directory
+_ARRAYS = ("feature", "threshold", "left", "right", "leaf_index", "leaf_value", "roots")
+
+# Rows evaluated per traversal chunk (bounds the rows x trees cursor matrix)
+EVAL_CHUNK_ROWS = 2048
+
+# One tree's node arrays, whatever estimator it came from
+_TreeArrays = namedtuple(
+    "_TreeArrays", ["left", "right", "feature", "threshold", "value", "is_leaf", "max_depth"]
+)
+
+
+# =============================================================================
+# Compiled Ensemble
+# =============================================================================
+
+@dataclass
+class CompiledEnsemble:
+    """
+    Tree ensemble compiled to flat node arrays.
+    
+    Attributes:
+        kind: "random_forest" or "gradient_boosting"
+        classes: Class labels in predict_proba column order
+        feature: Split feature per node (0 at leaves)
+        threshold: Split threshold per node (go left if x <= threshold)
+        left: Left child per node (self at leaves)
+        right: Right child per node (self at leaves)
+        leaf_index: Row of ``leaf_value`` per node (0 at internal nodes)
+        leaf_value: Per-leaf class probabilities (forest) or scores (boosting)
+        roots: Root node of each tree
+        max_depth: Deepest root-to-leaf path
+        learning_rate: Boosting shrinkage (boosting only)
+        init_raw: Initial raw score per class (boosting only)
+        input_dtype: Precision the source model compares features in
+    """
+    kind: str
+    classes: np.ndarray
+    feature: np.ndarray
+    threshold: np.ndarray
+    left: np.ndarray
+    right: np.ndarray
+    leaf_index: np.ndarray
+    leaf_value: np.ndarray
+    roots: np.ndarray
+    max_depth: int
+    learning_rate: float = 1.0
+    init_raw: Any = None
+    input_dtype: str = "float32"
+    
+    @property
+    def n_trees(self) -> int:
+        """Number of trees."""
+        return len(self.roots)
+    
+    @property
+    def nbytes(self) -> int:
+        """Total size of the node arrays."""
+        return sum(getattr(self, name).nbytes for name in _ARRAYS)
+    
+    def leaves(self, X: np.ndarray) -> np.ndarray:
+        """
+        Find the leaf each row reaches in each tree.
+        
+        Args:
+            X: Feature matrix (n_samples, n_features)
+        
+        Returns:
+            Leaf node ids, shape (n_samples, n_trees).
+        """
+        # sklearn trees compare float32 features (float64 for histogram
+        # boosting) against float64 thresholds. Features are laid out
+        # column-major so each gather is one flat take.
+        n_rows = len(X)
+        columns = np.ascontiguousarray(np.asarray(X, dtype=self.input_dtype).T).ravel()
+        row_ids = np.arange(n_rows)
+        nodes = np.repeat(self.roots.astype(np.intp)[:, None], n_rows, axis=1)
+        
+        for _ in range(self.max_depth):
+            go_left = columns[self.feature[nodes] * n_rows + row_ids] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes]).astype(np.intp)
+        return nodes.T
+    
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities, equal to the source model's predict_proba.
+        
+        Args:
+            X: Feature matrix (n_samples, n_features)
+        
+        Returns:
+            Probabilities, shape (n_samples, n_classes).
+        """
+        X = np.atleast_2d(X)
+        if len(X) > EVAL_CHUNK_ROWS:
+            return np.concatenate([
+                self.predict_proba(X[i:i + EVAL_CHUNK_ROWS])
+                for i in range(0, len(X), EVAL_CHUNK_ROWS)
+            ])
+        
+        values = self.leaf_value[self.leaf_index[self.leaves(X)]]
+        
+        if self.kind == "random_forest":
+            return values.mean(axis=1)
+        
+        # Boosting: trees are stored stage-major, one per class per stage
+        n_classes = len(self.init_raw)
+        raw = self.init_raw + self.learning_rate * (
+            values.reshape(len(X), -1, n_classes).sum(axis=1)
+        )
+        if n_classes == 1:
+            positive = 1.0 / (1.0 + np.exp(-raw[:, 0]))
+            return np.column_stack([1.0 - positive, positive])
+        raw -= raw.max(axis=1, keepdims=True)
+        proba = np.exp(raw)
+        return proba / proba.sum(axis=1, keepdims=True)
+    
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Write the ensemble as an artifact directory of .npy files.
+        
+        Args:
+            path: Directory to create or overwrite
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for name in _ARRAYS:
+            np.save(path / f"{name}.npy", np.ascontiguousarray(getattr(self, name)))
+        
+        meta = {
+            "kind": self.kind,
+            "classes": self.classes.tolist(),
+            "max_depth": self.max_depth,
+            "learning_rate": self.learning_rate,
+            "init_raw": None if self.init_raw is None else np.asarray(self.init_raw).tolist(),
+            "input_dtype": self.input_dtype,
+        }
+        (path / "meta.json").write_text(json.dumps(meta))
+    
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> CompiledEnsemble:
+        """
+        Load an artifact directory.
+        
+        Args:
+            path: Directory written by ``save``
+            mmap: Memory-map the node arrays (shared between processes)
+        
+        Returns:
+            CompiledEnsemble backed by the files.
+        """
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text())
+        mode = "r" if mmap else None
+        arrays = {name: np.load(path / f"{name}.npy", mmap_mode=mode) for name in _ARRAYS}
+        
+        return cls(
+            kind=meta["kind"],
+            classes=np.array(meta["classes"], dtype=object),
+            max_depth=meta["max_depth"],
+            learning_rate=meta["learning_rate"],
+            init_raw=None if meta["init_raw"] is None else np.array(meta["init_raw"]),
+            input_dtype=meta.get("input_dtype", "float32"),
+            **arrays,
+        )
+
+
+# =============================================================================
+# Compilation
+# =============================================================================
+
+def _flatten_trees(trees: list[_TreeArrays]) -> dict[str, Any]:
+    """
+    Concatenate trees into one self-looping node table.
+    
+    Args:
+        trees: Per-tree node arrays
+    
+    Returns:
+        Node arrays and max_depth.
+    """
+    offsets = np.cumsum([0] + [len(tree.left) for tree in trees])
+    n_nodes = int(offsets[-1])
+    
+    feature = np.zeros(n_nodes, dtype=np.int32)
+    threshold = np.zeros(n_nodes, dtype=np.float64)
+    left = np.zeros(n_nodes, dtype=np.int32)
+    right = np.zeros(n_nodes, dtype=np.int32)
+    leaf_index = np.zeros(n_nodes, dtype=np.int32)
+    values = []
+    n_leaves = 0
+    
+    for tree, offset in zip(trees, offsets[:-1]):
+        node_count = len(tree.left)
+        span = slice(offset, offset + node_count)
+        node_ids = np.arange(offset, offset + node_count, dtype=np.int32)
+        is_leaf = tree.is_leaf
+        
+        feature[span] = np.where(is_leaf, 0, tree.feature)
+        threshold[span] = np.where(is_leaf, 0.0, tree.threshold)
+        left[span] = np.where(is_leaf, node_ids, tree.left.astype(np.int64) + offset)
+        right[span] = np.where(is_leaf, node_ids, tree.right.astype(np.int64) + offset)
+        
+        leaf_ids = np.nonzero(is_leaf)[0]
+        leaf_index[offset + leaf_ids] = n_leaves + np.arange(len(leaf_ids))
+        values.append(tree.value[leaf_ids])
+        n_leaves += len(leaf_ids)
+    
+    return {
+        "feature": feature,
+        "threshold": threshold,
+        "left": left,
+        "right": right,
+        "leaf_index": leaf_index,
+        "leaf_value": np.concatenate(values),
+        "roots": offsets[:-1].astype(np.int32),
+        "max_depth": int(max(tree.max_depth for tree in trees)),
+    }
+
+
+def _sklearn_tree(tree: Any, value: np.ndarray) -> _TreeArrays:
+    """Node arrays of a fitted sklearn ``Tree``."""
+    return _TreeArrays(
+        left=tree.children_left,
+        right=tree.children_right,
+        feature=tree.feature,
+        threshold=tree.threshold,
+        value=value,
+        is_leaf=tree.children_left == -1,
+        max_depth=tree.max_depth,
+    )
+
+
+def compile_random_forest(model: RandomForestClassifier) -> CompiledEnsemble:
+    """
+    Compile a fitted RandomForestClassifier.
+    
+    Args:
+        model: Fitted single-output forest
+    
+    Returns:
+        CompiledEnsemble averaging per-tree leaf class distributions.
+    """
+    trees = []
+    for estimator in model.estimators_:
+        value = estimator.tree_.value[:, 0, :].astype(np.float64)
+        totals = value.sum(axis=1, keepdims=True)
+        value = np.divide(value, totals, out=np.zeros_like(value), where=totals > 0)
+        trees.append(_sklearn_tree(estimator.tree_, value))
+    
+    return CompiledEnsemble(
+        kind="random_forest",
+        classes=np.asarray(model.classes_, dtype=object),
+        **_flatten_trees(trees),
+    )
+
+
+def compile_gradient_boosting(model: GradientBoostingClassifier) -> CompiledEnsemble:
+    """
+    Compile a fitted GradientBoostingClassifier.
+    
+    Args:
+        model: Fitted classifier with the default (prior or zero) init
+    
+    Returns:
+        CompiledEnsemble summing shrunken stage scores per class.
+    
+    Raises:
+        ValueError: If the init estimator is not constant.
+    """
+    if not (model.init_ == "zero" or isinstance(model.init_, DummyClassifier)):
+        raise ValueError("Only constant init estimators can be compiled")
+    
+    n_features = model.n_features_in_
+    init_raw = model._raw_predict_init(np.zeros((1, n_features), dtype=np.float32))[0]
+    trees = [
+        _sklearn_tree(estimator.tree_, estimator.tree_.value[:, 0, :].astype(np.float64))
+        for estimator in model.estimators_.ravel()
+    ]
+    
+    return CompiledEnsemble(
+        kind="gradient_boosting",
+        classes=np.asarray(model.classes_, dtype=object),
+        learning_rate=float(model.learning_rate),
+        init_raw=np.asarray(init_raw, dtype=np.float64),
+        **_flatten_trees(trees),
+    )
+
+
+def compile_hist_gradient_boosting(model: HistGradientBoostingClassifier) -> CompiledEnsemble:
+    """
+    Compile a fitted HistGradientBoostingClassifier.
+    
+    Leaf values already include the learning rate. Rows with missing
+    values follow the ``x <= threshold`` rule rather than the learned
+    missing-value direction.
+    
+    Args:
+        model: Fitted classifier without categorical features
+    
+    Returns:
+        CompiledEnsemble summing per-iteration scores per class.
+    
+    Raises:
+        ValueError: If the model uses categorical splits.
+    """
+    trees = []
+    for iteration in model._predictors:
+        for predictor in iteration:
+            nodes = predictor.nodes
+            if nodes["is_categorical"].any():
+                raise ValueError("Categorical splits cannot be compiled")
+            trees.append(_TreeArrays(
+                left=nodes["left"],
+                right=nodes["right"],
+                feature=nodes["feature_idx"],
+                threshold=nodes["num_threshold"],
+                value=nodes["value"][:, None].astype(np.float64),
+                is_leaf=nodes["is_leaf"].astype(bool),
+                max_depth=nodes["depth"].max(),
+            ))
+    
+    return CompiledEnsemble(
+        kind="gradient_boosting",
+        classes=np.asarray(model.classes_, dtype=object),
+        learning_rate=1.0,
+        init_raw=np.asarray(model._baseline_prediction, dtype=np.float64).ravel(),
+        input_dtype="float64",
+        **_flatten_trees(trees),
+    )
+
+
+def compile_boosting(model: Any) -> CompiledEnsemble:
+    """
+    Compile either supported boosting classifier.
+    
+    Args:
+        model: Fitted GradientBoosting or HistGradientBoosting classifier
+    
+    Returns:
+        CompiledEnsemble equivalent to the model's predict_proba.
+    """
+    if isinstance(model, HistGradientBoostingClassifier):
+        return compile_hist_gradient_boosting(model)
+    return compile_gradient_boosting(model)
+
+
+# Convenience exports
+__all__ = [
+    "CompiledEnsemble",
+    "compile_random_forest",
+    "compile_gradient_boosting",
+    "compile_hist_gradient_boosting",
+    "compile_boosting",
+]